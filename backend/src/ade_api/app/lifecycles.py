@@ -29,6 +29,7 @@ from ade_api.features.admin_settings.service import (
 from ade_api.features.documents.changes import purge_document_changes
 from ade_api.features.documents.events import DocumentChangesHub
 from ade_api.features.rbac import RbacService
+from ade_api.features.runs.events import RunEventsHub
 from ade_api.features.sso.env_sync import sync_sso_providers_from_env
 from ade_api.settings import Settings, get_settings
 from ade_db.models import User
@@ -296,6 +297,9 @@ def create_application_lifespan(
             events_hub = DocumentChangesHub(settings=settings)
             events_hub.start(loop=asyncio.get_running_loop())
             app.state.document_changes_hub = events_hub
+            run_events_hub = RunEventsHub(settings=settings)
+            run_events_hub.start(loop=asyncio.get_running_loop())
+            app.state.run_events_hub = run_events_hub
             maintenance_task = asyncio.create_task(
                 _document_changes_maintenance_loop(_maintain_document_changes)
             )
@@ -308,7 +312,9 @@ def create_application_lifespan(
                 with suppress(asyncio.CancelledError):
                     await maintenance_task
                 events_hub.stop()
+                run_events_hub.stop()
                 app.state.document_changes_hub = None
+                app.state.run_events_hub = None
                 app.state.document_changes_maintenance_task = None
         finally:
             shutdown_storage(app)
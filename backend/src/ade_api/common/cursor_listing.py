@@ -12,18 +12,18 @@ from uuid import UUID
 
 from fastapi import HTTPException, Query, Request, status
 from pydantic import Field
-from sqlalchemy import and_, false, func, or_, select, text
+from sqlalchemy import and_, false, or_, tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
 from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.operators import desc_op
 
+from ade_api.common.list_counts import CountKey, count_query
 from ade_api.common.list_filters import FilterItem, FilterJoinOperator, parse_filter_items
 from ade_api.common.schema import BaseSchema
 from ade_api.common.search import parse_q
 from ade_api.common.sorting import parse_sort
 from ade_api.common.validators import normalize_utc
-from ade_api.settings import COUNT_STATEMENT_TIMEOUT_MS
 
 T = TypeVar("T")
 
@@ -69,6 +69,7 @@ class CursorMeta(BaseSchema):
     next_cursor: str | None = Field(default=None, alias="nextCursor")
     total_included: bool = Field(alias="totalIncluded")
     total_count: int | None = Field(default=None, alias="totalCount")
+    total_estimated: bool | None = Field(default=None, alias="totalEstimated")
     changes_cursor: str | None = Field(default=None, alias="changesCursor")
 
 
@@ -447,6 +448,14 @@ def _build_cursor_predicate[T](
     if not keys:
         return false()
 
+    directions = {direction for _, direction, _ in keys}
+    if len(keys) > 1 and len(directions) == 1 and all(value is not None for *_, value in keys):
+        # A single row-value comparison is equivalent to the OR expansion below
+        # and lets Postgres seek a (prefix..., sort column, id) index directly.
+        row = tuple_(*(_unwrap_ordering(expr) for expr, _, _ in keys))
+        cursor_row = tuple(value for *_, value in keys)
+        return row < cursor_row if directions == {"desc"} else row > cursor_row
+
     conditions = []
     for i, (expr, direction, value) in enumerate(keys):
         eq_conditions = [
@@ -492,16 +501,6 @@ def _parse_cursor_values[T](
     return parsed
 
 
-def _maybe_set_count_statement_timeout(session: Session, *, include_total: bool) -> None:
-    if (
-        include_total
-        and COUNT_STATEMENT_TIMEOUT_MS
-        and session.bind is not None
-        and getattr(session.bind.dialect, "name", None) == "postgresql"
-    ):
-        session.execute(text(f"SET LOCAL statement_timeout = {int(COUNT_STATEMENT_TIMEOUT_MS)}"))
-
-
 def paginate_query_cursor(
     session: Session,
     stmt: Select,
@@ -512,13 +511,9 @@ def paginate_query_cursor(
     include_total: bool = False,
     changes_cursor: str | None = None,
     row_mapper: Callable[[Mapping[str, Any]], T] | None = None,
+    count_key: CountKey | None = None,
 ) -> CursorPage[T]:
-    _maybe_set_count_statement_timeout(session, include_total=include_total)
-
-    count: int | None = None
-    if include_total:
-        count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
-        count = session.execute(count_stmt).scalar_one()
+    total = count_query(session, stmt, cache_key=count_key) if include_total else None
 
     ordered_stmt = stmt.order_by(*resolved_sort.order_by)
 
@@ -549,7 +544,8 @@ def paginate_query_cursor(
         has_more=has_more,
         next_cursor=next_cursor,
         total_included=include_total,
-        total_count=count if include_total else None,
+        total_count=total.value if total is not None else None,
+        total_estimated=total.estimated if total is not None else None,
         changes_cursor=str(changes_cursor) if changes_cursor is not None else None,
     )
 
@@ -566,16 +562,12 @@ def paginate_query_page(
     include_total: bool = False,
     changes_cursor: str | None = None,
     row_mapper: Callable[[Mapping[str, Any]], T] | None = None,
+    count_key: CountKey | None = None,
 ) -> CursorPage[T]:
-    _maybe_set_count_statement_timeout(session, include_total=include_total)
-
     ordered_stmt = stmt.order_by(*resolved_sort.order_by)
     offset = max(page - 1, 0) * limit
 
-    count: int | None = None
-    if include_total:
-        count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
-        count = session.execute(count_stmt).scalar_one()
+    total = count_query(session, stmt, cache_key=count_key) if include_total else None
 
     result = session.execute(ordered_stmt.offset(offset).limit(limit + 1))
     if row_mapper is None:
@@ -585,15 +577,16 @@ def paginate_query_page(
 
     has_more = len(rows) > limit
     items = rows[:limit]
-    if include_total and count is not None:
-        has_more = offset + len(items) < count
+    if total is not None and not total.estimated:
+        has_more = offset + len(items) < total.value
 
     meta = CursorMeta(
         limit=limit,
         has_more=has_more,
         next_cursor=None,
         total_included=include_total,
-        total_count=count if include_total else None,
+        total_count=total.value if total is not None else None,
+        total_estimated=total.estimated if total is not None else None,
         changes_cursor=str(changes_cursor) if changes_cursor is not None else None,
     )
 
@@ -814,6 +807,17 @@ def parse_int(value: Any) -> int | None:
         raise HTTPException(status_code=422, detail="Invalid cursor value.") from exc
 
 
+def parse_float(value: Any) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail="Invalid cursor value.") from exc
+
+
 def parse_bool(value: Any) -> bool | None:
     if value is None:
         return None
@@ -868,6 +872,7 @@ __all__ = [
     "parse_bool",
     "parse_datetime",
     "parse_enum",
+    "parse_float",
     "parse_int",
     "parse_str",
     "parse_uuid",
@@ -39,6 +39,22 @@ def format_weak_etag(value: str | None) -> str | None:
     return f'W/"{token}"'
 
 
+def etag_matches(if_none_match: str | None, token: str | None) -> bool:
+    """Return True when an ``If-None-Match`` header matches ``token``.
+
+    Handles ``*`` and comma-separated lists; comparison is weak, as RFC 9110
+    requires for ``If-None-Match``.
+    """
+
+    if not if_none_match or not token:
+        return False
+    for candidate in if_none_match.split(","):
+        value = candidate.strip()
+        if value == "*" or canonicalize_etag(value) == token:
+            return True
+    return False
+
+
 def build_etag_token(*parts: Any) -> str:
     """Build a stable ETag token from component parts."""
 
@@ -56,6 +72,7 @@ def build_etag_token(*parts: Any) -> str:
 __all__ = [
     "build_etag_token",
     "canonicalize_etag",
+    "etag_matches",
     "format_etag",
     "format_weak_etag",
 ]
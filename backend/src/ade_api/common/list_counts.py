@@ -0,0 +1,175 @@
+"""Count strategies for ``include_total`` on list endpoints.
+
+An exact ``count(*)`` over the filtered query costs as much as reading every
+matching row, so totals are resolved in order of cost:
+
+1. A cached exact count for the same scope and filter fingerprint, valid only
+   while the scope's version (for documents, the latest ``document_changes``
+   id) is unchanged.
+2. The planner's row estimate (``EXPLAIN``) when it is at least
+   ``COUNT_ESTIMATE_THRESHOLD``; the page reports ``totalEstimated``.
+3. An exact count, stored in the cache when the caller supplied a version.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import func, literal_column, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+from ade_api.settings import (
+    COUNT_CACHE_MAX_ENTRIES,
+    COUNT_CACHE_TTL_SECONDS,
+    COUNT_ESTIMATE_THRESHOLD,
+    COUNT_STATEMENT_TIMEOUT_MS,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CountKey:
+    """Identifies a cacheable count: ``scope`` + ``fingerprint`` at ``version``."""
+
+    scope: str
+    fingerprint: str
+    version: str
+
+
+@dataclass(frozen=True, slots=True)
+class ListCount:
+    value: int
+    estimated: bool = False
+
+
+def count_fingerprint(*parts: Any) -> str:
+    """Stable hash of the inputs (filters, ``q``, lifecycle, ...) that shape a count."""
+
+    material = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class CountCache:
+    """Thread-safe, in-process LRU of exact counts with a TTL."""
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], tuple[str, int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CountKey) -> int | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((key.scope, key.fingerprint))
+            if entry is None:
+                return None
+            version, value, expires_at = entry
+            if version != key.version or expires_at <= now:
+                del self._entries[(key.scope, key.fingerprint)]
+                return None
+            self._entries.move_to_end((key.scope, key.fingerprint))
+            return value
+
+    def set(self, key: CountKey, value: int) -> None:
+        if self._max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self._ttl_seconds
+        with self._lock:
+            self._entries[(key.scope, key.fingerprint)] = (key.version, value, expires_at)
+            self._entries.move_to_end((key.scope, key.fingerprint))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+COUNT_CACHE = CountCache(max_entries=COUNT_CACHE_MAX_ENTRIES, ttl_seconds=COUNT_CACHE_TTL_SECONDS)
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _is_postgres(session: Session) -> bool:
+    return session.bind is not None and getattr(session.bind.dialect, "name", None) == "postgresql"
+
+
+def estimate_count(session: Session, stmt: Select) -> int | None:
+    """Return the planner's row estimate for ``stmt``, or ``None`` off Postgres."""
+
+    if not _is_postgres(session):
+        return None
+    probe: Select[tuple[Any]] = select(literal_column("1")).select_from(
+        stmt.order_by(None).subquery()
+    )
+    plan = session.execute(_Explain(probe)).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (LookupError, TypeError, ValueError):
+        return None
+
+
+def _exact_count(session: Session, stmt: Select) -> int:
+    if COUNT_STATEMENT_TIMEOUT_MS and _is_postgres(session):
+        session.execute(text(f"SET LOCAL statement_timeout = {int(COUNT_STATEMENT_TIMEOUT_MS)}"))
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    return int(session.execute(count_stmt).scalar_one())
+
+
+def count_query(
+    session: Session,
+    stmt: Select,
+    *,
+    cache_key: CountKey | None = None,
+    estimate_threshold: int | None = COUNT_ESTIMATE_THRESHOLD,
+    cache: CountCache = COUNT_CACHE,
+) -> ListCount:
+    """Resolve the total for ``stmt`` using the cheapest acceptable strategy."""
+
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return ListCount(cached)
+
+    if estimate_threshold is not None:
+        estimate = estimate_count(session, stmt)
+        if estimate is not None and estimate >= estimate_threshold:
+            return ListCount(estimate, estimated=True)
+
+    value = _exact_count(session, stmt)
+    if cache_key is not None:
+        cache.set(cache_key, value)
+    return ListCount(value)
+
+
+__all__ = [
+    "COUNT_CACHE",
+    "CountCache",
+    "CountKey",
+    "ListCount",
+    "count_fingerprint",
+    "count_query",
+    "estimate_count",
+]
@@ -0,0 +1,285 @@
+"""Cache of rendered workbook previews keyed by file content and preview options.
+
+File versions are immutable (``sha256`` identifies their bytes), so a preview
+for a given version and set of options never changes. ``PreviewCache`` keeps
+serialized previews in a size-bounded LRU directory on local disk and, when
+enabled, in a shared tier on blob storage so other API processes and hosts
+can reuse them. Cache failures are logged and treated as misses.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from ade_api.common.logging import log_context
+from ade_api.common.workbook_preview import WorkbookSheetPreview
+from ade_api.settings import Settings
+from ade_storage import StorageAdapter, StorageError
+
+logger = logging.getLogger(__name__)
+
+# Bump when the preview payload or reader output changes so stale entries miss.
+PREVIEW_CACHE_VERSION = 2
+# Previews are per-user authorized, so browsers may keep them but must revalidate.
+PREVIEW_CACHE_CONTROL = "private, no-cache"
+
+_ENTRY_SUFFIX = ".json"
+# Evict down to this fraction of the budget so eviction scans stay infrequent.
+_LOW_WATER_RATIO = 0.8
+
+
+def preview_cache_key(
+    content_sha256: str,
+    *,
+    file_type: str,
+    sheet_name: str | None,
+    sheet_index: int | None,
+    max_rows: int,
+    max_columns: int,
+    trim_empty_columns: bool,
+    trim_empty_rows: bool,
+    row_offset: int = 0,
+    column_offset: int = 0,
+) -> str:
+    """Return the cache key (also used as the strong ETag) for a preview."""
+
+    material = json.dumps(
+        [
+            PREVIEW_CACHE_VERSION,
+            content_sha256,
+            file_type,
+            sheet_name,
+            sheet_index,
+            row_offset,
+            column_offset,
+            max_rows,
+            max_columns,
+            trim_empty_columns,
+            trim_empty_rows,
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class DiskPreviewCache:
+    """Size-bounded LRU of cache entries stored as files under ``root``.
+
+    Recency is tracked with file mtimes (bumped on every hit), so the cache
+    survives restarts and can be shared by API processes on the same host.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: int) -> None:
+        self._root = root
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: int | None = None
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def get(self, key: str) -> bytes | None:
+        path = self._entry_path(key)
+        try:
+            payload = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return payload
+
+    def put(self, key: str, payload: bytes) -> None:
+        if len(payload) > self._max_bytes:
+            return
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(payload)
+            if self._size > self._max_bytes:
+                self._evict_locked()
+
+    def _entry_path(self, key: str) -> Path:
+        return self._root / key[:2] / f"{key}{_ENTRY_SUFFIX}"
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries: list[tuple[float, int, Path]] = []
+        if not self._root.is_dir():
+            return entries
+        for shard in os.scandir(self._root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(_ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict_locked(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in entries)
+        target = int(self._max_bytes * _LOW_WATER_RATIO)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        self._size = total
+        logger.debug(
+            "preview.cache.evicted",
+            extra=log_context(evicted=evicted, remaining_bytes=total),
+        )
+
+
+class PreviewCache:
+    """Two-tier preview cache: local disk LRU first, then optional blob storage."""
+
+    def __init__(
+        self,
+        *,
+        local: DiskPreviewCache | None,
+        shared: StorageAdapter | None = None,
+    ) -> None:
+        self._local = local
+        self._shared = shared
+
+    @property
+    def enabled(self) -> bool:
+        return self._local is not None or self._shared is not None
+
+    def get(self, key: str, *, workspace_id: UUID) -> WorkbookSheetPreview | None:
+        payload = self._get_local(key)
+        if payload is None:
+            payload = self._get_shared(key, workspace_id=workspace_id)
+            if payload is not None:
+                self._put_local(key, payload)
+        if payload is None:
+            return None
+        try:
+            return WorkbookSheetPreview.model_validate_json(payload)
+        except ValidationError:
+            logger.warning("preview.cache.corrupt_entry", extra=log_context(cache_key=key))
+            return None
+
+    def put(self, key: str, preview: WorkbookSheetPreview, *, workspace_id: UUID) -> None:
+        if not self.enabled:
+            return
+        payload = preview.json_bytes()
+        self._put_local(key, payload)
+        if self._shared is not None:
+            try:
+                self._shared.write(shared_preview_uri(workspace_id, key), io.BytesIO(payload))
+            except (OSError, StorageError):
+                logger.warning(
+                    "preview.cache.shared_write_failed",
+                    extra=log_context(workspace_id=workspace_id, cache_key=key),
+                    exc_info=True,
+                )
+
+    def _get_local(self, key: str) -> bytes | None:
+        if self._local is None:
+            return None
+        try:
+            return self._local.get(key)
+        except OSError:
+            logger.warning("preview.cache.read_failed", extra=log_context(cache_key=key))
+            return None
+
+    def _put_local(self, key: str, payload: bytes) -> None:
+        if self._local is None:
+            return
+        try:
+            self._local.put(key, payload)
+        except OSError:
+            logger.warning(
+                "preview.cache.write_failed",
+                extra=log_context(cache_key=key),
+                exc_info=True,
+            )
+
+    def _get_shared(self, key: str, *, workspace_id: UUID) -> bytes | None:
+        if self._shared is None:
+            return None
+        try:
+            return b"".join(self._shared.stream(shared_preview_uri(workspace_id, key)))
+        except FileNotFoundError:
+            return None
+        except (OSError, StorageError):
+            logger.warning(
+                "preview.cache.shared_read_failed",
+                extra=log_context(workspace_id=workspace_id, cache_key=key),
+                exc_info=True,
+            )
+            return None
+
+
+def shared_preview_uri(workspace_id: UUID, key: str) -> str:
+    """Blob name of a shared-tier entry (under the workspace prefix)."""
+
+    return f"{workspace_id}/cache/previews/{key}{_ENTRY_SUFFIX}"
+
+
+_local_caches: dict[tuple[Path, int], DiskPreviewCache] = {}
+_local_caches_lock = threading.Lock()
+
+
+def get_preview_cache(settings: Settings, storage: StorageAdapter) -> PreviewCache:
+    """Return the preview cache configured by ``settings``.
+
+    The local tier is a process-wide singleton per directory so its size
+    accounting is shared by every request.
+    """
+
+    local: DiskPreviewCache | None = None
+    if settings.preview_cache_max_bytes > 0:
+        cache_key = (settings.preview_cache_dir, settings.preview_cache_max_bytes)
+        with _local_caches_lock:
+            local = _local_caches.get(cache_key)
+            if local is None:
+                local = DiskPreviewCache(
+                    settings.preview_cache_dir,
+                    max_bytes=settings.preview_cache_max_bytes,
+                )
+                _local_caches[cache_key] = local
+    shared = storage if settings.preview_cache_shared_enabled else None
+    return PreviewCache(local=local, shared=shared)
+
+
+__all__ = [
+    "PREVIEW_CACHE_CONTROL",
+    "PREVIEW_CACHE_VERSION",
+    "DiskPreviewCache",
+    "PreviewCache",
+    "get_preview_cache",
+    "preview_cache_key",
+    "shared_preview_uri",
+]
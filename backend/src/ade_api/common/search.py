@@ -7,7 +7,8 @@ from dataclasses import dataclass
 from typing import Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, or_
+from sqlalchemy import Float, and_, cast, func, or_
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql.elements import ColumnElement
 
 MAX_QUERY_LENGTH = 200
@@ -28,13 +29,33 @@ class SearchField:
     predicate: Callable[[str], ColumnElement[Any]]
 
 
+@dataclass(frozen=True)
+class SearchIndex:
+    """A maintained, trigram-indexed text column covering every field of a resource.
+
+    When a resource has one, ``q`` matches each token against this single
+    column instead of OR-ing per-field predicates, so Postgres can answer
+    the ``ILIKE '%token%'`` from a ``gin_trgm_ops`` index.
+    """
+
+    column: ColumnElement[Any] | InstrumentedAttribute[Any]
+
+
 class SearchRegistry:
-    def __init__(self, entries: dict[str, Sequence[SearchField]]) -> None:
+    def __init__(
+        self,
+        entries: dict[str, Sequence[SearchField]],
+        indexes: dict[str, SearchIndex] | None = None,
+    ) -> None:
         self._entries = {key: tuple(value) for key, value in entries.items()}
+        self._indexes = dict(indexes or {})
 
     def get(self, key: str) -> Sequence[SearchField] | None:
         return self._entries.get(key)
 
+    def get_index(self, key: str) -> SearchIndex | None:
+        return self._indexes.get(key)
+
     def keys(self) -> Sequence[str]:
         return tuple(self._entries.keys())
 
@@ -79,7 +100,9 @@ def escape_like(token: str) -> str:
     )
 
 
-def build_like_predicate(column: ColumnElement[Any]) -> Callable[[str], ColumnElement[Any]]:
+def build_like_predicate(
+    column: ColumnElement[Any] | InstrumentedAttribute[Any],
+) -> Callable[[str], ColumnElement[Any]]:
     def _predicate(token: str) -> ColumnElement[Any]:
         escaped = escape_like(token)
         pattern = f"%{escaped}%"
@@ -105,6 +128,11 @@ def build_q_predicate(
             detail=f"q is not supported for resource '{resource}'.",
         )
 
+    index = registry.get_index(resource)
+    if index is not None:
+        predicate = build_like_predicate(index.column)
+        return and_(*(predicate(token) for token in parsed.tokens))
+
     token_predicates: list[ColumnElement[Any]] = []
     for token in parsed.tokens:
         field_predicates = [field.predicate(token) for field in fields]
@@ -112,6 +140,28 @@ def build_q_predicate(
     return and_(*token_predicates)
 
 
+def build_q_relevance(
+    *,
+    resource: str,
+    q: str | None,
+    registry: SearchRegistry,
+) -> ColumnElement[float] | None:
+    """Return a ``pg_trgm`` relevance score for ``q``, or ``None`` when unavailable.
+
+    Only resources with a ``SearchIndex`` can be ranked; the score is
+    ``word_similarity`` between the query and the indexed column (0 to 1).
+    It is cast from ``real`` to ``double precision`` so the value stored in a
+    cursor compares equal to the score the next page's keyset recomputes.
+    """
+
+    parsed = parse_q(q)
+    index = registry.get_index(resource)
+    if not parsed.tokens or index is None:
+        return None
+    query = " ".join(parsed.tokens).lower()
+    return cast(func.word_similarity(query, index.column), Float(53))
+
+
 def matches_q_values(q: str | None, values: Iterable[str | None]) -> bool:
     parsed = parse_q(q)
     return matches_tokens(parsed.tokens, values)
@@ -135,9 +185,11 @@ __all__ = [
     "MIN_QUERY_TOKEN_LENGTH",
     "ParsedQuery",
     "SearchField",
+    "SearchIndex",
     "SearchRegistry",
     "build_like_predicate",
     "build_q_predicate",
+    "build_q_relevance",
     "escape_like",
     "matches_q_values",
     "matches_tokens",
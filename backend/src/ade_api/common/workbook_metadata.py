@@ -0,0 +1,469 @@
+"""Workbook metadata captured once per file version.
+
+Listing the sheets of a workbook used to mean downloading the whole blob and
+opening it with openpyxl. Instead, ``extract_workbook_metadata`` reads the
+workbook part and streams each worksheet part once, when a ``FileVersion`` is
+created, and the result is stored on ``file_versions.workbook_metadata``.
+
+The payload is plain JSON::
+
+    {
+        "version": 1,
+        "sheets": [
+            {
+                "name": "Data",
+                "index": 0,
+                "state": "visible",
+                "is_active": true,
+                "dimension": "A1:D120",
+                "row_count": 120,
+                "column_count": 4,
+                "hidden_row_count": 0,
+                "hidden_column_count": 1,
+                "row_index": {
+                    "interval": 1024,
+                    "prelude": "<?xml ...?><worksheet ...>...<sheetData>",
+                    "checkpoints": [[1025, 81233], [2049, 162901]]
+                }
+            }
+        ]
+    }
+
+``row_index`` is only present for sheets with more than ``ROW_INDEX_INTERVAL``
+rows. Each checkpoint is ``[row_number, byte_offset]`` of a ``<row>`` tag in
+the decompressed sheet part; ``prelude`` is everything before the first row.
+Together they let a reader start parsing at any checkpoint (see
+``SheetRowIndex``) instead of from the top of the sheet. Only XML parsing is
+skipped: seeking in a deflated part still inflates every byte before the
+checkpoint. Deep windows of large sheets are therefore served from a row
+sidecar when the version has one (see ``workbook_sidecar``).
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from ade_api.common.logging import log_context
+
+WORKBOOK_METADATA_VERSION = 1
+WORKBOOK_PART = "xl/workbook.xml"
+WORKBOOK_RELS_PART = "xl/_rels/workbook.xml.rels"
+
+ROW_INDEX_INTERVAL = 1024
+
+_SHEET_SCAN_CHUNK_SIZE = 1024 * 1024
+_MAX_COLUMNS = 16_384
+_MAX_PRELUDE_BYTES = 64 * 1024
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_DOC_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_DIMENSION_RE = re.compile(rb'<(?:\w+:)?dimension\b[^>]*\bref="([^"]+)"')
+_SHEET_DATA_RE = re.compile(rb"<(?:\w+:)?sheetData\b[^>]*>")
+_ROW_TAG_RE = re.compile(rb"<(?:\w+:)?row\b([^>]*)>")
+_COL_TAG_RE = re.compile(rb"<(?:\w+:)?col\b([^>]*)>")
+_ROW_NUMBER_RE = re.compile(rb'\br="(\d+)"')
+_HIDDEN_RE = re.compile(rb'\bhidden="(?:1|true)"')
+_MIN_RE = re.compile(rb'\bmin="(\d+)"')
+_MAX_RE = re.compile(rb'\bmax="(\d+)"')
+_CELL_REF_RE = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+
+logger = logging.getLogger(__name__)
+
+
+class WorkbookMetadataError(ValueError):
+    """Raised when a workbook package cannot be read."""
+
+
+@dataclass(frozen=True, slots=True)
+class WorkbookSheetRef:
+    """One ``<sheet>`` entry of a workbook and the package part it points at."""
+
+    name: str
+    index: int
+    state: str
+    part: str | None
+    is_active: bool
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "index": self.index,
+            "state": self.state,
+            "is_active": self.is_active,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class SheetRowIndex:
+    """Row checkpoints for seeking into a worksheet part (see module docstring)."""
+
+    prelude: bytes
+    checkpoints: list[tuple[int, int]]
+
+    def seek_point(self, row_number: int) -> tuple[int, int] | None:
+        """Return the last ``(row_number, byte_offset)`` checkpoint at or before ``row_number``."""
+
+        position = bisect.bisect_right(self.checkpoints, (row_number, float("inf")))
+        if position == 0:
+            return None
+        return self.checkpoints[position - 1]
+
+
+def sheet_row_index(sheet: Any) -> SheetRowIndex | None:
+    """Return the ``SheetRowIndex`` stored on a sheet descriptor, if valid."""
+
+    if not isinstance(sheet, dict):
+        return None
+    payload = sheet.get("row_index")
+    if not isinstance(payload, dict):
+        return None
+    prelude = payload.get("prelude")
+    raw_checkpoints = payload.get("checkpoints")
+    if not isinstance(prelude, str) or not isinstance(raw_checkpoints, list):
+        return None
+    try:
+        checkpoints = [(int(row), int(offset)) for row, offset in raw_checkpoints]
+    except (TypeError, ValueError):
+        return None
+    if not checkpoints or checkpoints != sorted(checkpoints):
+        return None
+    return SheetRowIndex(prelude=prelude.encode("utf-8"), checkpoints=checkpoints)
+
+
+def extract_workbook_metadata(source: Path | IO[bytes]) -> dict[str, Any]:
+    """Return sheet metadata for the xlsx workbook at ``source``.
+
+    ``source`` may be a path or a seekable binary stream (such as an upload's
+    spooled file). Cell values are never materialised; each worksheet part is
+    decompressed and scanned once for its dimension, row and column tags.
+    """
+
+    try:
+        with zipfile.ZipFile(source, "r") as archive:
+            sheets = []
+            for ref in read_workbook_sheet_refs(archive):
+                scan = _scan_sheet_part(archive, ref.part) if ref.part else _SheetScan()
+                sheets.append({**ref.as_dict(), **scan.as_dict()})
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError) as exc:
+        raise WorkbookMetadataError(str(exc) or type(exc).__name__) from exc
+
+    return {"version": WORKBOOK_METADATA_VERSION, "sheets": sheets}
+
+
+def workbook_metadata_sheets(metadata: Any) -> list[dict[str, Any]] | None:
+    """Return stored sheet descriptors, or ``None`` when they are absent or stale."""
+
+    if not isinstance(metadata, dict):
+        return None
+    if metadata.get("version") != WORKBOOK_METADATA_VERSION:
+        return None
+    sheets = metadata.get("sheets")
+    if not isinstance(sheets, list) or not sheets:
+        return None
+    if not all(isinstance(sheet, dict) and isinstance(sheet.get("name"), str) for sheet in sheets):
+        return None
+    return sheets
+
+
+def find_sheet_row_index(
+    metadata: Any,
+    *,
+    sheet_name: str | None,
+    sheet_index: int | None,
+) -> SheetRowIndex | None:
+    """Return the stored row index for the sheet a preview would select."""
+
+    sheets = workbook_metadata_sheets(metadata)
+    if sheets is None:
+        return None
+    if sheet_name:
+        matches = [sheet for sheet in sheets if sheet["name"] == sheet_name]
+        return sheet_row_index(matches[0]) if matches else None
+    index = sheet_index if sheet_index is not None else 0
+    if index < 0 or index >= len(sheets):
+        return None
+    return sheet_row_index(sheets[index])
+
+
+def is_workbook_filename(name: str | None) -> bool:
+    return Path(name or "").suffix.lower() == ".xlsx"
+
+
+def capture_workbook_metadata(
+    source: Path | IO[bytes],
+    *,
+    filename: str | None,
+) -> dict[str, Any] | None:
+    """Best-effort extraction used when a file version is created.
+
+    Returns ``None`` for non-workbook files and for workbooks that cannot be
+    read; sheet listing then falls back to inspecting the stored blob, which
+    reports the parse error to the caller.
+    """
+
+    if not is_workbook_filename(filename):
+        return None
+    rewind = getattr(source, "seek", None)
+    try:
+        if callable(rewind):
+            rewind(0)
+        return extract_workbook_metadata(source)
+    except (WorkbookMetadataError, ValueError, OSError) as exc:
+        logger.debug(
+            "workbook.metadata.extract_failed",
+            extra=log_context(upload_filename=filename, reason=type(exc).__name__),
+        )
+        return None
+    finally:
+        if callable(rewind):
+            try:
+                rewind(0)
+            except (OSError, ValueError):
+                pass
+
+
+class _SheetScan:
+    __slots__ = (
+        "checkpoints",
+        "dimension",
+        "head",
+        "hidden_columns",
+        "hidden_rows",
+        "last_row",
+        "max_row",
+        "prelude",
+        "rows",
+    )
+
+    def __init__(self) -> None:
+        self.dimension: str | None = None
+        self.rows = 0
+        self.max_row = 0
+        self.last_row = 0
+        self.hidden_rows = 0
+        self.hidden_columns: set[int] = set()
+        # Bytes before the first row; ``head`` collects them until sheetData opens.
+        self.head: bytearray | None = bytearray()
+        self.prelude: bytes | None = None
+        self.checkpoints: list[list[int]] = []
+
+    def as_dict(self) -> dict[str, Any]:
+        row_count, column_count = _dimension_size(self.dimension)
+        if row_count is None:
+            row_count = self.max_row or self.rows
+        payload: dict[str, Any] = {
+            "dimension": self.dimension,
+            "row_count": row_count,
+            "column_count": column_count,
+            "hidden_row_count": self.hidden_rows,
+            "hidden_column_count": len(self.hidden_columns),
+        }
+        prelude = self._prelude_text()
+        if prelude is not None and self.checkpoints:
+            payload["row_index"] = {
+                "interval": ROW_INDEX_INTERVAL,
+                "prelude": prelude,
+                "checkpoints": self.checkpoints,
+            }
+        return payload
+
+    def _prelude_text(self) -> str | None:
+        if self.prelude is None:
+            return None
+        try:
+            return self.prelude.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+
+def parse_workbook_parts(
+    workbook_xml: bytes,
+    rels_xml: bytes | None,
+) -> list[WorkbookSheetRef]:
+    """Resolve sheets from ``xl/workbook.xml`` and ``xl/_rels/workbook.xml.rels``.
+
+    Each sheet's relationship id is mapped to its package part (for example
+    ``xl/worksheets/sheet1.xml``); ``part`` is ``None`` when the relationship
+    is missing.
+    """
+
+    workbook_root = ET.fromstring(workbook_xml)
+    targets = _parse_workbook_rels(rels_xml) if rels_xml else {}
+
+    entries: list[tuple[str, str, str | None]] = []
+    for sheet_el in workbook_root.iter(f"{{{_MAIN_NS}}}sheet"):
+        name = sheet_el.attrib.get("name") or ""
+        state = sheet_el.attrib.get("state") or "visible"
+        r_id = sheet_el.attrib.get(f"{{{_DOC_REL_NS}}}id")
+        entries.append((name, state, targets.get(r_id or "")))
+
+    view = workbook_root.find(f".//{{{_MAIN_NS}}}workbookView")
+    raw = view.attrib.get("activeTab") if view is not None else None
+    try:
+        active_index = int(raw) if raw is not None else 0
+    except ValueError:
+        active_index = 0
+    if not 0 <= active_index < len(entries):
+        active_index = 0
+
+    return [
+        WorkbookSheetRef(
+            name=name,
+            index=index,
+            state=state,
+            part=part,
+            is_active=index == active_index,
+        )
+        for index, (name, state, part) in enumerate(entries)
+    ]
+
+
+def _parse_workbook_rels(rels_xml: bytes) -> dict[str, str]:
+    rels_root = ET.fromstring(rels_xml)
+    targets: dict[str, str] = {}
+    for rel in rels_root.findall(f".//{{{_PKG_REL_NS}}}Relationship"):
+        rel_id = rel.attrib.get("Id")
+        target = rel.attrib.get("Target")
+        if not rel_id or not target:
+            continue
+        target = target.lstrip("/")
+        if not target.startswith("xl/"):
+            target = "xl/" + target
+        targets[rel_id] = target
+    return targets
+
+
+def read_workbook_sheet_refs(archive: zipfile.ZipFile) -> list[WorkbookSheetRef]:
+    """Resolve sheets from an open workbook package."""
+
+    try:
+        rels_xml: bytes | None = archive.read(WORKBOOK_RELS_PART)
+    except KeyError:
+        rels_xml = None
+    return parse_workbook_parts(archive.read(WORKBOOK_PART), rels_xml)
+
+
+def _scan_sheet_part(archive: zipfile.ZipFile, part: str) -> _SheetScan:
+    scan = _SheetScan()
+    try:
+        handle = archive.open(part)
+    except KeyError:
+        return scan
+
+    tail = b""
+    offset = 0  # position of ``tail`` (and so of the next buffer) in the part
+    with handle:
+        while True:
+            chunk = handle.read(_SHEET_SCAN_CHUNK_SIZE)
+            if not chunk:
+                break
+            buffer = tail + chunk
+            start = offset
+            # Hold back a trailing partial tag so regexes never see half of it.
+            cut = buffer.rfind(b"<")
+            if cut >= 0 and buffer.find(b">", cut) < 0:
+                buffer, tail = buffer[:cut], buffer[cut:]
+            else:
+                tail = b""
+            offset = start + len(buffer)
+            _scan_buffer(scan, buffer, start)
+        if tail:
+            _scan_buffer(scan, tail, offset)
+    return scan
+
+
+def _capture_prelude(scan: _SheetScan, buffer: bytes) -> None:
+    if scan.head is None:
+        return
+    scan.head += buffer
+    match = _SHEET_DATA_RE.search(scan.head)
+    if match is not None:
+        if match.end() <= _MAX_PRELUDE_BYTES and not match.group(0).endswith(b"/>"):
+            scan.prelude = bytes(scan.head[: match.end()])
+        scan.head = None
+    elif len(scan.head) > _MAX_PRELUDE_BYTES:
+        scan.head = None
+
+
+def _scan_buffer(scan: _SheetScan, buffer: bytes, start: int) -> None:
+    _capture_prelude(scan, buffer)
+
+    if scan.dimension is None and scan.rows == 0:
+        match = _DIMENSION_RE.search(buffer)
+        if match:
+            scan.dimension = match.group(1).decode("ascii", errors="replace")
+
+    if scan.rows == 0:
+        for match in _COL_TAG_RE.finditer(buffer):
+            attrs = match.group(1)
+            if not _HIDDEN_RE.search(attrs):
+                continue
+            low = _MIN_RE.search(attrs)
+            high = _MAX_RE.search(attrs)
+            if low is None or high is None:
+                continue
+            first = max(1, int(low.group(1)))
+            last = min(_MAX_COLUMNS, int(high.group(1)))
+            scan.hidden_columns.update(range(first - 1, last))
+
+    for match in _ROW_TAG_RE.finditer(buffer):
+        attrs = match.group(1)
+        number = _ROW_NUMBER_RE.search(attrs)
+        row_number = int(number.group(1)) if number is not None else scan.last_row + 1
+        if scan.rows and scan.rows % ROW_INDEX_INTERVAL == 0 and row_number > scan.last_row:
+            scan.checkpoints.append([row_number, start + match.start()])
+        scan.rows += 1
+        scan.last_row = row_number
+        scan.max_row = max(scan.max_row, row_number)
+        if _HIDDEN_RE.search(attrs):
+            scan.hidden_rows += 1
+
+
+def _dimension_size(dimension: str | None) -> tuple[int | None, int | None]:
+    if not dimension:
+        return None, None
+    refs = dimension.split(":")
+    start = _parse_cell_ref(refs[0])
+    end = _parse_cell_ref(refs[-1])
+    if start is None or end is None:
+        return None, None
+    (start_col, start_row), (end_col, end_row) = start, end
+    return max(0, end_row - start_row + 1), max(0, end_col - start_col + 1)
+
+
+def _parse_cell_ref(ref: str) -> tuple[int, int] | None:
+    match = _CELL_REF_RE.match(ref.strip())
+    if match is None:
+        return None
+    column = 0
+    for char in match.group(1).upper():
+        column = column * 26 + (ord(char) - ord("A") + 1)
+    return column, int(match.group(2))
+
+
+__all__ = [
+    "ROW_INDEX_INTERVAL",
+    "WORKBOOK_METADATA_VERSION",
+    "WORKBOOK_PART",
+    "WORKBOOK_RELS_PART",
+    "WorkbookMetadataError",
+    "SheetRowIndex",
+    "WorkbookSheetRef",
+    "capture_workbook_metadata",
+    "extract_workbook_metadata",
+    "find_sheet_row_index",
+    "is_workbook_filename",
+    "parse_workbook_parts",
+    "read_workbook_sheet_refs",
+    "sheet_row_index",
+    "workbook_metadata_sheets",
+]
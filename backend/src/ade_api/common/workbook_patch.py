@@ -0,0 +1,636 @@
+"""Apply cell and row operations to a stored workbook without rebuilding it.
+
+Edits arrive as a short list of operations (set a cell, insert a row, delete a
+row) against 0-based sheet positions, applied in order. ``RowPlan`` compiles
+them into a mapping from source rows to output rows plus per-row cell edits,
+so the rewrite is a single streaming pass over the source:
+
+* xlsx: only the edited worksheet part is rewritten. Its XML is copied row by
+  row; untouched rows are copied verbatim (renumbered when earlier rows were
+  inserted or deleted) and only edited rows are rebuilt. Every other package
+  part is copied as-is, except ``calcChain.xml``, which Excel rebuilds.
+* csv: rows are read and written one at a time.
+
+Like openpyxl's ``insert_rows``/``delete_rows``, formulas, merged cells and
+other range references are not adjusted when rows move.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+import re
+import shutil
+import sys
+import zipfile
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from typing import IO, TypeVar
+from xml.sax.saxutils import escape
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils.cell import get_column_letter
+
+from .xlsx_stream import XlsxPackage
+
+# Worksheet limits in Excel.
+MAX_SHEET_ROWS = 1_048_576
+MAX_SHEET_COLUMNS = 16_384
+
+_CHUNK_SIZE = 64 * 1024
+_UNBOUNDED = sys.maxsize
+_CALC_CHAIN_NAME = "calcchain.xml"
+_CONTENT_TYPES_PART = "[Content_Types].xml"
+
+_SHEET_DATA_RE = re.compile(rb"<(?:\w+:)?sheetData\b[^>]*?(/?)>")
+_DIMENSION_RE = re.compile(rb'(<(?:\w+:)?dimension\b[^>]*?\bref=")([^"]*)(")')
+_ROW_TAG_RE = re.compile(rb"<((?:\w+:)?)row\b([^>]*?)(/?)>")
+_ROW_OR_END_RE = re.compile(rb"<((?:\w+:)?)row\b([^>]*?)(/?)>|</(?:\w+:)?sheetData>")
+_CELL_RE = re.compile(rb"<(?:\w+:)?c\b(?:[^>]*?/>|[^>]*>.*?</(?:\w+:)?c>)", re.S)
+_CELL_TAG_RE = re.compile(rb"<(?:\w+:)?c\b[^>]*>")
+_CELL_NAME_RE = re.compile(rb"<(?:\w+:)?c\b")
+_R_ATTR_RE = re.compile(rb'(\s)r="([A-Za-z]*)([^"]*)"')
+_S_ATTR_RE = re.compile(rb'\ss="(\d+)"')
+_SPANS_ATTR_RE = re.compile(rb'\sspans="[^"]*"')
+_REF_RE = re.compile(r"([A-Za-z]{1,3})(\d+)$")
+_CALC_CHAIN_OVERRIDE_RE = re.compile(
+    rb'<Override\b[^>]*PartName="/[^"]*calcChain\.xml"[^>]*/>', re.I
+)
+_CALC_CHAIN_REL_RE = re.compile(rb'<Relationship\b[^>]*Target="[^"]*calcChain\.xml"[^>]*/>', re.I)
+
+T = TypeVar("T")
+
+
+class WorkbookPatchError(ValueError):
+    """Raised when operations cannot be applied to a workbook."""
+
+
+@dataclass(frozen=True, slots=True)
+class SetCell:
+    row: int
+    column: int
+    value: str
+
+
+@dataclass(frozen=True, slots=True)
+class InsertRow:
+    row: int
+    values: Sequence[str] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class DeleteRow:
+    row: int
+
+
+PatchOperation = SetCell | InsertRow | DeleteRow
+
+
+@dataclass(slots=True)
+class _SourceRows:
+    start: int
+    stop: int
+
+
+@dataclass(slots=True)
+class _NewRow:
+    cells: dict[int, str] = field(default_factory=dict)
+
+
+class RowPlan:
+    """Output layout of a sheet after ``operations``, relative to its source rows.
+
+    The sheet is modelled as an unbounded grid: inserting shifts every later
+    row down, deleting shifts them up, and positions past the last source row
+    are simply empty. The plan is a list of segments (runs of source rows and
+    inserted rows) that only grows with inserts and deletes.
+    """
+
+    def __init__(self, operations: Iterable[PatchOperation]) -> None:
+        self._segments: list[_SourceRows | _NewRow] = [_SourceRows(0, _UNBOUNDED)]
+        self._edits: dict[int, dict[int, str]] = {}
+        for operation in operations:
+            self._apply(operation)
+
+    def cells(self) -> Iterator[dict[int, str]]:
+        """Every set of written cells (edits and inserted rows), keyed by column."""
+
+        yield from self._edits.values()
+        for segment in self._segments:
+            if isinstance(segment, _NewRow):
+                yield segment.cells
+
+    def rows(
+        self, source: Iterable[tuple[int, T]]
+    ) -> Iterator[tuple[int, T | None, dict[int, str]]]:
+        """Merge ``source`` rows into the plan, yielding ``(row, item, cells)``.
+
+        ``source`` yields ``(source_row, item)`` in ascending order and may skip
+        rows. Output rows come out in ascending order: ``item`` is ``None`` for
+        inserted rows and for absent source rows that have edits, and ``cells``
+        holds the values to write over the row (an inserted row's full content).
+        """
+
+        segments = self._segments
+        current = 0
+        position = 0
+        for index, item in self._with_edited_rows(source):
+            segment = segments[current]
+            while isinstance(segment, _NewRow) or segment.stop <= index:
+                if isinstance(segment, _NewRow):
+                    yield position, None, segment.cells
+                    position += 1
+                else:
+                    position += segment.stop - segment.start
+                current += 1
+                segment = segments[current]
+            if index < segment.start:
+                continue  # deleted
+            yield position + index - segment.start, item, self._edits.get(index, {})
+        for segment in segments[current:]:
+            if isinstance(segment, _NewRow):
+                yield position, None, segment.cells
+                position += 1
+            elif segment.stop == _UNBOUNDED:
+                break
+            else:
+                position += segment.stop - segment.start
+
+    def output_row(self, source_row: int) -> int | None:
+        """Output position of ``source_row``, or ``None`` if it was deleted."""
+
+        position = 0
+        for segment in self._segments:
+            if isinstance(segment, _NewRow):
+                position += 1
+            elif source_row < segment.start:
+                return None
+            elif source_row < segment.stop:
+                return position + source_row - segment.start
+            else:
+                position += segment.stop - segment.start
+        return None
+
+    def extent(self, source_rows: int, source_columns: int) -> tuple[int, int]:
+        """Upper bound of the output's ``(rows, columns)`` for a source of that size."""
+
+        rows = 0
+        columns = source_columns
+        position = 0
+        for segment in self._segments:
+            if isinstance(segment, _NewRow):
+                position += 1
+                if any(segment.cells.values()):
+                    rows = max(rows, position)
+                    columns = max(columns, _last_column(segment.cells))
+                continue
+            kept = min(segment.stop, source_rows) - segment.start
+            if kept > 0:
+                rows = max(rows, position + kept)
+            if segment.stop == _UNBOUNDED:
+                break
+            position += segment.stop - segment.start
+        for source_row, cells in self._edits.items():
+            if not any(cells.values()):
+                continue
+            output = self.output_row(source_row)
+            if output is not None:
+                rows = max(rows, output + 1)
+                columns = max(columns, _last_column(cells))
+        return rows, columns
+
+    def _apply(self, operation: PatchOperation) -> None:
+        if isinstance(operation, SetCell):
+            index, offset = self._locate(operation.row)
+            segment = self._segments[index]
+            if isinstance(segment, _NewRow):
+                segment.cells[operation.column] = operation.value
+            else:
+                source_row = segment.start + offset
+                self._edits.setdefault(source_row, {})[operation.column] = operation.value
+        elif isinstance(operation, InsertRow):
+            index = self._split(operation.row)
+            cells = {column: value for column, value in enumerate(operation.values) if value}
+            self._segments.insert(index, _NewRow(cells))
+        elif isinstance(operation, DeleteRow):
+            index = self._split(operation.row)
+            segment = self._segments[index]
+            if isinstance(segment, _SourceRows):
+                self._edits.pop(segment.start, None)
+                if segment.stop - segment.start > 1:
+                    segment.start += 1
+                    return
+            del self._segments[index]
+        else:  # pragma: no cover - guarded by the type
+            raise WorkbookPatchError(f"Unsupported operation {operation!r}")
+
+    def _locate(self, row: int) -> tuple[int, int]:
+        ends = list(accumulate(_segment_length(segment) for segment in self._segments))
+        index = bisect_right(ends, row)
+        return index, row - (ends[index - 1] if index else 0)
+
+    def _split(self, row: int) -> int:
+        index, offset = self._locate(row)
+        if offset == 0:
+            return index
+        segment = self._segments[index]
+        assert isinstance(segment, _SourceRows)
+        split = segment.start + offset
+        self._segments.insert(index + 1, _SourceRows(split, segment.stop))
+        segment.stop = split
+        return index + 1
+
+    def _with_edited_rows(self, source: Iterable[tuple[int, T]]) -> Iterator[tuple[int, T | None]]:
+        pending = sorted(self._edits)
+        cursor = 0
+        for index, item in source:
+            while cursor < len(pending) and pending[cursor] < index:
+                yield pending[cursor], None
+                cursor += 1
+            if cursor < len(pending) and pending[cursor] == index:
+                cursor += 1
+            yield index, item
+        for index in pending[cursor:]:
+            yield index, None
+
+
+def coerce_cell_value(value: str) -> str | int | float | None:
+    """Type an edited cell the way workbook edits store it (empty clears the cell)."""
+
+    if value == "":
+        return None
+    try:
+        if value.isdigit() or (value.startswith("-") and value[1:].isdigit()):
+            return int(value)
+        number = float(value)
+    except ValueError:
+        return value
+    return number if math.isfinite(number) else value
+
+
+def patch_csv(source: Path, target: Path, plan: RowPlan) -> None:
+    """Write ``source`` with ``plan`` applied to ``target`` (UTF-8)."""
+
+    with (
+        source.open("r", newline="", encoding="utf-8", errors="replace") as reader,
+        target.open("w", newline="", encoding="utf-8") as handle,
+    ):
+        writer = csv.writer(handle)
+        next_row = 0
+        for row, values, cells in plan.rows(enumerate(csv.reader(reader))):
+            while next_row < row:
+                writer.writerow([])
+                next_row += 1
+            output = list(values or [])
+            for column, value in cells.items():
+                if column >= len(output):
+                    output.extend([""] * (column + 1 - len(output)))
+                output[column] = value
+            writer.writerow(output)
+            next_row = row + 1
+
+
+def patch_xlsx(
+    source: Path,
+    target: Path,
+    plan: RowPlan,
+    *,
+    sheet_name: str | None,
+    sheet_index: int | None,
+) -> None:
+    """Write ``source`` with ``plan`` applied to one worksheet to ``target``.
+
+    Raises ``KeyError``/``IndexError`` for an unknown sheet, like
+    ``XlsxPackage.select_sheet``.
+    """
+
+    _check_cells(plan)
+    try:
+        archive = zipfile.ZipFile(source, "r")
+    except (OSError, zipfile.BadZipFile) as exc:
+        raise WorkbookPatchError(f"Unable to open workbook: {exc}") from exc
+    with archive, zipfile.ZipFile(target, "w") as output:
+        sheet = XlsxPackage(archive).select_sheet(sheet_name, sheet_index)
+        if not sheet.part or sheet.part not in archive.namelist():
+            raise WorkbookPatchError(f"Worksheet part for {sheet.name!r} is missing")
+        drop_calc_chain = any(
+            name.lower().endswith(_CALC_CHAIN_NAME) for name in archive.namelist()
+        )
+        for info in archive.infolist():
+            name = info.filename
+            if drop_calc_chain and name.lower().endswith(_CALC_CHAIN_NAME):
+                continue
+            member = zipfile.ZipInfo(name, date_time=info.date_time)
+            member.compress_type = info.compress_type
+            member.external_attr = info.external_attr
+            if name == sheet.part:
+                with (
+                    archive.open(info) as reader,
+                    output.open(member, "w", force_zip64=True) as writer,
+                ):
+                    _rewrite_sheet(reader, writer, plan)
+            elif drop_calc_chain and name == _CONTENT_TYPES_PART:
+                output.writestr(member, _CALC_CHAIN_OVERRIDE_RE.sub(b"", archive.read(info)))
+            elif drop_calc_chain and name.endswith("workbook.xml.rels"):
+                output.writestr(member, _CALC_CHAIN_REL_RE.sub(b"", archive.read(info)))
+            else:
+                with archive.open(info) as reader, output.open(member, "w") as writer:
+                    shutil.copyfileobj(reader, writer, _CHUNK_SIZE)
+
+
+def _check_cells(plan: RowPlan) -> None:
+    for cells in plan.cells():
+        for column, value in cells.items():
+            if column >= MAX_SHEET_COLUMNS:
+                raise WorkbookPatchError(f"Column {column} is outside the worksheet")
+            if ILLEGAL_CHARACTERS_RE.search(value):
+                raise WorkbookPatchError("Cell values cannot contain control characters")
+
+
+class _Scanner:
+    """Incremental byte buffer over a readable stream."""
+
+    def __init__(self, reader: IO[bytes]) -> None:
+        self._reader = reader
+        self.buffer = bytearray()
+        self.position = 0
+        self._eof = False
+
+    def search(self, pattern: re.Pattern[bytes]) -> re.Match[bytes] | None:
+        while True:
+            match = pattern.search(self.buffer, self.position)
+            if match is not None or not self._fill():
+                return match
+
+    def find(self, token: bytes, start: int) -> int:
+        while True:
+            found = self.buffer.find(token, start)
+            if found != -1:
+                return found
+            start = max(start, len(self.buffer) - len(token))
+            if not self._fill():
+                return -1
+
+    def take(self, end: int) -> bytes:
+        data = bytes(self.buffer[self.position : end])
+        self.position = end
+        if self.position > _CHUNK_SIZE:
+            del self.buffer[: self.position]
+            self.position = 0
+        return data
+
+    def rest(self) -> Iterator[bytes]:
+        yield self.take(len(self.buffer))
+        while chunk := self._reader.read(_CHUNK_SIZE):
+            yield chunk
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._reader.read(_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+
+def _rewrite_sheet(reader: IO[bytes], writer: IO[bytes], plan: RowPlan) -> None:
+    scanner = _Scanner(reader)
+    sheet_data = scanner.search(_SHEET_DATA_RE)
+    if sheet_data is None:
+        raise WorkbookPatchError("Worksheet has no sheetData element")
+    prelude = scanner.take(sheet_data.end())
+    self_closing = bool(sheet_data.group(1))
+    tag_start = len(prelude) - (sheet_data.end() - sheet_data.start())
+    prefix = _element_prefix(prelude[tag_start:])
+    writer.write(_rewrite_dimension(prelude[:tag_start], plan))
+    if self_closing:
+        writer.write(b"<" + prefix + b"sheetData>")
+        rows: Iterable[tuple[int, tuple[int | None, bytes]]] = ()
+    else:
+        writer.write(prelude[tag_start:])
+        rows = _source_rows(scanner)
+    # Rows are small; batch them so the compressor sees large writes.
+    pending = bytearray()
+    for number, row, cells in plan.rows(rows):
+        if row is not None:
+            pending += _rewrite_row(row, number + 1, cells)
+        elif any(cells.values()):
+            pending += _new_row(prefix, number + 1, cells)
+        if len(pending) >= _CHUNK_SIZE:
+            writer.write(pending)
+            pending.clear()
+    writer.write(pending)
+    if self_closing:
+        writer.write(b"</" + prefix + b"sheetData>")
+    for chunk in scanner.rest():
+        writer.write(chunk)
+
+
+def _source_rows(scanner: _Scanner) -> Iterator[tuple[int, tuple[int | None, bytes]]]:
+    """Yield ``(0-based row, (r attribute, row XML))`` up to ``</sheetData>``."""
+
+    previous = 0
+    while True:
+        tag = scanner.search(_ROW_OR_END_RE)
+        if tag is None:
+            raise WorkbookPatchError("Unterminated sheetData element")
+        if tag.start() != scanner.position:
+            if scanner.buffer[scanner.position : tag.start()].strip():
+                raise WorkbookPatchError("Unexpected content in sheetData")
+            scanner.take(tag.start())
+        if tag.group(1) is None:
+            return
+        if tag.group(3):
+            end = tag.end()
+        else:
+            closing = b"</" + tag.group(1) + b"row>"
+            found = scanner.find(closing, tag.end())
+            if found == -1:
+                raise WorkbookPatchError("Unterminated row in sheetData")
+            end = found + len(closing)
+        number = _row_attr(tag.group(2))
+        previous = number if number is not None else previous + 1
+        yield previous - 1, (number, scanner.take(end))
+
+
+def _rewrite_dimension(prelude: bytes, plan: RowPlan) -> bytes:
+    match = _DIMENSION_RE.search(prelude)
+    if match is None:
+        return prelude
+    first, _, last = match.group(2).decode("ascii", "replace").partition(":")
+    bounds = _REF_RE.match(last or first)
+    if bounds is None:
+        return prelude
+    rows, columns = plan.extent(int(bounds.group(2)), _column_number(bounds.group(1)))
+    if rows > MAX_SHEET_ROWS:
+        raise WorkbookPatchError("Edits move rows past the end of the worksheet")
+    top_left = _REF_RE.match(first)
+    if rows == 0 or columns == 0 or top_left is None:
+        ref = "A1"
+    else:
+        last = f"{get_column_letter(columns)}{rows}"
+        row, column = int(top_left.group(2)), _column_number(top_left.group(1))
+        if row > rows or column > columns:
+            first = "A1"
+        ref = first if first == last else f"{first}:{last}"
+    return prelude[: match.start(2)] + ref.encode("ascii") + prelude[match.end(2) :]
+
+
+def _rewrite_row(source: tuple[int | None, bytes], number: int, cells: dict[int, str]) -> bytes:
+    source_number, row = source
+    if not cells and source_number == number:
+        return row
+    if number > MAX_SHEET_ROWS:
+        raise WorkbookPatchError("Edits move rows past the end of the worksheet")
+    tag = _ROW_TAG_RE.match(row)
+    assert tag is not None
+    if not cells:
+        return _renumber(row, tag, number)
+
+    prefix = tag.group(1)
+    existing: dict[int, bytes] = {}
+    column = 0
+    body = row[tag.end() :] if not tag.group(3) else b""
+    for cell in _CELL_RE.finditer(body):
+        column = _cell_column(cell.group(0), column)
+        existing[column - 1] = cell.group(0)
+    for index, value in cells.items():
+        style = None
+        if index in existing:
+            cell_tag = _CELL_TAG_RE.match(existing[index])
+            if cell_tag is None:
+                raise WorkbookPatchError(f"Malformed cell in row {number}")
+            style_attr = _S_ATTR_RE.search(cell_tag.group(0))
+            style = style_attr.group(1) if style_attr else None
+        if value == "" and style is None:
+            existing.pop(index, None)
+        else:
+            existing[index] = _cell_xml(prefix, index, number, value, style)
+    attrs = _SPANS_ATTR_RE.sub(b"", _set_row_attr(tag.group(2), number))
+    parts = [b"<", prefix, b"row", attrs, b">"]
+    for index in sorted(existing):
+        parts.append(_with_ref(existing[index], index, number))
+    parts.append(b"</" + prefix + b"row>")
+    return b"".join(parts)
+
+
+def _renumber(row: bytes, tag: re.Match[bytes], number: int) -> bytes:
+    digits = str(number).encode("ascii")
+    start = b"<" + tag.group(1) + b"row" + _set_row_attr(tag.group(2), number) + tag.group(3) + b">"
+    body = _CELL_TAG_RE.sub(
+        lambda cell: _R_ATTR_RE.sub(
+            lambda ref: ref.group(1) + b'r="' + ref.group(2) + digits + b'"',
+            cell.group(0),
+            count=1,
+        ),
+        row[tag.end() :],
+    )
+    return start + body
+
+
+def _new_row(prefix: bytes, number: int, cells: dict[int, str]) -> bytes:
+    if number > MAX_SHEET_ROWS:
+        raise WorkbookPatchError("Edits move rows past the end of the worksheet")
+    parts = [b"<", prefix, b'row r="', str(number).encode("ascii"), b'">']
+    for index in sorted(cells):
+        if cells[index]:
+            parts.append(_cell_xml(prefix, index, number, cells[index], None))
+    parts.append(b"</" + prefix + b"row>")
+    return b"".join(parts)
+
+
+def _cell_xml(prefix: bytes, column: int, number: int, value: str, style: bytes | None) -> bytes:
+    p = prefix.decode("ascii")
+    attrs = f' r="{get_column_letter(column + 1)}{number}"'
+    if style is not None:
+        attrs += f' s="{style.decode("ascii")}"'
+    typed = coerce_cell_value(value)
+    if typed is None:
+        xml = f"<{p}c{attrs}/>"
+    elif isinstance(typed, str):
+        text = f'<{p}t xml:space="preserve">{escape(typed)}</{p}t>'
+        xml = f'<{p}c{attrs} t="inlineStr"><{p}is>{text}</{p}is></{p}c>'
+    else:
+        xml = f"<{p}c{attrs}><{p}v>{typed!r}</{p}v></{p}c>"
+    return xml.encode("utf-8")
+
+
+def _with_ref(cell: bytes, column: int, number: int) -> bytes:
+    tag = _CELL_TAG_RE.match(cell)
+    name = _CELL_NAME_RE.match(cell)
+    if tag is None or name is None:
+        raise WorkbookPatchError(f"Malformed cell in row {number}")
+    ref = f'r="{get_column_letter(column + 1)}{number}"'.encode("ascii")
+    start = tag.group(0)
+    if _R_ATTR_RE.search(start):
+        start = _R_ATTR_RE.sub(lambda match: match.group(1) + ref, start, count=1)
+    else:
+        start = start[: name.end()] + b" " + ref + start[name.end() :]
+    return start + cell[tag.end() :]
+
+
+def _set_row_attr(attrs: bytes, number: int) -> bytes:
+    digits = str(number).encode("ascii")
+    if _R_ATTR_RE.search(attrs):
+        return _R_ATTR_RE.sub(lambda match: match.group(1) + b'r="' + digits + b'"', attrs, count=1)
+    return b' r="' + digits + b'"' + attrs
+
+
+def _row_attr(attrs: bytes) -> int | None:
+    match = _R_ATTR_RE.search(attrs)
+    if match is None or match.group(2):
+        return None
+    try:
+        return int(match.group(3))
+    except ValueError:
+        return None
+
+
+def _cell_column(cell: bytes, previous: int) -> int:
+    tag = _CELL_TAG_RE.match(cell)
+    match = _R_ATTR_RE.search(tag.group(0)) if tag is not None else None
+    if match is not None and match.group(2):
+        return _column_number(match.group(2).decode("ascii"))
+    return previous + 1
+
+
+def _column_number(letters: str) -> int:
+    column = 0
+    for char in letters.upper():
+        column = column * 26 + (ord(char) - ord("A") + 1)
+    return column
+
+
+def _element_prefix(tag: bytes) -> bytes:
+    name = tag[1:].split(None, 1)[0].rstrip(b"/>")
+    return name.rpartition(b":")[0] + b":" if b":" in name else b""
+
+
+def _last_column(cells: dict[int, str]) -> int:
+    return max((column + 1 for column, value in cells.items() if value), default=0)
+
+
+def _segment_length(segment: _SourceRows | _NewRow) -> int:
+    if isinstance(segment, _NewRow):
+        return 1
+    return segment.stop - segment.start
+
+
+__all__ = [
+    "MAX_SHEET_COLUMNS",
+    "MAX_SHEET_ROWS",
+    "DeleteRow",
+    "InsertRow",
+    "PatchOperation",
+    "RowPlan",
+    "SetCell",
+    "WorkbookPatchError",
+    "coerce_cell_value",
+    "patch_csv",
+    "patch_xlsx",
+]
@@ -1,18 +1,16 @@
 from __future__ import annotations
 
 import csv
-import xml.etree.ElementTree as ET
 import zipfile
 from collections.abc import Sequence
-from datetime import date, datetime
 from pathlib import Path
-from typing import Any
 
-import openpyxl
-from openpyxl.styles.colors import COLOR_INDEX
 from pydantic import Field
 
 from ade_api.common.schema import BaseSchema
+from ade_api.common.workbook_metadata import SheetRowIndex
+from ade_api.common.workbook_sidecar import WorkbookSidecar
+from ade_api.common.xlsx_stream import SheetWindow, XlsxPackage, cell_text
 
 DEFAULT_PREVIEW_ROWS = 10_000
 DEFAULT_PREVIEW_COLUMNS = 10_000
@@ -39,6 +37,8 @@ class WorkbookSheetPreview(BaseSchema):
     name: str
     index: int = Field(ge=0)
     rows: list[list[str]]
+    row_offset: int = Field(default=0, ge=0, alias="rowOffset")
+    column_offset: int = Field(default=0, ge=0, alias="columnOffset")
     total_rows: int = Field(alias="totalRows")
     total_columns: int = Field(alias="totalColumns")
     truncated_rows: bool = Field(alias="truncatedRows")
@@ -55,90 +55,7 @@ def get_xlsx_hidden_columns(
 ) -> list[int]:
     """Extract 0-based hidden column indices without loading the whole workbook."""
 
-    try:
-        with zipfile.ZipFile(path, "r") as archive:
-            rel_path = _resolve_xlsx_sheet_path(archive, sheet_name, sheet_index)
-            if not rel_path:
-                return []
-
-            ns = {"ns": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
-            sheet_xml = archive.read(rel_path)
-            sheet_root = ET.fromstring(sheet_xml)
-
-            hidden_cols = []
-            cols_el = sheet_root.find(".//ns:cols", ns)
-            if cols_el is not None:
-                for col in cols_el.findall("ns:col", ns):
-                    if col.attrib.get("hidden") in ("1", "true"):
-                        min_attr = col.attrib.get("min")
-                        max_attr = col.attrib.get("max")
-                        if min_attr is None or max_attr is None:
-                            continue
-                        c_min = int(min_attr)
-                        c_max = int(max_attr)
-                        # min and max are 1-based, convert to 0-based for list indices
-                        for col_idx in range(c_min, c_max + 1):
-                            hidden_cols.append(col_idx - 1)
-            return sorted(list(set(hidden_cols)))
-    except Exception:
-        # Fallback gracefully if ZIP/XML parsing fails for any reason
-        return []
-
-
-def _resolve_xlsx_sheet_path(
-    archive: zipfile.ZipFile,
-    sheet_name: str | None,
-    sheet_index: int | None,
-) -> str | None:
-    # Step 1: Parse workbook to map sheet to relationship ID
-    wb_content = archive.read("xl/workbook.xml")
-    wb_root = ET.fromstring(wb_content)
-    ns = {
-        "ns": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
-        "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-    }
-
-    sheets = []
-    for sheet_el in wb_root.findall(".//ns:sheet", ns):
-        name = sheet_el.attrib.get("name")
-        r_id = sheet_el.attrib.get(
-            "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
-        )
-        sheets.append({"name": name, "r_id": r_id})
-
-    # Step 2: Determine which sheet we need
-    target_sheet = None
-    if sheet_name is not None:
-        for s in sheets:
-            if s["name"] == sheet_name:
-                target_sheet = s
-                break
-    else:
-        idx = sheet_index if sheet_index is not None else 0
-        if 0 <= idx < len(sheets):
-            target_sheet = sheets[idx]
-
-    if not target_sheet:
-        return None
-
-    # Step 3: Find relationship targets to get sheet file path
-    rel_content = archive.read("xl/_rels/workbook.xml.rels")
-    rel_root = ET.fromstring(rel_content)
-    rel_ns = {"rel": "http://schemas.openxmlformats.org/package/2006/relationships"}
-
-    rel_map = {}
-    for rel in rel_root.findall(".//rel:Relationship", rel_ns):
-        rel_map[rel.attrib.get("Id")] = rel.attrib.get("Target")
-
-    rel_path = rel_map.get(target_sheet["r_id"])
-    if not rel_path:
-        return None
-
-    rel_path = rel_path.lstrip("/")
-    if not rel_path.startswith("xl/"):
-        rel_path = "xl/" + rel_path
-
-    return rel_path
+    return _scan_xlsx_hidden(path, sheet_name, sheet_index)[1]
 
 
 def get_xlsx_hidden_rows(
@@ -148,27 +65,21 @@ def get_xlsx_hidden_rows(
 ) -> list[int]:
     """Extract 0-based hidden row indices without loading the whole workbook."""
 
+    return _scan_xlsx_hidden(path, sheet_name, sheet_index)[0]
+
+
+def _scan_xlsx_hidden(
+    path: Path,
+    sheet_name: str | None,
+    sheet_index: int | None,
+) -> tuple[list[int], list[int]]:
     try:
         with zipfile.ZipFile(path, "r") as archive:
-            rel_path = _resolve_xlsx_sheet_path(archive, sheet_name, sheet_index)
-            if not rel_path:
-                return []
-
-            ns = {"ns": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
-            sheet_xml = archive.read(rel_path)
-            sheet_root = ET.fromstring(sheet_xml)
-
-            hidden_rows = []
-            for row in sheet_root.findall(".//ns:sheetData/ns:row", ns):
-                if row.attrib.get("hidden") not in ("1", "true"):
-                    continue
-                row_number = row.attrib.get("r")
-                if row_number is None:
-                    continue
-                hidden_rows.append(int(row_number) - 1)
-            return sorted(list(set(hidden_rows)))
+            package = XlsxPackage(archive)
+            return package.scan_hidden(package.select_sheet(sheet_name, sheet_index))
     except Exception:
-        return []
+        # Fallback gracefully if ZIP/XML parsing fails for any reason
+        return [], []
 
 
 def build_workbook_preview_from_xlsx(
@@ -180,29 +91,113 @@ def build_workbook_preview_from_xlsx(
     trim_empty_rows: bool = False,
     sheet_name: str | None = None,
     sheet_index: int | None = None,
+    row_offset: int = 0,
+    column_offset: int = 0,
+    row_index: SheetRowIndex | None = None,
 ) -> WorkbookSheetPreview:
-    with path.open("rb") as handle:
-        workbook = openpyxl.load_workbook(
-            handle,
-            read_only=True,
-            data_only=True,
-            keep_links=False,
+    """Preview a ``max_rows`` x ``max_columns`` window of an xlsx sheet.
+
+    The window starts after ``row_offset`` rows and ``column_offset`` columns.
+    The sheet is streamed once and reading stops at the end of the window, so
+    cost follows the window rather than the workbook size; ``row_index`` (the
+    sheet's stored checkpoints) also skips parsing the rows before it. Hidden
+    rows are reported within the window, hidden columns for the whole sheet,
+    both as absolute 0-based positions like ``cell_formats``.
+    """
+
+    with zipfile.ZipFile(path, "r") as archive:
+        package = XlsxPackage(archive)
+        sheet = package.select_sheet(sheet_name, sheet_index)
+        window = package.read_sheet_window(
+            sheet,
+            max_rows=max_rows,
+            max_columns=max_columns,
+            row_offset=row_offset,
+            column_offset=column_offset,
+            row_index=row_index,
         )
-        try:
-            index, sheet = _select_xlsx_sheet(workbook, sheet_name, sheet_index)
-            preview = _preview_xlsx_sheet(
-                sheet,
-                index=index,
-                max_rows=max_rows,
-                max_columns=max_columns,
-                trim_empty_columns=trim_empty_columns,
-                trim_empty_rows=trim_empty_rows,
-            )
-            preview.hidden_rows = get_xlsx_hidden_rows(path, sheet_name=preview.name)
-            preview.hidden_columns = get_xlsx_hidden_columns(path, sheet_name=preview.name)
-            return preview
-        finally:
-            workbook.close()
+
+    return _preview_from_window(
+        window,
+        max_rows=max_rows,
+        max_columns=max_columns,
+        trim_empty_columns=trim_empty_columns,
+        trim_empty_rows=trim_empty_rows,
+    )
+
+
+def build_workbook_preview_from_sidecar(
+    source: WorkbookSidecar,
+    *,
+    max_rows: int = DEFAULT_PREVIEW_ROWS,
+    max_columns: int = DEFAULT_PREVIEW_COLUMNS,
+    trim_empty_columns: bool = False,
+    trim_empty_rows: bool = False,
+    sheet_name: str | None = None,
+    sheet_index: int | None = None,
+    row_offset: int = 0,
+    column_offset: int = 0,
+) -> WorkbookSheetPreview:
+    """Preview a window of a sheet from its stored row sidecar.
+
+    Same result as ``build_workbook_preview_from_xlsx`` for the source
+    workbook, but only the window's row records are read.
+    """
+
+    sheet = source.select_sheet(sheet_name, sheet_index)
+    window = source.read_sheet_window(
+        sheet,
+        max_rows=max_rows,
+        max_columns=max_columns,
+        row_offset=row_offset,
+        column_offset=column_offset,
+    )
+    return _preview_from_window(
+        window,
+        max_rows=max_rows,
+        max_columns=max_columns,
+        trim_empty_columns=trim_empty_columns,
+        trim_empty_rows=trim_empty_rows,
+    )
+
+
+def _preview_from_window(
+    window: SheetWindow,
+    *,
+    max_rows: int,
+    max_columns: int,
+    trim_empty_columns: bool,
+    trim_empty_rows: bool,
+) -> WorkbookSheetPreview:
+    preview = _preview_sheet_from_rows(
+        name=window.name,
+        index=window.index,
+        rows=[[cell_text(value) for value in row] for row in window.rows],
+        total_rows=window.max_row,
+        total_columns=window.max_column,
+        max_rows=max_rows,
+        max_columns=max_columns,
+        row_offset=window.row_offset,
+        column_offset=window.column_offset,
+        trim_empty_columns=trim_empty_columns,
+        trim_empty_rows=trim_empty_rows,
+    )
+    preview.hidden_rows = window.hidden_rows
+    preview.hidden_columns = window.hidden_columns
+    preview.cell_formats = [
+        WorkbookCellFormat(
+            row=row,
+            column=column,
+            bg_color=style.bg_color,
+            text_color=style.text_color,
+            bold=style.bold,
+            italic=style.italic,
+            horizontal_align=style.horizontal_align,
+            wrap_text=style.wrap_text,
+        )
+        for row, column, style in window.styles
+    ]
+    return preview
 
 
 def build_workbook_preview_from_csv(
@@ -214,6 +209,8 @@ def build_workbook_preview_from_csv(
     trim_empty_rows: bool = False,
     sheet_name: str | None = None,
     sheet_index: int | None = None,
+    row_offset: int = 0,
+    column_offset: int = 0,
 ) -> WorkbookSheetPreview:
     name = path.stem or "Sheet1"
     if sheet_name and sheet_name != name:
@@ -230,8 +227,9 @@ def build_workbook_preview_from_csv(
         for row in reader:
             total_rows += 1
             total_columns = max(total_columns, len(row))
-            if len(rows) < max_rows:
-                rows.append([_normalize_cell(cell) for cell in row])
+            if total_rows > row_offset and len(rows) < max_rows:
+                window = row[column_offset : column_offset + max_columns]
+                rows.append([cell_text(cell) for cell in window])
 
     return _preview_sheet_from_rows(
         name=name,
@@ -241,67 +239,13 @@ def build_workbook_preview_from_csv(
         total_columns=total_columns,
         max_rows=max_rows,
         max_columns=max_columns,
+        row_offset=row_offset,
+        column_offset=column_offset,
         trim_empty_columns=trim_empty_columns,
         trim_empty_rows=trim_empty_rows,
     )
 
 
-def _select_xlsx_sheet(
-    workbook: Any,
-    sheet_name: str | None,
-    sheet_index: int | None,
-) -> tuple[int, Any]:
-    if sheet_name:
-        if sheet_name not in workbook.sheetnames:
-            raise KeyError(f"Sheet {sheet_name!r} not found")
-        index = workbook.sheetnames.index(sheet_name)
-        return index, workbook[sheet_name]
-    effective_index = sheet_index if sheet_index is not None else 0
-    if effective_index < 0 or effective_index >= len(workbook.sheetnames):
-        raise IndexError("sheet_index out of range")
-    return effective_index, workbook[workbook.sheetnames[effective_index]]
-
-
-def _preview_xlsx_sheet(
-    sheet: Any,
-    *,
-    index: int,
-    max_rows: int,
-    max_columns: int,
-    trim_empty_columns: bool,
-    trim_empty_rows: bool,
-) -> WorkbookSheetPreview:
-    rows: list[list[str]] = []
-    cell_formats: list[WorkbookCellFormat] = []
-    for row_index, row in enumerate(sheet.iter_rows(
-        min_row=1,
-        max_row=max_rows,
-        max_col=max_columns,
-        values_only=False,
-    )):
-        rows.append([_normalize_cell(cell.value) for cell in row])
-        for column_index, cell in enumerate(row):
-            cell_format = _extract_cell_format(cell, row_index, column_index)
-            if cell_format:
-                cell_formats.append(cell_format)
-
-    total_rows = sheet.max_row or 0
-    total_columns = sheet.max_column or 0
-    preview = _preview_sheet_from_rows(
-        name=sheet.title,
-        index=index,
-        rows=rows,
-        total_rows=total_rows,
-        total_columns=total_columns,
-        max_rows=max_rows,
-        max_columns=max_columns,
-        trim_empty_columns=trim_empty_columns,
-        trim_empty_rows=trim_empty_rows,
-    )
-    preview.cell_formats = cell_formats
-    return preview
-
-
 def _preview_sheet_from_rows(
     *,
     name: str,
@@ -311,11 +255,14 @@ def _preview_sheet_from_rows(
     total_columns: int,
     max_rows: int,
     max_columns: int,
+    row_offset: int = 0,
+    column_offset: int = 0,
     trim_empty_columns: bool,
     trim_empty_rows: bool,
 ) -> WorkbookSheetPreview:
     max_row_length = max((len(row) for row in rows), default=0)
-    preview_columns = min(max_columns, total_columns or max_row_length)
+    remaining_columns = max(0, total_columns - column_offset)
+    preview_columns = min(max_columns, remaining_columns or max_row_length)
     normalized_rows = [_normalize_row(list(row), preview_columns) for row in rows]
     if trim_empty_rows:
         normalized_rows = _trim_empty_rows(normalized_rows)
@@ -326,23 +273,15 @@ def _preview_sheet_from_rows(
         name=name,
         index=index,
         rows=normalized_rows,
+        row_offset=row_offset,
+        column_offset=column_offset,
         total_rows=total_rows,
         total_columns=total_columns,
-        truncated_rows=total_rows > max_rows,
-        truncated_columns=total_columns > max_columns,
+        truncated_rows=total_rows > row_offset + max_rows,
+        truncated_columns=total_columns > column_offset + max_columns,
     )
 
 
-def _normalize_cell(value: object) -> str:
-    if value is None:
-        return ""
-    if isinstance(value, bool):
-        return "true" if value else "false"
-    if isinstance(value, (datetime, date)):
-        return value.isoformat()
-    return str(value)
-
-
 def _normalize_row(row: Sequence[str], length: int) -> list[str]:
     return [row[index] if index < len(row) else "" for index in range(length)]
 
@@ -369,60 +308,6 @@ def _trim_empty_rows(rows: Sequence[Sequence[str]]) -> list[list[str]]:
     return [list(row) for row in rows if any(cell.strip() for cell in row)]
 
 
-def _extract_cell_format(cell: Any, row_index: int, column_index: int) -> WorkbookCellFormat | None:
-    fill = getattr(cell, "fill", None)
-    font = getattr(cell, "font", None)
-    alignment = getattr(cell, "alignment", None)
-
-    fill_type = getattr(fill, "fill_type", None)
-    bg_color = None
-    if fill_type and fill_type != "none":
-        bg_color = _css_color_from_openpyxl_color(getattr(fill, "fgColor", None))
-
-    text_color = _css_color_from_openpyxl_color(getattr(font, "color", None))
-    bold = True if getattr(font, "bold", False) else None
-    italic = True if getattr(font, "italic", False) else None
-    horizontal_align = getattr(alignment, "horizontal", None)
-    wrap_text = True if getattr(alignment, "wrap_text", False) else None
-
-    if not any([bg_color, text_color, bold, italic, horizontal_align, wrap_text]):
-        return None
-
-    return WorkbookCellFormat(
-        row=row_index,
-        column=column_index,
-        bg_color=bg_color,
-        text_color=text_color,
-        bold=bold,
-        italic=italic,
-        horizontal_align=horizontal_align,
-        wrap_text=wrap_text,
-    )
-
-
-def _css_color_from_openpyxl_color(color: Any) -> str | None:
-    color_type = getattr(color, "type", None)
-    raw: str | None = None
-
-    if color_type == "rgb":
-        raw = getattr(color, "rgb", None)
-    elif color_type == "indexed":
-        indexed = getattr(color, "indexed", None)
-        if isinstance(indexed, int) and 0 <= indexed < len(COLOR_INDEX):
-            raw = COLOR_INDEX[indexed]
-
-    if not raw or not isinstance(raw, str):
-        return None
-
-    raw = raw.upper()
-    if len(raw) == 8:
-        rgb = raw[2:]
-        return f"#{rgb}"
-    if len(raw) == 6:
-        return f"#{raw}"
-    return None
-
-
 __all__ = [
     "DEFAULT_PREVIEW_COLUMNS",
     "DEFAULT_PREVIEW_ROWS",
@@ -431,6 +316,8 @@ __all__ = [
     "WorkbookCellFormat",
     "WorkbookSheetPreview",
     "build_workbook_preview_from_csv",
+    "build_workbook_preview_from_sidecar",
     "build_workbook_preview_from_xlsx",
+    "get_xlsx_hidden_columns",
     "get_xlsx_hidden_rows",
 ]
@@ -0,0 +1,255 @@
+"""Sheet discovery for stored workbooks using ranged reads.
+
+An xlsx file is a ZIP package, so its sheet list lives in two small parts
+(``xl/workbook.xml`` and its relationships) that the ZIP central directory at
+the end of the object points at. ``read_workbook_sheets`` fetches the
+end-of-central-directory record, the central directory and those two parts
+with ranged reads, which is a few KB of I/O regardless of the workbook size.
+"""
+
+from __future__ import annotations
+
+import struct
+import xml.etree.ElementTree as ET
+import zlib
+from dataclasses import dataclass
+
+from ade_storage import StorageAdapter
+
+from .workbook_metadata import (
+    WORKBOOK_PART,
+    WORKBOOK_RELS_PART,
+    WorkbookMetadataError,
+    WorkbookSheetRef,
+    parse_workbook_parts,
+)
+
+# The EOCD record is 22 bytes plus an optional comment of up to 64 KiB. Most
+# packages have no comment, so try a small tail first.
+_INITIAL_TAIL_BYTES = 8 * 1024
+_MAX_TAIL_BYTES = 22 + 0xFFFF + 20
+_MAX_CENTRAL_DIRECTORY_BYTES = 16 * 1024 * 1024
+_MAX_PART_BYTES = 32 * 1024 * 1024
+_LOCAL_HEADER_SLACK = 256
+
+_EOCD_SIGNATURE = b"PK\x05\x06"
+_ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+_ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+_CENTRAL_SIGNATURE = b"PK\x01\x02"
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+
+_EOCD = struct.Struct("<4s4H2LH")
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_EOCD = struct.Struct("<4sQ2H2L4Q")
+_CENTRAL = struct.Struct("<4s6H3L5H2L")
+_LOCAL = struct.Struct("<4s5H3L2H")
+
+_STORED = 0
+_DEFLATED = 8
+
+
+class WorkbookRangeError(WorkbookMetadataError):
+    """Raised when a stored object is not a readable xlsx package."""
+
+
+@dataclass(frozen=True, slots=True)
+class _ZipEntry:
+    name: str
+    method: int
+    compressed_size: int
+    size: int
+    header_offset: int
+    extra_length: int
+
+
+class _RangeZip:
+    def __init__(
+        self,
+        storage: StorageAdapter,
+        uri: str,
+        *,
+        size: int,
+        version_id: str | None,
+    ) -> None:
+        self._storage = storage
+        self._uri = uri
+        self._size = size
+        self._version_id = version_id
+        self.bytes_read = 0
+
+    def read(self, offset: int, length: int) -> bytes:
+        length = min(length, self._size - offset)
+        if offset < 0 or length <= 0:
+            raise WorkbookRangeError("ZIP structure points outside the object")
+        data = self._storage.read_range(
+            self._uri,
+            offset=offset,
+            length=length,
+            version_id=self._version_id,
+        )
+        self.bytes_read += len(data)
+        if len(data) != length:
+            raise WorkbookRangeError("Short read from storage")
+        return data
+
+    def central_directory(self) -> dict[str, _ZipEntry]:
+        tail_length = min(self._size, _INITIAL_TAIL_BYTES)
+        tail_start = self._size - tail_length
+        tail = self.read(tail_start, tail_length)
+        eocd_at = tail.rfind(_EOCD_SIGNATURE)
+        if eocd_at < 0 and tail_length < min(self._size, _MAX_TAIL_BYTES):
+            tail_length = min(self._size, _MAX_TAIL_BYTES)
+            tail_start = self._size - tail_length
+            tail = self.read(tail_start, tail_length)
+            eocd_at = tail.rfind(_EOCD_SIGNATURE)
+        if eocd_at < 0 or eocd_at + _EOCD.size > len(tail):
+            raise WorkbookRangeError("End of central directory not found")
+
+        (_, _, _, _, count, cd_size, cd_offset, _) = _EOCD.unpack_from(tail, eocd_at)
+        if count == 0xFFFF or cd_size == 0xFFFFFFFF or cd_offset == 0xFFFFFFFF:
+            count, cd_size, cd_offset = self._zip64_directory(tail, tail_start, eocd_at)
+
+        if cd_size > _MAX_CENTRAL_DIRECTORY_BYTES:
+            raise WorkbookRangeError("Central directory is too large")
+        if tail_start <= cd_offset and cd_offset + cd_size <= tail_start + len(tail):
+            start = cd_offset - tail_start
+            directory = tail[start : start + cd_size]
+        else:
+            directory = self.read(cd_offset, cd_size)
+        return _parse_central_directory(directory, count)
+
+    def _zip64_directory(self, tail: bytes, tail_start: int, eocd_at: int) -> tuple[int, int, int]:
+        locator_at = eocd_at - _ZIP64_LOCATOR.size
+        if locator_at >= 0:
+            locator = tail[locator_at:eocd_at]
+        else:
+            locator = self.read(tail_start + locator_at, _ZIP64_LOCATOR.size)
+        signature, _, record_offset, _ = _ZIP64_LOCATOR.unpack(locator)
+        if signature != _ZIP64_LOCATOR_SIGNATURE:
+            raise WorkbookRangeError("ZIP64 locator not found")
+        record = self.read(record_offset, _ZIP64_EOCD.size)
+        fields = _ZIP64_EOCD.unpack(record)
+        if fields[0] != _ZIP64_EOCD_SIGNATURE:
+            raise WorkbookRangeError("ZIP64 end of central directory not found")
+        return fields[7], fields[8], fields[9]
+
+    def read_member(self, entry: _ZipEntry) -> bytes:
+        if entry.size > _MAX_PART_BYTES:
+            raise WorkbookRangeError(f"{entry.name} is too large")
+        header_guess = _LOCAL.size + len(entry.name.encode("utf-8")) + entry.extra_length
+        block = self.read(
+            entry.header_offset,
+            header_guess + entry.compressed_size + _LOCAL_HEADER_SLACK,
+        )
+        fields = _LOCAL.unpack_from(block)
+        if fields[0] != _LOCAL_SIGNATURE:
+            raise WorkbookRangeError(f"Local header for {entry.name} not found")
+        data_start = _LOCAL.size + fields[9] + fields[10]
+        data = block[data_start : data_start + entry.compressed_size]
+        if len(data) < entry.compressed_size:
+            data = self.read(entry.header_offset + data_start, entry.compressed_size)
+        return _decompress(entry, data)
+
+
+def _parse_central_directory(directory: bytes, count: int) -> dict[str, _ZipEntry]:
+    entries: dict[str, _ZipEntry] = {}
+    offset = 0
+    for _ in range(count):
+        if offset + _CENTRAL.size > len(directory):
+            raise WorkbookRangeError("Truncated central directory")
+        fields = _CENTRAL.unpack_from(directory, offset)
+        if fields[0] != _CENTRAL_SIGNATURE:
+            raise WorkbookRangeError("Invalid central directory entry")
+        flags, method = fields[3], fields[4]
+        compressed_size, size = fields[8], fields[9]
+        name_length, extra_length, comment_length = fields[10], fields[11], fields[12]
+        header_offset = fields[16]
+
+        name_start = offset + _CENTRAL.size
+        raw_name = directory[name_start : name_start + name_length]
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+        extra = directory[name_start + name_length : name_start + name_length + extra_length]
+        size, compressed_size, header_offset = _apply_zip64_extra(
+            extra, size, compressed_size, header_offset
+        )
+        entries[name] = _ZipEntry(
+            name=name,
+            method=method,
+            compressed_size=compressed_size,
+            size=size,
+            header_offset=header_offset,
+            extra_length=extra_length,
+        )
+        offset = name_start + name_length + extra_length + comment_length
+    return entries
+
+
+def _apply_zip64_extra(
+    extra: bytes,
+    size: int,
+    compressed_size: int,
+    header_offset: int,
+) -> tuple[int, int, int]:
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, data_size = struct.unpack_from("<2H", extra, position)
+        if header_id == 0x0001:
+            block = extra[position + 4 : position + 4 + data_size]
+            values = list(struct.unpack_from(f"<{len(block) // 8}Q", block))
+            if size == 0xFFFFFFFF and values:
+                size = values.pop(0)
+            if compressed_size == 0xFFFFFFFF and values:
+                compressed_size = values.pop(0)
+            if header_offset == 0xFFFFFFFF and values:
+                header_offset = values.pop(0)
+            break
+        position += 4 + data_size
+    return size, compressed_size, header_offset
+
+
+def _decompress(entry: _ZipEntry, data: bytes) -> bytes:
+    if entry.method == _STORED:
+        return data[: entry.size]
+    if entry.method != _DEFLATED:
+        raise WorkbookRangeError(f"Unsupported compression method {entry.method}")
+    inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+    try:
+        payload = inflater.decompress(data, _MAX_PART_BYTES + 1)
+    except zlib.error as exc:
+        raise WorkbookRangeError(f"Corrupt data for {entry.name}") from exc
+    if len(payload) > _MAX_PART_BYTES:
+        raise WorkbookRangeError(f"{entry.name} is too large")
+    return payload
+
+
+def read_workbook_sheets(
+    storage: StorageAdapter,
+    uri: str,
+    *,
+    size: int,
+    version_id: str | None = None,
+) -> list[WorkbookSheetRef]:
+    """Return the sheets of the xlsx stored at ``uri`` using ranged reads.
+
+    ``size`` is the object's byte length (``FileVersion.byte_size``). Raises
+    ``FileNotFoundError`` when the object is missing and ``WorkbookRangeError``
+    when it is not an xlsx package.
+    """
+
+    if size <= 0:
+        raise WorkbookRangeError("Object is empty")
+    package = _RangeZip(storage, uri, size=size, version_id=version_id)
+    try:
+        entries = package.central_directory()
+        workbook = entries.get(WORKBOOK_PART)
+        if workbook is None:
+            raise WorkbookRangeError(f"{WORKBOOK_PART} not found")
+        rels = entries.get(WORKBOOK_RELS_PART)
+        workbook_xml = package.read_member(workbook)
+        rels_xml = package.read_member(rels) if rels is not None else None
+        return parse_workbook_parts(workbook_xml, rels_xml)
+    except (struct.error, UnicodeDecodeError, ET.ParseError) as exc:
+        raise WorkbookRangeError(f"Invalid workbook package ({type(exc).__name__})") from exc
+
+
+__all__ = ["WorkbookRangeError", "read_workbook_sheets"]
@@ -0,0 +1,305 @@
+"""Row sidecars: pre-rendered worksheet rows stored alongside workbook outputs.
+
+Previewing a window of an xlsx sheet means inflating and parsing the sheet XML
+up to that window. Run outputs are read far more often than they are written,
+so the worker also stores a *row sidecar* for them: one blob holding every
+sheet's rows already rendered to preview text, followed by a fixed-width offset
+table per sheet. Any window is then two small ranged reads (its slice of the
+offset table and the row records it spans) with no ZIP, XML or shared-string
+work on the read path.
+
+Blob layout::
+
+    b"ADEROWS1"
+    for each sheet: row records, then (rows + 1) little-endian u64 offsets
+
+Row ``n`` (1-based) spans ``offsets[n - 1]:offsets[n]``. Rows absent from the
+sheet XML have zero-length records; present rows are a JSON array
+``[values, styles, hidden]`` with empty trailing items dropped, where
+``styles`` holds ``[column, style_id]`` pairs into the descriptor's style table.
+
+The descriptor (sheet sizes, offset-table positions, style table and blob
+location) is stored under ``"sidecar"`` in the file version's
+``workbook_metadata``.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+import zipfile
+from array import array
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from ade_storage import StorageAdapter
+
+from .workbook_metadata import WorkbookMetadataError
+from .xlsx_stream import CellStyle, SheetWindow, XlsxPackage, cell_text
+
+SIDECAR_FORMAT = "ade-rows"
+SIDECAR_VERSION = 1
+SIDECAR_MAGIC = b"ADEROWS1"
+SIDECAR_SUFFIX = ".rows"
+
+# A preview window larger than this is served from the workbook instead.
+_MAX_WINDOW_BYTES = 64 * 1024 * 1024
+_OFFSET_SIZE = 8
+
+RangeReader = Callable[[int, int], bytes]
+
+
+class WorkbookSidecarError(WorkbookMetadataError):
+    """Raised when a sidecar descriptor or blob cannot be used."""
+
+
+@dataclass(frozen=True, slots=True)
+class SidecarSheet:
+    name: str
+    index: int
+    rows: int
+    max_row: int
+    max_column: int
+    hidden_columns: list[int]
+    offsets: int
+
+
+class WorkbookSidecar:
+    """Reads sheet windows from a sidecar through ``read(offset, length)``."""
+
+    def __init__(self, descriptor: Mapping[str, Any], read: RangeReader) -> None:
+        try:
+            self._styles = [CellStyle(**style) for style in descriptor["styles"]]
+            self._sheets = [
+                SidecarSheet(
+                    name=str(sheet["name"]),
+                    index=int(sheet["index"]),
+                    rows=int(sheet["rows"]),
+                    max_row=int(sheet["max_row"]),
+                    max_column=int(sheet["max_column"]),
+                    hidden_columns=[int(column) for column in sheet["hidden_columns"]],
+                    offsets=int(sheet["offsets"]),
+                )
+                for sheet in descriptor["sheets"]
+            ]
+        except (KeyError, TypeError, ValueError) as exc:
+            raise WorkbookSidecarError("Invalid sidecar descriptor") from exc
+        self._read = read
+
+    @classmethod
+    def from_storage(
+        cls,
+        storage: StorageAdapter,
+        descriptor: Mapping[str, Any],
+    ) -> WorkbookSidecar:
+        blob_name = str(descriptor["blob_name"])
+        version_id = descriptor.get("version_id")
+
+        def read(offset: int, length: int) -> bytes:
+            return storage.read_range(
+                blob_name,
+                offset=offset,
+                length=length,
+                version_id=version_id,
+            )
+
+        return cls(descriptor, read)
+
+    @property
+    def sheets(self) -> list[SidecarSheet]:
+        return self._sheets
+
+    def select_sheet(self, sheet_name: str | None, sheet_index: int | None) -> SidecarSheet:
+        if sheet_name:
+            for sheet in self._sheets:
+                if sheet.name == sheet_name:
+                    return sheet
+            raise KeyError(f"Sheet {sheet_name!r} not found")
+        effective_index = sheet_index if sheet_index is not None else 0
+        if effective_index < 0 or effective_index >= len(self._sheets):
+            raise IndexError("sheet_index out of range")
+        return self._sheets[effective_index]
+
+    def read_sheet_window(
+        self,
+        sheet: SidecarSheet,
+        *,
+        max_rows: int,
+        max_columns: int,
+        row_offset: int = 0,
+        column_offset: int = 0,
+    ) -> SheetWindow:
+        """Same window ``XlsxPackage.read_sheet_window`` returns for the source sheet."""
+
+        window = SheetWindow(
+            name=sheet.name,
+            index=sheet.index,
+            rows=[],
+            max_row=sheet.max_row,
+            max_column=sheet.max_column,
+            row_offset=row_offset,
+            column_offset=column_offset,
+            hidden_columns=list(sheet.hidden_columns),
+        )
+        first_row = row_offset + 1
+        last_row = min(row_offset + max_rows, sheet.rows)
+        if first_row <= last_row:
+            offsets = self._row_offsets(sheet, first_row, last_row)
+            start, end = offsets[0], offsets[-1]
+            if end - start > _MAX_WINDOW_BYTES:
+                raise WorkbookSidecarError("Sidecar window exceeds the read limit")
+            data = self._read(start, end - start) if end > start else b""
+            if len(data) != end - start:
+                raise WorkbookSidecarError("Sidecar blob is truncated")
+            self._decode_rows(window, data, offsets, max_columns=max_columns)
+        # Mirrors the xlsx reader: rows past the window mean it is fully populated.
+        if sheet.rows > row_offset + max_rows:
+            while len(window.rows) < max_rows:
+                window.rows.append([])
+        return window
+
+    def _row_offsets(self, sheet: SidecarSheet, first_row: int, last_row: int) -> tuple[int, ...]:
+        count = last_row - first_row + 2
+        payload = self._read(sheet.offsets + (first_row - 1) * _OFFSET_SIZE, count * _OFFSET_SIZE)
+        if len(payload) != count * _OFFSET_SIZE:
+            raise WorkbookSidecarError("Sidecar offset table is truncated")
+        return struct.unpack(f"<{count}Q", payload)
+
+    def _decode_rows(
+        self,
+        window: SheetWindow,
+        data: bytes,
+        offsets: tuple[int, ...],
+        *,
+        max_columns: int,
+    ) -> None:
+        first_column = window.column_offset
+        last_column = first_column + max_columns
+        base = offsets[0]
+        pending_empty = 0
+        for position in range(len(offsets) - 1):
+            start, end = offsets[position] - base, offsets[position + 1] - base
+            if start == end:
+                pending_empty += 1
+                continue
+            try:
+                record = json.loads(data[start:end])
+            except ValueError as exc:
+                raise WorkbookSidecarError("Corrupt sidecar row record") from exc
+            window.rows.extend([] for _ in range(pending_empty))
+            pending_empty = 0
+            row = window.row_offset + position
+            values = record[0] if record else []
+            window.rows.append(values[first_column:last_column])
+            for column, style_id in record[1] if len(record) > 1 else ():
+                if first_column <= column < last_column:
+                    window.styles.append((row, column, self._styles[style_id]))
+            if len(record) > 2 and record[2]:
+                window.hidden_rows.append(row)
+
+
+def sidecar_descriptor(metadata: Any) -> dict[str, Any] | None:
+    """Return the sidecar descriptor stored in ``workbook_metadata``, if usable."""
+
+    if not isinstance(metadata, dict):
+        return None
+    descriptor = metadata.get("sidecar")
+    if not isinstance(descriptor, dict):
+        return None
+    if descriptor.get("format") != SIDECAR_FORMAT or descriptor.get("version") != SIDECAR_VERSION:
+        return None
+    if not isinstance(descriptor.get("blob_name"), str):
+        return None
+    if not isinstance(descriptor.get("sheets"), list):
+        return None
+    return descriptor
+
+
+def write_workbook_sidecar(source: Path, target: Path) -> dict[str, Any]:
+    """Write the row sidecar for the xlsx at ``source`` and return its descriptor.
+
+    The caller adds ``blob_name`` (and ``version_id``) once the file is stored.
+    """
+
+    try:
+        archive = zipfile.ZipFile(source, "r")
+    except (OSError, zipfile.BadZipFile) as exc:
+        raise WorkbookSidecarError(f"Unable to open workbook: {exc}") from exc
+    styles: dict[CellStyle, int] = {}
+    sheets: list[dict[str, Any]] = []
+    with archive, target.open("wb") as handle:
+        handle.write(SIDECAR_MAGIC)
+        position = len(SIDECAR_MAGIC)
+        package = XlsxPackage(archive)
+        for ref in package.sheets:
+            rows = package.sheet_rows(ref)
+            offsets = array("Q", [position])
+            for row in rows:
+                while len(offsets) < row.number:
+                    offsets.append(position)
+                if len(offsets) > row.number:
+                    continue  # out-of-order row numbers; keep the first
+                position += _write_record(handle, row.values, row.styles, row.hidden, styles)
+                offsets.append(position)
+            sheets.append({
+                "name": ref.name,
+                "index": ref.index,
+                "rows": len(offsets) - 1,
+                "max_row": rows.max_row,
+                "max_column": rows.max_column,
+                "hidden_columns": rows.hidden_columns,
+                "offsets": position,
+            })
+            position += _write_offsets(handle, offsets)
+    return {
+        "format": SIDECAR_FORMAT,
+        "version": SIDECAR_VERSION,
+        "byte_size": position,
+        "styles": [
+            {key: value for key, value in asdict(style).items() if value is not None}
+            for style in styles
+        ],
+        "sheets": sheets,
+    }
+
+
+def _write_record(
+    handle: BinaryIO,
+    values: list[Any],
+    cell_styles: list[tuple[int, CellStyle]],
+    hidden: bool,
+    styles: dict[CellStyle, int],
+) -> int:
+    record: list[Any] = [[cell_text(value) for value in values]]
+    if cell_styles or hidden:
+        record.append([
+            [column, styles.setdefault(style, len(styles))] for column, style in cell_styles
+        ])
+    if hidden:
+        record.append(1)
+    payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    handle.write(payload)
+    return len(payload)
+
+
+def _write_offsets(handle: BinaryIO, offsets: array) -> int:
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    payload = offsets.tobytes()
+    handle.write(payload)
+    return len(payload)
+
+
+__all__ = [
+    "SIDECAR_FORMAT",
+    "SIDECAR_SUFFIX",
+    "SIDECAR_VERSION",
+    "SidecarSheet",
+    "WorkbookSidecar",
+    "WorkbookSidecarError",
+    "sidecar_descriptor",
+    "write_workbook_sidecar",
+]
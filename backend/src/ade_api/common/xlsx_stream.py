@@ -0,0 +1,729 @@
+"""Single-pass streaming reader for xlsx worksheet previews.
+
+``read_sheet_window`` walks a worksheet part with ``iterparse`` and stops as
+soon as it passes ``max_rows``, collecting cell values, display formatting
+and hidden rows/columns on the way. Shared strings are resolved in a second,
+equally bounded pass that only keeps the indices referenced by the window, so
+memory follows the preview window rather than the sheet or string table size.
+
+Cell values are decoded the way openpyxl does in read-only, ``data_only``
+mode (number casting, date styles, booleans, inline and rich strings) so
+previews do not change when switching readers.
+"""
+
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import partial
+from typing import IO, Any
+
+from openpyxl.styles.colors import COLOR_INDEX
+from openpyxl.styles.numbers import (
+    BUILTIN_FORMATS,
+    is_date_format,
+    is_timedelta_format,
+)
+from openpyxl.utils.datetime import (
+    CALENDAR_MAC_1904,
+    CALENDAR_WINDOWS_1900,
+    from_excel,
+    from_ISO8601,
+)
+
+from .workbook_metadata import (
+    WORKBOOK_PART,
+    SheetRowIndex,
+    WorkbookSheetRef,
+    read_workbook_sheet_refs,
+)
+
+SHARED_STRINGS_PART = "xl/sharedStrings.xml"
+STYLES_PART = "xl/styles.xml"
+
+_CELL_REF_RE = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+_ROW_START_RE = re.compile(rb"<(?:\w+:)?row\b")
+_TRUE_VALUES = {"1", "true"}
+
+
+@dataclass(frozen=True, slots=True)
+class CellStyle:
+    """Display formatting for one ``cellXfs`` entry."""
+
+    bg_color: str | None = None
+    text_color: str | None = None
+    bold: bool | None = None
+    italic: bool | None = None
+    horizontal_align: str | None = None
+    wrap_text: bool | None = None
+
+
+@dataclass(slots=True)
+class SheetWindow:
+    """A ``max_rows`` x ``max_columns`` block of a worksheet."""
+
+    name: str
+    index: int
+    rows: list[list[Any]]
+    max_row: int
+    max_column: int
+    row_offset: int = 0
+    column_offset: int = 0
+    styles: list[tuple[int, int, CellStyle]] = field(default_factory=list)
+    hidden_rows: list[int] = field(default_factory=list)
+    hidden_columns: list[int] = field(default_factory=list)
+
+
+class _StaleRowIndex(Exception):
+    """A row index checkpoint does not point at a ``<row>`` tag."""
+
+
+class _SharedString(int):
+    """Placeholder for a shared string index until the table is read."""
+
+
+@dataclass(slots=True)
+class _XfInfo:
+    is_date: bool
+    is_timedelta: bool
+    style: CellStyle | None
+
+
+class XlsxPackage:
+    """Lazily parsed xlsx package: sheet list, styles and shared strings."""
+
+    def __init__(self, archive: zipfile.ZipFile) -> None:
+        self._archive = archive
+        self._names = set(archive.namelist())
+        self._sheets: list[WorkbookSheetRef] | None = None
+        self._epoch: datetime | None = None
+        self._xfs: list[_XfInfo] | None = None
+
+    @property
+    def sheets(self) -> list[WorkbookSheetRef]:
+        if self._sheets is None:
+            self._sheets = read_workbook_sheet_refs(self._archive)
+        return self._sheets
+
+    def select_sheet(
+        self,
+        sheet_name: str | None,
+        sheet_index: int | None,
+    ) -> WorkbookSheetRef:
+        sheets = self.sheets
+        if sheet_name:
+            for sheet in sheets:
+                if sheet.name == sheet_name:
+                    return sheet
+            raise KeyError(f"Sheet {sheet_name!r} not found")
+        effective_index = sheet_index if sheet_index is not None else 0
+        if effective_index < 0 or effective_index >= len(sheets):
+            raise IndexError("sheet_index out of range")
+        return sheets[effective_index]
+
+    def read_sheet_window(
+        self,
+        sheet: WorkbookSheetRef,
+        *,
+        max_rows: int,
+        max_columns: int,
+        row_offset: int = 0,
+        column_offset: int = 0,
+        row_index: SheetRowIndex | None = None,
+        include_styles: bool = True,
+    ) -> SheetWindow:
+        """Read rows ``row_offset + 1 .. row_offset + max_rows`` (1-based) of ``sheet``.
+
+        With a ``row_index`` for the sheet, parsing starts at the nearest
+        checkpoint instead of the first row. Row and column positions in
+        ``styles`` and ``hidden_rows`` are absolute (0-based) sheet positions.
+        """
+
+        read = partial(
+            self._read_window,
+            sheet,
+            max_rows=max_rows,
+            max_columns=max_columns,
+            row_offset=row_offset,
+            column_offset=column_offset,
+            include_styles=include_styles,
+        )
+        if row_index is not None:
+            try:
+                return read(row_index=row_index)
+            except _StaleRowIndex:
+                pass
+        return read(row_index=None)
+
+    def _read_window(
+        self,
+        sheet: WorkbookSheetRef,
+        *,
+        max_rows: int,
+        max_columns: int,
+        row_offset: int,
+        column_offset: int,
+        row_index: SheetRowIndex | None,
+        include_styles: bool,
+    ) -> SheetWindow:
+        window = SheetWindow(
+            name=sheet.name,
+            index=sheet.index,
+            rows=[],
+            max_row=0,
+            max_column=0,
+            row_offset=row_offset,
+            column_offset=column_offset,
+        )
+        if not sheet.part or sheet.part not in self._names:
+            return window
+
+        xfs = self._cell_xfs()
+        epoch = self._workbook_epoch()
+        first_row = row_offset + 1
+        last_row = row_offset + max_rows
+        first_column = column_offset + 1
+        last_column = column_offset + max_columns
+        dimension: tuple[int, int] | None = None
+        hidden_columns: set[int] = set()
+        seek = row_index.seek_point(first_row) if row_index is not None else None
+        observed_row = seek[0] - 1 if seek is not None else 0
+        observed_column = 0
+        shared_refs: list[tuple[list[Any], int]] = []
+
+        elements = _iter_sheet_elements(
+            self._archive,
+            sheet.part,
+            start=(row_index.prelude, seek[1]) if row_index is not None and seek else None,
+        )
+        for kind, elem in elements:
+            if kind == "dimension":
+                dimension = _dimension_bounds(elem.get("ref"))
+                continue
+            if kind == "col":
+                hidden_columns.update(_hidden_column_range(elem))
+                continue
+
+            row_number = _row_number(elem, observed_row)
+            observed_row = row_number
+            if row_number < first_row:
+                continue
+            if row_number > last_row:
+                break
+            while len(window.rows) < row_number - first_row:
+                window.rows.append([])
+            if elem.get("hidden") in _TRUE_VALUES:
+                window.hidden_rows.append(row_number - 1)
+
+            values: list[Any] = []
+            for column, cell in _row_cells(elem):
+                observed_column = max(observed_column, column)
+                if column < first_column or column > last_column:
+                    continue
+                value, info = _decode_cell(cell, xfs, epoch)
+                if value is None and (info is None or info.style is None):
+                    continue
+                position = column - first_column
+                while len(values) <= position:
+                    values.append(None)
+                values[position] = value
+                if isinstance(value, _SharedString):
+                    shared_refs.append((values, position))
+                if include_styles and info is not None and info.style is not None:
+                    window.styles.append((row_number - 1, column - 1, info.style))
+            window.rows.append(values)
+
+        # A later row ended the scan: the rows in between exist but are empty.
+        while observed_row > last_row and len(window.rows) < max_rows:
+            window.rows.append([])
+
+        if shared_refs:
+            strings = self._shared_strings({int(values[idx]) for values, idx in shared_refs})
+            for values, idx in shared_refs:
+                values[idx] = strings.get(int(values[idx]), "")
+
+        if dimension is not None:
+            window.max_row, window.max_column = dimension
+        else:
+            window.max_row = observed_row
+            window.max_column = observed_column
+        window.hidden_columns = sorted(hidden_columns)
+        return window
+
+    def sheet_rows(self, sheet: WorkbookSheetRef) -> SheetRows:
+        """Return an iterator over every row of ``sheet`` (see ``SheetRows``)."""
+
+        return SheetRows(self, sheet)
+
+    def scan_hidden(self, sheet: WorkbookSheetRef) -> tuple[list[int], list[int]]:
+        """Return all hidden rows and columns (0-based) of ``sheet``."""
+
+        hidden_rows: list[int] = []
+        hidden_columns: set[int] = set()
+        if not sheet.part or sheet.part not in self._names:
+            return hidden_rows, []
+        row_number = 0
+        for kind, elem in _iter_sheet_elements(self._archive, sheet.part):
+            if kind == "col":
+                hidden_columns.update(_hidden_column_range(elem))
+            elif kind == "row":
+                row_number = _row_number(elem, row_number)
+                if elem.get("hidden") in _TRUE_VALUES:
+                    hidden_rows.append(row_number - 1)
+        return sorted(set(hidden_rows)), sorted(hidden_columns)
+
+    def _workbook_epoch(self) -> datetime:
+        if self._epoch is None:
+            self._epoch = CALENDAR_WINDOWS_1900
+            root = ET.fromstring(self._archive.read(WORKBOOK_PART))
+            for elem in root:
+                if _local(elem.tag) == "workbookPr":
+                    if elem.get("date1904") in _TRUE_VALUES:
+                        self._epoch = CALENDAR_MAC_1904
+                    break
+        return self._epoch
+
+    def _part_name(self, default: str) -> str | None:
+        if default in self._names:
+            return default
+        suffix = default.rsplit("/", 1)[-1].lower()
+        for name in self._names:
+            if name.lower().endswith(suffix):
+                return name
+        return None
+
+    def _shared_strings(self, wanted: set[int]) -> dict[int, str]:
+        part = self._part_name(SHARED_STRINGS_PART)
+        if part is None or not wanted:
+            return {}
+        found: dict[int, str] = {}
+        last = max(wanted)
+        index = -1
+        root: ET.Element | None = None
+        with self._archive.open(part) as handle:
+            for event, elem in ET.iterparse(handle, events=("start", "end")):
+                if event == "start":
+                    if root is None:
+                        root = elem
+                    continue
+                if _local(elem.tag) != "si":
+                    continue
+                index += 1
+                if index in wanted:
+                    found[index] = _rich_text(elem)
+                if root is not None:
+                    root.clear()
+                if index >= last:
+                    break
+        return found
+
+    def _all_shared_strings(self) -> list[str]:
+        part = self._part_name(SHARED_STRINGS_PART)
+        if part is None:
+            return []
+        strings: list[str] = []
+        root: ET.Element | None = None
+        with self._archive.open(part) as handle:
+            for event, elem in ET.iterparse(handle, events=("start", "end")):
+                if event == "start":
+                    if root is None:
+                        root = elem
+                    continue
+                if _local(elem.tag) == "si":
+                    strings.append(_rich_text(elem))
+                    if root is not None:
+                        root.clear()
+        return strings
+
+    def _cell_xfs(self) -> list[_XfInfo]:
+        if self._xfs is None:
+            part = self._part_name(STYLES_PART)
+            self._xfs = _parse_cell_xfs(self._archive.read(part)) if part else []
+        return self._xfs
+
+
+@dataclass(slots=True)
+class SheetRow:
+    """One worksheet row: 1-based ``number``, values from column A, styled cells."""
+
+    number: int
+    values: list[Any]
+    styles: list[tuple[int, CellStyle]]
+    hidden: bool
+
+
+class SheetRows:
+    """Full, streaming pass over a worksheet yielding ``SheetRow`` objects.
+
+    Unlike ``read_sheet_window`` this loads the whole shared string table, so
+    it is meant for one-off conversions rather than request-time previews.
+    ``max_row``, ``max_column`` and ``hidden_columns`` describe the sheet once
+    iteration has finished.
+    """
+
+    def __init__(self, package: XlsxPackage, sheet: WorkbookSheetRef) -> None:
+        self._package = package
+        self.name = sheet.name
+        self.index = sheet.index
+        self.part = sheet.part
+        self.max_row = 0
+        self.max_column = 0
+        self.hidden_columns: list[int] = []
+
+    def __iter__(self) -> Iterator[SheetRow]:
+        package = self._package
+        if not self.part or self.part not in package._names:
+            return
+        xfs = package._cell_xfs()
+        epoch = package._workbook_epoch()
+        strings: list[str] | None = None
+        dimension: tuple[int, int] | None = None
+        hidden_columns: set[int] = set()
+        observed_row = 0
+        observed_column = 0
+        for kind, elem in _iter_sheet_elements(package._archive, self.part):
+            if kind == "dimension":
+                dimension = _dimension_bounds(elem.get("ref"))
+                continue
+            if kind == "col":
+                hidden_columns.update(_hidden_column_range(elem))
+                continue
+            observed_row = _row_number(elem, observed_row)
+            row = SheetRow(
+                number=observed_row,
+                values=[],
+                styles=[],
+                hidden=elem.get("hidden") in _TRUE_VALUES,
+            )
+            for column, cell in _row_cells(elem):
+                observed_column = max(observed_column, column)
+                value, info = _decode_cell(cell, xfs, epoch)
+                if value is None and (info is None or info.style is None):
+                    continue
+                if isinstance(value, _SharedString):
+                    if strings is None:
+                        strings = package._all_shared_strings()
+                    value = strings[value] if value < len(strings) else ""
+                while len(row.values) < column:
+                    row.values.append(None)
+                row.values[column - 1] = value
+                if info is not None and info.style is not None:
+                    row.styles.append((column - 1, info.style))
+            yield row
+
+        if dimension is not None:
+            self.max_row, self.max_column = dimension
+        else:
+            self.max_row, self.max_column = observed_row, observed_column
+        self.hidden_columns = sorted(hidden_columns)
+
+
+class _PreludeReader:
+    """File-like view of ``prelude`` followed by the rest of ``handle``."""
+
+    def __init__(self, prelude: bytes, handle: IO[bytes]) -> None:
+        self._prelude = prelude
+        self._handle = handle
+
+    def read(self, size: int = -1) -> bytes:
+        if self._prelude:
+            if size is None or size < 0:
+                data, self._prelude = self._prelude + self._handle.read(), b""
+                return data
+            data, self._prelude = self._prelude[:size], self._prelude[size:]
+            return data
+        return self._handle.read(size)
+
+
+def _iter_sheet_elements(
+    archive: zipfile.ZipFile,
+    part: str,
+    *,
+    start: tuple[bytes, int] | None = None,
+) -> Iterator[tuple[str, ET.Element]]:
+    """Yield ``dimension``, ``col`` and complete ``row`` elements in document order.
+
+    Rows are cleared from the tree once consumed, so a full scan holds one row
+    at a time. ``start`` is a ``(prelude, byte_offset)`` pair from a
+    ``SheetRowIndex``: the part is read from ``byte_offset`` with ``prelude``
+    (everything up to ``<sheetData>``) replayed in front of it.
+    """
+
+    sheet_data: ET.Element | None = None
+    with archive.open(part) as handle:
+        source: IO[bytes] | _PreludeReader = handle
+        if start is not None:
+            prelude, offset = start
+            # Deflated parts have no random access: this still inflates (but
+            # does not parse) everything before ``offset``.
+            handle.seek(offset)
+            if _ROW_START_RE.match(handle.read(16)) is None:
+                raise _StaleRowIndex(part)
+            handle.seek(offset)
+            source = _PreludeReader(prelude, handle)
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            name = _local(elem.tag)
+            if event == "start":
+                if name == "sheetData":
+                    sheet_data = elem
+                continue
+            if name == "row":
+                yield "row", elem
+                if sheet_data is not None:
+                    sheet_data.clear()
+            elif name in {"dimension", "col"}:
+                yield name, elem
+
+
+def _parse_cell_xfs(styles_xml: bytes) -> list[_XfInfo]:
+    root = ET.fromstring(styles_xml)
+    sections = {_local(child.tag): child for child in root}
+
+    custom_formats: dict[int, str] = {}
+    for num_fmt in _children(sections.get("numFmts"), "numFmt"):
+        fmt_id = _as_int(num_fmt.get("numFmtId"), -1)
+        if fmt_id >= 0:
+            custom_formats[fmt_id] = num_fmt.get("formatCode") or ""
+
+    fonts = [_font_style(font) for font in _children(sections.get("fonts"), "font")]
+    fills = [_fill_color(fill) for fill in _children(sections.get("fills"), "fill")]
+
+    xfs: list[_XfInfo] = []
+    for xf in _children(sections.get("cellXfs"), "xf"):
+        fmt_id = _as_int(xf.get("numFmtId"))
+        fmt = custom_formats.get(fmt_id)
+        if fmt is None:
+            fmt = BUILTIN_FORMATS.get(fmt_id) or ""
+        font_id = _as_int(xf.get("fontId"))
+        fill_id = _as_int(xf.get("fillId"))
+        text_color, bold, italic = fonts[font_id] if 0 <= font_id < len(fonts) else (None,) * 3
+        bg_color = fills[fill_id] if 0 <= fill_id < len(fills) else None
+        horizontal_align = None
+        wrap_text = None
+        for alignment in _children(xf, "alignment"):
+            horizontal_align = alignment.get("horizontal")
+            wrap_text = True if alignment.get("wrapText") in _TRUE_VALUES else None
+        style = CellStyle(
+            bg_color=bg_color,
+            text_color=text_color,
+            bold=bold,
+            italic=italic,
+            horizontal_align=horizontal_align,
+            wrap_text=wrap_text,
+        )
+        has_style = any([bg_color, text_color, bold, italic, horizontal_align, wrap_text])
+        xfs.append(
+            _XfInfo(
+                is_date=is_date_format(fmt),
+                is_timedelta=is_timedelta_format(fmt),
+                style=style if has_style else None,
+            )
+        )
+    return xfs
+
+
+def _font_style(font: ET.Element) -> tuple[str | None, bool | None, bool | None]:
+    text_color = None
+    bold = None
+    italic = None
+    for child in font:
+        name = _local(child.tag)
+        if name == "color":
+            text_color = _css_color(child)
+        elif name == "b":
+            bold = True if child.get("val", "1") in _TRUE_VALUES else None
+        elif name == "i":
+            italic = True if child.get("val", "1") in _TRUE_VALUES else None
+    return text_color, bold, italic
+
+
+def _fill_color(fill: ET.Element) -> str | None:
+    for pattern in _children(fill, "patternFill"):
+        fill_type = pattern.get("patternType")
+        if not fill_type or fill_type == "none":
+            return None
+        for color in _children(pattern, "fgColor"):
+            return _css_color(color)
+        # openpyxl defaults a missing foreground to opaque black.
+        return "#000000"
+    return None
+
+
+def _css_color(color: ET.Element) -> str | None:
+    if color.get("indexed") is not None:
+        indexed = _as_int(color.get("indexed"), -1)
+        raw = COLOR_INDEX[indexed] if 0 <= indexed < len(COLOR_INDEX) else None
+    elif color.get("theme") is not None or color.get("auto") is not None:
+        return None
+    else:
+        raw = color.get("rgb") or "00000000"
+    if not raw:
+        return None
+    raw = raw.upper()
+    if len(raw) == 8:
+        return f"#{raw[2:]}"
+    if len(raw) == 6:
+        return f"#{raw}"
+    return None
+
+
+def cell_text(value: object) -> str:
+    """Render a decoded cell value the way previews display it."""
+
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _row_cells(row: ET.Element) -> Iterator[tuple[int, ET.Element]]:
+    column = 0
+    for cell in row:
+        if _local(cell.tag) != "c":
+            continue
+        column = _cell_column(cell.get("r"), column)
+        yield column, cell
+
+
+def _decode_cell(
+    cell: ET.Element,
+    xfs: list[_XfInfo],
+    epoch: datetime,
+) -> tuple[Any, _XfInfo | None]:
+    style_id = _as_int(cell.get("s"))
+    info = xfs[style_id] if 0 <= style_id < len(xfs) else None
+    return _cell_value(cell, info, epoch), info
+
+
+def _cell_value(cell: ET.Element, info: _XfInfo | None, epoch: datetime) -> Any:
+    data_type = cell.get("t", "n")
+    if data_type == "inlineStr":
+        for child in cell:
+            if _local(child.tag) == "is":
+                return _rich_text(child)
+        return None
+
+    raw = None
+    for child in cell:
+        if _local(child.tag) == "v":
+            raw = child.text or None
+            break
+    if raw is None:
+        return None
+
+    if data_type == "n":
+        number = _cast_number(raw)
+        if info is not None and info.is_date:
+            try:
+                return from_excel(number, epoch, timedelta=info.is_timedelta)
+            except (OverflowError, ValueError):
+                return "#VALUE!"
+        return number
+    if data_type == "s":
+        return _SharedString(int(raw))
+    if data_type == "b":
+        return bool(int(raw))
+    if data_type == "d":
+        return from_ISO8601(raw)
+    return raw
+
+
+def _cast_number(value: str) -> int | float:
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def _rich_text(elem: ET.Element) -> str:
+    snippets: list[str] = []
+    for child in elem:
+        name = _local(child.tag)
+        if name == "t":
+            snippets.append(child.text or "")
+        elif name == "r":
+            for run_child in child:
+                if _local(run_child.tag) == "t":
+                    snippets.append(run_child.text or "")
+    return "".join(snippets)
+
+
+def _row_number(row: ET.Element, previous: int) -> int:
+    raw = row.get("r")
+    if raw is None:
+        return previous + 1
+    try:
+        return int(raw)
+    except ValueError:
+        return int(float(raw))
+
+
+def _cell_column(ref: str | None, previous: int) -> int:
+    if ref:
+        match = _CELL_REF_RE.match(ref)
+        if match is not None:
+            return _column_number(match.group(1))
+    return previous + 1
+
+
+def _column_number(letters: str) -> int:
+    column = 0
+    for char in letters.upper():
+        column = column * 26 + (ord(char) - ord("A") + 1)
+    return column
+
+
+def _dimension_bounds(ref: str | None) -> tuple[int, int] | None:
+    if not ref:
+        return None
+    match = _CELL_REF_RE.match(ref.split(":")[-1].strip())
+    if match is None:
+        return None
+    return int(match.group(2)), _column_number(match.group(1))
+
+
+def _hidden_column_range(col: ET.Element) -> Iterable[int]:
+    if col.get("hidden") not in _TRUE_VALUES:
+        return ()
+    low = col.get("min")
+    high = col.get("max")
+    if low is None or high is None:
+        return ()
+    return range(int(low) - 1, int(high))
+
+
+def _children(parent: ET.Element | None, name: str) -> Iterator[ET.Element]:
+    if parent is None:
+        return
+    for child in parent:
+        if _local(child.tag) == name:
+            yield child
+
+
+def _local(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _as_int(value: str | None, default: int = 0) -> int:
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+__all__ = [
+    "CellStyle",
+    "SheetRow",
+    "SheetRows",
+    "SheetWindow",
+    "XlsxPackage",
+    "cell_text",
+]
@@ -0,0 +1,98 @@
+"""Document list facets (trigger-maintained counters + filtered fallback)."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from ade_db.models import File
+
+from .schemas import DocumentFileType, DocumentListLifecycle
+
+
+def _buckets(counts: Counter[Any]) -> list[dict[str, Any]]:
+    buckets = [{"value": value, "count": int(count)} for value, count in counts.items() if count]
+    buckets.sort(key=lambda bucket: str(bucket["value"]))
+    return buckets
+
+
+def _facets(file_types: Counter[Any], statuses: Counter[Any]) -> dict[str, Any]:
+    return {
+        "lastRunPhase": {"buckets": _buckets(statuses)},
+        "fileType": {"buckets": _buckets(file_types)},
+    }
+
+
+def read_document_facet_counts(
+    session: Session,
+    workspace_id: UUID,
+    *,
+    lifecycle: DocumentListLifecycle,
+) -> dict[str, Any]:
+    """Return unfiltered facets from ``document_facet_counts``.
+
+    The ``trg_files_document_facets_*`` triggers append deltas that the worker
+    folds into the counters, so this reads a handful of bucket rows plus any
+    pending deltas regardless of workspace size.
+    """
+
+    rows = session.execute(
+        text(
+            """
+            SELECT file_type, last_run_status, sum(document_count) AS document_count
+            FROM (
+                SELECT file_type, last_run_status, document_count
+                FROM document_facet_counts
+                WHERE workspace_id = :workspace_id
+                  AND lifecycle = :lifecycle
+                UNION ALL
+                SELECT file_type, last_run_status, delta
+                FROM document_facet_count_deltas
+                WHERE workspace_id = :workspace_id
+                  AND lifecycle = :lifecycle
+            ) AS buckets
+            GROUP BY file_type, last_run_status
+            HAVING sum(document_count) > 0
+            """
+        ),
+        {"workspace_id": workspace_id, "lifecycle": lifecycle.value},
+    ).all()
+    file_types: Counter[Any] = Counter()
+    statuses: Counter[Any] = Counter()
+    for file_type, status, count in rows:
+        file_types[file_type] += int(count)
+        statuses[status] += int(count)
+    return _facets(file_types, statuses)
+
+
+def compute_document_facets(session: Session, stmt: Select) -> dict[str, Any]:
+    """Return facets for a filtered list query in one ``GROUPING SETS`` pass."""
+
+    filtered_ids = stmt.order_by(None).with_only_columns(File.id).distinct().subquery()
+    rows = session.execute(
+        select(
+            func.grouping(File.file_type).label("by_status"),
+            File.file_type,
+            File.last_run_status,
+            func.count().label("count"),
+        )
+        .select_from(File)
+        .join(filtered_ids, filtered_ids.c.id == File.id)
+        .group_by(func.grouping_sets(File.file_type, File.last_run_status))
+    ).all()
+    file_types: Counter[Any] = Counter()
+    statuses: Counter[Any] = Counter()
+    for by_status, file_type, status, count in rows:
+        if by_status:
+            statuses[status] += int(count)
+        else:
+            file_types[file_type or DocumentFileType.UNKNOWN.value] += int(count)
+    return _facets(file_types, statuses)
+
+
+__all__ = ["compute_document_facets", "read_document_facet_counts"]
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.sql import Select
 from sqlalchemy.sql.elements import ColumnElement
 
@@ -37,22 +37,6 @@ from .tags import TagValidationError, normalize_tag_set
 ALLOWED_FILE_TYPES = {"xlsx", "xls", "csv", "pdf"}
 
 
-def _current_version_byte_size_expr() -> ColumnElement[Any]:
-    return (
-        select(FileVersion.byte_size)
-        .where(FileVersion.id == File.current_version_id)
-        .scalar_subquery()
-    )
-
-
-def _current_version_content_type_expr() -> ColumnElement[Any]:
-    return (
-        select(FileVersion.content_type)
-        .where(FileVersion.id == File.current_version_id)
-        .scalar_subquery()
-    )
-
-
 def _current_version_origin_expr() -> ColumnElement[Any]:
     return (
         select(FileVersion.origin)
@@ -61,29 +45,6 @@ def _current_version_origin_expr() -> ColumnElement[Any]:
     )
 
 
-def _last_run_at_expr() -> ColumnElement[Any]:
-    return (
-        select(func.max(func.coalesce(Run.completed_at, Run.started_at, Run.created_at)))
-        .select_from(Run)
-        .join(FileVersion, Run.input_file_version_id == FileVersion.id)
-        .where(
-            FileVersion.file_id == File.id,
-            Run.workspace_id == File.workspace_id,
-        )
-        .scalar_subquery()
-    )
-
-
-def _activity_at_expr() -> ColumnElement[Any]:
-    last_run_at = _last_run_at_expr()
-    return case(
-        (last_run_at.is_(None), File.updated_at),
-        (File.updated_at.is_(None), last_run_at),
-        (last_run_at > File.updated_at, last_run_at),
-        else_=File.updated_at,
-    )
-
-
 DOCUMENT_FILTER_REGISTRY = FilterRegistry([
     FilterField(
         id="id",
@@ -106,7 +67,7 @@ DOCUMENT_FILTER_REGISTRY = FilterRegistry([
     ),
     FilterField(
         id="lastRunPhase",
-        column=Run.status,
+        column=File.last_run_status,
         operators={
             FilterOperator.EQ,
             FilterOperator.NE,
@@ -119,7 +80,7 @@ DOCUMENT_FILTER_REGISTRY = FilterRegistry([
     ),
     FilterField(
         id="fileType",
-        column=File.name,
+        column=File.file_type,
         operators={
             FilterOperator.EQ,
             FilterOperator.IN,
@@ -212,7 +173,7 @@ DOCUMENT_FILTER_REGISTRY = FilterRegistry([
     ),
     FilterField(
         id="activityAt",
-        column=_activity_at_expr(),
+        column=File.activity_at,
         operators={
             FilterOperator.EQ,
             FilterOperator.NE,
@@ -228,7 +189,7 @@ DOCUMENT_FILTER_REGISTRY = FilterRegistry([
     ),
     FilterField(
         id="byteSize",
-        column=_current_version_byte_size_expr(),
+        column=File.current_byte_size,
         operators={
             FilterOperator.EQ,
             FilterOperator.NE,
@@ -276,44 +237,15 @@ def apply_document_filters(
     parsed_filters = prepare_filters(filters, DOCUMENT_FILTER_REGISTRY)
     predicates: list = []
 
-    last_run_joined = False
-    status_expr = None
-    last_run_subquery = None
+    status_expr = File.last_run_status
 
     for parsed in parsed_filters:
         filter_id = parsed.field.id
         if filter_id == "lastRunPhase":
-            if not last_run_joined:
-                timestamp = func.coalesce(Run.completed_at, Run.started_at, Run.created_at)
-                last_run_subquery = (
-                    select(
-                        FileVersion.file_id.label("file_id"),
-                        Run.status.label("status"),
-                        func
-                        .row_number()
-                        .over(
-                            partition_by=FileVersion.file_id,
-                            order_by=timestamp.desc(),
-                        )
-                        .label("rank"),
-                    )
-                    .select_from(Run)
-                    .join(FileVersion, Run.input_file_version_id == FileVersion.id)
-                    .where(Run.input_file_version_id.is_not(None))
-                    .subquery()
-                )
-                stmt = stmt.outerjoin(
-                    last_run_subquery,
-                    (last_run_subquery.c.file_id == File.id) & (last_run_subquery.c.rank == 1),
-                )
-                status_expr = last_run_subquery.c.status
-                last_run_joined = True
             if parsed.operator == FilterOperator.IS_EMPTY:
-                assert status_expr is not None
                 predicates.append(status_expr.is_(None))
                 continue
             if parsed.operator == FilterOperator.IS_NOT_EMPTY:
-                assert status_expr is not None
                 predicates.append(status_expr.is_not(None))
                 continue
 
@@ -342,7 +274,6 @@ def apply_document_filters(
                     detail=f"Invalid lastRunPhase value(s): {', '.join(sorted(invalid))}",
                 )
             if parsed.operator in {FilterOperator.NE, FilterOperator.NOT_IN}:
-                assert status_expr is not None
                 base = (
                     and_(status_expr.is_not(None), ~status_expr.in_(normalized_phases))
                     if normalized_phases
@@ -354,17 +285,20 @@ def apply_document_filters(
                     continue
                 phase_predicates = []
                 if normalized_phases:
-                    assert status_expr is not None
                     phase_predicates.append(status_expr.in_(normalized_phases))
                 if include_empty:
-                    assert status_expr is not None
                     phase_predicates.append(status_expr.is_(None))
-                assert status_expr is not None
                 predicate = or_(*phase_predicates) if phase_predicates else status_expr.is_(None)
             predicates.append(predicate)
             continue
 
         if filter_id == "fileType":
+            if parsed.operator == FilterOperator.IS_EMPTY:
+                predicates.append(File.file_type.is_(None))
+                continue
+            if parsed.operator == FilterOperator.IS_NOT_EMPTY:
+                predicates.append(File.file_type.is_not(None))
+                continue
             values = parsed.value
             types = values if isinstance(values, list) else [values]
             normalized_types = {str(item).strip().lower() for item in types if str(item).strip()}
@@ -376,25 +310,14 @@ def apply_document_filters(
                     status.HTTP_422_UNPROCESSABLE_CONTENT,
                     detail=f"Invalid file type value(s): {', '.join(invalid)}",
                 )
-            lower_name = func.lower(File.name)
-            lower_type = func.lower(_current_version_content_type_expr())
-            type_predicates = []
-            if "xlsx" in normalized_types:
-                type_predicates.append(
-                    or_(lower_name.like("%.xlsx"), lower_type.like("%spreadsheetml%"))
-                )
-            if "xls" in normalized_types:
-                type_predicates.append(or_(lower_name.like("%.xls"), lower_type.like("%ms-excel%")))
-            if "csv" in normalized_types:
-                type_predicates.append(or_(lower_name.like("%.csv"), lower_type.like("%csv%")))
-            if "pdf" in normalized_types:
-                type_predicates.append(or_(lower_name.like("%.pdf"), lower_type.like("%pdf%")))
-            if not type_predicates:
+            if not normalized_types:
                 continue
-            predicate = or_(*type_predicates)
             if parsed.operator == FilterOperator.NOT_IN:
-                predicate = ~predicate
-            predicates.append(predicate)
+                predicates.append(
+                    or_(File.file_type.is_(None), File.file_type.not_in(sorted(normalized_types)))
+                )
+            else:
+                predicates.append(File.file_type.in_(sorted(normalized_types)))
             continue
 
         if filter_id == "tags":
@@ -0,0 +1,121 @@
+"""Conditional GET and in-process caching for document list pages.
+
+Every mutation that can change a list row (files, tags, runs, the
+trigger-maintained summary columns, and renames of an uploader or assignee)
+writes a ``document_changes`` row, so a
+list page is determined by its request parameters plus the workspace's latest
+change id. That pair becomes the page's ETag: polling clients get a 304
+without the page query, facets or last-run attachment running, and identical
+first-page requests from other clients can be served from memory.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from ade_api.common.etag import build_etag_token
+from ade_api.common.list_counts import count_fingerprint
+from ade_api.settings import Settings
+
+if TYPE_CHECKING:
+    from .schemas import DocumentListPage
+
+DOCUMENT_LIST_ETAG_VERSION = 1
+# Lists are per-user authorized, so browsers may keep them but must revalidate.
+DOCUMENT_LIST_CACHE_CONTROL = "private, no-cache"
+
+
+def document_list_etag(
+    *,
+    workspace_id: UUID,
+    changes_cursor: int,
+    params: Mapping[str, Any],
+) -> str:
+    """Return the ETag token for a list request at ``changes_cursor``."""
+
+    return build_etag_token(
+        "documents",
+        DOCUMENT_LIST_ETAG_VERSION,
+        workspace_id,
+        changes_cursor,
+        count_fingerprint(dict(params)),
+    )
+
+
+class DocumentListCache:
+    """Thread-safe LRU of rendered list pages keyed by ETag token, with a TTL.
+
+    Tokens embed the latest change id, so a document mutation makes new
+    requests miss without explicit invalidation; the TTL bounds how long a
+    page can be reused when a transaction commits a lower change id after a
+    higher one is already visible.
+    """
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[DocumentListPage, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> DocumentListPage | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            page, expires_at = entry
+            if expires_at <= now:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return page
+
+    def set(self, token: str, page: DocumentListPage) -> None:
+        if self._max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self._ttl_seconds
+        with self._lock:
+            self._entries[token] = (page, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_caches: dict[tuple[int, float], DocumentListCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_document_list_cache(settings: Settings) -> DocumentListCache | None:
+    """Return the process-wide list cache, or ``None`` when it is disabled."""
+
+    max_entries = settings.documents_list_cache_max_entries
+    if max_entries <= 0:
+        return None
+    cache_key = (max_entries, settings.documents_list_cache_ttl_seconds)
+    with _caches_lock:
+        cache = _caches.get(cache_key)
+        if cache is None:
+            cache = DocumentListCache(
+                max_entries=max_entries,
+                ttl_seconds=settings.documents_list_cache_ttl_seconds,
+            )
+            _caches[cache_key] = cache
+    return cache
+
+
+__all__ = [
+    "DOCUMENT_LIST_CACHE_CONTROL",
+    "DOCUMENT_LIST_ETAG_VERSION",
+    "DocumentListCache",
+    "document_list_etag",
+    "get_document_list_cache",
+]
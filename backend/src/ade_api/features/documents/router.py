@@ -41,7 +41,9 @@ from ade_api.common.cursor_listing import (
     strict_cursor_query_guard,
 )
 from ade_api.common.downloads import build_content_disposition
+from ade_api.common.etag import etag_matches, format_etag
 from ade_api.common.logging import log_context
+from ade_api.common.preview_cache import PREVIEW_CACHE_CONTROL
 from ade_api.common.sse import sse_json
 from ade_api.common.workbook_preview import (
     DEFAULT_PREVIEW_COLUMNS,
@@ -91,6 +93,7 @@ from .exceptions import (
     InvalidDocumentTagsError,
     UserNotificationNotFoundError,
 )
+from .list_cache import DOCUMENT_LIST_CACHE_CONTROL, get_document_list_cache
 from .schemas import (
     DocumentActivityCommentCreate,
     DocumentActivityResponse,
@@ -130,7 +133,7 @@ from .sorting import (
     CURSOR_FIELDS,
     DEFAULT_SORT,
     ID_FIELD,
-    SORT_FIELDS,
+    document_sort_fields,
 )
 from .upload_metadata import build_upload_metadata
 
@@ -457,6 +460,9 @@ def upload_document_version(
         )
     ],
     responses={
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "The list page matches the ETag sent in If-None-Match.",
+        },
         status.HTTP_401_UNAUTHORIZED: {
             "description": "Authentication required to list documents.",
         },
@@ -471,7 +477,10 @@ def upload_document_version(
 def list_documents(
     workspace_id: WorkspacePath,
     list_query: Annotated[CursorQueryParams, Depends(documents_cursor_query_params)],
+    request: Request,
+    response: Response,
     service: DocumentsServiceReadDep,
+    settings: SettingsDep,
     actor: DocumentReader,
     page: Annotated[
         int | None,
@@ -481,7 +490,7 @@ def list_documents(
     include_run_metrics: Annotated[bool, Query(alias="includeRunMetrics")] = False,
     include_run_table_columns: Annotated[bool, Query(alias="includeRunTableColumns")] = False,
     include_run_fields: Annotated[bool, Query(alias="includeRunFields")] = False,
-) -> DocumentListPage:
+) -> DocumentListPage | Response:
     if page is not None and list_query.cursor is not None:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
@@ -490,27 +499,46 @@ def list_documents(
 
     resolved_sort = resolve_cursor_sort(
         list_query.sort,
-        allowed=SORT_FIELDS,
+        allowed=document_sort_fields(list_query.q),
         cursor_fields=CURSOR_FIELDS,
         default=DEFAULT_SORT,
         id_field=ID_FIELD,
     )
-    page_result = service.list_documents(
-        workspace_id=workspace_id,
-        limit=list_query.limit,
-        page=page,
-        cursor=list_query.cursor,
-        resolved_sort=resolved_sort,
-        filters=list_query.filters,
-        join_operator=list_query.join_operator,
-        q=list_query.q,
-        include_total=list_query.include_total,
-        include_facets=list_query.include_facets,
-        lifecycle=lifecycle,
-        include_run_metrics=include_run_metrics,
-        include_run_table_columns=include_run_table_columns,
-        include_run_fields=include_run_fields,
-    )
+    list_params: dict[str, Any] = {
+        "workspace_id": workspace_id,
+        "limit": list_query.limit,
+        "page": page,
+        "cursor": list_query.cursor,
+        "resolved_sort": resolved_sort,
+        "filters": list_query.filters,
+        "join_operator": list_query.join_operator,
+        "q": list_query.q,
+        "include_total": list_query.include_total,
+        "include_facets": list_query.include_facets,
+        "lifecycle": lifecycle,
+        "include_run_metrics": include_run_metrics,
+        "include_run_table_columns": include_run_table_columns,
+        "include_run_fields": include_run_fields,
+    }
+    etag_token = service.get_document_list_etag(**list_params)
+    etag = format_etag(etag_token)
+    if etag_token is None or etag is None:
+        return service.list_documents(**list_params)
+
+    headers = {"ETag": etag, "Cache-Control": DOCUMENT_LIST_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag_token):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+    # Only first pages are cached: they are what dashboards and saved views poll.
+    cache = get_document_list_cache(settings)
+    if cache is None or list_query.cursor is not None or (page or 1) > 1:
+        return service.list_documents(**list_params)
+    cached = cache.get(etag_token)
+    if cached is not None:
+        return cached
+    page_result = service.list_documents(**list_params)
+    cache.set(etag_token, page_result)
     return page_result
 
 
@@ -1484,6 +1512,9 @@ def download_document_version(
     summary="Preview a document worksheet",
     response_model_exclude_none=True,
     responses={
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "The preview matches the ETag sent in If-None-Match.",
+        },
         status.HTTP_404_NOT_FOUND: {
             "description": "Document not found within the workspace.",
         },
@@ -1498,6 +1529,8 @@ def download_document_version(
 def preview_document(
     workspace_id: WorkspacePath,
     document_id: DocumentPath,
+    request: Request,
+    response: Response,
     service: DocumentsServiceReadDep,
     _actor: DocumentReader,
     *,
@@ -1519,6 +1552,22 @@ def preview_document(
             description="Maximum columns per sheet to include in the preview.",
         ),
     ] = DEFAULT_PREVIEW_COLUMNS,
+    row_offset: Annotated[
+        int,
+        Query(
+            ge=0,
+            alias="rowOffset",
+            description="Rows to skip before the preview window (for scrolling large sheets).",
+        ),
+    ] = 0,
+    column_offset: Annotated[
+        int,
+        Query(
+            ge=0,
+            alias="columnOffset",
+            description="Columns to skip before the preview window.",
+        ),
+    ] = 0,
     trim_empty_columns: Annotated[
         bool,
         Query(
@@ -1553,7 +1602,7 @@ def preview_document(
             ),
         ),
     ] = None,
-) -> WorkbookSheetPreview:
+) -> WorkbookSheetPreview | Response:
     if sheet_name and sheet_index is not None:
         raise HTTPException(
             status.HTTP_422_UNPROCESSABLE_CONTENT,
@@ -1562,11 +1611,31 @@ def preview_document(
     if sheet_name is None and sheet_index is None:
         sheet_index = 0
     try:
+        etag_token = service.get_document_preview_etag(
+            workspace_id=workspace_id,
+            document_id=document_id,
+            max_rows=max_rows,
+            max_columns=max_columns,
+            row_offset=row_offset,
+            column_offset=column_offset,
+            trim_empty_columns=trim_empty_columns,
+            trim_empty_rows=trim_empty_rows,
+            sheet_name=sheet_name,
+            sheet_index=sheet_index,
+        )
+        etag = format_etag(etag_token)
+        if etag:
+            headers = {"ETag": etag, "Cache-Control": PREVIEW_CACHE_CONTROL}
+            if etag_matches(request.headers.get("if-none-match"), etag_token):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            response.headers.update(headers)
         return service.get_document_preview(
             workspace_id=workspace_id,
             document_id=document_id,
             max_rows=max_rows,
             max_columns=max_columns,
+            row_offset=row_offset,
+            column_offset=column_offset,
             trim_empty_columns=trim_empty_columns,
             trim_empty_rows=trim_empty_rows,
             sheet_name=sheet_name,
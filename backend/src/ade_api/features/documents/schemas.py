@@ -90,6 +90,7 @@ class DocumentOut(BaseSchema):
         serialization_alias="metadata",
     )
     source: FileVersionOrigin | None = Field(default=None)
+    file_type: DocumentFileType = Field(default=DocumentFileType.UNKNOWN, alias="fileType")
     activity_at: datetime | None = Field(default=None, alias="activityAt")
     created_at: datetime = Field(alias="createdAt")
     updated_at: datetime = Field(alias="updatedAt")
@@ -151,6 +152,12 @@ class DocumentOut(BaseSchema):
             return []
         return sorted(value)
 
+    @field_validator("file_type", mode="before")
+    @classmethod
+    def _default_file_type(cls, value: Any) -> Any:
+        # files.file_type is NULL when neither the name nor the content type is known.
+        return value or DocumentFileType.UNKNOWN
+
     @field_validator("metadata", mode="before")
     @classmethod
     def _strip_internal_metadata(cls, value: Any) -> dict[str, Any]:
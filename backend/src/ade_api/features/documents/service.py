@@ -6,7 +6,7 @@ import logging
 import re
 import tempfile
 import unicodedata
-from collections.abc import Iterator, Mapping, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FuturesTimeout
 from contextlib import contextmanager
@@ -22,7 +22,6 @@ from fastapi import UploadFile
 from sqlalchemy import case, func, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy.sql import Select
 
 from ade_api.common.cursor_listing import (
     CursorFieldSpec,
@@ -36,13 +35,29 @@ from ade_api.common.cursor_listing import (
 )
 from ade_api.common.downloads import build_canonical_download_filename
 from ade_api.common.ids import generate_uuid7
+from ade_api.common.list_counts import CountKey, count_fingerprint
 from ade_api.common.list_filters import FilterItem, FilterJoinOperator
 from ade_api.common.logging import log_context
+from ade_api.common.preview_cache import get_preview_cache, preview_cache_key
+from ade_api.common.search import parse_q
+from ade_api.common.workbook_metadata import (
+    WorkbookSheetRef,
+    capture_workbook_metadata,
+    find_sheet_row_index,
+    workbook_metadata_sheets,
+)
 from ade_api.common.workbook_preview import (
     WorkbookSheetPreview,
     build_workbook_preview_from_csv,
+    build_workbook_preview_from_sidecar,
     build_workbook_preview_from_xlsx,
 )
+from ade_api.common.workbook_ranges import WorkbookRangeError, read_workbook_sheets
+from ade_api.common.workbook_sidecar import (
+    WorkbookSidecar,
+    WorkbookSidecarError,
+    sidecar_descriptor,
+)
 from ade_api.features.runs.schemas import RunColumnResource, RunFieldResource, RunMetricsResource
 from ade_api.features.workspaces.effective_members import EffectiveWorkspaceMembersResolver
 from ade_api.settings import Settings
@@ -100,7 +115,9 @@ from .exceptions import (
     InvalidDocumentTagsError,
     UserNotificationNotFoundError,
 )
+from .facets import compute_document_facets, read_document_facet_counts
 from .filters import apply_document_filters
+from .list_cache import document_list_etag
 from .repository import DocumentsRepository
 from .schemas import (
     DocumentActivityDocumentItemOut,
@@ -112,7 +129,6 @@ from .schemas import (
     DocumentCommentMentionIn,
     DocumentCommentOut,
     DocumentConflictMode,
-    DocumentFileType,
     DocumentListLifecycle,
     DocumentListPage,
     DocumentListRow,
@@ -130,6 +146,7 @@ from .schemas import (
     TagCatalogPage,
     UserNotificationOut,
 )
+from .sorting import document_relevance_expr
 from .tags import (
     MAX_TAGS_PER_DOCUMENT,
     TagValidationError,
@@ -163,9 +180,9 @@ def _run_with_timeout(func: Any, *, timeout: float, **kwargs: Any) -> Any:
         return future.result(timeout=timeout)
 
 
-def _map_document_row(row: Mapping[str, Any]) -> File:
+def _map_ranked_document_row(row: Mapping[str, Any]) -> File:
     document = row[File]
-    document._last_run_at = row.get("last_run_at")
+    document._search_rank = row.get("search_rank")
     return document
 
 
@@ -179,6 +196,7 @@ class StagedUpload:
     blob_name: str
     stored: StoredObject
     overwrite_existing: bool = False
+    workbook_metadata: dict[str, Any] | None = None
 
 
 class UploadAction(str, Enum):
@@ -369,6 +387,7 @@ class DocumentsService:
                 content_type=content_type,
                 filename_at_upload=upload_name,
                 storage_version_id=storage_version_id,
+                workbook_metadata=staged_upload.workbook_metadata,
             )
             self._session.add(file_version)
             self._session.flush()
@@ -432,6 +451,10 @@ class DocumentsService:
             blob_name=plan.blob_name,
             stored=stored,
             overwrite_existing=plan.action == UploadAction.NEW_VERSION,
+            workbook_metadata=capture_workbook_metadata(
+                upload.file,
+                filename=upload.filename or plan.name,
+            ),
         )
 
     def discard_staged_upload(self, *, staged: StagedUpload) -> None:
@@ -446,6 +469,49 @@ class DocumentsService:
                 exc_info=True,
             )
 
+    def get_document_list_etag(
+        self,
+        *,
+        workspace_id: UUID,
+        limit: int,
+        cursor: str | None,
+        page: int | None = None,
+        resolved_sort: ResolvedCursorSort[File],
+        filters: list[FilterItem],
+        join_operator: FilterJoinOperator,
+        q: str | None,
+        include_total: bool,
+        include_facets: bool,
+        lifecycle: DocumentListLifecycle = DocumentListLifecycle.ACTIVE,
+        include_run_metrics: bool = False,
+        include_run_table_columns: bool = False,
+        include_run_fields: bool = False,
+    ) -> str | None:
+        """Return the ETag token for a list page without querying the page."""
+
+        changes_cursor = get_latest_document_change_id(self._session, workspace_id)
+        if changes_cursor is None:
+            return None
+        return document_list_etag(
+            workspace_id=workspace_id,
+            changes_cursor=changes_cursor,
+            params={
+                "limit": limit,
+                "cursor": cursor,
+                "page": page,
+                "sort": resolved_sort.tokens,
+                "filters": [item.model_dump(mode="json") for item in filters],
+                "joinOperator": join_operator.value,
+                "q": q,
+                "includeTotal": include_total,
+                "includeFacets": include_facets,
+                "lifecycle": lifecycle.value,
+                "includeRunMetrics": include_run_metrics,
+                "includeRunTableColumns": include_run_table_columns,
+                "includeRunFields": include_run_fields,
+            },
+        )
+
     def list_documents(
         self,
         *,
@@ -489,21 +555,40 @@ class DocumentsService:
             join_operator=join_operator,
             q=q,
         )
-        last_run_at_expr = (
-            select(func.max(func.coalesce(Run.completed_at, Run.started_at, Run.created_at)))
-            .select_from(Run)
-            .join(FileVersion, Run.input_file_version_id == FileVersion.id)
-            .where(
-                FileVersion.file_id == File.id,
-                Run.workspace_id == File.workspace_id,
-            )
-            .scalar_subquery()
-            .label("last_run_at")
-        )
-        stmt = stmt.add_columns(last_run_at_expr)
+        # Sort keys such as last_run_at are trigger-maintained; refresh any
+        # documents already in the session so cursors are built from DB values.
+        stmt = stmt.execution_options(populate_existing=True)
 
-        facets = self._build_document_facets(stmt) if include_facets else None
+        facets = None
+        if include_facets:
+            if filters or parse_q(q).tokens:
+                facets = compute_document_facets(self._session, stmt)
+            else:
+                facets = read_document_facet_counts(
+                    self._session, workspace_id, lifecycle=lifecycle
+                )
+        row_mapper: Callable[[Mapping[str, Any]], File] | None = None
+        relevance = document_relevance_expr(q)
+        if relevance is not None and any(
+            field.field_id == "relevance" for field in resolved_sort.fields
+        ):
+            stmt = stmt.add_columns(relevance.label("search_rank"))
+            row_mapper = _map_ranked_document_row
         changes_cursor = get_latest_document_change_id(self._session, workspace_id)
+        # Every document mutation writes a document_changes row, so an exact
+        # total stays valid until the workspace's latest change id moves.
+        count_key: CountKey | None = None
+        if include_total and changes_cursor is not None:
+            count_key = CountKey(
+                scope=f"documents:{workspace_id}",
+                fingerprint=count_fingerprint(
+                    lifecycle.value,
+                    [item.model_dump(mode="json") for item in filters],
+                    join_operator.value,
+                    q,
+                ),
+                version=str(changes_cursor),
+            )
         if page is not None:
             page_result = paginate_query_page(
                 self._session,
@@ -513,7 +598,8 @@ class DocumentsService:
                 page=page,
                 include_total=include_total,
                 changes_cursor=str(changes_cursor) if changes_cursor is not None else None,
-                row_mapper=lambda row: _map_document_row(row),
+                row_mapper=row_mapper,
+                count_key=count_key,
             )
         else:
             page_result = paginate_query_cursor(
@@ -524,7 +610,8 @@ class DocumentsService:
                 cursor=cursor,
                 include_total=include_total,
                 changes_cursor=str(changes_cursor) if changes_cursor is not None else None,
-                row_mapper=lambda row: _map_document_row(row),
+                row_mapper=row_mapper,
+                count_key=count_key,
             )
         raw_items = list(page_result.items)
         items = [DocumentOut.model_validate(item) for item in raw_items]
@@ -1348,7 +1435,63 @@ class DocumentsService:
                 blob_name=document.blob_name,
             )
 
+        stored_sheets = workbook_metadata_sheets(current_version.workbook_metadata)
+        if stored_sheets is not None:
+            sheets = [
+                DocumentSheet(
+                    name=sheet["name"],
+                    index=index,
+                    kind="worksheet",
+                    is_active=bool(sheet.get("is_active")),
+                )
+                for index, sheet in enumerate(stored_sheets)
+            ]
+            logger.info(
+                "document.sheets.list.success",
+                extra=log_context(
+                    workspace_id=workspace_id,
+                    document_id=document_id,
+                    sheet_count=len(sheets),
+                    kind="workbook",
+                    source="metadata",
+                ),
+            )
+            return sheets
+
         suffix = Path(document.name).suffix.lower()
+        if suffix == ".xlsx":
+            try:
+                refs = self._read_workbook_sheet_refs(
+                    blob_name=document.blob_name,
+                    version=current_version,
+                )
+            except FileNotFoundError as exc:
+                raise DocumentFileMissingError(
+                    document_id=document_id,
+                    blob_name=document.blob_name,
+                ) from exc
+            if refs is not None:
+                sheets = [
+                    DocumentSheet(
+                        name=ref.name,
+                        index=ref.index,
+                        kind="worksheet",
+                        is_active=ref.is_active,
+                    )
+                    for ref in refs
+                ]
+                logger.info(
+                    "document.sheets.list.success",
+                    extra=log_context(
+                        workspace_id=workspace_id,
+                        document_id=document_id,
+                        sheet_count=len(sheets),
+                        kind="workbook",
+                        source="range",
+                    ),
+                )
+                return sheets
+
         try:
             with self._download_blob_to_tempfile(
                 blob_name=document.blob_name,
@@ -1402,6 +1545,39 @@ class DocumentsService:
         )
         return sheets
 
+    def get_document_preview_etag(
+        self,
+        *,
+        workspace_id: UUID,
+        document_id: UUID,
+        max_rows: int,
+        max_columns: int,
+        row_offset: int = 0,
+        column_offset: int = 0,
+        trim_empty_columns: bool = False,
+        trim_empty_rows: bool = False,
+        sheet_name: str | None = None,
+        sheet_index: int | None = None,
+    ) -> str | None:
+        """Return the strong ETag token for a document preview without rendering it."""
+
+        document = self._get_document(workspace_id, document_id)
+        current_version = document.current_version
+        if current_version is None:
+            return None
+        return self._preview_cache_key(
+            document=document,
+            version=current_version,
+            max_rows=max_rows,
+            max_columns=max_columns,
+            row_offset=row_offset,
+            column_offset=column_offset,
+            trim_empty_columns=trim_empty_columns,
+            trim_empty_rows=trim_empty_rows,
+            sheet_name=sheet_name,
+            sheet_index=sheet_index,
+        )
+
     def get_document_preview(
         self,
         *,
@@ -1409,6 +1585,8 @@ class DocumentsService:
         document_id: UUID,
         max_rows: int,
         max_columns: int,
+        row_offset: int = 0,
+        column_offset: int = 0,
         trim_empty_columns: bool = False,
         trim_empty_rows: bool = False,
         sheet_name: str | None = None,
@@ -1439,41 +1617,90 @@ class DocumentsService:
             )
 
         suffix = Path(document.name).suffix.lower()
+        cache_key = self._preview_cache_key(
+            document=document,
+            version=current_version,
+            max_rows=max_rows,
+            max_columns=max_columns,
+            row_offset=row_offset,
+            column_offset=column_offset,
+            trim_empty_columns=trim_empty_columns,
+            trim_empty_rows=trim_empty_rows,
+            sheet_name=sheet_name,
+            sheet_index=effective_sheet_index,
+        )
+        preview_cache = get_preview_cache(self._settings, self._storage)
+        cached = preview_cache.get(cache_key, workspace_id=workspace_id)
+        if cached is not None:
+            logger.info(
+                "document.preview.success",
+                extra=log_context(
+                    workspace_id=workspace_id,
+                    document_id=document_id,
+                    sheet_name=cached.name,
+                    sheet_index=cached.index,
+                    cache="hit",
+                ),
+            )
+            return cached
+
         try:
-            with self._download_blob_to_tempfile(
-                blob_name=document.blob_name,
-                version_id=current_version.storage_version_id,
+            preview = self._read_sidecar_preview(
+                version=current_version,
                 suffix=suffix,
-            ) as path:
-                if suffix == ".xlsx":
-                    preview = _run_with_timeout(
-                        build_workbook_preview_from_xlsx,
-                        timeout=self._settings.preview_timeout_seconds,
-                        path=path,
-                        max_rows=max_rows,
-                        max_columns=max_columns,
-                        trim_empty_columns=trim_empty_columns,
-                        trim_empty_rows=trim_empty_rows,
-                        sheet_name=sheet_name,
-                        sheet_index=effective_sheet_index,
-                    )
-                elif suffix == ".csv":
-                    preview = _run_with_timeout(
-                        build_workbook_preview_from_csv,
-                        timeout=self._settings.preview_timeout_seconds,
-                        path=path,
-                        max_rows=max_rows,
-                        max_columns=max_columns,
-                        trim_empty_columns=trim_empty_columns,
-                        trim_empty_rows=trim_empty_rows,
-                        sheet_name=sheet_name,
-                        sheet_index=effective_sheet_index,
-                    )
-                else:
-                    raise DocumentPreviewUnsupportedError(
-                        document_id=document_id,
-                        file_type=suffix or "unknown",
-                    )
+                max_rows=max_rows,
+                max_columns=max_columns,
+                row_offset=row_offset,
+                column_offset=column_offset,
+                trim_empty_columns=trim_empty_columns,
+                trim_empty_rows=trim_empty_rows,
+                sheet_name=sheet_name,
+                sheet_index=effective_sheet_index,
+            )
+            if preview is None:
+                with self._download_blob_to_tempfile(
+                    blob_name=document.blob_name,
+                    version_id=current_version.storage_version_id,
+                    suffix=suffix,
+                ) as path:
+                    if suffix == ".xlsx":
+                        preview = _run_with_timeout(
+                            build_workbook_preview_from_xlsx,
+                            timeout=self._settings.preview_timeout_seconds,
+                            path=path,
+                            max_rows=max_rows,
+                            max_columns=max_columns,
+                            row_offset=row_offset,
+                            column_offset=column_offset,
+                            row_index=find_sheet_row_index(
+                                current_version.workbook_metadata,
+                                sheet_name=sheet_name,
+                                sheet_index=effective_sheet_index,
+                            ),
+                            trim_empty_columns=trim_empty_columns,
+                            trim_empty_rows=trim_empty_rows,
+                            sheet_name=sheet_name,
+                            sheet_index=effective_sheet_index,
+                        )
+                    elif suffix == ".csv":
+                        preview = _run_with_timeout(
+                            build_workbook_preview_from_csv,
+                            timeout=self._settings.preview_timeout_seconds,
+                            path=path,
+                            max_rows=max_rows,
+                            max_columns=max_columns,
+                            row_offset=row_offset,
+                            column_offset=column_offset,
+                            trim_empty_columns=trim_empty_columns,
+                            trim_empty_rows=trim_empty_rows,
+                            sheet_name=sheet_name,
+                            sheet_index=effective_sheet_index,
+                        )
+                    else:
+                        raise DocumentPreviewUnsupportedError(
+                            document_id=document_id,
+                            file_type=suffix or "unknown",
+                        )
         except (KeyError, IndexError) as exc:
             requested = sheet_name if sheet_name is not None else str(effective_sheet_index)
             raise DocumentPreviewSheetNotFoundError(
@@ -1500,6 +1727,7 @@ class DocumentsService:
                 reason=type(exc).__name__,
             ) from exc
 
+        preview_cache.put(cache_key, preview, workspace_id=workspace_id)
         logger.info(
             "document.preview.success",
             extra=log_context(
@@ -1507,10 +1735,66 @@ class DocumentsService:
                 document_id=document_id,
                 sheet_name=preview.name,
                 sheet_index=preview.index,
+                cache="miss",
             ),
         )
         return preview
 
+    def _read_sidecar_preview(
+        self,
+        *,
+        version: FileVersion,
+        suffix: str,
+        **options: Any,
+    ) -> WorkbookSheetPreview | None:
+        """Render a preview from the version's row sidecar; ``None`` means read the workbook."""
+
+        descriptor = sidecar_descriptor(version.workbook_metadata) if suffix == ".xlsx" else None
+        if descriptor is None:
+            return None
+        try:
+            return _run_with_timeout(
+                build_workbook_preview_from_sidecar,
+                timeout=self._settings.preview_timeout_seconds,
+                source=WorkbookSidecar.from_storage(self._storage, descriptor),
+                **options,
+            )
+        except (WorkbookSidecarError, StorageError, OSError) as exc:
+            logger.warning(
+                "document.preview.sidecar_failed",
+                extra=log_context(blob_name=descriptor["blob_name"], reason=str(exc)),
+            )
+            return None
+
+    @staticmethod
+    def _preview_cache_key(
+        *,
+        document: File,
+        version: FileVersion,
+        max_rows: int,
+        max_columns: int,
+        row_offset: int,
+        column_offset: int,
+        trim_empty_columns: bool,
+        trim_empty_rows: bool,
+        sheet_name: str | None,
+        sheet_index: int | None,
+    ) -> str:
+        if sheet_name is None and sheet_index is None:
+            sheet_index = 0
+        return preview_cache_key(
+            version.sha256,
+            file_type=Path(document.name).suffix.lower(),
+            sheet_name=sheet_name,
+            sheet_index=sheet_index,
+            max_rows=max_rows,
+            max_columns=max_columns,
+            trim_empty_columns=trim_empty_columns,
+            trim_empty_rows=trim_empty_rows,
+            row_offset=row_offset,
+            column_offset=column_offset,
+        )
+
     def stream_document(
         self,
         *,
@@ -2570,7 +2854,7 @@ class DocumentsService:
             id=document.id,
             workspace_id=document.workspace_id,
             name=document.name,
-            file_type=self._derive_file_type(document.name),
+            file_type=document.file_type,
             uploader=document.uploader,
             assignee=document.assignee,
             tags=document.tags,
@@ -2587,117 +2871,6 @@ class DocumentsService:
             last_run_fields=document.last_run_fields,
         )
 
-    def _build_document_facets(self, stmt: Select) -> dict[str, Any]:
-        filtered_ids = stmt.order_by(None).with_only_columns(File.id).distinct().subquery()
-
-        def coerce_value(value: Any) -> Any:
-            if isinstance(value, Enum):
-                return value.value
-            if isinstance(value, UUID):
-                return str(value)
-            return value
-
-        def build_buckets(expr: Any) -> list[dict[str, Any]]:
-            rows = self._session.execute(
-                select(
-                    expr.label("value"),
-                    func.count().label("count"),
-                )
-                .select_from(File)
-                .join(filtered_ids, filtered_ids.c.id == File.id)
-                .group_by(expr)
-            ).all()
-            buckets = [
-                {"value": coerce_value(value), "count": int(count or 0)} for value, count in rows
-            ]
-            buckets.sort(key=lambda bucket: str(bucket["value"]))
-            return buckets
-
-        lower_name = func.lower(File.name)
-        file_type_expr = case(
-            (lower_name.like("%.xlsx"), DocumentFileType.XLSX.value),
-            (lower_name.like("%.xls"), DocumentFileType.XLS.value),
-            (lower_name.like("%.csv"), DocumentFileType.CSV.value),
-            (lower_name.like("%.pdf"), DocumentFileType.PDF.value),
-            else_=DocumentFileType.UNKNOWN.value,
-        )
-        file_type_subquery = (
-            select(
-                File.id.label("document_id"),
-                file_type_expr.label("file_type"),
-            )
-            .select_from(File)
-            .subquery()
-        )
-        file_type_rows = self._session.execute(
-            select(
-                file_type_subquery.c.file_type.label("value"),
-                func.count().label("count"),
-            )
-            .select_from(file_type_subquery)
-            .join(filtered_ids, filtered_ids.c.id == file_type_subquery.c.document_id)
-            .group_by(file_type_subquery.c.file_type)
-        ).all()
-        file_type_buckets = [
-            {"value": coerce_value(value), "count": int(count or 0)}
-            for value, count in file_type_rows
-        ]
-        file_type_buckets.sort(key=lambda bucket: str(bucket["value"]))
-
-        timestamp = func.coalesce(Run.completed_at, Run.started_at, Run.created_at)
-        ranked_runs = (
-            select(
-                FileVersion.file_id.label("document_id"),
-                Run.status.label("status"),
-                func
-                .row_number()
-                .over(
-                    partition_by=FileVersion.file_id,
-                    order_by=timestamp.desc(),
-                )
-                .label("rank"),
-            )
-            .select_from(Run)
-            .join(FileVersion, Run.input_file_version_id == FileVersion.id)
-            .where(FileVersion.file_id.in_(select(filtered_ids.c.id)))
-            .subquery()
-        )
-        status_rows = self._session.execute(
-            select(
-                ranked_runs.c.status.label("value"),
-                func.count().label("count"),
-            )
-            .select_from(File)
-            .join(filtered_ids, filtered_ids.c.id == File.id)
-            .outerjoin(
-                ranked_runs,
-                (ranked_runs.c.document_id == File.id) & (ranked_runs.c.rank == 1),
-            )
-            .group_by(ranked_runs.c.status)
-        ).all()
-        status_buckets = [
-            {"value": coerce_value(value), "count": int(count or 0)} for value, count in status_rows
-        ]
-        status_buckets.sort(key=lambda bucket: str(bucket["value"]))
-
-        return {
-            "lastRunPhase": {"buckets": status_buckets},
-            "fileType": {"buckets": file_type_buckets},
-        }
-
-    @staticmethod
-    def _derive_file_type(name: str) -> DocumentFileType:
-        suffix = Path(name).suffix.lower().lstrip(".")
-        if suffix == "xlsx":
-            return DocumentFileType.XLSX
-        if suffix == "xls":
-            return DocumentFileType.XLS
-        if suffix == "csv":
-            return DocumentFileType.CSV
-        if suffix == "pdf":
-            return DocumentFileType.PDF
-        return DocumentFileType.UNKNOWN
-
     @staticmethod
     def _last_run_at(run: DocumentRunSummary | None) -> datetime | None:
         if run is None:
@@ -3015,6 +3188,29 @@ class DocumentsService:
                     handle.write(chunk)
             yield path
 
+    def _read_workbook_sheet_refs(
+        self,
+        *,
+        blob_name: str,
+        version: FileVersion,
+    ) -> list[WorkbookSheetRef] | None:
+        """Resolve sheets with ranged reads; ``None`` means fall back to a download."""
+
+        try:
+            refs = read_workbook_sheets(
+                self._storage,
+                blob_name,
+                size=version.byte_size,
+                version_id=version.storage_version_id,
+            )
+        except (WorkbookRangeError, StorageError) as exc:
+            logger.debug(
+                "document.sheets.range_read_failed",
+                extra=log_context(blob_name=blob_name, reason=str(exc)),
+            )
+            return None
+        return refs or None
+
     @staticmethod
     def _inspect_workbook(path: Path) -> list[DocumentSheet]:
         with path.open("rb") as raw:
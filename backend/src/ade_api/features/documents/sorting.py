@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Any
 
-from sqlalchemy import case, func, select
+from sqlalchemy import func, select
 from sqlalchemy.sql.elements import ColumnElement
 
 from ade_api.common.cursor_listing import (
@@ -12,20 +11,15 @@ from ade_api.common.cursor_listing import (
     cursor_field_nulls_last,
     parse_datetime,
     parse_enum,
+    parse_float,
     parse_int,
     parse_str,
     parse_uuid,
 )
+from ade_api.common.search import build_q_relevance
 from ade_api.common.sql import nulls_last
-from ade_db.models import File, FileVersion, FileVersionOrigin, Run
-
-
-def _current_version_byte_size_expr() -> ColumnElement[Any]:
-    return (
-        select(FileVersion.byte_size)
-        .where(FileVersion.id == File.current_version_id)
-        .scalar_subquery()
-    )
+from ade_api.features.search_registry import SEARCH_REGISTRY
+from ade_db.models import File, FileVersion, FileVersionOrigin
 
 
 def _current_version_origin_expr() -> ColumnElement[Any]:
@@ -36,38 +30,6 @@ def _current_version_origin_expr() -> ColumnElement[Any]:
     )
 
 
-def _last_run_at_expr() -> ColumnElement[Any]:
-    return (
-        select(func.max(func.coalesce(Run.completed_at, Run.started_at, Run.created_at)))
-        .select_from(Run)
-        .join(FileVersion, Run.input_file_version_id == FileVersion.id)
-        .where(
-            FileVersion.file_id == File.id,
-            Run.workspace_id == File.workspace_id,
-        )
-        .scalar_subquery()
-    )
-
-
-def _activity_at_expr() -> ColumnElement[Any]:
-    last_run_at = _last_run_at_expr()
-    return case(
-        (last_run_at.is_(None), File.updated_at),
-        (File.updated_at.is_(None), last_run_at),
-        (last_run_at > File.updated_at, last_run_at),
-        else_=File.updated_at,
-    )
-
-
-def _activity_at_value(document: File) -> datetime | None:
-    last_run_at = getattr(document, "_last_run_at", None)
-    if last_run_at is None:
-        return document.updated_at
-    if document.updated_at is None:
-        return last_run_at
-    return last_run_at if last_run_at > document.updated_at else document.updated_at
-
-
 SORT_FIELDS = {
     "id": (File.id.asc(), File.id.desc()),
     "createdAt": (File.created_at.asc(), File.created_at.desc()),
@@ -77,14 +39,11 @@ SORT_FIELDS = {
         tuple(nulls_last(File.deleted_at.desc())),
     ),
     "lastRunAt": (
-        tuple(nulls_last(_last_run_at_expr().asc())),
-        tuple(nulls_last(_last_run_at_expr().desc())),
+        tuple(nulls_last(File.last_run_at.asc())),
+        tuple(nulls_last(File.last_run_at.desc())),
     ),
-    "activityAt": (
-        tuple(nulls_last(_activity_at_expr().asc())),
-        tuple(nulls_last(_activity_at_expr().desc())),
-    ),
-    "byteSize": (_current_version_byte_size_expr().asc(), _current_version_byte_size_expr().desc()),
+    "activityAt": (File.activity_at.asc(), File.activity_at.desc()),
+    "byteSize": (File.current_byte_size.asc(), File.current_byte_size.desc()),
     "source": (_current_version_origin_expr().asc(), _current_version_origin_expr().desc()),
     "name": (
         func.lower(File.name).asc(),
@@ -100,14 +59,37 @@ CURSOR_FIELDS: dict[str, CursorFieldSpec[File]] = {
     "createdAt": cursor_field(lambda doc: doc.created_at, parse_datetime),
     "updatedAt": cursor_field(lambda doc: doc.updated_at, parse_datetime),
     "deletedAt": cursor_field_nulls_last(lambda doc: doc.deleted_at, parse_datetime),
-    "lastRunAt": cursor_field_nulls_last(
-        lambda doc: getattr(doc, "_last_run_at", None),
-        parse_datetime,
-    ),
-    "activityAt": cursor_field_nulls_last(_activity_at_value, parse_datetime),
-    "byteSize": cursor_field(lambda doc: doc.byte_size, parse_int),
+    "lastRunAt": cursor_field_nulls_last(lambda doc: doc.last_run_at, parse_datetime),
+    "activityAt": cursor_field(lambda doc: doc.activity_at, parse_datetime),
+    "byteSize": cursor_field(lambda doc: doc.current_byte_size, parse_int),
     "source": cursor_field(lambda doc: doc.source, parse_enum(FileVersionOrigin)),
     "name": cursor_field(lambda doc: (doc.name or "").lower(), parse_str),
+    "relevance": cursor_field(lambda doc: getattr(doc, "_search_rank", None), parse_float),
 }
 
-__all__ = ["CURSOR_FIELDS", "DEFAULT_SORT", "ID_FIELD", "SORT_FIELDS"]
+
+def document_relevance_expr(q: str | None) -> ColumnElement[float] | None:
+    return build_q_relevance(resource="documents", q=q, registry=SEARCH_REGISTRY)
+
+
+def document_sort_fields(q: str | None) -> dict[str, Any]:
+    """Return the sortable fields for a list request.
+
+    ``relevance`` ranks by trigram similarity to ``q`` and is only offered
+    when ``q`` has searchable tokens.
+    """
+
+    relevance = document_relevance_expr(q)
+    if relevance is None:
+        return SORT_FIELDS
+    return {**SORT_FIELDS, "relevance": (relevance.asc(), relevance.desc())}
+
+
+__all__ = [
+    "CURSOR_FIELDS",
+    "DEFAULT_SORT",
+    "ID_FIELD",
+    "SORT_FIELDS",
+    "document_relevance_expr",
+    "document_sort_fields",
+]
@@ -0,0 +1,186 @@
+"""Run log/status notifications via Postgres LISTEN/NOTIFY.
+
+The worker publishes ``{"runId", "kind": "log", "offset"}`` whenever it ships new
+run log bytes, and a trigger on ``runs`` publishes ``{"runId", "kind": "status",
+"status"}`` on every status transition. ``RunEventsHub`` keeps one LISTEN
+connection per API process and fans those payloads out to the SSE streams
+watching each run, so streams only touch blob storage when there is something
+new to read.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import psycopg
+from fastapi import FastAPI, Request
+
+from ade_api.settings import Settings
+from ade_db.engine import build_psycopg_connect_kwargs
+
+RUN_EVENTS_CHANNEL = "ade_run_events"
+RUN_EVENT_KIND_LOG = "log"
+RUN_EVENT_KIND_STATUS = "status"
+RUN_EVENT_KIND_RESYNC = "resync"
+DEFAULT_POLL_SECONDS = 1.0
+DEFAULT_QUEUE_SIZE = 100
+MAX_BACKOFF_SECONDS = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+EventPayload = dict[str, Any]
+EventQueue = asyncio.Queue[EventPayload]
+
+
+class RunEventsHub:
+    """Background LISTEN loop that fans out run log/status notifications."""
+
+    def __init__(
+        self,
+        *,
+        settings: Settings,
+        channel: str = RUN_EVENTS_CHANNEL,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        self._settings = settings
+        self._channel = channel
+        self._poll_seconds = max(0.1, float(poll_seconds))
+        self._queue_size = max(10, int(queue_size))
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._subscribers: dict[str, set[EventQueue]] = {}
+
+    def start(self, *, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._thread.start()
+
+    def stop(self, *, timeout: float = 2.0) -> None:
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+
+    def subscribe(self, run_id: str) -> tuple[EventQueue, Callable[[], None]]:
+        queue: EventQueue = asyncio.Queue(maxsize=self._queue_size)
+        with self._lock:
+            self._subscribers.setdefault(run_id, set()).add(queue)
+
+        def _unsubscribe() -> None:
+            with self._lock:
+                queues = self._subscribers.get(run_id)
+                if not queues:
+                    return
+                queues.discard(queue)
+                if not queues:
+                    self._subscribers.pop(run_id, None)
+
+        return queue, _unsubscribe
+
+    def _enqueue(self, queue: EventQueue, payload: EventPayload) -> None:
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # A stalled subscriber only needs to know "something changed"; collapse
+            # its backlog into a single resync marker.
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            with contextlib.suppress(asyncio.QueueFull):
+                queue.put_nowait({"runId": payload.get("runId"), "kind": RUN_EVENT_KIND_RESYNC})
+
+    def _publish(self, run_id: str, payload: EventPayload) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        with self._lock:
+            queues = list(self._subscribers.get(run_id, set()))
+        for queue in queues:
+            try:
+                loop.call_soon_threadsafe(self._enqueue, queue, payload)
+            except RuntimeError:
+                continue
+
+    def _parse_payload(self, payload: str) -> tuple[str, EventPayload] | None:
+        try:
+            data = json.loads(payload)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        run_id = data.get("runId")
+        kind = data.get("kind")
+        if not run_id or kind not in {RUN_EVENT_KIND_LOG, RUN_EVENT_KIND_STATUS}:
+            return None
+        event: EventPayload = {"runId": str(run_id), "kind": kind}
+        if kind == RUN_EVENT_KIND_LOG:
+            offset = data.get("offset")
+            if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+                return None
+            event["offset"] = offset
+        else:
+            status = data.get("status")
+            if not isinstance(status, str) or not status:
+                return None
+            event["status"] = status
+        return str(run_id), event
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            connection = None
+            try:
+                connect_kwargs = build_psycopg_connect_kwargs(self._settings)
+                connection = psycopg.connect(**connect_kwargs, autocommit=True)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self._channel}")
+                logger.info("runs.events.listen channel=%s", self._channel)
+                backoff = 1.0
+
+                while not self._stop_event.is_set():
+                    for notification in connection.notifies(timeout=self._poll_seconds):
+                        parsed = self._parse_payload(notification.payload)
+                        if parsed:
+                            run_id, payload = parsed
+                            self._publish(run_id, payload)
+            except Exception:
+                logger.exception("runs.events.listen_failed retry_in=%ss", backoff)
+                time.sleep(backoff + random.random())
+                backoff = min(MAX_BACKOFF_SECONDS, backoff * 2)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+def _resolve_app(app_or_request: FastAPI | Request) -> FastAPI:
+    if isinstance(app_or_request, FastAPI):
+        return app_or_request
+    return app_or_request.app
+
+
+def get_run_events_hub(app_or_request: FastAPI | Request) -> RunEventsHub | None:
+    """Return the running hub, or ``None`` so callers fall back to polling."""
+
+    app = _resolve_app(app_or_request)
+    return getattr(app.state, "run_events_hub", None)
+
+
+__all__ = [
+    "RUN_EVENTS_CHANNEL",
+    "RunEventsHub",
+    "get_run_events_hub",
+]
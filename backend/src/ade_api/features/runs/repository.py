@@ -35,6 +35,11 @@ class RunsRepository:
 
         return self._session.get(Run, run_id)
 
+    def get_for_update(self, run_id: UUID) -> Run | None:
+        """Return the run with a row lock held until the transaction ends."""
+
+        return self._session.get(Run, run_id, with_for_update=True, populate_existing=True)
+
     def list_by_workspace(
         self,
         *,
@@ -33,6 +33,9 @@ from ade_api.common.cursor_listing import (
     strict_cursor_query_guard,
 )
 from ade_api.common.downloads import build_content_disposition
+from ade_api.common.etag import etag_matches, format_etag, format_weak_etag
+from ade_api.common.preview_cache import PREVIEW_CACHE_CONTROL
+from ade_api.common.workbook_patch import DeleteRow, InsertRow, PatchOperation, SetCell
 from ade_api.common.workbook_preview import (
     DEFAULT_PREVIEW_COLUMNS,
     DEFAULT_PREVIEW_ROWS,
@@ -51,6 +54,7 @@ from ade_api.features.configs.exceptions import (
 from ade_db.models import Run, RunStatus, User
 from ade_storage import StorageLimitError, get_storage_adapter
 
+from .events import get_run_events_hub
 from .exceptions import (
     RunDocumentMissingError,
     RunInputDocumentRequiredForProcessError,
@@ -75,14 +79,17 @@ from .schemas import (
     RunInput,
     RunMetricsResource,
     RunOutput,
+    RunOutputDeleteRowOperation,
     RunOutputEditRequest,
+    RunOutputInsertRowOperation,
+    RunOutputPatchRequest,
     RunOutputSheet,
     RunPage,
     RunResource,
     RunWorkspaceBatchCreateRequest,
     RunWorkspaceCreateRequest,
 )
-from .service import RunsService
+from .service import RunsService, output_etag_token
 from .sorting import CURSOR_FIELDS, DEFAULT_SORT, ID_FIELD, SORT_FIELDS
 
 router = APIRouter(
@@ -226,6 +233,28 @@ def _output_missing_detail(*, run: Run, message: str) -> str | dict[str, dict[st
     return message
 
 
+def _set_output_etag(response: Response, output: RunOutput) -> None:
+    if output.file_version_id is None:
+        return
+    etag = format_weak_etag(output_etag_token(output.file_version_id))
+    if etag:
+        response.headers["ETag"] = etag
+
+
+def _patch_operations(payload: RunOutputPatchRequest) -> list[PatchOperation]:
+    operations: list[PatchOperation] = []
+    for operation in payload.operations:
+        if isinstance(operation, RunOutputInsertRowOperation):
+            operations.append(InsertRow(row=operation.row, values=operation.values))
+        elif isinstance(operation, RunOutputDeleteRowOperation):
+            operations.append(DeleteRow(row=operation.row))
+        else:
+            operations.append(
+                SetCell(row=operation.row, column=operation.column, value=operation.value)
+            )
+    return operations
+
+
 def _normalise_run_events_filename_stem(value: str | None) -> str:
     if value is None:
         return ""
@@ -606,9 +635,14 @@ async def stream_workspace_run_events_endpoint(
 ) -> EventSourceResponse:
     run = _require_workspace_run(service=service, workspace_id=workspace_id, run_id=run_id)
     resolved_cursor = _resolve_stream_cursor(request, cursor)
+    events_hub = get_run_events_hub(request)
 
     async def event_stream() -> AsyncIterator[dict[str, str]]:
-        async for message in service.stream_run_events(run_id=run.id, cursor=resolved_cursor):
+        async for message in service.stream_run_events(
+            run_id=run.id,
+            cursor=resolved_cursor,
+            events_hub=events_hub,
+        ):
             if await request.is_disconnected():
                 return
             yield message
@@ -676,12 +710,15 @@ def get_workspace_run_output_metadata_endpoint(
     run_id: RunPath,
     service: RunsServiceReadDep,
     _actor: RunReader,
+    response: Response,
 ) -> RunOutput:
     _require_workspace_run(service=service, workspace_id=workspace_id, run_id=run_id)
     try:
-        return service.get_run_output_metadata(run_id=run_id)
+        output = service.get_run_output_metadata(run_id=run_id)
     except RunNotFoundError as exc:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    _set_output_etag(response, output)
+    return output
 
 
 @router.post(
@@ -834,6 +871,9 @@ def list_workspace_run_output_sheets_endpoint(
         "and trimming controls."
     ),
     responses={
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "The preview matches the ETag sent in If-None-Match.",
+        },
         status.HTTP_404_NOT_FOUND: {"description": "Run or output not found"},
         status.HTTP_409_CONFLICT: {"description": "Output not ready"},
         status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {
@@ -847,6 +887,7 @@ def list_workspace_run_output_sheets_endpoint(
 def preview_workspace_run_output_endpoint(
     workspace_id: WorkspacePath,
     run_id: RunPath,
+    request: Request,
     response: Response,
     service: RunsServiceReadDep,
     _actor: RunReader,
@@ -869,6 +910,22 @@ def preview_workspace_run_output_endpoint(
             description="Maximum columns per sheet to include in the preview.",
         ),
     ] = DEFAULT_PREVIEW_COLUMNS,
+    row_offset: Annotated[
+        int,
+        Query(
+            ge=0,
+            alias="rowOffset",
+            description="Rows to skip before the preview window (for scrolling large sheets).",
+        ),
+    ] = 0,
+    column_offset: Annotated[
+        int,
+        Query(
+            ge=0,
+            alias="columnOffset",
+            description="Columns to skip before the preview window.",
+        ),
+    ] = 0,
     trim_empty_columns: Annotated[
         bool,
         Query(
@@ -903,7 +960,7 @@ def preview_workspace_run_output_endpoint(
             ),
         ),
     ] = None,
-) -> WorkbookSheetPreview:
+) -> WorkbookSheetPreview | Response:
     run = _require_workspace_run(service=service, workspace_id=workspace_id, run_id=run_id)
     if sheet_name and sheet_index is not None:
         raise HTTPException(
@@ -913,11 +970,29 @@ def preview_workspace_run_output_endpoint(
     if sheet_name is None and sheet_index is None:
         sheet_index = 0
     try:
-        response.headers["Cache-Control"] = "no-store"
+        etag_token = service.get_run_output_preview_etag(
+            run_id=run_id,
+            max_rows=max_rows,
+            max_columns=max_columns,
+            row_offset=row_offset,
+            column_offset=column_offset,
+            trim_empty_columns=trim_empty_columns,
+            trim_empty_rows=trim_empty_rows,
+            sheet_name=sheet_name,
+            sheet_index=sheet_index,
+        )
+        etag = format_etag(etag_token)
+        if etag:
+            headers = {"ETag": etag, "Cache-Control": PREVIEW_CACHE_CONTROL}
+            if etag_matches(request.headers.get("if-none-match"), etag_token):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            response.headers.update(headers)
         return service.get_run_output_preview(
             run_id=run_id,
             max_rows=max_rows,
             max_columns=max_columns,
+            row_offset=row_offset,
+            column_offset=column_offset,
             trim_empty_columns=trim_empty_columns,
             trim_empty_rows=trim_empty_rows,
             sheet_name=sheet_name,
@@ -996,3 +1071,70 @@ def edit_workspace_run_output_endpoint(
     except (RunOutputPreviewParseError, RunOutputPreviewSheetNotFoundError) as exc:
         raise HTTPException(status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc)) from exc
 
+
+@router.patch(
+    "/{runId}/output",
+    response_model=RunOutput,
+    response_model_exclude_none=True,
+    dependencies=[Security(require_csrf)],
+    summary="Apply cell and row edits to a run output sheet",
+    description=(
+        "Apply set-cell, insert-row and delete-row operations, in order, to a worksheet "
+        "of the current run output and save the result as a new version. Only the edited "
+        "sheet is rewritten. Requires an If-Match header carrying the ETag returned by "
+        "the output metadata endpoint."
+    ),
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Run or output not found"},
+        status.HTTP_409_CONFLICT: {"description": "Output not ready"},
+        status.HTTP_412_PRECONDITION_FAILED: {
+            "description": "The output changed since the ETag in If-Match was issued.",
+        },
+        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {
+            "description": "Edits are not supported for this file type.",
+        },
+        status.HTTP_422_UNPROCESSABLE_CONTENT: {
+            "description": "The sheet was not found or the operations could not be applied.",
+        },
+        status.HTTP_428_PRECONDITION_REQUIRED: {"description": "If-Match header is required."},
+    },
+)
+def patch_workspace_run_output_endpoint(
+    workspace_id: WorkspacePath,
+    run_id: RunPath,
+    payload: RunOutputPatchRequest,
+    request: Request,
+    response: Response,
+    service: RunsServiceDep,
+    actor: RunManager,
+) -> RunOutput:
+    _require_workspace_run(service=service, workspace_id=workspace_id, run_id=run_id)
+    try:
+        output = service.patch_run_output(
+            run_id=run_id,
+            operations=_patch_operations(payload),
+            if_match=request.headers.get("if-match"),
+            sheet_name=payload.sheet_name,
+            sheet_index=payload.sheet_index,
+            actor_id=actor.id,
+        )
+    except RunNotFoundError as exc:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except RunOutputNotReadyError as exc:
+        raise HTTPException(
+            status.HTTP_409_CONFLICT,
+            detail=_output_not_ready_detail(str(exc)),
+        ) from exc
+    except RunOutputMissingError as exc:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except RunOutputPreviewUnsupportedError as exc:
+        raise HTTPException(
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(exc),
+        ) from exc
+    except (RunOutputPreviewParseError, RunOutputPreviewSheetNotFoundError) as exc:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc)) from exc
+    except StorageLimitError as exc:
+        raise HTTPException(status.HTTP_413_CONTENT_TOO_LARGE, detail=str(exc)) from exc
+    _set_output_etag(response, output)
+    return output
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal
+from typing import Annotated, Literal
 
 from pydantic import Field, model_validator
 
 from ade_api.common.cursor_listing import CursorPage
 from ade_api.common.ids import UUIDStr
 from ade_api.common.schema import BaseSchema
+from ade_api.common.workbook_patch import MAX_SHEET_COLUMNS, MAX_SHEET_ROWS
 from ade_db.models import RunOperation, RunStatus
 
 RunObjectType = Literal["ade.run"]
@@ -30,6 +31,7 @@ __all__ = [
     "RunOutput",
     "RunOutputSheet",
     "RunOutputEditRequest",
+    "RunOutputPatchRequest",
     "RunPage",
     "RunResource",
 ]
@@ -183,6 +185,50 @@ class RunOutputEditRequest(BaseSchema):
     rows: list[list[str]] = Field(...)
 
 
+MAX_OUTPUT_PATCH_OPERATIONS = 10_000
+
+
+class RunOutputSetCellOperation(BaseSchema):
+    """Set one cell; an empty value clears it."""
+
+    op: Literal["set"]
+    row: int = Field(ge=0, lt=MAX_SHEET_ROWS)
+    column: int = Field(ge=0, lt=MAX_SHEET_COLUMNS)
+    value: str
+
+
+class RunOutputInsertRowOperation(BaseSchema):
+    """Insert a row before ``row``, shifting it and later rows down."""
+
+    op: Literal["insertRow"]
+    row: int = Field(ge=0, lt=MAX_SHEET_ROWS)
+    values: list[str] = Field(default_factory=list, max_length=MAX_SHEET_COLUMNS)
+
+
+class RunOutputDeleteRowOperation(BaseSchema):
+    """Delete ``row``, shifting later rows up."""
+
+    op: Literal["deleteRow"]
+    row: int = Field(ge=0, lt=MAX_SHEET_ROWS)
+
+
+RunOutputPatchOperation = Annotated[
+    RunOutputSetCellOperation | RunOutputInsertRowOperation | RunOutputDeleteRowOperation,
+    Field(discriminator="op"),
+]
+
+
+class RunOutputPatchRequest(BaseSchema):
+    """Operations applied in order to a run output sheet (0-based, as in previews)."""
+
+    sheet_name: str | None = Field(default=None, alias="sheetName")
+    sheet_index: int | None = Field(default=None, alias="sheetIndex")
+    operations: list[RunOutputPatchOperation] = Field(
+        min_length=1,
+        max_length=MAX_OUTPUT_PATCH_OPERATIONS,
+    )
+
+
 class RunMetricsResource(BaseSchema):
     """Aggregate run metrics derived from engine.run.completed."""
 
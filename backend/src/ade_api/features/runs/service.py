@@ -25,17 +25,40 @@ from sqlalchemy import case, func, insert, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ade_api.common.concurrency import require_if_match
 from ade_api.common.cursor_listing import ResolvedCursorSort
 from ade_api.common.downloads import build_canonical_download_filename
+from ade_api.common.etag import build_etag_token
 from ade_api.common.list_filters import FilterItem, FilterJoinOperator
 from ade_api.common.logging import log_context
+from ade_api.common.preview_cache import get_preview_cache, preview_cache_key
 from ade_api.common.sse import sse_text
 from ade_api.common.time import utc_now
+from ade_api.common.workbook_metadata import (
+    capture_workbook_metadata,
+    find_sheet_row_index,
+    workbook_metadata_sheets,
+)
+from ade_api.common.workbook_patch import (
+    PatchOperation,
+    RowPlan,
+    WorkbookPatchError,
+    coerce_cell_value,
+    patch_csv,
+    patch_xlsx,
+)
 from ade_api.common.workbook_preview import (
     WorkbookSheetPreview,
     build_workbook_preview_from_csv,
+    build_workbook_preview_from_sidecar,
     build_workbook_preview_from_xlsx,
 )
+from ade_api.common.workbook_ranges import WorkbookRangeError, read_workbook_sheets
+from ade_api.common.workbook_sidecar import (
+    WorkbookSidecar,
+    WorkbookSidecarError,
+    sidecar_descriptor,
+)
 from ade_api.features.admin_settings.service import RuntimeSettingsService
 from ade_api.features.configs.deps import compute_dependency_digest, has_engine_dependency
 from ade_api.features.configs.exceptions import (
@@ -62,11 +85,13 @@ from ade_db.models import (
     RunField,
     RunMetrics,
     RunOperation,
+    RunPriority,
     RunStatus,
     RunTableColumn,
 )
-from ade_storage import StorageAdapter
+from ade_storage import StorageAdapter, StorageError, StoredObject
 
+from .events import RUN_EVENT_KIND_LOG, RUN_EVENT_KIND_STATUS, RunEventsHub
 from .exceptions import (
     RunDocumentMissingError,
     RunInputDocumentRequiredForProcessError,
@@ -105,6 +130,7 @@ __all__ = [
     "RunOutputNotReadyError",
     "RunOutputMissingError",
     "RunsService",
+    "output_etag_token",
 ]
 
 logger = logging.getLogger(__name__)
@@ -115,6 +141,7 @@ _MAX_FILENAME_LENGTH = 255
 _CONFIG_DIGEST_SNAPSHOT_KEY = "__config_digest_snapshot"
 _RUN_EVENTS_STREAM_POLL_SECONDS = 0.25
 _RUN_EVENTS_STREAM_KEEPALIVE_SECONDS = 15.0
+_RUN_EVENTS_STREAM_FALLBACK_POLL_SECONDS = 5.0
 _RUN_EVENTS_STREAM_TERMINAL_EOF_GRACE_SECONDS = 3.0
 
 
@@ -136,6 +163,42 @@ def _deps_digest_cache_key(configuration: Configuration) -> str:
 # --------------------------------------------------------------------------- #
 
 
+def _output_preview_cache_key(
+    *,
+    output_file: File,
+    output_version: FileVersion,
+    max_rows: int,
+    max_columns: int,
+    row_offset: int,
+    column_offset: int,
+    trim_empty_columns: bool,
+    trim_empty_rows: bool,
+    sheet_name: str | None,
+    sheet_index: int | None,
+) -> str:
+    if sheet_name is None and sheet_index is None:
+        sheet_index = 0
+    output_name = output_version.filename_at_upload or output_file.name
+    return preview_cache_key(
+        output_version.sha256,
+        file_type=Path(output_name).suffix.lower(),
+        sheet_name=sheet_name,
+        sheet_index=sheet_index,
+        max_rows=max_rows,
+        max_columns=max_columns,
+        trim_empty_columns=trim_empty_columns,
+        trim_empty_rows=trim_empty_rows,
+        row_offset=row_offset,
+        column_offset=column_offset,
+    )
+
+
+def output_etag_token(file_version_id: UUID | str) -> str:
+    """ETag token of a run output: the id of its current file version."""
+
+    return build_etag_token(file_version_id)
+
+
 def _run_with_timeout(func: Any, *, timeout: float, **kwargs: Any) -> Any:
     """Run a callable with a timeout to avoid hanging on large workbook operations."""
     if timeout <= 0:
@@ -250,6 +313,7 @@ class RunsService:
                 },
                 existing_statuses=[RunStatus.QUEUED, RunStatus.RUNNING],
                 operation=RunOperation.PROCESS,
+                priority=RunPriority.INTERACTIVE,
             )
             run = self._require_active_run(
                 configuration_id=configuration.id,
@@ -391,8 +455,13 @@ class RunsService:
         input_sheet_names_by_document_id: dict[UUID, list[str]] | None = None,
         active_sheet_only_by_document_id: dict[UUID, bool] | None = None,
         skip_existing_check: bool = False,
+        priority: RunPriority = RunPriority.INTERACTIVE,
     ) -> list[Run]:
-        """Create queued runs for each document id, enforcing all-or-nothing semantics."""
+        """Create queued runs for each document id, enforcing all-or-nothing semantics.
+
+        Runs a user asked for are ``INTERACTIVE``; bulk re-processing passes
+        ``BACKFILL`` so it queues behind them.
+        """
         operation = _normalize_run_operation(options.operation)
 
         logger.debug(
@@ -491,6 +560,7 @@ class RunsService:
                 },
                 existing_statuses=[RunStatus.QUEUED, RunStatus.RUNNING],
                 operation=RunOperation.PROCESS,
+                priority=priority,
             )
 
         configuration.last_used_at = utc_now()
@@ -651,6 +721,7 @@ class RunsService:
                 input_sheet_names_by_document_id=sheet_names_by_document_id or None,
                 active_sheet_only_by_document_id=active_sheet_only_by_document_id or None,
                 skip_existing_check=True,
+                priority=RunPriority.BACKFILL,
             )
             total += len(runs)
             if len(document_ids) < limit:
@@ -760,6 +831,7 @@ class RunsService:
             deps_digest=deps_digest,
             operation=RunOperation.VALIDATE,
             status=RunStatus.QUEUED,
+            priority=RunPriority.CONFIGURATION,
             available_at=utc_now(),
             attempt_count=0,
             max_attempts=self._run_max_attempts,
@@ -786,6 +858,7 @@ class RunsService:
             deps_digest=deps_digest,
             operation=RunOperation.PUBLISH,
             status=RunStatus.QUEUED,
+            priority=RunPriority.CONFIGURATION,
             available_at=utc_now(),
             attempt_count=0,
             max_attempts=self._run_max_attempts,
@@ -805,6 +878,7 @@ class RunsService:
         run_options_by_document_id: dict[UUID, dict[str, Any] | None] | None,
         existing_statuses: Sequence[RunStatus] | None,
         operation: RunOperation = RunOperation.PROCESS,
+        priority: RunPriority,
     ) -> None:
         if not document_ids:
             return
@@ -862,6 +936,7 @@ class RunsService:
                     "deps_digest": deps_digest,
                     "operation": operation,
                     "status": RunStatus.QUEUED,
+                    "priority": int(priority),
                     "available_at": now,
                     "attempt_count": 0,
                     "max_attempts": self._run_max_attempts,
@@ -1340,6 +1415,7 @@ class RunsService:
             upload.file,
             max_bytes=self._settings.storage_upload_max_bytes,
         )
+        workbook_metadata = capture_workbook_metadata(upload.file, filename=upload_name)
 
         storage_version_id = stored.version_id
         now = datetime.now(tz=UTC)
@@ -1356,6 +1432,7 @@ class RunsService:
             content_type=content_type,
             filename_at_upload=upload_name,
             storage_version_id=storage_version_id,
+            workbook_metadata=workbook_metadata,
         )
         self._session.add(file_version)
         self._session.flush()
@@ -1466,12 +1543,69 @@ class RunsService:
             return None
         return source_document.name
 
+    def _read_sidecar_preview(
+        self,
+        *,
+        version: FileVersion,
+        suffix: str,
+        **options: Any,
+    ) -> WorkbookSheetPreview | None:
+        """Render a preview from the version's row sidecar; ``None`` means read the workbook."""
+
+        descriptor = sidecar_descriptor(version.workbook_metadata) if suffix == ".xlsx" else None
+        if descriptor is None:
+            return None
+        try:
+            return _run_with_timeout(
+                build_workbook_preview_from_sidecar,
+                timeout=self._settings.preview_timeout_seconds,
+                source=WorkbookSidecar.from_storage(self._blob_storage, descriptor),
+                **options,
+            )
+        except (WorkbookSidecarError, StorageError, OSError) as exc:
+            logger.warning(
+                "run.output.preview.sidecar_failed",
+                extra=log_context(blob_name=descriptor["blob_name"], reason=str(exc)),
+            )
+            return None
+
+    def get_run_output_preview_etag(
+        self,
+        *,
+        run_id: UUID,
+        max_rows: int,
+        max_columns: int,
+        row_offset: int = 0,
+        column_offset: int = 0,
+        trim_empty_columns: bool = False,
+        trim_empty_rows: bool = False,
+        sheet_name: str | None = None,
+        sheet_index: int | None = None,
+    ) -> str:
+        """Return the strong ETag token for a run output preview without rendering it."""
+
+        _, output_file, output_version = self.resolve_output_for_download(run_id=run_id)
+        return _output_preview_cache_key(
+            output_file=output_file,
+            output_version=output_version,
+            max_rows=max_rows,
+            max_columns=max_columns,
+            row_offset=row_offset,
+            column_offset=column_offset,
+            trim_empty_columns=trim_empty_columns,
+            trim_empty_rows=trim_empty_rows,
+            sheet_name=sheet_name,
+            sheet_index=sheet_index,
+        )
+
     def get_run_output_preview(
         self,
         *,
         run_id: UUID,
         max_rows: int,
         max_columns: int,
+        row_offset: int = 0,
+        column_offset: int = 0,
         trim_empty_columns: bool = False,
         trim_empty_rows: bool = False,
         sheet_name: str | None = None,
@@ -1496,41 +1630,90 @@ class RunsService:
         output_name = output_version.filename_at_upload or output_file.name
         suffix = Path(output_name).suffix.lower()
         timeout = self._settings.preview_timeout_seconds
+        cache_key = _output_preview_cache_key(
+            output_file=output_file,
+            output_version=output_version,
+            max_rows=max_rows,
+            max_columns=max_columns,
+            row_offset=row_offset,
+            column_offset=column_offset,
+            trim_empty_columns=trim_empty_columns,
+            trim_empty_rows=trim_empty_rows,
+            sheet_name=sheet_name,
+            sheet_index=effective_sheet_index,
+        )
+        preview_cache = get_preview_cache(self._settings, self._blob_storage)
+        cached = preview_cache.get(cache_key, workspace_id=run.workspace_id)
+        if cached is not None:
+            logger.info(
+                "run.output.preview.success",
+                extra=log_context(
+                    run_id=run.id,
+                    workspace_id=run.workspace_id,
+                    configuration_id=run.configuration_id,
+                    sheet_name=cached.name,
+                    sheet_index=cached.index,
+                    cache="hit",
+                ),
+            )
+            return cached
 
         try:
-            with self._download_blob_to_tempfile(
-                blob_name=output_file.blob_name,
-                version_id=output_version.storage_version_id,
+            preview = self._read_sidecar_preview(
+                version=output_version,
                 suffix=suffix,
-            ) as path:
-                if suffix == ".xlsx":
-                    preview = _run_with_timeout(
-                        build_workbook_preview_from_xlsx,
-                        timeout=timeout,
-                        path=path,
-                        max_rows=max_rows,
-                        max_columns=max_columns,
-                        trim_empty_columns=trim_empty_columns,
-                        trim_empty_rows=trim_empty_rows,
-                        sheet_name=sheet_name,
-                        sheet_index=effective_sheet_index,
-                    )
-                elif suffix == ".csv":
-                    preview = _run_with_timeout(
-                        build_workbook_preview_from_csv,
-                        timeout=timeout,
-                        path=path,
-                        max_rows=max_rows,
-                        max_columns=max_columns,
-                        trim_empty_columns=trim_empty_columns,
-                        trim_empty_rows=trim_empty_rows,
-                        sheet_name=sheet_name,
-                        sheet_index=effective_sheet_index,
-                    )
-                else:
-                    raise RunOutputPreviewUnsupportedError(
-                        f"Preview is not supported for output file type {suffix!r}."
-                    )
+                max_rows=max_rows,
+                max_columns=max_columns,
+                row_offset=row_offset,
+                column_offset=column_offset,
+                trim_empty_columns=trim_empty_columns,
+                trim_empty_rows=trim_empty_rows,
+                sheet_name=sheet_name,
+                sheet_index=effective_sheet_index,
+            )
+            if preview is None:
+                with self._download_blob_to_tempfile(
+                    blob_name=output_file.blob_name,
+                    version_id=output_version.storage_version_id,
+                    suffix=suffix,
+                ) as path:
+                    if suffix == ".xlsx":
+                        preview = _run_with_timeout(
+                            build_workbook_preview_from_xlsx,
+                            timeout=timeout,
+                            path=path,
+                            max_rows=max_rows,
+                            max_columns=max_columns,
+                            row_offset=row_offset,
+                            column_offset=column_offset,
+                            row_index=find_sheet_row_index(
+                                output_version.workbook_metadata,
+                                sheet_name=sheet_name,
+                                sheet_index=effective_sheet_index,
+                            ),
+                            trim_empty_columns=trim_empty_columns,
+                            trim_empty_rows=trim_empty_rows,
+                            sheet_name=sheet_name,
+                            sheet_index=effective_sheet_index,
+                        )
+                    elif suffix == ".csv":
+                        preview = _run_with_timeout(
+                            build_workbook_preview_from_csv,
+                            timeout=timeout,
+                            path=path,
+                            max_rows=max_rows,
+                            max_columns=max_columns,
+                            row_offset=row_offset,
+                            column_offset=column_offset,
+                            trim_empty_columns=trim_empty_columns,
+                            trim_empty_rows=trim_empty_rows,
+                            sheet_name=sheet_name,
+                            sheet_index=effective_sheet_index,
+                        )
+                    else:
+                        raise RunOutputPreviewUnsupportedError(
+                            f"Preview is not supported for output file type {suffix!r}."
+                        )
         except FileNotFoundError as exc:
             raise RunOutputMissingError("Run output is unavailable") from exc
         except (KeyError, IndexError) as exc:
@@ -1549,6 +1732,7 @@ class RunsService:
                 f"Preview generation failed for run {run_id!r} output ({type(exc).__name__})."
             ) from exc
 
+        preview_cache.put(cache_key, preview, workspace_id=run.workspace_id)
         logger.info(
             "run.output.preview.success",
             extra=log_context(
@@ -1557,6 +1741,7 @@ class RunsService:
                 configuration_id=run.configuration_id,
                 sheet_name=preview.name,
                 sheet_index=preview.index,
+                cache="miss",
             ),
         )
         return preview
@@ -1628,20 +1813,11 @@ class RunsService:
                         # Overwrite cell values
                         for r_idx, row_data in enumerate(rows):
                             for c_idx, val in enumerate(row_data):
-                                typed_val: str | int | float = val
-                                if val != "":
-                                    try:
-                                        is_neg_digit = (
-                                            val.startswith("-") and val[1:].isdigit()
-                                        )
-                                        if val.isdigit() or is_neg_digit:
-                                            typed_val = int(val)
-                                        else:
-                                            typed_val = float(val)
-                                    except ValueError:
-                                        pass
-                                cell_val = None if val == "" else typed_val
-                                sheet.cell(row=r_idx + 1, column=c_idx + 1, value=cell_val)
+                                sheet.cell(
+                                    row=r_idx + 1,
+                                    column=c_idx + 1,
+                                    value=coerce_cell_value(val),
+                                )
 
                         workbook.save(path)
                     finally:
@@ -1663,17 +1839,145 @@ class RunsService:
                         file_stream,
                         max_bytes=self._settings.storage_upload_max_bytes,
                     )
+                workbook_metadata = capture_workbook_metadata(path, filename=output_name)
 
         except FileNotFoundError as exc:
             raise RunOutputMissingError("Run output is unavailable") from exc
 
-        storage_version_id = stored.version_id
-        now = datetime.now(tz=UTC)
+        file_version = self._record_output_edit(
+            run=run,
+            output_file=output_file,
+            output_version=output_version,
+            stored=stored,
+            workbook_metadata=workbook_metadata,
+            actor_id=actor_id,
+        )
+        logger.info(
+            "run.output.edit.success",
+            extra=log_context(
+                run_id=run.id,
+                workspace_id=run.workspace_id,
+                configuration_id=run.configuration_id,
+                file_version_id=file_version.id,
+                version_no=file_version.version_no,
+            ),
+        )
+        return self._build_output_metadata(run=run)
 
-        version_no = self._next_version_no(file_id=output_file.id)
+    def patch_run_output(
+        self,
+        *,
+        run_id: UUID,
+        operations: Sequence[PatchOperation],
+        if_match: str | None,
+        sheet_name: str | None = None,
+        sheet_index: int | None = None,
+        actor_id: UUID | None = None,
+    ) -> RunOutput:
+        """Apply cell and row operations to a run output and create a new FileVersion.
+
+        ``if_match`` must carry the ETag of the current output version. The run
+        row stays locked until the transaction ends, so concurrent patches
+        cannot both pass the check. Only the edited sheet is rewritten.
+        """
+        if sheet_name is None and sheet_index is None:
+            sheet_index = 0
+
+        logger.info(
+            "run.output.patch.start",
+            extra=log_context(
+                run_id=run_id,
+                sheet_name=sheet_name,
+                sheet_index=sheet_index,
+                operation_count=len(operations),
+            ),
+        )
+
+        if self._runs.get_for_update(run_id) is None:
+            raise RunNotFoundError(run_id)
+        run, output_file, output_version = self.resolve_output_for_download(run_id=run_id)
+        require_if_match(if_match, expected_token=output_etag_token(output_version.id))
+
+        output_name = output_version.filename_at_upload or output_file.name
+        suffix = Path(output_name).suffix.lower()
+        if suffix not in {".xlsx", ".csv"}:
+            raise RunOutputPreviewUnsupportedError(
+                f"Editing is not supported for output file type {suffix!r}."
+            )
+        plan = RowPlan(operations)
+
+        try:
+            with self._download_blob_to_tempfile(
+                blob_name=output_file.blob_name,
+                version_id=output_version.storage_version_id,
+                suffix=suffix,
+            ) as path:
+                patched = path.with_name(f"run-output-patched{suffix}")
+                if suffix == ".xlsx":
+                    try:
+                        patch_xlsx(
+                            path,
+                            patched,
+                            plan,
+                            sheet_name=sheet_name,
+                            sheet_index=sheet_index,
+                        )
+                    except (KeyError, IndexError) as exc:
+                        raise RunOutputPreviewSheetNotFoundError(
+                            f"Sheet {sheet_name or sheet_index!r} not found"
+                        ) from exc
+                else:
+                    patch_csv(path, patched, plan)
+
+                with patched.open("rb") as file_stream:
+                    stored = self._blob_storage.write(
+                        output_file.blob_name,
+                        file_stream,
+                        max_bytes=self._settings.storage_upload_max_bytes,
+                    )
+                workbook_metadata = capture_workbook_metadata(patched, filename=output_name)
+        except FileNotFoundError as exc:
+            raise RunOutputMissingError("Run output is unavailable") from exc
+        except WorkbookPatchError as exc:
+            raise RunOutputPreviewParseError(str(exc)) from exc
+
+        file_version = self._record_output_edit(
+            run=run,
+            output_file=output_file,
+            output_version=output_version,
+            stored=stored,
+            workbook_metadata=workbook_metadata,
+            actor_id=actor_id,
+        )
+        logger.info(
+            "run.output.patch.success",
+            extra=log_context(
+                run_id=run.id,
+                workspace_id=run.workspace_id,
+                configuration_id=run.configuration_id,
+                file_version_id=file_version.id,
+                version_no=file_version.version_no,
+                operation_count=len(operations),
+            ),
+        )
+        return self._build_output_metadata(run=run)
+
+    def _record_output_edit(
+        self,
+        *,
+        run: Run,
+        output_file: File,
+        output_version: FileVersion,
+        stored: StoredObject,
+        workbook_metadata: dict[str, Any] | None,
+        actor_id: UUID | None,
+    ) -> FileVersion:
+        """Make the re-uploaded output the run's current output version."""
+
+        now = datetime.now(tz=UTC)
         file_version = FileVersion(
             file_id=output_file.id,
-            version_no=version_no,
+            version_no=self._next_version_no(file_id=output_file.id),
             origin=FileVersionOrigin.MANUAL,
             run_id=run.id,
             created_by_user_id=actor_id,
@@ -1681,7 +1985,8 @@ class RunsService:
             byte_size=stored.byte_size,
             content_type=output_version.content_type,
             filename_at_upload=output_version.filename_at_upload,
-            storage_version_id=storage_version_id,
+            storage_version_id=stored.version_id,
+            workbook_metadata=workbook_metadata,
         )
         self._session.add(file_version)
         self._session.flush()
@@ -1690,18 +1995,7 @@ class RunsService:
         output_file.updated_at = now
         run.output_file_version_id = file_version.id
         self._session.flush()
-
-        logger.info(
-            "run.output.edit.success",
-            extra=log_context(
-                run_id=run.id,
-                workspace_id=run.workspace_id,
-                configuration_id=run.configuration_id,
-                file_version_id=file_version.id,
-                version_no=version_no,
-            ),
-        )
-        return self._build_output_metadata(run=run)
+        return file_version
 
     def list_run_output_sheets(
         self,
@@ -1720,7 +2014,69 @@ class RunsService:
         suffix = Path(output_name).suffix.lower()
         timeout = self._settings.preview_timeout_seconds
 
+        stored_sheets = workbook_metadata_sheets(output_version.workbook_metadata)
+        if suffix == ".xlsx" and stored_sheets is not None:
+            sheets = [
+                RunOutputSheet(
+                    name=sheet["name"],
+                    index=index,
+                    kind="worksheet",
+                    is_active=bool(sheet.get("is_active")),
+                )
+                for index, sheet in enumerate(stored_sheets)
+            ]
+            logger.info(
+                "run.output.sheets.list.success",
+                extra=log_context(
+                    run_id=run.id,
+                    workspace_id=run.workspace_id,
+                    configuration_id=run.configuration_id,
+                    sheet_count=len(sheets),
+                    kind="workbook",
+                    source="metadata",
+                ),
+            )
+            return sheets
+
         if suffix == ".xlsx":
+            try:
+                refs = read_workbook_sheets(
+                    self._blob_storage,
+                    output_file.blob_name,
+                    size=output_version.byte_size,
+                    version_id=output_version.storage_version_id,
+                )
+            except FileNotFoundError as exc:
+                raise RunOutputMissingError("Run output is unavailable") from exc
+            except (WorkbookRangeError, StorageError) as exc:
+                logger.debug(
+                    "run.output.sheets.range_read_failed",
+                    extra=log_context(run_id=run.id, reason=str(exc)),
+                )
+                refs = []
+            if refs:
+                sheets = [
+                    RunOutputSheet(
+                        name=ref.name,
+                        index=ref.index,
+                        kind="worksheet",
+                        is_active=ref.is_active,
+                    )
+                    for ref in refs
+                ]
+                logger.info(
+                    "run.output.sheets.list.success",
+                    extra=log_context(
+                        run_id=run.id,
+                        workspace_id=run.workspace_id,
+                        configuration_id=run.configuration_id,
+                        sheet_count=len(sheets),
+                        kind="workbook",
+                        source="range",
+                    ),
+                )
+                return sheets
+
             try:
                 with self._download_blob_to_tempfile(
                     blob_name=output_file.blob_name,
@@ -1801,11 +2157,18 @@ class RunsService:
         *,
         run_id: UUID,
         cursor: int = 0,
+        events_hub: RunEventsHub | None = None,
     ) -> AsyncIterator[dict[str, str]]:
-        """Tail run NDJSON logs from blob storage and yield SSE event messages."""
+        """Tail run NDJSON logs from blob storage and yield SSE event messages.
+
+        With an ``events_hub`` the stream sleeps until the worker announces new
+        log bytes or a status change, and only then reads the blob. Without one
+        it falls back to polling storage and the database.
+        """
 
         snapshot = self._run_stream_snapshot(run_id=run_id)
         blob_name = self._run_log_blob_name(workspace_id=snapshot["workspace_id"], run_id=run_id)
+        status: RunStatus = snapshot["status"]
         offset = max(0, int(cursor))
         buffer = b""
         last_keepalive_at = time.monotonic()
@@ -1815,98 +2178,158 @@ class RunsService:
             RunStatus.FAILED,
             RunStatus.CANCELLED,
         }
+        events: asyncio.Queue[dict[str, Any]] | None = None
+        unsubscribe = None
+        if events_hub is not None:
+            events, unsubscribe = events_hub.subscribe(str(run_id))
+
+        def _end(reason: str) -> dict[str, str]:
+            return sse_text(
+                "end",
+                json.dumps(
+                    {
+                        "runId": str(run_id),
+                        "status": status.value,
+                        "cursor": offset,
+                        "reason": reason,
+                    },
+                    separators=(",", ":"),
+                ),
+                event_id=offset,
+            )
 
-        yield sse_text(
-            "ready",
-            json.dumps(
-                {
-                    "runId": str(run_id),
-                    "status": snapshot["status"].value,
-                    "cursor": offset,
-                },
-                separators=(",", ":"),
-            ),
-            event_id=offset,
-        )
+        try:
+            yield sse_text(
+                "ready",
+                json.dumps(
+                    {
+                        "runId": str(run_id),
+                        "status": status.value,
+                        "cursor": offset,
+                    },
+                    separators=(",", ":"),
+                ),
+                event_id=offset,
+            )
 
-        while True:
-            saw_bytes = False
-            try:
-                stream = self._blob_storage.stream_range(
-                    blob_name,
-                    start_offset=offset,
-                    chunk_size=self._settings.blob_download_chunk_size_bytes,
+            should_read = True
+            while True:
+                saw_bytes = False
+                if should_read:
+                    try:
+                        stream = self._blob_storage.stream_range(
+                            blob_name,
+                            start_offset=offset,
+                            chunk_size=self._settings.blob_download_chunk_size_bytes,
+                        )
+                        for chunk in stream:
+                            if not chunk:
+                                continue
+                            saw_bytes = True
+                            buffer += chunk
+                            lines = buffer.splitlines(keepends=True)
+                            buffer = b""
+                            for line in lines:
+                                if not line.endswith(b"\n"):
+                                    buffer = line
+                                    break
+                                offset += len(line)
+                                raw = line.decode("utf-8", errors="replace").rstrip("\r\n")
+                                event_name = self._extract_event_name(raw)
+                                if not event_name:
+                                    continue
+                                yield sse_text("message", raw, event_id=offset)
+                                if event_name == "run.complete":
+                                    status = self._run_stream_snapshot(run_id=run_id)["status"]
+                                    yield _end("run_complete")
+                                    return
+                    except FileNotFoundError:
+                        # A stream client may connect before the worker writes the first log chunk.
+                        pass
+
+                now = time.monotonic()
+                if now - last_keepalive_at >= _RUN_EVENTS_STREAM_KEEPALIVE_SECONDS:
+                    yield sse_text("keepalive", "{}")
+                    last_keepalive_at = now
+
+                if events is None:
+                    status = self._run_stream_snapshot(run_id=run_id)["status"]
+                if status in terminal_statuses:
+                    if terminal_observed_at is None:
+                        terminal_observed_at = now
+                    if saw_bytes or buffer:
+                        terminal_observed_at = now
+                    grace_elapsed = (
+                        now - terminal_observed_at >= _RUN_EVENTS_STREAM_TERMINAL_EOF_GRACE_SECONDS
+                    )
+                    if grace_elapsed and not saw_bytes and not buffer:
+                        yield _end("terminal_status")
+                        return
+                else:
+                    terminal_observed_at = None
+
+                if events is None or status in terminal_statuses:
+                    # Poll until EOF once the run is terminal: the final log ship
+                    # may land just after the status flips.
+                    await asyncio.sleep(_RUN_EVENTS_STREAM_POLL_SECONDS)
+                    should_read = True
+                    continue
+
+                timeout = min(
+                    _RUN_EVENTS_STREAM_FALLBACK_POLL_SECONDS,
+                    max(0.0, _RUN_EVENTS_STREAM_KEEPALIVE_SECONDS - (now - last_keepalive_at)),
                 )
-                for chunk in stream:
-                    if not chunk:
-                        continue
-                    saw_bytes = True
-                    buffer += chunk
-                    lines = buffer.splitlines(keepends=True)
-                    buffer = b""
-                    for line in lines:
-                        if not line.endswith(b"\n"):
-                            buffer = line
-                            break
-                        offset += len(line)
-                        raw = line.decode("utf-8", errors="replace").rstrip("\r\n")
-                        event_name = self._extract_event_name(raw)
-                        if not event_name:
-                            continue
-                        yield sse_text("message", raw, event_id=offset)
-                        if event_name == "run.complete":
-                            snapshot = self._run_stream_snapshot(run_id=run_id)
-                            yield sse_text(
-                                "end",
-                                json.dumps(
-                                    {
-                                        "runId": str(run_id),
-                                        "status": snapshot["status"].value,
-                                        "cursor": offset,
-                                        "reason": "run_complete",
-                                    },
-                                    separators=(",", ":"),
-                                ),
-                                event_id=offset,
-                            )
-                            return
-            except FileNotFoundError:
-                # A stream client may connect before the worker writes the first log chunk.
-                pass
-
-            now = time.monotonic()
-            if now - last_keepalive_at >= _RUN_EVENTS_STREAM_KEEPALIVE_SECONDS:
-                yield sse_text("keepalive", "{}")
-                last_keepalive_at = now
-
-            snapshot = self._run_stream_snapshot(run_id=run_id)
-            if snapshot["status"] in terminal_statuses:
-                if terminal_observed_at is None:
-                    terminal_observed_at = now
-                if saw_bytes or buffer:
-                    terminal_observed_at = now
-                grace_elapsed = (
-                    now - terminal_observed_at >= _RUN_EVENTS_STREAM_TERMINAL_EOF_GRACE_SECONDS
+                should_read, status = await self._wait_for_run_event(
+                    events,
+                    run_id=run_id,
+                    offset=offset + len(buffer),
+                    status=status,
+                    timeout=timeout,
                 )
-                if grace_elapsed and not saw_bytes and not buffer:
-                    yield sse_text(
-                        "end",
-                        json.dumps(
-                            {
-                                "runId": str(run_id),
-                                "status": snapshot["status"].value,
-                                "cursor": offset,
-                                "reason": "terminal_status",
-                            },
-                            separators=(",", ":"),
-                        ),
-                        event_id=offset,
-                    )
-                    return
-            else:
-                terminal_observed_at = None
+        finally:
+            if unsubscribe is not None:
+                unsubscribe()
+
+    async def _wait_for_run_event(
+        self,
+        events: asyncio.Queue[dict[str, Any]],
+        *,
+        run_id: UUID,
+        offset: int,
+        status: RunStatus,
+        timeout: float,
+    ) -> tuple[bool, RunStatus]:
+        """Wait for hub notifications; return ``(should_read, status)``."""
 
-            await asyncio.sleep(_RUN_EVENTS_STREAM_POLL_SECONDS)
+        try:
+            first = await asyncio.wait_for(events.get(), timeout=max(0.01, timeout))
+        except TimeoutError:
+            # Safety net for notifications dropped during a LISTEN reconnect.
+            return True, self._run_stream_snapshot(run_id=run_id)["status"]
+
+        payloads = [first]
+        while True:
+            try:
+                payloads.append(events.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        should_read = False
+        for payload in payloads:
+            kind = payload.get("kind")
+            if kind == RUN_EVENT_KIND_LOG:
+                if int(payload.get("offset") or 0) > offset:
+                    should_read = True
+            elif kind == RUN_EVENT_KIND_STATUS:
+                try:
+                    status = RunStatus(str(payload.get("status")))
+                except ValueError:
+                    status = self._run_stream_snapshot(run_id=run_id)["status"]
+                should_read = True
+            else:
+                status = self._run_stream_snapshot(run_id=run_id)["status"]
+                should_read = True
+        return should_read, status
 
     def _run_stream_snapshot(
         self,
@@ -5,9 +5,10 @@ from __future__ import annotations
 from typing import Any
 
 from sqlalchemy import String, case, cast, func
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql.elements import ColumnElement
 
-from ade_api.common.search import SearchField, SearchRegistry, build_like_predicate
+from ade_api.common.search import SearchField, SearchIndex, SearchRegistry, build_like_predicate
 from ade_db.models import (
     ApiKey,
     AssignmentScopeType,
@@ -27,15 +28,18 @@ from ade_db.models import (
 )
 
 
-def _field(field_id: str, column: ColumnElement[Any]) -> SearchField:
+_Column = ColumnElement[Any] | InstrumentedAttribute[Any]
+
+
+def _field(field_id: str, column: _Column) -> SearchField:
     return SearchField(field_id, build_like_predicate(column))
 
 
-def _field_cast(field_id: str, column: ColumnElement[Any]) -> SearchField:
+def _field_cast(field_id: str, column: _Column) -> SearchField:
     return SearchField(field_id, build_like_predicate(cast(column, String)))
 
 
-def _has_field(field_id: str, relationship: Any, column: ColumnElement[Any]) -> SearchField:
+def _has_field(field_id: str, relationship: Any, column: _Column) -> SearchField:
     predicate = build_like_predicate(column)
 
     def _builder(token: str) -> ColumnElement[Any]:
@@ -44,7 +48,7 @@ def _has_field(field_id: str, relationship: Any, column: ColumnElement[Any]) ->
     return SearchField(field_id, _builder)
 
 
-def _any_field(field_id: str, relationship: Any, column: ColumnElement[Any]) -> SearchField:
+def _any_field(field_id: str, relationship: Any, column: _Column) -> SearchField:
     predicate = build_like_predicate(column)
 
     def _builder(token: str) -> ColumnElement[Any]:
@@ -83,67 +87,72 @@ _PRINCIPAL_ASSIGNMENT_SCOPE_TYPE = case(
 )
 
 
-SEARCH_REGISTRY = SearchRegistry({
-    "documents": [
-        _field("name", File.name),
-        _has_field("uploaderName", File.uploaded_by_user, User.display_name),
-        _has_field("uploaderEmail", File.uploaded_by_user, User.email),
-        _any_field("tags", File.tags, FileTag.tag),
-    ],
-    "runs": [
-        _field_cast("id", Run.id),
-        _field_cast("status", Run.status),
-        _field_cast("configurationId", Run.configuration_id),
-        _field("inputFilename", FileVersion.filename_at_upload),
-    ],
-    "configurations": [
-        _field("displayName", Configuration.display_name),
-        _field_cast("status", Configuration.status),
-    ],
-    "users": [
-        _field("email", User.email),
-        _field("displayName", User.display_name),
-    ],
-    "apikeys": [
-        _field("name", ApiKey.name),
-        _field("prefix", ApiKey.prefix),
-    ],
-    "workspaces": [
-        _field("name", Workspace.name),
-        _field("slug", Workspace.slug),
-    ],
-    "members": [
-        _field_cast("userId", UserRoleAssignment.user_id),
-        _has_field("roleSlugs", UserRoleAssignment.role, Role.slug),
-    ],
-    "permissions": [
-        _field("key", Permission.key),
-        _field("resource", Permission.resource),
-        _field("action", Permission.action),
-        _field("label", Permission.label),
-    ],
-    "roles": [
-        _field("name", Role.name),
-        _field("slug", Role.slug),
-        _field("description", Role.description),
-    ],
-    "roleassignments": [
-        _field_cast("userId", UserRoleAssignment.user_id),
-        _has_field("roleSlug", UserRoleAssignment.role, Role.slug),
-        _field("scopeType", _ASSIGNMENT_SCOPE_TYPE),
-        _field_cast("scopeId", UserRoleAssignment.workspace_id),
-    ],
-    "principalroleassignments": [
-        _field_cast("principalType", RoleAssignment.principal_type),
-        _field_cast("principalId", RoleAssignment.principal_id),
-        _field("principalDisplayName", _PRINCIPAL_ASSIGNMENT_DISPLAY_NAME),
-        _field("principalEmail", _PRINCIPAL_ASSIGNMENT_EMAIL),
-        _field("principalSlug", _PRINCIPAL_ASSIGNMENT_SLUG),
-        _field_cast("roleId", RoleAssignment.role_id),
-        _field("roleSlug", Role.slug),
-        _field("scopeType", _PRINCIPAL_ASSIGNMENT_SCOPE_TYPE),
-        _field_cast("scopeId", RoleAssignment.scope_id),
-    ],
-})
+SEARCH_REGISTRY = SearchRegistry(
+    {
+        "documents": [
+            _field("name", File.name),
+            _has_field("uploaderName", File.uploaded_by_user, User.display_name),
+            _has_field("uploaderEmail", File.uploaded_by_user, User.email),
+            _has_field("assigneeName", File.assignee_user, User.display_name),
+            _has_field("assigneeEmail", File.assignee_user, User.email),
+            _any_field("tags", File.tags, FileTag.tag),
+        ],
+        "runs": [
+            _field_cast("id", Run.id),
+            _field_cast("status", Run.status),
+            _field_cast("configurationId", Run.configuration_id),
+            _field("inputFilename", FileVersion.filename_at_upload),
+        ],
+        "configurations": [
+            _field("displayName", Configuration.display_name),
+            _field_cast("status", Configuration.status),
+        ],
+        "users": [
+            _field("email", User.email),
+            _field("displayName", User.display_name),
+        ],
+        "apikeys": [
+            _field("name", ApiKey.name),
+            _field("prefix", ApiKey.prefix),
+        ],
+        "workspaces": [
+            _field("name", Workspace.name),
+            _field("slug", Workspace.slug),
+        ],
+        "members": [
+            _field_cast("userId", UserRoleAssignment.user_id),
+            _has_field("roleSlugs", UserRoleAssignment.role, Role.slug),
+        ],
+        "permissions": [
+            _field("key", Permission.key),
+            _field("resource", Permission.resource),
+            _field("action", Permission.action),
+            _field("label", Permission.label),
+        ],
+        "roles": [
+            _field("name", Role.name),
+            _field("slug", Role.slug),
+            _field("description", Role.description),
+        ],
+        "roleassignments": [
+            _field_cast("userId", UserRoleAssignment.user_id),
+            _has_field("roleSlug", UserRoleAssignment.role, Role.slug),
+            _field("scopeType", _ASSIGNMENT_SCOPE_TYPE),
+            _field_cast("scopeId", UserRoleAssignment.workspace_id),
+        ],
+        "principalroleassignments": [
+            _field_cast("principalType", RoleAssignment.principal_type),
+            _field_cast("principalId", RoleAssignment.principal_id),
+            _field("principalDisplayName", _PRINCIPAL_ASSIGNMENT_DISPLAY_NAME),
+            _field("principalEmail", _PRINCIPAL_ASSIGNMENT_EMAIL),
+            _field("principalSlug", _PRINCIPAL_ASSIGNMENT_SLUG),
+            _field_cast("roleId", RoleAssignment.role_id),
+            _field("roleSlug", Role.slug),
+            _field("scopeType", _PRINCIPAL_ASSIGNMENT_SCOPE_TYPE),
+            _field_cast("scopeId", RoleAssignment.scope_id),
+        ],
+    },
+    indexes={"documents": SearchIndex(File.search_text)},
+)
 
 __all__ = ["SEARCH_REGISTRY"]
@@ -0,0 +1,166 @@
+"""CLI to populate ``file_versions.workbook_metadata`` for existing workbooks."""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from ade_api.common.workbook_metadata import (
+    WorkbookMetadataError,
+    extract_workbook_metadata,
+)
+from ade_db.engine import build_engine, session_scope
+from ade_db.models import File, FileVersion
+from ade_storage import StorageAdapter
+from ade_storage.factory import build_storage_adapter
+
+from ..settings import Settings
+
+DEFAULT_BATCH_SIZE = 200
+
+
+def _pending_batch(
+    session: Session,
+    *,
+    after: UUID | None,
+    limit: int,
+    refresh: bool = False,
+) -> list[tuple[UUID, str, str | None]]:
+    stmt = (
+        select(FileVersion.id, File.blob_name, FileVersion.storage_version_id)
+        .join(File, File.id == FileVersion.file_id)
+        .where(FileVersion.filename_at_upload.ilike("%.xlsx"))
+        .order_by(FileVersion.id)
+        .limit(limit)
+    )
+    if not refresh:
+        stmt = stmt.where(FileVersion.workbook_metadata.is_(None))
+    if after is not None:
+        stmt = stmt.where(FileVersion.id > after)
+    return [(row[0], row[1], row[2]) for row in session.execute(stmt)]
+
+
+def _extract_from_blob(
+    storage: StorageAdapter,
+    *,
+    blob_name: str,
+    version_id: str | None,
+    chunk_size: int,
+) -> dict | None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "workbook.xlsx"
+        with path.open("wb") as handle:
+            for chunk in storage.stream(blob_name, version_id=version_id, chunk_size=chunk_size):
+                handle.write(chunk)
+        try:
+            return extract_workbook_metadata(path)
+        except WorkbookMetadataError:
+            return None
+
+
+def backfill(
+    settings: Settings,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    refresh: bool = False,
+) -> tuple[int, int, int]:
+    """Return ``(updated, unreadable, missing)`` counts.
+
+    ``refresh`` re-extracts versions that already have metadata, e.g. to add
+    row indexes to entries captured before they were recorded.
+    """
+
+    engine = build_engine(settings)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    storage = build_storage_adapter(settings)
+    updated = unreadable = missing = 0
+    after: UUID | None = None
+    try:
+        while True:
+            with session_scope(session_factory) as session:
+                batch = _pending_batch(
+                    session,
+                    after=after,
+                    limit=batch_size,
+                    refresh=refresh,
+                )
+            if not batch:
+                break
+            after = batch[-1][0]
+
+            for version_id, blob_name, storage_version_id in batch:
+                try:
+                    metadata = _extract_from_blob(
+                        storage,
+                        blob_name=blob_name,
+                        version_id=storage_version_id,
+                        chunk_size=settings.blob_download_chunk_size_bytes,
+                    )
+                except FileNotFoundError:
+                    missing += 1
+                    print(f"missing: {version_id} ({blob_name})")
+                    continue
+                if metadata is None:
+                    unreadable += 1
+                    print(f"unreadable: {version_id} ({blob_name})")
+                    continue
+                updated += 1
+                if dry_run:
+                    continue
+                with session_scope(session_factory) as session:
+                    session.execute(
+                        update(FileVersion)
+                        .where(FileVersion.id == version_id)
+                        .values(workbook_metadata=metadata)
+                    )
+            print(f"processed {updated + unreadable + missing} version(s)")
+    finally:
+        engine.dispose()
+    return updated, unreadable, missing
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Extract and store sheet metadata for workbook file versions that lack it.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"File versions fetched per query (default: {DEFAULT_BATCH_SIZE}).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Download and inspect workbooks without writing metadata.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Also re-extract versions that already have metadata (adds row indexes).",
+    )
+    args = parser.parse_args(argv)
+
+    settings = Settings()
+    if not settings.database_url:
+        raise RuntimeError("Database settings are required (set ADE_DATABASE_URL).")
+
+    updated, unreadable, missing = backfill(
+        settings,
+        batch_size=max(1, args.batch_size),
+        dry_run=args.dry_run,
+        refresh=args.refresh,
+    )
+    verb = "would update" if args.dry_run else "updated"
+    print(f"{verb} {updated}, unreadable {unreadable}, missing {missing}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
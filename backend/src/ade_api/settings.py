@@ -34,6 +34,9 @@ MIN_SEARCH_LEN = 2
 MAX_SEARCH_LEN = 128
 MAX_SET_SIZE = 50  # cap for *_in lists
 COUNT_STATEMENT_TIMEOUT_MS: int | None = None  # optional (Postgres), e.g., 500
+COUNT_ESTIMATE_THRESHOLD = 100_000  # planner estimate above which totals are estimated
+COUNT_CACHE_TTL_SECONDS = 300.0
+COUNT_CACHE_MAX_ENTRIES = 1024
 
 REMOVED_AUTH_ENV_VARS = (
     "ADE_AUTH_EXTERNAL_ENABLED",
@@ -137,6 +140,14 @@ class Settings(
     # Runs
     preview_timeout_seconds: float = Field(10, gt=0)
 
+    # Preview cache
+    preview_cache_max_bytes: int = Field(256 * 1024 * 1024, ge=0)
+    preview_cache_shared_enabled: bool = False
+
+    # Document list cache
+    documents_list_cache_max_entries: int = Field(0, ge=0)
+    documents_list_cache_ttl_seconds: float = Field(30, gt=0)
+
     # ---- Validators ----
 
     @field_validator("server_cors_origins", mode="before")
@@ -241,6 +252,10 @@ class Settings(
     def runs_dir(self) -> Path:
         return self.workspaces_dir
 
+    @property
+    def preview_cache_dir(self) -> Path:
+        return self.data_dir / "cache" / "previews"
+
     @property
     def effective_request_log_level(self) -> str:
         return self.request_log_level or self.effective_api_log_level
@@ -181,6 +181,26 @@ def run_routes() -> None:
     run([sys.executable, "-m", "ade_api.scripts.api_routes"], cwd=REPO_ROOT)
 
 
+def run_backfill_workbook_metadata(
+    *,
+    batch_size: int,
+    dry_run: bool,
+    refresh: bool = False,
+) -> None:
+    cmd = [
+        sys.executable,
+        "-m",
+        "ade_api.scripts.backfill_workbook_metadata",
+        "--batch-size",
+        str(batch_size),
+    ]
+    if dry_run:
+        cmd.append("--dry-run")
+    if refresh:
+        cmd.append("--refresh")
+    run(cmd, cwd=REPO_ROOT)
+
+
 def run_types() -> None:
     """Generate OpenAPI JSON and TypeScript types for frontend."""
 
@@ -306,9 +326,43 @@ def routes() -> None:
     run_routes()
 
 
+@app.command(
+    name="backfill-workbook-metadata",
+    help="Store sheet metadata for existing workbook file versions.",
+)
+def backfill_workbook_metadata(
+    batch_size: int = typer.Option(
+        200,
+        "--batch-size",
+        help="File versions fetched per query.",
+        min=1,
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Inspect workbooks without writing metadata.",
+    ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Also re-extract versions that already have metadata (adds row indexes).",
+    ),
+) -> None:
+    run_backfill_workbook_metadata(batch_size=batch_size, dry_run=dry_run, refresh=refresh)
+
+
 @app.command(name="types", help=run_types.__doc__)
 def types_() -> None:
     run_types()
 
 
-__all__ = ["app", "run_dev", "run_start", "run_tests", "run_lint", "run_routes", "run_types"]
+__all__ = [
+    "app",
+    "run_backfill_workbook_metadata",
+    "run_dev",
+    "run_start",
+    "run_tests",
+    "run_lint",
+    "run_routes",
+    "run_types",
+]
@@ -0,0 +1,47 @@
+"""Notify run status changes on the ade_run_events channel.
+
+Revision ID: 0008_run_events_notify
+Revises: 0007_user_notifications
+Create Date: 2026-10-16 09:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision = "0008_run_events_notify"
+down_revision = "0007_user_notifications"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION fn_runs_notify_events()
+        RETURNS trigger AS $$
+        BEGIN
+            IF NEW.status IS DISTINCT FROM OLD.status THEN
+                PERFORM pg_notify(
+                    'ade_run_events',
+                    json_build_object(
+                        'runId', NEW.id,
+                        'kind', 'status',
+                        'status', NEW.status::text
+                    )::text
+                );
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        CREATE TRIGGER trg_runs_notify_events
+        AFTER UPDATE OF status ON runs
+        FOR EACH ROW
+        EXECUTE FUNCTION fn_runs_notify_events();
+        """
+    )
+
+
+def downgrade() -> None:  # pragma: no cover
+    raise NotImplementedError("Downgrades are not supported.")
@@ -0,0 +1,29 @@
+"""Add workbook_metadata to file_versions.
+
+Revision ID: 0009_workbook_metadata
+Revises: 0008_run_events_notify
+Create Date: 2026-10-16 10:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# Revision identifiers, used by Alembic.
+revision = "0009_workbook_metadata"
+down_revision = "0008_run_events_notify"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "file_versions",
+        sa.Column("workbook_metadata", postgresql.JSONB(), nullable=True),
+    )
+
+
+def downgrade() -> None:  # pragma: no cover
+    raise NotImplementedError("Downgrades are not supported.")
@@ -0,0 +1,44 @@
+"""Add run priority and fair-share claim indexes.
+
+Revision ID: 0010_run_priority
+Revises: 0009_workbook_metadata
+Create Date: 2026-10-16 12:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision = "0010_run_priority"
+down_revision = "0009_workbook_metadata"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "runs",
+        sa.Column("priority", sa.SmallInteger(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        "UPDATE runs SET priority = 100 "
+        "WHERE status = 'queued' AND operation IN ('validate', 'publish')"
+    )
+    op.create_index(
+        "ix_runs_queued_workspace",
+        "runs",
+        ["workspace_id", sa.text("priority DESC"), "available_at", "created_at"],
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+    op.create_index(
+        "ix_runs_running_workspace",
+        "runs",
+        ["workspace_id"],
+        postgresql_where=sa.text("status = 'running'"),
+    )
+
+
+def downgrade() -> None:  # pragma: no cover
+    raise NotImplementedError("Downgrades are not supported.")
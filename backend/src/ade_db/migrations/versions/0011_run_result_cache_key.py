@@ -0,0 +1,31 @@
+"""Add the run result cache key.
+
+Revision ID: 0011_run_result_cache_key
+Revises: 0010_run_priority
+Create Date: 2026-10-16 15:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision = "0011_run_result_cache_key"
+down_revision = "0010_run_priority"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("runs", sa.Column("result_cache_key", sa.String(length=64), nullable=True))
+    op.create_index(
+        "ix_runs_result_cache",
+        "runs",
+        ["workspace_id", "result_cache_key", "completed_at"],
+        postgresql_where=sa.text("status = 'succeeded' AND result_cache_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:  # pragma: no cover
+    raise NotImplementedError("Downgrades are not supported.")
@@ -0,0 +1,40 @@
+"""Notify workers when a running run is cancelled.
+
+Revision ID: 0012_run_cancel_notify
+Revises: 0011_run_result_cache_key
+Create Date: 2026-10-16 18:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision = "0012_run_cancel_notify"
+down_revision = "0011_run_result_cache_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION fn_runs_notify_cancelled()
+        RETURNS trigger AS $$
+        BEGIN
+            IF NEW.status = 'cancelled' AND OLD.status = 'running' THEN
+                PERFORM pg_notify('ade_run_cancelled', NEW.id::text);
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        CREATE TRIGGER trg_runs_notify_cancelled
+        AFTER UPDATE OF status ON runs
+        FOR EACH ROW
+        EXECUTE FUNCTION fn_runs_notify_cancelled();
+        """
+    )
+
+
+def downgrade() -> None:  # pragma: no cover
+    raise NotImplementedError("Downgrades are not supported.")
@@ -0,0 +1,232 @@
+"""Denormalize document list summary columns onto files.
+
+Revision ID: 0013_document_summary_columns
+Revises: 0012_run_cancel_notify
+Create Date: 2026-10-16 21:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision = "0013_document_summary_columns"
+down_revision = "0012_run_cancel_notify"
+branch_labels = None
+depends_on = None
+
+
+def _create_functions() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION document_file_type(_name text, _content_type text)
+        RETURNS text AS $$
+            SELECT CASE
+                WHEN lower(_name) LIKE '%.xlsx' THEN 'xlsx'
+                WHEN lower(_name) LIKE '%.xls' THEN 'xls'
+                WHEN lower(_name) LIKE '%.csv' THEN 'csv'
+                WHEN lower(_name) LIKE '%.pdf' THEN 'pdf'
+                WHEN lower(_content_type) LIKE '%spreadsheetml%' THEN 'xlsx'
+                WHEN lower(_content_type) LIKE '%ms-excel%' THEN 'xls'
+                WHEN lower(_content_type) LIKE '%csv%' THEN 'csv'
+                WHEN lower(_content_type) LIKE '%pdf%' THEN 'pdf'
+            END
+        $$ LANGUAGE sql IMMUTABLE;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION refresh_document_last_run(_workspace_id uuid, _file_id uuid)
+        RETURNS void AS $$
+        DECLARE
+            _at timestamptz;
+            _status text;
+        BEGIN
+            SELECT COALESCE(r.completed_at, r.started_at, r.created_at), r.status
+              INTO _at, _status
+              FROM runs AS r
+              INNER JOIN file_versions AS fv ON fv.id = r.input_file_version_id
+             WHERE fv.file_id = _file_id
+               AND r.workspace_id = _workspace_id
+             ORDER BY 1 DESC, r.id DESC
+             LIMIT 1;
+
+            UPDATE files
+               SET last_run_at = _at,
+                   last_run_status = _status
+             WHERE id = _file_id
+               AND (
+                   last_run_at IS DISTINCT FROM _at
+                   OR last_run_status IS DISTINCT FROM _status
+               );
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION trg_files_document_summary()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT'
+               OR NEW.current_version_id IS DISTINCT FROM OLD.current_version_id THEN
+                SELECT byte_size, content_type
+                  INTO NEW.current_byte_size, NEW.current_content_type
+                  FROM file_versions
+                 WHERE id = NEW.current_version_id;
+                IF NOT FOUND THEN
+                    NEW.current_byte_size := NULL;
+                    NEW.current_content_type := NULL;
+                END IF;
+            END IF;
+            NEW.file_type := document_file_type(NEW.name, NEW.current_content_type);
+            NEW.activity_at := GREATEST(NEW.updated_at, NEW.last_run_at);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION trg_runs_document_summary()
+        RETURNS trigger AS $$
+        DECLARE
+            _file_id uuid;
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.input_file_version_id IS NOT NULL THEN
+                SELECT file_id INTO _file_id
+                  FROM file_versions
+                 WHERE id = OLD.input_file_version_id;
+                IF _file_id IS NOT NULL THEN
+                    PERFORM refresh_document_last_run(OLD.workspace_id, _file_id);
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.input_file_version_id IS NOT NULL
+               AND (
+                   TG_OP = 'INSERT'
+                   OR NEW.input_file_version_id IS DISTINCT FROM OLD.input_file_version_id
+                   OR NEW.workspace_id IS DISTINCT FROM OLD.workspace_id
+               ) THEN
+                SELECT file_id INTO _file_id
+                  FROM file_versions
+                 WHERE id = NEW.input_file_version_id;
+                IF _file_id IS NOT NULL THEN
+                    PERFORM refresh_document_last_run(NEW.workspace_id, _file_id);
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def _backfill() -> None:
+    op.execute(
+        """
+        UPDATE files AS f
+           SET current_byte_size = fv.byte_size,
+               current_content_type = fv.content_type
+          FROM file_versions AS fv
+         WHERE fv.id = f.current_version_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE files AS f
+           SET last_run_at = latest.run_at,
+               last_run_status = latest.status
+          FROM (
+              SELECT DISTINCT ON (fv.file_id)
+                     fv.file_id,
+                     COALESCE(r.completed_at, r.started_at, r.created_at) AS run_at,
+                     r.status
+                FROM runs AS r
+                INNER JOIN file_versions AS fv ON fv.id = r.input_file_version_id
+                INNER JOIN files AS rf
+                        ON rf.id = fv.file_id AND rf.workspace_id = r.workspace_id
+               ORDER BY fv.file_id, run_at DESC, r.id DESC
+          ) AS latest
+         WHERE latest.file_id = f.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE files
+           SET file_type = document_file_type(name, current_content_type),
+               activity_at = GREATEST(updated_at, last_run_at)
+        """
+    )
+
+
+def _install_triggers() -> None:
+    op.execute(
+        """
+        CREATE TRIGGER trg_files_document_summary
+        BEFORE INSERT OR UPDATE ON files
+        FOR EACH ROW
+        EXECUTE FUNCTION trg_files_document_summary();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_runs_document_summary_insert
+        AFTER INSERT ON runs
+        FOR EACH ROW
+        EXECUTE FUNCTION trg_runs_document_summary();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_runs_document_summary_update
+        AFTER UPDATE OF status, started_at, completed_at, input_file_version_id, workspace_id
+        ON runs
+        FOR EACH ROW
+        WHEN (
+            NEW.status IS DISTINCT FROM OLD.status
+            OR NEW.started_at IS DISTINCT FROM OLD.started_at
+            OR NEW.completed_at IS DISTINCT FROM OLD.completed_at
+            OR NEW.input_file_version_id IS DISTINCT FROM OLD.input_file_version_id
+            OR NEW.workspace_id IS DISTINCT FROM OLD.workspace_id
+        )
+        EXECUTE FUNCTION trg_runs_document_summary();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_runs_document_summary_delete
+        AFTER DELETE ON runs
+        FOR EACH ROW
+        EXECUTE FUNCTION trg_runs_document_summary();
+        """
+    )
+
+
+def upgrade() -> None:
+    op.add_column("files", sa.Column("last_run_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("files", sa.Column("last_run_status", sa.String(length=20), nullable=True))
+    op.add_column("files", sa.Column("activity_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("files", sa.Column("current_byte_size", sa.Integer(), nullable=True))
+    op.add_column("files", sa.Column("current_content_type", sa.String(length=255), nullable=True))
+    op.add_column("files", sa.Column("file_type", sa.String(length=10), nullable=True))
+
+    _create_functions()
+    _backfill()
+    op.alter_column("files", "activity_at", nullable=False)
+    _install_triggers()
+
+    for column in ("last_run_at", "activity_at", "current_byte_size", "file_type"):
+        op.create_index(f"ix_files_workspace_{column}", "files", ["workspace_id", column, "id"])
+    op.create_index(
+        "ix_files_workspace_last_run_status",
+        "files",
+        ["workspace_id", "last_run_status", "id"],
+    )
+
+
+def downgrade() -> None:  # pragma: no cover
+    raise NotImplementedError("Downgrades are not supported.")
@@ -0,0 +1,164 @@
+"""Add a trigram-indexed search document to files.
+
+Revision ID: 0014_document_search
+Revises: 0013_document_summary_columns
+Create Date: 2026-10-16 22:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision = "0014_document_search"
+down_revision = "0013_document_summary_columns"
+branch_labels = None
+depends_on = None
+
+
+def _create_functions() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION document_search_text(
+            _file_id uuid,
+            _name text,
+            _uploaded_by_user_id uuid,
+            _assignee_user_id uuid
+        )
+        RETURNS text AS $$
+            SELECT lower(concat_ws(
+                E'\\n',
+                _name,
+                (
+                    SELECT string_agg(tag, E'\\n' ORDER BY tag)
+                      FROM file_tags
+                     WHERE file_id = _file_id
+                ),
+                (
+                    SELECT concat_ws(E'\\n', display_name, email)
+                      FROM users
+                     WHERE id = _uploaded_by_user_id
+                ),
+                (
+                    SELECT concat_ws(E'\\n', display_name, email)
+                      FROM users
+                     WHERE id = _assignee_user_id
+                )
+            ))
+        $$ LANGUAGE sql STABLE;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION trg_files_document_search()
+        RETURNS trigger AS $$
+        BEGIN
+            NEW.search_text := document_search_text(
+                NEW.id,
+                NEW.name,
+                NEW.uploaded_by_user_id,
+                NEW.assignee_user_id
+            );
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION trg_file_tags_document_search()
+        RETURNS trigger AS $$
+        DECLARE
+            _file_id uuid;
+        BEGIN
+            _file_id := CASE WHEN TG_OP = 'DELETE' THEN OLD.file_id ELSE NEW.file_id END;
+            UPDATE files
+               SET search_text = document_search_text(
+                       id,
+                       name,
+                       uploaded_by_user_id,
+                       assignee_user_id
+                   )
+             WHERE id = _file_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION trg_users_document_search()
+        RETURNS trigger AS $$
+        BEGIN
+            UPDATE files
+               SET search_text = document_search_text(
+                       id,
+                       name,
+                       uploaded_by_user_id,
+                       assignee_user_id
+                   )
+             WHERE uploaded_by_user_id = NEW.id
+                OR assignee_user_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def _install_triggers() -> None:
+    op.execute(
+        """
+        CREATE TRIGGER trg_files_document_search
+        BEFORE INSERT OR UPDATE OF name, uploaded_by_user_id, assignee_user_id ON files
+        FOR EACH ROW
+        EXECUTE FUNCTION trg_files_document_search();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_file_tags_document_search
+        AFTER INSERT OR DELETE ON file_tags
+        FOR EACH ROW
+        EXECUTE FUNCTION trg_file_tags_document_search();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_users_document_search
+        AFTER UPDATE OF display_name, email ON users
+        FOR EACH ROW
+        WHEN (
+            NEW.display_name IS DISTINCT FROM OLD.display_name
+            OR NEW.email IS DISTINCT FROM OLD.email
+        )
+        EXECUTE FUNCTION trg_users_document_search();
+        """
+    )
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "files",
+        sa.Column("search_text", sa.Text(), nullable=False, server_default=""),
+    )
+    _create_functions()
+    op.execute(
+        "UPDATE files SET search_text = "
+        "document_search_text(id, name, uploaded_by_user_id, assignee_user_id)"
+    )
+    _install_triggers()
+    op.execute(
+        "CREATE INDEX ix_files_search_text_trgm ON files USING gin (search_text gin_trgm_ops)"
+    )
+    op.create_index("ix_files_uploaded_by_user_id", "files", ["uploaded_by_user_id"])
+    op.create_index("ix_files_assignee_user_id", "files", ["assignee_user_id"])
+
+
+def downgrade() -> None:  # pragma: no cover
+    raise NotImplementedError("Downgrades are not supported.")
@@ -0,0 +1,205 @@
+"""Maintain per-workspace document facet counters.
+
+File triggers append signed deltas to ``document_facet_count_deltas`` instead
+of updating shared bucket rows, so concurrent document and run writes in one
+workspace never wait on (or deadlock over) the same counter row. Readers add
+pending deltas to ``document_facet_counts``; ``compact_document_facet_counts``
+folds them in from the worker's maintenance loop.
+
+Revision ID: 0015_document_facet_counts
+Revises: 0014_document_search
+Create Date: 2026-10-16 23:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision = "0015_document_facet_counts"
+down_revision = "0014_document_search"
+branch_labels = None
+depends_on = None
+
+
+def _create_table() -> None:
+    op.execute(
+        """
+        CREATE TABLE document_facet_counts (
+            workspace_id uuid NOT NULL,
+            lifecycle varchar(10) NOT NULL CHECK (lifecycle IN ('active', 'archived')),
+            file_type varchar(10) NOT NULL,
+            last_run_status varchar(20),
+            document_count bigint NOT NULL DEFAULT 0,
+            CONSTRAINT uq_document_facet_counts_bucket
+                UNIQUE NULLS NOT DISTINCT (workspace_id, lifecycle, file_type, last_run_status)
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE document_facet_count_deltas (
+            workspace_id uuid NOT NULL,
+            lifecycle varchar(10) NOT NULL CHECK (lifecycle IN ('active', 'archived')),
+            file_type varchar(10) NOT NULL,
+            last_run_status varchar(20),
+            delta integer NOT NULL
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_document_facet_count_deltas_workspace
+            ON document_facet_count_deltas (workspace_id, lifecycle);
+        """
+    )
+
+
+def _create_functions() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION bump_document_facet_count(
+            _workspace_id uuid,
+            _deleted_at timestamptz,
+            _file_type text,
+            _last_run_status text,
+            _delta integer
+        )
+        RETURNS void AS $$
+            INSERT INTO document_facet_count_deltas (
+                workspace_id, lifecycle, file_type, last_run_status, delta
+            )
+            VALUES (
+                _workspace_id,
+                CASE WHEN _deleted_at IS NULL THEN 'active' ELSE 'archived' END,
+                COALESCE(_file_type, 'unknown'),
+                _last_run_status,
+                _delta
+            )
+        $$ LANGUAGE sql;
+        """
+    )
+
+    # One compactor at a time; the DELETE only takes deltas visible to its
+    # snapshot, so rows appended meanwhile wait for the next pass.
+    op.execute(
+        """
+        CREATE FUNCTION compact_document_facet_counts()
+        RETURNS bigint AS $$
+        DECLARE
+            folded bigint := 0;
+        BEGIN
+            IF NOT pg_try_advisory_xact_lock(hashtext('document_facet_counts')) THEN
+                RETURN 0;
+            END IF;
+            WITH moved AS (
+                DELETE FROM document_facet_count_deltas
+                RETURNING workspace_id, lifecycle, file_type, last_run_status, delta
+            ),
+            summed AS (
+                SELECT workspace_id, lifecycle, file_type, last_run_status,
+                       sum(delta) AS delta, count(*) AS delta_rows
+                  FROM moved
+                 GROUP BY 1, 2, 3, 4
+            ),
+            applied AS (
+                INSERT INTO document_facet_counts AS c (
+                    workspace_id, lifecycle, file_type, last_run_status, document_count
+                )
+                SELECT workspace_id, lifecycle, file_type, last_run_status, delta
+                  FROM summed
+                ON CONFLICT (workspace_id, lifecycle, file_type, last_run_status)
+                DO UPDATE SET document_count = c.document_count + EXCLUDED.document_count
+            )
+            SELECT COALESCE(sum(delta_rows), 0) INTO folded FROM summed;
+            RETURN folded;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION trg_files_document_facets()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.kind = 'input' THEN
+                PERFORM bump_document_facet_count(
+                    OLD.workspace_id,
+                    OLD.deleted_at,
+                    OLD.file_type,
+                    OLD.last_run_status,
+                    -1
+                );
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.kind = 'input' THEN
+                PERFORM bump_document_facet_count(
+                    NEW.workspace_id,
+                    NEW.deleted_at,
+                    NEW.file_type,
+                    NEW.last_run_status,
+                    1
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def _install_triggers() -> None:
+    op.execute(
+        """
+        CREATE TRIGGER trg_files_document_facets_insert_delete
+        AFTER INSERT OR DELETE ON files
+        FOR EACH ROW
+        EXECUTE FUNCTION trg_files_document_facets();
+        """
+    )
+    # No column list: file_type and last_run_status are set by BEFORE triggers
+    # and by refresh_document_last_run, which UPDATE OF would not see.
+    op.execute(
+        """
+        CREATE TRIGGER trg_files_document_facets_update
+        AFTER UPDATE ON files
+        FOR EACH ROW
+        WHEN (
+            (OLD.kind, OLD.workspace_id, OLD.deleted_at IS NULL, OLD.file_type, OLD.last_run_status)
+            IS DISTINCT FROM
+            (NEW.kind, NEW.workspace_id, NEW.deleted_at IS NULL, NEW.file_type, NEW.last_run_status)
+        )
+        EXECUTE FUNCTION trg_files_document_facets();
+        """
+    )
+
+
+def _backfill() -> None:
+    op.execute(
+        """
+        INSERT INTO document_facet_counts (
+            workspace_id, lifecycle, file_type, last_run_status, document_count
+        )
+        SELECT workspace_id,
+               CASE WHEN deleted_at IS NULL THEN 'active' ELSE 'archived' END,
+               COALESCE(file_type, 'unknown'),
+               last_run_status,
+               count(*)
+          FROM files
+         WHERE kind = 'input'
+         GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def upgrade() -> None:
+    _create_table()
+    _create_functions()
+    # Triggers go in before the backfill; CREATE TRIGGER blocks writes to
+    # files until this transaction commits, so no change is counted twice.
+    _install_triggers()
+    _backfill()
+
+
+def downgrade() -> None:  # pragma: no cover
+    raise NotImplementedError("Downgrades are not supported.")
@@ -0,0 +1,57 @@
+"""Record document changes when an uploader or assignee is renamed.
+
+List rows embed the uploader and assignee (display name and email), and ``q``
+matches them, but a rename only rewrote ``files.search_text``, which the
+change-feed trigger ignores. The users trigger now records an ``upsert`` for
+every input document that references the user, so list ETags, cached pages
+and change-feed clients see the new name.
+
+Revision ID: 0016_user_rename_doc_changes
+Revises: 0015_document_facet_counts
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision = "0016_user_rename_doc_changes"
+down_revision = "0015_document_facet_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION trg_users_document_search()
+        RETURNS trigger AS $$
+        BEGIN
+            UPDATE files
+               SET search_text = document_search_text(
+                       id,
+                       name,
+                       uploaded_by_user_id,
+                       assignee_user_id
+                   )
+             WHERE uploaded_by_user_id = NEW.id
+                OR assignee_user_id = NEW.id;
+            PERFORM record_document_change(
+                workspace_id,
+                id,
+                'upsert',
+                clock_timestamp()
+            )
+               FROM files
+              WHERE kind = 'input'
+                AND (uploaded_by_user_id = NEW.id OR assignee_user_id = NEW.id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def downgrade() -> None:  # pragma: no cover
+    raise NotImplementedError("Downgrades are not supported.")
@@ -41,7 +41,7 @@ from .file import (
     FileVersionOrigin,
 )
 from .rbac import Permission, Role, RolePermission, ScopeType, UserRoleAssignment
-from .run import Run, RunOperation, RunStatus
+from .run import Run, RunOperation, RunPriority, RunStatus
 from .run_field import RunField
 from .run_metrics import RunMetrics
 from .run_table_column import RunTableColumn
@@ -90,6 +90,7 @@ __all__ = [
     "RunField",
     "RunMetrics",
     "RunOperation",
+    "RunPriority",
     "RunStatus",
     "RunTableColumn",
     "ScimToken",
@@ -11,6 +11,7 @@ from sqlalchemy import (
     Enum as SAEnum,
 )
 from sqlalchemy import (
+    FetchedValue,
     ForeignKey,
     Index,
     Integer,
@@ -137,6 +138,42 @@ class File(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     )
 
     last_run_id: Mapped[UUID | None] = mapped_column(GUID(), nullable=True)
+
+    # List summary columns, maintained by the trg_files_document_summary and
+    # trg_runs_document_summary_* triggers so list sorts and filters read
+    # indexed columns instead of per-row subqueries. Never written by the app.
+    last_run_at: Mapped[datetime | None] = mapped_column(
+        UTCDateTime(), nullable=True, server_default=FetchedValue()
+    )
+    last_run_status: Mapped[str | None] = mapped_column(
+        String(20), nullable=True, server_default=FetchedValue()
+    )
+    activity_at: Mapped[datetime] = mapped_column(
+        UTCDateTime(),
+        nullable=False,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
+    current_byte_size: Mapped[int | None] = mapped_column(
+        Integer, nullable=True, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
+    current_content_type: Mapped[str | None] = mapped_column(
+        String(255), nullable=True, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
+    file_type: Mapped[str | None] = mapped_column(
+        String(10), nullable=True, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
+    # Lower-cased name, tags, uploader and assignee, maintained by the
+    # trg_*_document_search triggers and trigram-indexed for the ``q`` search.
+    # Deferred because list responses never read it.
+    search_text: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        deferred=True,
+    )
+
     deleted_at: Mapped[datetime | None] = mapped_column(UTCDateTime(), nullable=True)
     deleted_by_user_id: Mapped[UUID | None] = mapped_column(
         GUID(), ForeignKey("users.id", ondelete="NO ACTION"), nullable=True
@@ -168,6 +205,19 @@ class File(UUIDPrimaryKeyMixin, TimestampMixin, Base):
         Index("ix_files_workspace_last_run_id", "workspace_id", "last_run_id"),
         Index("ix_files_workspace_uploader", "workspace_id", "uploaded_by_user_id"),
         Index("ix_files_workspace_assignee", "workspace_id", "assignee_user_id"),
+        Index("ix_files_workspace_last_run_at", "workspace_id", "last_run_at", "id"),
+        Index("ix_files_workspace_activity_at", "workspace_id", "activity_at", "id"),
+        Index("ix_files_workspace_current_byte_size", "workspace_id", "current_byte_size", "id"),
+        Index("ix_files_workspace_file_type", "workspace_id", "file_type", "id"),
+        Index("ix_files_workspace_last_run_status", "workspace_id", "last_run_status", "id"),
+        Index(
+            "ix_files_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        Index("ix_files_uploaded_by_user_id", "uploaded_by_user_id"),
+        Index("ix_files_assignee_user_id", "assignee_user_id"),
     )
 
     @property
@@ -257,6 +307,7 @@ class FileVersion(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     content_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
     filename_at_upload: Mapped[str] = mapped_column(String(255), nullable=False)
     storage_version_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    workbook_metadata: Mapped[dict[str, object] | None] = mapped_column(JSONB, nullable=True)
 
     __table_args__ = (
         UniqueConstraint("file_id", "version_no", name="file_versions_file_id_version_no_key"),
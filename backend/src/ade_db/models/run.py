@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy import ForeignKey, Index, Integer, SmallInteger, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column
@@ -38,6 +38,14 @@ class RunOperation(str, Enum):
     PUBLISH = "publish"
 
 
+class RunPriority(IntEnum):
+    """Claim priority for queued runs; workers claim higher values first."""
+
+    BACKFILL = 0
+    INTERACTIVE = 50
+    CONFIGURATION = 100
+
+
 class Run(UUIDPrimaryKeyMixin, Base):
     """Persistent record of an ADE engine execution."""
 
@@ -58,11 +66,18 @@ class Run(UUIDPrimaryKeyMixin, Base):
         GUID(), ForeignKey("file_versions.id", ondelete="NO ACTION"), nullable=True
     )
     deps_digest: Mapped[str] = mapped_column(String(128), nullable=False)
+    result_cache_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
     available_at: Mapped[datetime] = mapped_column(
         UTCDateTime(), nullable=False, default=utc_now
     )
     attempt_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    priority: Mapped[int] = mapped_column(
+        SmallInteger,
+        nullable=False,
+        default=RunPriority.BACKFILL,
+        server_default=text("0"),
+    )
     claimed_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
     claim_expires_at: Mapped[datetime | None] = mapped_column(UTCDateTime(), nullable=True)
     operation: Mapped[RunOperation] = mapped_column(
@@ -109,6 +124,19 @@ class Run(UUIDPrimaryKeyMixin, Base):
         Index("ix_runs_status", "status"),
         Index("ix_runs_input_file_version", "input_file_version_id"),
         Index("ix_runs_claim", "status", "available_at", "created_at"),
+        Index(
+            "ix_runs_queued_workspace",
+            "workspace_id",
+            text("priority DESC"),
+            "available_at",
+            "created_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index(
+            "ix_runs_running_workspace",
+            "workspace_id",
+            postgresql_where=text("status = 'running'"),
+        ),
         Index("ix_runs_status_created_at", "status", "created_at"),
         Index("ix_runs_claim_expires", "status", "claim_expires_at"),
         Index("ix_runs_status_completed", "status", "completed_at"),
@@ -139,7 +167,14 @@ class Run(UUIDPrimaryKeyMixin, Base):
             "started_at",
         ),
         Index("ix_runs_workspace_created", "workspace_id", "created_at"),
+        Index(
+            "ix_runs_result_cache",
+            "workspace_id",
+            "result_cache_key",
+            "completed_at",
+            postgresql_where=text("status = 'succeeded' AND result_cache_key IS NOT NULL"),
+        ),
     )
 
 
-__all__ = ["Run", "RunOperation", "RunStatus"]
+__all__ = ["Run", "RunOperation", "RunPriority", "RunStatus"]
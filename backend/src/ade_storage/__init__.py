@@ -2,8 +2,17 @@
 
 from __future__ import annotations
 
+from .append_log import IncrementalLogSink, LocalFileAppendWriter
 from .azure_blob import AzureBlobConfig, AzureBlobStorage
-from .base import StorageAdapter, StorageError, StorageLimitError, StoredObject
+from .base import (
+    AppendLimitError,
+    AppendPositionError,
+    AppendWriter,
+    StorageAdapter,
+    StorageError,
+    StorageLimitError,
+    StoredObject,
+)
 from .factory import build_storage_adapter, get_storage_adapter, init_storage, shutdown_storage
 from .layout import (
     ensure_storage_roots,
@@ -24,6 +33,11 @@ from .settings import (
 )
 
 __all__ = [
+    "AppendLimitError",
+    "AppendPositionError",
+    "AppendWriter",
+    "IncrementalLogSink",
+    "LocalFileAppendWriter",
     "StorageAdapter",
     "StorageError",
     "StorageLimitError",
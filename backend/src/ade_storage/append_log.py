@@ -0,0 +1,105 @@
+"""Incremental shipping of append-only local logs to storage."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from .base import AppendLimitError, AppendPositionError, AppendWriter
+
+APPEND_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class LocalFileAppendWriter(AppendWriter):
+    """Append writer backed by a local file (used by tests and local tooling)."""
+
+    def __init__(self, path: Path, *, uri: str | None = None) -> None:
+        self.path = Path(path)
+        self.uri = uri or str(self.path)
+
+    def reset(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(b"")
+
+    def append(self, data: bytes, *, offset: int) -> None:
+        with self.path.open("ab") as fh:
+            if fh.tell() != offset:
+                raise AppendPositionError(f"{self.uri} is not {offset} bytes long")
+            fh.write(data)
+
+
+class IncrementalLogSink:
+    """Ship new complete lines of a growing local file to an append-only object.
+
+    The sink remembers how many bytes of ``source`` have already been shipped
+    and only appends what was written since. Partial trailing lines are held
+    back until their newline arrives so remote readers never see half a record.
+    Every append is conditioned on the remote length matching ``offset``, so a
+    retried or duplicated append cannot write the same bytes twice; a mismatch
+    rebuilds the object from the local file.
+    """
+
+    def __init__(
+        self,
+        source: Path,
+        writer: AppendWriter,
+        *,
+        chunk_size: int = APPEND_CHUNK_SIZE,
+    ) -> None:
+        self.source = Path(source)
+        self.writer = writer
+        self.chunk_size = max(1, int(chunk_size))
+        self.offset = 0
+        self._started = False
+        self._lock = threading.Lock()
+
+    def ship(self) -> int:
+        """Append unshipped bytes; return the number of bytes appended."""
+
+        with self._lock:
+            try:
+                size = self.source.stat().st_size
+            except FileNotFoundError:
+                return 0
+            if not self._started or size < self.offset:
+                self.writer.reset()
+                self.offset = 0
+                self._started = True
+            if size == self.offset:
+                return 0
+
+            with self.source.open("rb") as fh:
+                fh.seek(self.offset)
+                pending = fh.read(size - self.offset)
+            end = pending.rfind(b"\n")
+            if end < 0:
+                return 0
+            pending = pending[: end + 1]
+
+            start = self.offset
+            try:
+                for index in range(0, len(pending), self.chunk_size):
+                    self._append(pending[index : index + self.chunk_size])
+            except (AppendLimitError, AppendPositionError):
+                self._rebuild(start + len(pending))
+            return self.offset - start
+
+    def _append(self, chunk: bytes) -> None:
+        self.writer.append(chunk, offset=self.offset)
+        self.offset += len(chunk)
+
+    def _rebuild(self, length: int) -> None:
+        # The remote object ran out of appendable blocks or no longer matches
+        # what was shipped; rewrite it from the local file in as few (large)
+        # blocks as possible and carry on.
+        self.writer.reset()
+        self.offset = 0
+        with self.source.open("rb") as fh:
+            while self.offset < length:
+                chunk = fh.read(min(self.chunk_size, length - self.offset))
+                if not chunk:
+                    break
+                self._append(chunk)
+
+
+__all__ = ["APPEND_CHUNK_SIZE", "IncrementalLogSink", "LocalFileAppendWriter"]
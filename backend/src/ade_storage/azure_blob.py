@@ -10,7 +10,15 @@ from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
 from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient
 
-from .base import StorageAdapter, StorageError, StorageLimitError, StoredObject
+from .base import (
+    AppendLimitError,
+    AppendPositionError,
+    AppendWriter,
+    StorageAdapter,
+    StorageError,
+    StorageLimitError,
+    StoredObject,
+)
 
 @dataclass(frozen=True, slots=True)
 class AzureBlobConfig:
@@ -51,6 +59,39 @@ class _HashingReader:
         return self._digest.hexdigest()
 
 
+class _AzureAppendBlobWriter(AppendWriter):
+    """Append writer backed by an Azure append blob."""
+
+    def __init__(self, blob, *, uri: str, timeout: float) -> None:
+        self._blob = blob
+        self.uri = uri
+        self._timeout = timeout
+
+    def reset(self) -> None:
+        try:
+            self._blob.create_append_blob(timeout=self._timeout)
+        except HttpResponseError as exc:
+            raise StorageError("Failed to create append blob") from exc
+
+    def append(self, data: bytes, *, offset: int) -> None:
+        if not data:
+            return
+        try:
+            self._blob.append_block(
+                data,
+                length=len(data),
+                appendpos_condition=offset,
+                timeout=self._timeout,
+            )
+        except HttpResponseError as exc:
+            error_code = getattr(exc, "error_code", None)
+            if error_code == "BlockCountExceedsLimit":
+                raise AppendLimitError("Append blob block limit reached") from exc
+            if error_code == "AppendPositionConditionNotMet":
+                raise AppendPositionError(f"Append blob is not {offset} bytes long") from exc
+            raise StorageError("Failed to append to blob") from exc
+
+
 class AzureBlobStorage(StorageAdapter):
     """Storage adapter backed by Azure Blob Storage."""
 
@@ -186,10 +227,42 @@ class AzureBlobStorage(StorageAdapter):
 
         return _iter()
 
+    def read_range(
+        self,
+        uri: str,
+        *,
+        offset: int,
+        length: int,
+        version_id: str | None = None,
+    ) -> bytes:
+        if length <= 0:
+            return b""
+        blob_name = self._blob_name(uri)
+        blob = self._container_client.get_blob_client(blob_name, version_id=version_id)
+        try:
+            downloader = blob.download_blob(
+                offset=max(0, int(offset)),
+                length=int(length),
+                timeout=self._config.request_timeout_seconds,
+            )
+            return downloader.readall()
+        except ResourceNotFoundError as exc:
+            raise FileNotFoundError(uri) from exc
+        except HttpResponseError as exc:
+            raise StorageError("Failed to download blob range") from exc
+
     def upload_path(self, uri: str, path: Path, *, max_bytes: int | None = None) -> StoredObject:
         with path.open("rb") as stream:
             return self.write(uri, stream, max_bytes=max_bytes)
 
+    def open_append_writer(self, uri: str) -> AppendWriter:
+        blob = self._container_client.get_blob_client(self._blob_name(uri))
+        return _AzureAppendBlobWriter(
+            blob,
+            uri=uri,
+            timeout=self._config.request_timeout_seconds,
+        )
+
     def download_to_path(
         self,
         uri: str,
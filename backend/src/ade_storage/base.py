@@ -23,6 +23,14 @@ class StorageLimitError(StorageError):
         self.received = received
 
 
+class AppendLimitError(StorageError):
+    """Raised when an append-only object cannot accept more appends."""
+
+
+class AppendPositionError(StorageError):
+    """Raised when an append-only object is not the length the writer expected."""
+
+
 @dataclass(slots=True)
 class StoredObject:
     """Metadata describing an object persisted by a storage adapter."""
@@ -33,6 +41,20 @@ class StoredObject:
     version_id: str | None = None
 
 
+class AppendWriter(ABC):
+    """Append-only handle on a single storage object."""
+
+    uri: str
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Create (or truncate) the object so the next append lands at offset 0."""
+
+    @abstractmethod
+    def append(self, data: bytes, *, offset: int) -> None:
+        """Append ``data`` to the object, which must currently be ``offset`` bytes long."""
+
+
 class StorageAdapter(ABC):
     """Protocol implemented by storage adapters."""
 
@@ -71,6 +93,52 @@ class StorageAdapter(ABC):
     ) -> Iterator[bytes]:
         """Yield bytes stored at ``uri`` starting at ``start_offset``."""
 
+    def read_range(
+        self,
+        uri: str,
+        *,
+        offset: int,
+        length: int,
+        version_id: str | None = None,
+    ) -> bytes:
+        """Return up to ``length`` bytes stored at ``uri`` starting at ``offset``.
+
+        The default implementation stops consuming ``stream_range`` once enough
+        bytes have arrived; adapters with native ranged GETs should override it
+        so only the requested bytes cross the wire.
+        """
+
+        if length <= 0:
+            return b""
+        chunks: list[bytes] = []
+        remaining = length
+        stream = self.stream_range(
+            uri,
+            start_offset=offset,
+            version_id=version_id,
+            chunk_size=min(length, 1024 * 1024),
+        )
+        try:
+            for chunk in stream:
+                chunks.append(chunk[:remaining])
+                remaining -= len(chunks[-1])
+                if remaining <= 0:
+                    break
+        finally:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
+        return b"".join(chunks)
+
     @abstractmethod
     def delete(self, uri: str, *, version_id: str | None = None) -> None:
         """Remove ``uri`` from storage if it exists."""
+
+    def open_append_writer(self, uri: str) -> AppendWriter:
+        """Return an append-only writer for ``uri``.
+
+        Adapters without native append support raise ``NotImplementedError`` and
+        callers fall back to rewriting the whole object.
+        """
+
+        raise NotImplementedError(f"{type(self).__name__} does not support appends")
@@ -0,0 +1,217 @@
+"""Resource-aware admission of claimed runs.
+
+``worker_run_concurrency`` caps the run threads; with admission enabled the
+worker additionally claims new runs only while the node has memory and CPU
+headroom. Usage is read from the worker's cgroup v2 (``memory.current``,
+``memory.max``, ``cpu.stat``, ``cpu.max``), which also accounts for every engine
+process group the worker started, with ``/proc/meminfo`` and the load average as
+fallbacks outside a cgroup.
+
+Each admitted batch reserves an estimate derived from its largest input's
+``byte_size``. A batch runs its claims one after another, so the largest input
+stands for the whole batch. The reservation covers the gap between claiming a
+run and its engine actually growing; projected use is the larger of measured
+use and the sum of reservations.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger("ade_worker.admission")
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# Cost model: an engine process starts at about RUN_BASE_BYTES and grows with
+# its input; xlsx inputs expand well beyond their compressed size in memory.
+RUN_BASE_BYTES = 256 * 1024 * 1024
+INPUT_BYTES_FACTOR = 8
+
+CPU_SAMPLE_SECONDS = 1.0
+
+
+def estimate_run_bytes(input_byte_size: int | None) -> int:
+    return RUN_BASE_BYTES + max(0, int(input_byte_size or 0)) * INPUT_BYTES_FACTOR
+
+
+def _read_text(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def current_cgroup_dir(root: Path = CGROUP_ROOT) -> Path | None:
+    """Return this process's cgroup v2 directory, or ``None`` without cgroup v2."""
+
+    if not (root / "cgroup.controllers").exists():
+        return None
+    membership = _read_text(Path("/proc/self/cgroup")) or ""
+    for line in membership.splitlines():
+        if line.startswith("0::"):
+            candidate = root / line[3:].lstrip("/")
+            return candidate if candidate.is_dir() else root
+    return root
+
+
+def _meminfo() -> dict[str, int]:
+    values: dict[str, int] = {}
+    for line in (_read_text(Path("/proc/meminfo")) or "").splitlines():
+        name, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts and parts[0].isdigit():
+            values[name] = int(parts[0]) * 1024
+    return values
+
+
+@dataclass(slots=True)
+class ResourceProbe:
+    """Reads node memory and CPU usage, preferring the worker's cgroup v2."""
+
+    cgroup_dir: Path | None = None
+    _last_cpu: tuple[float, float] | None = field(default=None, init=False, repr=False)
+    _cpu_utilization: float = field(default=0.0, init=False, repr=False)
+
+    def _stat(self, filename: str, key: str, *, default: int = 0) -> int:
+        assert self.cgroup_dir is not None
+        for line in (_read_text(self.cgroup_dir / filename) or "").splitlines():
+            name, _, value = line.partition(" ")
+            if name == key and value.isdigit():
+                return int(value)
+        return default
+
+    def memory(self) -> tuple[int, int] | None:
+        """Return ``(limit_bytes, used_bytes)``, or ``None`` when unknown."""
+
+        meminfo = _meminfo()
+        total = meminfo.get("MemTotal")
+        if self.cgroup_dir is not None:
+            current = _read_text(self.cgroup_dir / "memory.current")
+            limit_raw = _read_text(self.cgroup_dir / "memory.max")
+            if current is not None and current.isdigit():
+                limit = int(limit_raw) if limit_raw and limit_raw.isdigit() else total
+                if limit:
+                    # Reclaimable page cache is not pressure.
+                    used = max(0, int(current) - self._stat("memory.stat", "inactive_file"))
+                    return min(limit, total or limit), used
+        if total and "MemAvailable" in meminfo:
+            return total, total - meminfo["MemAvailable"]
+        return None
+
+    def cpu_limit(self) -> float:
+        cpus = float(len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else 0)
+        cpus = cpus or float(os.cpu_count() or 1)
+        if self.cgroup_dir is not None:
+            quota, _, period = (_read_text(self.cgroup_dir / "cpu.max") or "max").partition(" ")
+            if quota.isdigit() and period.isdigit() and int(period) > 0:
+                cpus = min(cpus, int(quota) / int(period))
+        return max(cpus, 0.01)
+
+    def cpu_utilization(self) -> float:
+        """Return CPU use as a fraction of ``cpu_limit()`` (may exceed 1.0)."""
+
+        if self.cgroup_dir is None:
+            load = os.getloadavg()[0] if hasattr(os, "getloadavg") else 0.0
+            return load / self.cpu_limit()
+        usage_usec = self._stat("cpu.stat", "usage_usec", default=-1)
+        if usage_usec < 0:
+            return 0.0
+        now = time.monotonic()
+        if self._last_cpu is None:
+            self._last_cpu = (now, float(usage_usec))
+            return self._cpu_utilization
+        last_at, last_usage = self._last_cpu
+        if now - last_at >= CPU_SAMPLE_SECONDS:
+            used = (usage_usec - last_usage) / 1_000_000
+            self._cpu_utilization = used / (now - last_at) / self.cpu_limit()
+            self._last_cpu = (now, float(usage_usec))
+        return self._cpu_utilization
+
+
+class AdmissionController:
+    """Decides whether the worker may claim another run right now."""
+
+    def __init__(
+        self,
+        *,
+        probe: ResourceProbe,
+        memory_target: float,
+        cpu_target: float,
+    ) -> None:
+        self.probe = probe
+        self.memory_target = float(memory_target)
+        self.cpu_target = float(cpu_target)
+        self._reservations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, input_byte_sizes: list[int | None]) -> int:
+        estimate = max((estimate_run_bytes(size) for size in input_byte_sizes), default=0)
+        with self._lock:
+            self._reservations[key] = estimate
+        return estimate
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._reservations.pop(key, None)
+
+    def has_headroom(self) -> bool:
+        """True if one more typical run fits; always true with nothing running."""
+
+        with self._lock:
+            active = len(self._reservations)
+            reserved = sum(self._reservations.values())
+        if active == 0:
+            return True
+
+        cpu = self.probe.cpu_utilization()
+        if cpu >= self.cpu_target:
+            logger.debug("run.admission.blocked reason=cpu utilization=%.2f", cpu)
+            return False
+
+        memory = self.probe.memory()
+        if memory is None:
+            return True
+        limit, used = memory
+        projected = max(used, reserved) + estimate_run_bytes(0)
+        if projected > limit * self.memory_target:
+            logger.debug(
+                "run.admission.blocked reason=memory used=%s reserved=%s limit=%s",
+                used,
+                reserved,
+                limit,
+            )
+            return False
+        return True
+
+
+def limit_process_memory(pid: int, max_bytes: int) -> None:
+    """Cap ``pid``'s address space; its children inherit the limit.
+
+    Applied right after spawn with ``prlimit`` so no ``preexec_fn`` runs in a
+    threaded parent. No-op where ``prlimit`` is unavailable.
+    """
+
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - non-POSIX
+        return
+    if not hasattr(resource, "prlimit"):
+        return
+    try:
+        resource.prlimit(pid, resource.RLIMIT_AS, (max_bytes, max_bytes))
+    except (OSError, ValueError) as exc:
+        logger.warning("run.memory_limit.failed pid=%s error=%s", pid, exc)
+
+
+__all__ = [
+    "AdmissionController",
+    "ResourceProbe",
+    "current_cgroup_dir",
+    "estimate_run_bytes",
+    "limit_process_memory",
+]
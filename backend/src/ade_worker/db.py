@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
@@ -23,17 +24,27 @@ from ade_db.schema import (
 
 # --- SQL snippets -----------------------------------------------------------
 
-POSTGRES_CLAIM_RUN_BATCH = """    WITH next_run AS (
-    SELECT id
-    FROM runs
-    WHERE status = 'queued'
-      AND available_at <= :now
-      AND attempt_count < max_attempts
-    ORDER BY available_at ASC, created_at ASC
-    FOR UPDATE SKIP LOCKED
-    LIMIT :limit
-)
-UPDATE runs AS r
+# Per-workspace concurrency cap: the workspace's ``max_concurrent_runs`` setting,
+# else the worker-wide default. NULL means uncapped.
+_WORKSPACE_MAX_RUNNING = """COALESCE(
+            CASE
+                WHEN jsonb_typeof(w.settings -> 'max_concurrent_runs') = 'number'
+                THEN CAST(
+                    LEAST(CAST(w.settings ->> 'max_concurrent_runs' AS NUMERIC), 1000000)
+                    AS BIGINT
+                )
+            END,
+            CAST(:workspace_max_running AS BIGINT)
+        )"""
+
+_WORKSPACE_RUNNING = """(
+            SELECT count(*)
+            FROM runs AS running
+            WHERE running.workspace_id = w.id
+              AND running.status = 'running'
+        )"""
+
+_CLAIM_UPDATE = """UPDATE runs AS r
 SET
     status = 'running',
     claimed_by = :worker_id,
@@ -43,7 +54,132 @@ SET
     error_message = NULL
 FROM next_run
 WHERE r.id = next_run.id
-RETURNING r.id, r.attempt_count, r.max_attempts;
+RETURNING
+    r.id,
+    r.attempt_count,
+    r.max_attempts,
+    r.configuration_id,
+    r.deps_digest,
+    r.operation,
+    r.run_options,
+    (
+        SELECT fv.byte_size
+        FROM file_versions AS fv
+        WHERE fv.id = r.input_file_version_id
+    ) AS input_byte_size;
+"""
+
+# Batch siblings wait behind their leader, so ``started_at`` is stamped when
+# each one actually starts (``mark_run_started``), not at claim time.
+_SIBLING_CLAIM_UPDATE = _CLAIM_UPDATE.replace(
+    "    started_at = COALESCE(r.started_at, :now),\n", ""
+)
+
+# Fair-share claim. Workspaces with queued runs are found with a skip scan over
+# ``ix_runs_queued_workspace``; each contributes at most its remaining cap of
+# runs in (priority, available_at) order. Higher priority always wins; within a
+# priority, runs go to the workspace with the fewest runs in flight, so one
+# workspace's backlog cannot starve the others. Only the final pick is locked.
+POSTGRES_CLAIM_RUN_BATCH = f"""    WITH RECURSIVE queued_workspaces AS (
+    (
+        SELECT workspace_id
+        FROM runs
+        WHERE status = 'queued'
+        ORDER BY workspace_id
+        LIMIT 1
+    )
+    UNION ALL
+    SELECT (
+        SELECT r.workspace_id
+        FROM runs AS r
+        WHERE r.status = 'queued'
+          AND r.workspace_id > q.workspace_id
+        ORDER BY r.workspace_id
+        LIMIT 1
+    )
+    FROM queued_workspaces AS q
+    WHERE q.workspace_id IS NOT NULL
+),
+workspace_load AS (
+    SELECT
+        w.id AS workspace_id,
+        {_WORKSPACE_RUNNING} AS running,
+        {_WORKSPACE_MAX_RUNNING} AS max_running
+    FROM queued_workspaces AS q
+    JOIN workspaces AS w ON w.id = q.workspace_id
+),
+candidates AS (
+    SELECT
+        c.id,
+        c.priority,
+        c.available_at,
+        c.created_at,
+        l.running + row_number() OVER (
+            PARTITION BY l.workspace_id, c.priority
+            ORDER BY c.available_at, c.created_at
+        ) AS turn
+    FROM workspace_load AS l
+    CROSS JOIN LATERAL (
+        SELECT r.id, r.priority, r.available_at, r.created_at
+        FROM runs AS r
+        WHERE r.workspace_id = l.workspace_id
+          AND r.status = 'queued'
+          AND r.available_at <= :now
+          AND r.attempt_count < r.max_attempts
+        ORDER BY r.priority DESC, r.available_at ASC, r.created_at ASC
+        LIMIT CASE
+            WHEN l.max_running IS NULL THEN :limit
+            ELSE GREATEST(LEAST(l.max_running - l.running, :limit), 0)
+        END
+    ) AS c
+),
+next_run AS (
+    SELECT r.id
+    FROM candidates AS c
+    JOIN runs AS r ON r.id = c.id
+    WHERE r.status = 'queued'
+    ORDER BY c.priority DESC, c.turn ASC, c.available_at ASC, c.created_at ASC
+    LIMIT :limit
+    FOR UPDATE OF r SKIP LOCKED
+)
+{_CLAIM_UPDATE}"""
+
+POSTGRES_CLAIM_RUN_SIBLINGS = f"""    WITH leader AS (
+    SELECT
+        CASE
+            WHEN l.max_running IS NULL THEN :limit
+            ELSE GREATEST(LEAST(l.max_running - l.running, :limit), 0)
+        END AS budget
+    FROM (
+        SELECT
+            {_WORKSPACE_RUNNING} AS running,
+            {_WORKSPACE_MAX_RUNNING} AS max_running
+        FROM runs AS leader_run
+        JOIN workspaces AS w ON w.id = leader_run.workspace_id
+        WHERE leader_run.id = :leader_id
+    ) AS l
+),
+next_run AS (
+    SELECT id
+    FROM runs
+    WHERE status = 'queued'
+      AND configuration_id = :configuration_id
+      AND deps_digest = :deps_digest
+      AND operation = 'process'
+      AND run_options IS NOT DISTINCT FROM CAST(:run_options AS JSONB)
+      AND available_at <= :now
+      AND attempt_count < max_attempts
+    ORDER BY priority DESC, available_at ASC, created_at ASC
+    FOR UPDATE SKIP LOCKED
+    LIMIT COALESCE((SELECT budget FROM leader), 0)
+)
+{_SIBLING_CLAIM_UPDATE}"""
+
+RUN_MARK_STARTED = """    UPDATE runs
+SET started_at = COALESCE(started_at, :now)
+WHERE id = :run_id
+  AND status = 'running'
+  AND claimed_by = :worker_id;
 """
 
 RUN_ACK_SUCCESS = """    UPDATE runs
@@ -90,6 +226,15 @@ WHERE id = :run_id
   AND claimed_by = :worker_id;
 """
 
+RUN_HEARTBEAT_BULK = """    UPDATE runs
+SET
+    claim_expires_at = :lease_expires_at
+WHERE id = ANY(CAST(:run_ids AS UUID[]))
+  AND status = 'running'
+  AND claimed_by = :worker_id
+RETURNING id;
+"""
+
 RUN_EXPIRE_REQUEUE_BULK = """    UPDATE runs
 SET
     status = 'queued',
@@ -117,6 +262,11 @@ WHERE status = 'running'
   AND attempt_count >= max_attempts;
 """
 
+RUN_EVENTS_CHANNEL = "ade_run_events"
+
+RUN_NOTIFY_LOG_ADVANCED = """    SELECT pg_notify(:channel, :payload);
+"""
+
 
 # --- Types ------------------------------------------------------------------
 
@@ -125,6 +275,45 @@ class RunClaim:
     id: str
     attempt_count: int
     max_attempts: int
+    configuration_id: str = ""
+    deps_digest: str = ""
+    operation: str = ""
+    run_options: str | None = None
+    input_byte_size: int | None = None
+
+    @property
+    def batch_key(self) -> tuple[str, str, str | None] | None:
+        """Runs sharing this key can go through one engine host back to back."""
+
+        if self.operation != "process" or not self.configuration_id:
+            return None
+        return (self.configuration_id, self.deps_digest, self.run_options)
+
+
+def _canonical_run_options(value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _run_claim(row: Any) -> RunClaim:
+    return RunClaim(
+        id=str(row.get("id") or ""),
+        attempt_count=int(row.get("attempt_count") or 0),
+        max_attempts=int(row.get("max_attempts") or 0),
+        configuration_id=str(row.get("configuration_id") or ""),
+        deps_digest=str(row.get("deps_digest") or ""),
+        operation=str(row.get("operation") or ""),
+        run_options=_canonical_run_options(row.get("run_options")),
+        input_byte_size=(
+            int(row["input_byte_size"]) if row.get("input_byte_size") is not None else None
+        ),
+    )
 
 
 # --- Queue / lease helpers --------------------------------------------------
@@ -136,6 +325,7 @@ def claim_runs(
     now: datetime,
     lease_seconds: int,
     limit: int,
+    workspace_max_running: int | None = None,
 ) -> list[RunClaim]:
     lease_expires_at = now + timedelta(seconds=int(lease_seconds))
     params = {
@@ -143,16 +333,54 @@ def claim_runs(
         "now": now,
         "lease_expires_at": lease_expires_at,
         "limit": max(1, int(limit)),
+        "workspace_max_running": workspace_max_running,
     }
     rows = session.execute(text(POSTGRES_CLAIM_RUN_BATCH), params).mappings().all()
-    return [
-        RunClaim(
-            id=str(row.get("id") or ""),
-            attempt_count=int(row.get("attempt_count") or 0),
-            max_attempts=int(row.get("max_attempts") or 0),
-        )
-        for row in rows
-    ]
+    return [_run_claim(row) for row in rows]
+
+
+def claim_run_siblings(
+    session: Session,
+    *,
+    leader: RunClaim,
+    worker_id: str,
+    now: datetime,
+    lease_seconds: int,
+    limit: int,
+    workspace_max_running: int | None = None,
+) -> list[RunClaim]:
+    """Claim queued ``process`` runs that can share ``leader``'s engine batch.
+
+    Siblings match the leader's configuration, dependency digest, and run
+    options exactly, so one venv and one engine host serve the whole batch.
+    The workspace concurrency cap applies to siblings as well.
+    """
+
+    if leader.batch_key is None or limit <= 0:
+        return []
+    lease_expires_at = now + timedelta(seconds=int(lease_seconds))
+    params = {
+        "worker_id": worker_id,
+        "now": now,
+        "lease_expires_at": lease_expires_at,
+        "limit": int(limit),
+        "workspace_max_running": workspace_max_running,
+        "leader_id": leader.id,
+        "configuration_id": leader.configuration_id,
+        "deps_digest": leader.deps_digest,
+        "run_options": leader.run_options,
+    }
+    rows = session.execute(text(POSTGRES_CLAIM_RUN_SIBLINGS), params).mappings().all()
+    return [_run_claim(row) for row in rows]
+
+
+def mark_run_started(session: Session, *, run_id: str, worker_id: str, now: datetime) -> None:
+    """Stamp ``started_at`` on a claimed batch sibling when its turn comes."""
+
+    session.execute(
+        text(RUN_MARK_STARTED),
+        {"run_id": run_id, "worker_id": worker_id, "now": now},
+    )
 
 
 def heartbeat_run(
@@ -173,6 +401,41 @@ def heartbeat_run(
     return bool(getattr(result, "rowcount", 0) == 1)
 
 
+def heartbeat_runs(
+    session: Session,
+    *,
+    run_ids: list[str],
+    worker_id: str,
+    now: datetime,
+    lease_seconds: int,
+) -> set[str]:
+    """Extend the leases of several claimed runs; return the ids still held."""
+
+    if not run_ids:
+        return set()
+    lease_expires_at = now + timedelta(seconds=int(lease_seconds))
+    params = {
+        "run_ids": [str(run_id) for run_id in run_ids],
+        "worker_id": worker_id,
+        "lease_expires_at": lease_expires_at,
+    }
+    rows = session.execute(text(RUN_HEARTBEAT_BULK), params).scalars().all()
+    return {str(row).lower() for row in rows}
+
+
+def notify_run_log_advanced(session: Session, *, run_id: str, offset: int) -> None:
+    """Tell API replicas that the shipped run log now ends at ``offset`` bytes."""
+
+    payload = json.dumps(
+        {"runId": str(run_id), "kind": "log", "offset": int(offset)},
+        separators=(",", ":"),
+    )
+    session.execute(
+        text(RUN_NOTIFY_LOG_ADVANCED),
+        {"channel": RUN_EVENTS_CHANNEL, "payload": payload},
+    )
+
+
 def ack_run_success(
     session: Session,
     *,
@@ -252,6 +515,23 @@ def next_run_due_at(
     return row
 
 
+def queue_stats(
+    session: Session,
+    *,
+    now: datetime,
+) -> tuple[int, datetime | None]:
+    """Return the count of due queued runs and the oldest one's ``available_at``."""
+
+    row = session.execute(
+        select(func.count(), func.min(runs.c.available_at)).where(
+            runs.c.status == "queued",
+            runs.c.attempt_count < runs.c.max_attempts,
+            runs.c.available_at <= now,
+        )
+    ).one()
+    return int(row[0] or 0), row[1]
+
+
 # --- Repository helpers -----------------------------------------------------
 
 def load_run(session: Session, run_id: str) -> dict[str, Any] | None:
@@ -274,6 +554,23 @@ def load_file_version(
     return dict(row) if row else None
 
 
+def set_file_version_sidecar(
+    session: Session,
+    *,
+    file_version_id: str,
+    workbook_metadata: dict[str, Any],
+) -> bool:
+    """Store ``workbook_metadata`` carrying a row sidecar unless one is already recorded."""
+
+    result = session.execute(
+        update(file_versions)
+        .where(file_versions.c.id == file_version_id)
+        .where(file_versions.c.workbook_metadata["sidecar"].is_(None))
+        .values(workbook_metadata=workbook_metadata)
+    )
+    return bool(result.rowcount)
+
+
 def ensure_output_file(
     session: Session,
     *,
@@ -337,6 +634,7 @@ def create_output_file_version(
     byte_size: int,
     storage_version_id: str | None,
     now: datetime,
+    workbook_metadata: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     current = session.execute(
         select(func.max(file_versions.c.version_no)).where(file_versions.c.file_id == file_id)
@@ -355,6 +653,7 @@ def create_output_file_version(
         "content_type": content_type,
         "filename_at_upload": filename_at_upload,
         "storage_version_id": storage_version_id,
+        "workbook_metadata": workbook_metadata,
         "created_at": now,
         "updated_at": now,
     }
@@ -375,6 +674,7 @@ def record_run_result(
     exit_code: int | None,
     output_file_version_id: str | None,
     error_message: str | None,
+    result_cache_key: str | None = None,
 ) -> None:
     session.execute(
         update(runs)
@@ -384,10 +684,53 @@ def record_run_result(
             exit_code=exit_code,
             output_file_version_id=output_file_version_id,
             error_message=error_message,
+            result_cache_key=result_cache_key,
         )
     )
 
 
+def find_cached_run_result(
+    session: Session,
+    *,
+    workspace_id: str,
+    result_cache_key: str,
+    exclude_run_id: str,
+) -> dict[str, Any] | None:
+    """Return the latest succeeded run in the workspace with the same cache key.
+
+    Runs whose output now points at another version (e.g. a manual edit) are
+    skipped: only output the engine generated for that run is reused.
+    """
+
+    row = session.execute(
+        select(runs.c.id, runs.c.output_file_version_id)
+        .select_from(
+            runs.outerjoin(file_versions, file_versions.c.id == runs.c.output_file_version_id)
+        )
+        .where(
+            runs.c.workspace_id == workspace_id,
+            runs.c.result_cache_key == result_cache_key,
+            runs.c.status == "succeeded",
+            runs.c.id != exclude_run_id,
+            (runs.c.output_file_version_id.is_(None))
+            | (
+                (file_versions.c.origin == "generated")
+                & (file_versions.c.run_id == runs.c.id)
+            ),
+        )
+        .order_by(runs.c.completed_at.desc())
+        .limit(1)
+    ).mappings().first()
+    return dict(row) if row else None
+
+
+def compact_document_facet_counts(session: Session) -> int:
+    """Fold pending document facet deltas into their counters; return rows folded."""
+
+    folded = session.execute(text("SELECT compact_document_facet_counts()")).scalar_one()
+    return int(folded or 0)
+
+
 def activate_configuration_publish(
     session: Session,
     *,
@@ -462,25 +805,46 @@ def replace_run_table_columns(
     session.execute(insert(run_table_columns), payload)
 
 
+def copy_run_results(session: Session, *, source_run_id: str, run_id: str) -> None:
+    """Replace ``run_id``'s metrics, fields and table columns with the source run's."""
+
+    for table in (run_metrics, run_fields, run_table_columns):
+        rows = session.execute(
+            select(table).where(table.c.run_id == source_run_id)
+        ).mappings().all()
+        session.execute(delete(table).where(table.c.run_id == run_id))
+        if rows:
+            session.execute(insert(table), [dict(row, run_id=run_id) for row in rows])
+
+
 # --- Exports ----------------------------------------------------------------
 
 
 __all__ = [
     "RunClaim",
     "claim_runs",
+    "claim_run_siblings",
+    "mark_run_started",
     "heartbeat_run",
+    "heartbeat_runs",
+    "notify_run_log_advanced",
     "ack_run_success",
     "ack_run_failure",
     "expire_run_leases",
+    "compact_document_facet_counts",
     "next_run_due_at",
+    "queue_stats",
     "load_run",
     "load_file",
     "load_file_version",
+    "set_file_version_sidecar",
     "ensure_output_file",
     "create_output_file_version",
     "record_run_result",
+    "find_cached_run_result",
     "activate_configuration_publish",
     "replace_run_metrics",
     "replace_run_fields",
     "replace_run_table_columns",
+    "copy_run_results",
 ]
@@ -0,0 +1,152 @@
+"""Long-lived ``ade_engine`` host executed inside a configuration virtualenv.
+
+The worker starts this script with the venv interpreter and writes one JSON job
+per line to stdin::
+
+    {"job_id": "...", "argv": ["process", "file", ...], "cwd": null, "config_dir": "..."}
+
+Each job runs ``python -m ade_engine <argv>`` in-process, so interpreter start-up
+and heavy imports (polars, openpyxl, the config package) are paid once per host
+instead of once per run. Engine output keeps flowing as NDJSON on stdout; after
+every job the host writes an ``engine_host.job.completed`` event with the job id
+and exit code so the worker knows where one run ends and the next begins.
+
+This file is executed by path with the config venv interpreter and must only
+depend on the standard library.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import runpy
+import sys
+import traceback
+from pathlib import Path
+from typing import Any
+
+JOB_COMPLETED_EVENT = "engine_host.job.completed"
+READY_EVENT = "engine_host.ready"
+
+
+def _emit(event: str, data: dict[str, Any]) -> None:
+    record = {"event": event, "level": "debug", "message": "", "data": data}
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+def _config_fingerprint(config_dir: Path) -> tuple[tuple[str, int, int], ...]:
+    entries: list[tuple[str, int, int]] = []
+    for path in sorted(config_dir.rglob("*")):
+        if not path.is_file() or "__pycache__" in path.parts:
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+
+def _purge_modules_under(root: Path) -> None:
+    prefix = str(root.resolve()) + os.sep
+    for name, module in list(sys.modules.items()):
+        origin = getattr(module, "__file__", None)
+        if origin and os.path.abspath(origin).startswith(prefix):
+            sys.modules.pop(name, None)
+
+
+def _snapshot_handlers() -> dict[str, list[logging.Handler]]:
+    snapshot = {"": list(logging.root.handlers)}
+    for name, logger in logging.Logger.manager.loggerDict.items():
+        if isinstance(logger, logging.Logger):
+            snapshot[name] = list(logger.handlers)
+    return snapshot
+
+
+def _restore_handlers(snapshot: dict[str, list[logging.Handler]]) -> None:
+    """Drop handlers a job attached so the next job does not log twice."""
+
+    loggers: list[tuple[str, logging.Logger]] = [("", logging.root)]
+    for name, logger in logging.Logger.manager.loggerDict.items():
+        if isinstance(logger, logging.Logger):
+            loggers.append((name, logger))
+    for name, logger in loggers:
+        keep = snapshot.get(name, [])
+        for handler in list(logger.handlers):
+            if handler in keep:
+                continue
+            logger.removeHandler(handler)
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+
+def _run_job(argv: list[str]) -> int:
+    sys.argv = ["ade_engine", *argv]
+    try:
+        runpy.run_module("ade_engine", run_name="__main__", alter_sys=True)
+    except SystemExit as exc:
+        code = exc.code
+        if code is None:
+            return 0
+        if isinstance(code, int):
+            return code
+        sys.stderr.write(f"{code}\n")
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def main() -> int:
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stderr.reconfigure(line_buffering=True)
+    base_cwd = os.getcwd()
+    fingerprints: dict[str, tuple[tuple[str, int, int], ...]] = {}
+
+    _emit(READY_EVENT, {"pid": os.getpid()})
+    for raw in sys.stdin:
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            job = json.loads(raw)
+        except json.JSONDecodeError:
+            sys.stderr.write(f"engine host: invalid job line: {raw[:200]}\n")
+            continue
+        job_id = str(job.get("job_id") or "")
+        argv = [str(item) for item in job.get("argv") or []]
+
+        config_dir = job.get("config_dir")
+        if config_dir:
+            root = Path(config_dir)
+            fingerprint = _config_fingerprint(root)
+            previous = fingerprints.get(str(root))
+            if previous is not None and previous != fingerprint:
+                _purge_modules_under(root)
+            fingerprints[str(root)] = fingerprint
+
+        handlers = _snapshot_handlers()
+        exit_code = 1
+        try:
+            os.chdir(job.get("cwd") or base_cwd)
+            exit_code = _run_job(argv)
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            _restore_handlers(handlers)
+            try:
+                os.chdir(base_cwd)
+            except OSError:
+                pass
+            sys.stderr.flush()
+            _emit(JOB_COMPLETED_EVENT, {"job_id": job_id, "exit_code": exit_code})
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
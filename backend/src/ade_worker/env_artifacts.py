@@ -0,0 +1,64 @@
+"""Shared environment artifacts published to blob storage.
+
+A worker that builds an environment packs the dependency-only venv (before the
+editable config package is installed) and uploads it under a name keyed by
+``deps_digest`` and the interpreter/platform tag. Other workers unpack it
+instead of resolving and installing the same dependencies again.
+
+Venvs are created with ``uv venv --relocatable`` so entry points and activation
+scripts do not embed the build path.
+"""
+
+from __future__ import annotations
+
+import sys
+import sysconfig
+import tarfile
+from pathlib import Path
+
+from .paths import _deps_digest_segment
+
+ENVIRONMENT_ARTIFACT_PREFIX = "_environments"
+
+
+def environment_platform_tag() -> str:
+    """Return the interpreter/platform tag, e.g. ``cpython-313-linux-x86_64``."""
+
+    tag = f"{sys.implementation.cache_tag}-{sysconfig.get_platform()}"
+    return "".join(ch if ch.isalnum() or ch in {"-", "_", "."} else "_" for ch in tag)
+
+
+def environment_artifact_blob_name(deps_digest: str, *, platform_tag: str | None = None) -> str:
+    tag = platform_tag or environment_platform_tag()
+    return f"{ENVIRONMENT_ARTIFACT_PREFIX}/{tag}/{_deps_digest_segment(deps_digest)}.tar.gz"
+
+
+def pack_environment(venv_dir: Path, archive_path: Path) -> Path:
+    """Write ``venv_dir`` to a gzip tarball with paths relative to the venv."""
+
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(archive_path, "w:gz", compresslevel=6) as archive:
+        for child in sorted(venv_dir.iterdir()):
+            archive.add(child, arcname=child.name)
+    return archive_path
+
+
+def unpack_environment(archive_path: Path, venv_dir: Path) -> None:
+    """Extract a packed environment into ``venv_dir``.
+
+    The ``tar`` filter keeps members inside ``venv_dir`` but still allows the
+    interpreter symlink to point at the absolute base Python.
+    """
+
+    venv_dir.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(archive_path, "r:gz") as archive:
+        archive.extractall(venv_dir, filter="tar")
+
+
+__all__ = [
+    "ENVIRONMENT_ARTIFACT_PREFIX",
+    "environment_artifact_blob_name",
+    "environment_platform_tag",
+    "pack_environment",
+    "unpack_environment",
+]
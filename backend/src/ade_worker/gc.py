@@ -116,6 +116,47 @@ def gc_run_artifacts(
     return result
 
 
+def gc_input_cache(*, root: Path, max_bytes: int) -> GcResult:
+    """Evict least recently used input cache entries until under ``max_bytes``."""
+
+    result = GcResult()
+    objects_root = root / "objects"
+    if not objects_root.exists():
+        return result
+
+    entries: list[tuple[float, int, Path]] = []
+    for path in objects_root.glob("*/*"):
+        if path.name.startswith("."):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    result.scanned = len(entries)
+
+    total = sum(size for _, size, _ in entries)
+    for last_used, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            logger.warning("gc: input cache delete failed path=%s", path)
+            result.failed += 1
+            continue
+        total -= size
+        result.deleted += 1
+        logger.info(
+            "gc: input cache entry evicted path=%s bytes=%s last_used=%s",
+            path,
+            size,
+            datetime.fromtimestamp(last_used).isoformat(),
+        )
+    result.skipped = result.scanned - result.deleted - result.failed
+    return result
+
+
 def _delete_tree(path: Path) -> bool:
     if not path.exists():
         return True
@@ -147,6 +188,12 @@ def run_gc(settings: Settings | None = None) -> tuple[GcResult, GcResult | None]
         cache_ttl_days=settings.worker_cache_ttl_days,
     )
 
+    if settings.worker_input_cache_max_mb is not None:
+        gc_input_cache(
+            root=settings.worker_input_cache_dir,
+            max_bytes=settings.worker_input_cache_max_mb * 1024 * 1024,
+        )
+
     run_result: GcResult | None = None
     if settings.worker_run_artifact_ttl_days is not None:
         run_result = gc_run_artifacts(
@@ -160,4 +207,4 @@ def run_gc(settings: Settings | None = None) -> tuple[GcResult, GcResult | None]
     return cache_result, run_result
 
 
-__all__ = ["gc_local_venv_cache", "gc_run_artifacts", "GcResult", "run_gc"]
+__all__ = ["gc_input_cache", "gc_local_venv_cache", "gc_run_artifacts", "GcResult", "run_gc"]
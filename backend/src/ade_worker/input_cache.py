@@ -0,0 +1,114 @@
+"""Node-local, content-addressed cache of run input blobs.
+
+Input file versions are immutable and carry their ``sha256``, so a worker that
+has downloaded one keeps it under ``<root>/objects/<sha[:2]>/<sha>``. Later runs
+that stage the same version (retries, re-processing after a publish,
+validate-then-process) get a hardlink into their run directory instead of a
+fresh download. Hardlinks fall back to a copy across filesystems.
+
+Each hit refreshes the entry's mtime; ``ade_worker.gc.gc_input_cache`` evicts
+the least recently used entries once the cache exceeds its byte budget.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("ade_worker.input_cache")
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class InputDigestMismatchError(RuntimeError):
+    """Raised when downloaded bytes do not match the file version's sha256."""
+
+
+def _is_sha256(value: str) -> bool:
+    return len(value) == 64 and all(ch in "0123456789abcdef" for ch in value)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+@dataclass(slots=True)
+class InputBlobCache:
+    root: Path
+    max_bytes: int
+
+    def objects_root(self) -> Path:
+        return self.root / "objects"
+
+    def object_path(self, sha256: str) -> Path:
+        return self.objects_root() / sha256[:2] / sha256
+
+    def stage(
+        self,
+        storage: Any,
+        *,
+        blob_name: str,
+        version_id: str | None,
+        sha256: str | None,
+        destination: Path,
+    ) -> bool:
+        """Place the blob at ``destination``; return ``True`` on a cache hit.
+
+        Versions without a usable ``sha256`` are downloaded directly and not
+        cached. Storage errors (``FileNotFoundError`` included) propagate.
+        """
+
+        digest = (sha256 or "").strip().lower()
+        if not _is_sha256(digest):
+            storage.download_to_path(blob_name, version_id=version_id, destination=destination)
+            return False
+
+        cached = self.object_path(digest)
+        if cached.is_file():
+            try:
+                os.utime(cached)
+                _link_or_copy(cached, destination)
+                return True
+            except FileNotFoundError:
+                # Evicted between the check and the link; download it again.
+                pass
+
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".download-", dir=cached.parent)
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            storage.download_to_path(blob_name, version_id=version_id, destination=tmp_path)
+            actual = _file_sha256(tmp_path)
+            if actual != digest:
+                raise InputDigestMismatchError(
+                    f"Input blob {blob_name} has sha256 {actual}, expected {digest}"
+                )
+            tmp_path.chmod(0o444)
+            os.replace(tmp_path, cached)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        _link_or_copy(cached, destination)
+        return False
+
+
+__all__ = ["InputBlobCache", "InputDigestMismatchError"]
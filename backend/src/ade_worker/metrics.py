@@ -0,0 +1,309 @@
+"""Prometheus text-format metrics for the worker.
+
+A deliberately small registry (counters, gauges, histograms with labels) so the
+worker needs no client library. ``start_metrics_server`` serves ``/metrics``
+from a daemon thread when ``ADE_WORKER_METRICS_PORT`` is set; without it the
+metrics are still recorded but never exported.
+
+Scrape-time values (queue depth and age) come from collectors registered with
+``REGISTRY.add_collector``; each returns ``(name, labels, value)`` samples for
+gauges declared up front.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TypeVar
+
+logger = logging.getLogger("ade_worker.metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LONG_DURATION_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+LabelValues = tuple[str, ...]
+Sample = tuple[str, dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + float(amount)
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DURATION_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, totals = self._series.setdefault(key, ([0] * len(self.buckets), [0.0, 0.0]))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            totals[0] += 1
+            totals[1] += float(value)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return int(series[1][0]) if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, (list(c), list(t))) for key, (c, t) in self._series.items())
+        lines: list[str] = []
+        for key, (counts, (total_count, total_sum)) in items:
+            for bound, count in zip(self.buckets, counts, strict=True):
+                labels = _label_text(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _label_text(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {_format_value(total_count)}")
+            plain = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(total_sum)}")
+            lines.append(f"{self.name}_count{plain} {_format_value(total_count)}")
+        return lines
+
+
+MetricT = TypeVar("MetricT", bound=_Metric)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: MetricT) -> MetricT:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for collector in collectors:
+            try:
+                for name, labels, value in collector():
+                    metric = self._metrics.get(name)
+                    if isinstance(metric, Gauge):
+                        metric.set(value, **labels)
+            except Exception as exc:
+                logger.warning("metrics.collect_failed error=%s", exc)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def _gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def _histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    *,
+    buckets: Sequence[float] = DURATION_BUCKETS,
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+
+QUEUE_DEPTH = _gauge("ade_worker_queue_depth", "Queued runs that are due now.")
+QUEUE_OLDEST_AGE = _gauge(
+    "ade_worker_queue_oldest_age_seconds",
+    "Seconds the oldest due queued run has been waiting.",
+)
+CLAIM_DURATION = _histogram(
+    "ade_worker_claim_duration_seconds",
+    "Latency of one claim query.",
+)
+RUNS_CLAIMED = _counter("ade_worker_runs_claimed_total", "Runs claimed by this worker.")
+TIME_TO_FIRST_EVENT = _histogram(
+    "ade_worker_time_to_first_event_seconds",
+    "Seconds from the worker picking up a run to the engine's first event.",
+    buckets=LONG_DURATION_BUCKETS,
+)
+ENVIRONMENTS = _counter(
+    "ade_worker_environments_total",
+    "Environment requests by result (reused, built, restored, failed, lost).",
+    ("result",),
+)
+ENVIRONMENT_BUILD_DURATION = _histogram(
+    "ade_worker_environment_build_duration_seconds",
+    "Wall time of environment builds that finished, by result (built, restored).",
+    ("result",),
+    buckets=LONG_DURATION_BUCKETS,
+)
+STORAGE_BYTES = _counter(
+    "ade_worker_storage_bytes_total",
+    "Bytes moved between the worker and blob storage.",
+    ("direction",),
+)
+STORAGE_DURATION = _histogram(
+    "ade_worker_storage_transfer_duration_seconds",
+    "Wall time of blob transfers; bytes_total / duration_sum is throughput.",
+    ("direction",),
+)
+ENGINE_DURATION = _histogram(
+    "ade_worker_engine_duration_seconds",
+    "Engine wall time by run operation.",
+    ("operation",),
+    buckets=LONG_DURATION_BUCKETS,
+)
+LEASE_LOSSES = _counter(
+    "ade_worker_lease_losses_total",
+    "Runs interrupted because their lease was lost or the run was cancelled.",
+    ("reason",),
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry: Registry = REGISTRY
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        logger.debug("metrics.request " + format, *args)
+
+
+def start_metrics_server(host: str, port: int) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` on ``host:port`` from a daemon thread."""
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="ade-metrics", daemon=True)
+    thread.start()
+    logger.info("metrics.server.start host=%s port=%s", host, server.server_address[1])
+    return server
+
+
+__all__ = [
+    "CLAIM_DURATION",
+    "ENGINE_DURATION",
+    "ENVIRONMENTS",
+    "ENVIRONMENT_BUILD_DURATION",
+    "LEASE_LOSSES",
+    "QUEUE_DEPTH",
+    "QUEUE_OLDEST_AGE",
+    "REGISTRY",
+    "RUNS_CLAIMED",
+    "STORAGE_BYTES",
+    "STORAGE_DURATION",
+    "TIME_TO_FIRST_EVENT",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "start_metrics_server",
+]
@@ -36,6 +36,8 @@ class Settings(
     log_format: str = "console"
     log_level: str | None = None
     worker_log_level: str | None = None
+    worker_metrics_port: int | None = Field(None, ge=1, le=65535)
+    worker_metrics_host: str = "0.0.0.0"
 
     # ---- Garbage collection (run via scheduled job) -----------------------
     worker_cache_ttl_days: int = Field(30, ge=0)
@@ -45,15 +47,35 @@ class Settings(
     worker_lease_seconds: int = Field(900, ge=1)
     worker_backoff_base_seconds: int = Field(5, ge=0)
     worker_backoff_max_seconds: int = Field(300, ge=0)
+    worker_run_batch_size: int = Field(1, ge=1)
+    worker_workspace_max_concurrent_runs: int | None = Field(None, ge=1)
+
+    # ---- Admission ---------------------------------------------------------
+    worker_admission_enabled: bool = False
+    worker_admission_memory_target: float = Field(0.85, gt=0, le=1)
+    worker_admission_cpu_target: float = Field(0.9, gt=0)
+    worker_run_max_memory_mb: int | None = Field(None, ge=1)
 
     # ---- Runtime filesystem ------------------------------------------------
     worker_cache_dir: Path = Field(default=Path("/tmp/ade-worker-cache"))
+    worker_env_artifacts_enabled: bool = False
+    worker_input_cache_max_mb: int | None = Field(None, ge=1)
 
     # ---- Timeouts ----------------------------------------------------------
     worker_env_build_timeout_seconds: int = Field(600, ge=1)
     worker_run_timeout_seconds: int | None = None
     worker_log_upload_interval_seconds: float = Field(1.0, gt=0)
 
+    # ---- Warm engine hosts -------------------------------------------------
+    worker_engine_pool_enabled: bool = False
+    worker_engine_pool_max_jobs: int = Field(50, ge=1)
+    worker_engine_pool_max_rss_mb: int | None = Field(2048, ge=1)
+    worker_engine_pool_idle_seconds: float = Field(600.0, gt=0)
+
+    # ---- Outputs -----------------------------------------------------------
+    worker_output_sidecar_enabled: bool = True
+    worker_result_cache_enabled: bool = False
+
     @model_validator(mode="after")
     def _finalize(self) -> Settings:
         self.log_format = normalize_log_format(self.log_format, env_var="ADE_LOG_FORMAT")
@@ -62,6 +84,12 @@ class Settings(
             self.worker_log_level,
             env_var="ADE_WORKER_LOG_LEVEL",
         )
+        if self.worker_run_batch_size > 1 and not self.worker_engine_pool_enabled:
+            # Batched runs only save start-up work on a warm engine host; on
+            # cold subprocesses they would just serialize runs in one slot.
+            raise ValueError(
+                "ADE_WORKER_RUN_BATCH_SIZE above 1 requires ADE_WORKER_ENGINE_POOL_ENABLED=true."
+            )
         return self
 
     @property
@@ -84,6 +112,10 @@ class Settings(
     def worker_uv_cache_dir(self) -> Path:
         return self.worker_cache_dir / "uv"
 
+    @property
+    def worker_input_cache_dir(self) -> Path:
+        return self.worker_cache_dir / "inputs"
+
     def backoff_seconds(self, attempt_count: int) -> int:
         base = max(0, int(self.worker_backoff_base_seconds))
         delay = base * (2 ** max(attempt_count - 1, 0))
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import mimetypes
 import os
+import queue
 import random
+import selectors
 import shutil
 import signal
 import socket
@@ -15,16 +18,30 @@ import sys
 import threading
 import time
 from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
 from typing import Any, Callable
 from uuid import UUID, uuid4
 
+import orjson
 import psycopg
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from ade_api.common.workbook_metadata import (
+    capture_workbook_metadata,
+    is_workbook_filename,
+    sheet_row_index,
+    workbook_metadata_sheets,
+)
+from ade_api.common.workbook_ranges import read_workbook_sheets
+from ade_api.common.workbook_sidecar import (
+    SIDECAR_SUFFIX,
+    sidecar_descriptor,
+    write_workbook_sidecar,
+)
 from ade_api.features.configs.storage import compute_config_digest
 from ade_db.engine import (
     assert_tables_exist,
@@ -34,17 +51,38 @@ from ade_db.engine import (
 )
 from ade_db.models import FileKind, RunOperation
 from . import db
+from .admission import AdmissionController, ResourceProbe, current_cgroup_dir, limit_process_memory
+from .env_artifacts import environment_artifact_blob_name, pack_environment, unpack_environment
+from .gc import gc_input_cache
+from .input_cache import InputBlobCache
+from .metrics import (
+    CLAIM_DURATION,
+    ENGINE_DURATION,
+    ENVIRONMENT_BUILD_DURATION,
+    ENVIRONMENTS,
+    LEASE_LOSSES,
+    QUEUE_DEPTH,
+    QUEUE_OLDEST_AGE,
+    REGISTRY,
+    RUNS_CLAIMED,
+    STORAGE_BYTES,
+    STORAGE_DURATION,
+    TIME_TO_FIRST_EVENT,
+    start_metrics_server,
+)
 from .paths import PathManager
 from ade_db.schema import REQUIRED_TABLES
 from .settings import Settings, get_settings
-from ade_storage import build_storage_adapter, ensure_storage_roots
+from ade_storage import IncrementalLogSink, build_storage_adapter, ensure_storage_roots
 
 logger = logging.getLogger("ade_worker")
 
 CHANNEL_RUN_QUEUED = "ade_run_queued"
+CHANNEL_RUN_CANCELLED = "ade_run_cancelled"
 CLAIM_BATCH_SIZE = 5
 LISTEN_MAX_BACKOFF_SECONDS = 30.0
 NOTIFY_JITTER_MS = 200
+ADMISSION_RECHECK_SECONDS = 2.0
 _CONFIG_DIGEST_SNAPSHOT_KEY = "__config_digest_snapshot"
 _STANDARD_LOG_ATTRS = {
     "name",
@@ -183,20 +221,25 @@ class PgListener:
             return False
 
     def wait(self, timeout: float) -> bool:
+        return self.receive(timeout) is not None
+
+    def receive(self, timeout: float) -> str | None:
+        """Wait up to ``timeout`` seconds for one notification and return its payload."""
+
         if timeout <= 0:
-            return False
+            return None
         if not self.ensure_connected():
-            return False
+            return None
         try:
-            for _notify in self.conn.notifies(timeout=timeout):
-                return True
-            return False
+            for notify in self.conn.notifies(timeout=timeout):
+                return notify.payload
+            return None
         except Exception:
             logger.exception("run.notify.listen_failed retry_in=%ss", self.backoff)
             self.close()
             time.sleep(self.backoff + random.random())
             self.backoff = min(LISTEN_MAX_BACKOFF_SECONDS, self.backoff * 2)
-            return False
+            return None
 
 
 # --- NDJSON logging + subprocess runner ---
@@ -205,13 +248,26 @@ def utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+EVENT_LOG_FLUSH_SECONDS = 0.25
+EVENT_LOG_FLUSH_BYTES = 64 * 1024
+
+
 class EventLog:
-    """Append-only NDJSON log file."""
+    """Append-only NDJSON log file.
+
+    With ``buffered=True`` lines are collected in memory and written in one
+    append every ``EVENT_LOG_FLUSH_SECONDS`` (or ``EVENT_LOG_FLUSH_BYTES``);
+    whoever reads the file (the run log uploader) calls ``flush()`` first.
+    """
 
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, *, buffered: bool = False) -> None:
         self.path = Path(path)
+        self.buffered = buffered
         self._lock = threading.Lock()
         self._dir_ready = False
+        self._pending: list[bytes] = []
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
         self._ensure_parent()
 
     def _ensure_parent(self) -> None:
@@ -220,19 +276,44 @@ class EventLog:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self._dir_ready = True
 
+    def _write(self, data: bytes) -> None:
+        try:
+            self._ensure_parent()
+            with self.path.open("ab") as f:
+                f.write(data)
+        except FileNotFoundError:
+            # Parent directory may have been cleaned up; recreate once.
+            self._dir_ready = False
+            self._ensure_parent()
+            with self.path.open("ab") as f:
+                f.write(data)
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending.clear()
+        self._pending_bytes = 0
+        self._write(data)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
     def append(self, record: dict[str, Any]) -> None:
-        line = json.dumps(record, ensure_ascii=False) + "\n"
+        line = orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS, default=str) + b"\n"
         with self._lock:
-            try:
-                self._ensure_parent()
-                with self.path.open("a", encoding="utf-8") as f:
-                    f.write(line)
-            except FileNotFoundError:
-                # Parent directory may have been cleaned up; recreate once.
-                self._dir_ready = False
-                self._ensure_parent()
-                with self.path.open("a", encoding="utf-8") as f:
-                    f.write(line)
+            if not self.buffered:
+                self._write(line)
+                return
+            self._pending.append(line)
+            self._pending_bytes += len(line)
+            if (
+                self._pending_bytes >= EVENT_LOG_FLUSH_BYTES
+                or time.monotonic() - self._last_flush >= EVENT_LOG_FLUSH_SECONDS
+            ):
+                self._flush_locked()
 
     def emit(
         self,
@@ -266,6 +347,98 @@ class HeartbeatLostError(RuntimeError):
     """Raised when a lease heartbeat fails and work should stop."""
 
 
+class RunCancelledError(HeartbeatLostError):
+    """Raised when a run's stop event fires because the run was cancelled."""
+
+
+def _parse_event_line(line: str | bytes) -> dict[str, Any] | None:
+    if line[:1] not in ("{", b"{"):
+        return None
+    try:
+        obj = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
+    return obj if isinstance(obj, dict) and "event" in obj else None
+
+
+class _LineSplitter:
+    """Reassemble complete lines from non-blocking pipe reads."""
+
+    __slots__ = ("stream_name", "_partial")
+
+    def __init__(self, stream_name: str) -> None:
+        self.stream_name = stream_name
+        self._partial = b""
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        return lines
+
+    def finish(self) -> list[bytes]:
+        partial, self._partial = self._partial, b""
+        return [partial] if partial else []
+
+
+def _record_output_line(
+    line: str,
+    obj: dict[str, Any] | None,
+    *,
+    stream_name: str,
+    event_log: EventLog,
+    scope: str,
+    context: dict[str, Any] | None,
+    on_json_event: Callable[[dict[str, Any]], None] | None,
+) -> None:
+    """Append one line of child output to the run log (NDJSON events pass through)."""
+
+    if obj is None:
+        event_log.emit(event=f"{scope}.{stream_name}", message=line, context=context)
+        return
+    if context:
+        obj = dict(obj)
+        obj.setdefault("context", {})
+        if isinstance(obj["context"], dict):
+            obj["context"].update(dict(context))
+        else:
+            obj["context"] = dict(context)
+    event_log.append(obj)
+    if on_json_event:
+        on_json_event(obj)
+
+
+def _terminate_process_group(proc: subprocess.Popen) -> None:
+    try:
+        if os.name != "nt":
+            try:
+                os.killpg(proc.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                return
+        else:
+            proc.terminate()
+    except Exception:
+        pass
+
+    try:
+        proc.wait(timeout=5)
+        return
+    except Exception:
+        pass
+
+    try:
+        if os.name != "nt":
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except Exception:
+        pass
+
+
+SUBPROCESS_READ_BYTES = 64 * 1024
+SUBPROCESS_WAKE_SECONDS = 0.25
+SUBPROCESS_PIPE_GRACE_SECONDS = 2.0
+
+
 class SubprocessRunner:
     def run(
         self,
@@ -280,6 +453,8 @@ class SubprocessRunner:
         heartbeat_interval: float = 15.0,
         context: dict[str, Any] | None = None,
         on_json_event: Callable[[dict[str, Any]], None] | None = None,
+        stop_event: threading.Event | None = None,
+        memory_limit_bytes: int | None = None,
     ) -> SubprocessResult:
         start = time.monotonic()
         deadline = (start + float(timeout_seconds)) if timeout_seconds is not None else None
@@ -295,55 +470,293 @@ class SubprocessRunner:
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
+            bufsize=0,
             cwd=cwd,
             env=env,
             start_new_session=(os.name != "nt"),
         )
+        if memory_limit_bytes is not None:
+            limit_process_memory(proc.pid, memory_limit_bytes)
+        try:
+            timed_out = self._supervise(
+                proc,
+                event_log=event_log,
+                scope=scope,
+                deadline=deadline,
+                heartbeat=heartbeat,
+                heartbeat_interval=float(heartbeat_interval),
+                context=context,
+                on_json_event=on_json_event,
+                stop_event=stop_event,
+            )
+        except BaseException:
+            self._terminate(proc)
+            raise
+        finally:
+            for stream in (proc.stdout, proc.stderr):
+                if stream is not None:
+                    stream.close()
 
-        errors: list[BaseException] = []
-        timed_out = False
+        duration = max(0.0, time.monotonic() - start)
+        exit_code = int(proc.returncode or 0)
+        if timed_out:
+            exit_code = 124
 
-        def drain(stream, stream_name: str) -> None:
-            try:
-                assert stream is not None
-                for raw in iter(stream.readline, ""):
-                    line = raw.rstrip("\n")
-                    if not line:
+        event_log.emit(
+            event=f"{scope}.complete",
+            message="Subprocess finished",
+            data={"cmd": cmd, "exit_code": exit_code, "timed_out": timed_out, "duration_seconds": duration},
+            context=context,
+        )
+
+        return SubprocessResult(exit_code=exit_code, timed_out=timed_out, duration_seconds=duration)
+
+    def _supervise(
+        self,
+        proc: subprocess.Popen,
+        *,
+        event_log: EventLog,
+        scope: str,
+        deadline: float | None,
+        heartbeat: Callable[[], bool] | None,
+        heartbeat_interval: float,
+        context: dict[str, Any] | None,
+        on_json_event: Callable[[dict[str, Any]], None] | None,
+        stop_event: threading.Event | None,
+    ) -> bool:
+        """Drain both pipes from one selector loop; return ``True`` on timeout.
+
+        The loop sleeps in ``select`` until output arrives or the next heartbeat,
+        deadline or cancellation check is due, so an idle child costs no wakeups
+        beyond ``SUBPROCESS_WAKE_SECONDS`` and no drain threads.
+        """
+
+        selector = selectors.DefaultSelector()
+        for stream, stream_name in ((proc.stdout, "stdout"), (proc.stderr, "stderr")):
+            assert stream is not None
+            os.set_blocking(stream.fileno(), False)
+            selector.register(stream.fileno(), selectors.EVENT_READ, _LineSplitter(stream_name))
+
+        def _record(raw: bytes, stream_name: str) -> None:
+            raw = raw.rstrip(b"\r")
+            if not raw:
+                return
+            obj = _parse_event_line(raw)
+            line = raw.decode("utf-8", errors="replace") if obj is None else ""
+            _record_output_line(
+                line,
+                obj,
+                stream_name=stream_name,
+                event_log=event_log,
+                scope=scope,
+                context=context,
+                on_json_event=on_json_event,
+            )
+
+        def _call_heartbeat() -> None:
+            assert heartbeat is not None
+            if heartbeat() is False:
+                raise HeartbeatLostError("Lease heartbeat failed")
+
+        next_hb = float("inf")
+        if heartbeat:
+            _call_heartbeat()
+            next_hb = time.monotonic() + heartbeat_interval
+        exited_at: float | None = None
+
+        try:
+            while True:
+                now = time.monotonic()
+                if stop_event is not None and stop_event.is_set():
+                    raise RunCancelledError("Run cancelled")
+                if now >= next_hb:
+                    _call_heartbeat()
+                    next_hb = now + heartbeat_interval
+                if deadline is not None and now >= deadline:
+                    self._terminate(proc)
+                    return True
+
+                if not selector.get_map():
+                    # Both pipes closed; wait for the exit status with the same checks.
+                    try:
+                        proc.wait(timeout=self._wake_timeout(now, next_hb, deadline))
+                    except subprocess.TimeoutExpired:
                         continue
+                    return False
+
+                if exited_at is None and proc.poll() is not None:
+                    exited_at = now
+                if exited_at is not None and now - exited_at >= SUBPROCESS_PIPE_GRACE_SECONDS:
+                    # A grandchild kept the pipes open after the child exited.
+                    return False
+
+                for key, _mask in selector.select(self._wake_timeout(now, next_hb, deadline)):
+                    splitter: _LineSplitter = key.data
                     try:
-                        obj = json.loads(line) if line.startswith("{") else None
-                    except json.JSONDecodeError:
-                        obj = None
-
-                    if isinstance(obj, dict) and "event" in obj:
-                        if context:
-                            obj = dict(obj)
-                            obj.setdefault("context", {})
-                            if isinstance(obj["context"], dict):
-                                obj["context"].update(dict(context))
-                            else:
-                                obj["context"] = dict(context)
-                        event_log.append(obj)
-                        if on_json_event:
-                            on_json_event(obj)
+                        chunk = os.read(key.fd, SUBPROCESS_READ_BYTES)
+                    except BlockingIOError:
+                        continue
+                    if chunk:
+                        lines = splitter.feed(chunk)
                     else:
-                        event_log.emit(event=f"{scope}.{stream_name}", message=line, context=context)
-            except BaseException as exc:
-                errors.append(exc)
-            finally:
-                try:
-                    stream.close()  # type: ignore[attr-defined]
-                except Exception:
-                    pass
+                        selector.unregister(key.fd)
+                        lines = splitter.finish()
+                    for raw in lines:
+                        _record(raw, splitter.stream_name)
+        finally:
+            for key in list(selector.get_map().values()):
+                for raw in key.data.finish():
+                    _record(raw, key.data.stream_name)
+            selector.close()
+
+    @staticmethod
+    def _wake_timeout(now: float, next_hb: float, deadline: float | None) -> float:
+        due = min(next_hb, deadline if deadline is not None else float("inf"))
+        return max(0.0, min(due - now, SUBPROCESS_WAKE_SECONDS))
+
+    def _terminate(self, proc: subprocess.Popen) -> None:
+        _terminate_process_group(proc)
+
+
+# --- Warm engine hosts ---
+
+ENGINE_HOST_SCRIPT = Path(__file__).with_name("engine_host.py")
+ENGINE_HOST_JOB_COMPLETED = "engine_host.job.completed"
+ENGINE_HOST_READY = "engine_host.ready"
+
+
+class EngineHostError(RuntimeError):
+    """Raised when a warm engine host cannot accept a job."""
+
+
+def _record_transfer(direction: str, path: Path, started: float) -> None:
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return
+    STORAGE_BYTES.inc(size, direction=direction)
+    STORAGE_DURATION.observe(time.monotonic() - started, direction=direction)
+
+
+def _run_memory_limit_bytes(settings: Settings) -> int | None:
+    max_mb = settings.worker_run_max_memory_mb
+    return max_mb * 1024 * 1024 if max_mb else None
+
+
+def _process_rss_bytes(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class EngineHost:
+    """One long-lived ``ade_engine`` process serving jobs over NDJSON stdin/stdout."""
+
+    def __init__(
+        self,
+        *,
+        key: tuple[str, str],
+        python_bin: Path,
+        env: dict[str, str] | None,
+        script: Path = ENGINE_HOST_SCRIPT,
+        memory_limit_bytes: int | None = None,
+    ) -> None:
+        self.key = key
+        self.python_bin = Path(python_bin)
+        self.jobs_completed = 0
+        self.last_used = time.monotonic()
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self.proc = subprocess.Popen(
+            [str(self.python_bin), "-u", str(script)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            env=env,
+            start_new_session=(os.name != "nt"),
+        )
+        if memory_limit_bytes is not None:
+            limit_process_memory(self.proc.pid, memory_limit_bytes)
+        self._reader = threading.Thread(
+            target=self._read_output,
+            name=f"engine-host-{self.proc.pid}",
+            daemon=True,
+        )
+        self._reader.start()
+
+    @property
+    def pid(self) -> int:
+        return self.proc.pid
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def rss_bytes(self) -> int | None:
+        return _process_rss_bytes(self.proc.pid)
+
+    def _read_output(self) -> None:
+        stream = self.proc.stdout
+        try:
+            assert stream is not None
+            for raw in iter(stream.readline, ""):
+                self._lines.put(raw.rstrip("\n"))
+        except Exception:
+            pass
+        finally:
+            self._lines.put(None)
+
+    def close(self) -> None:
+        if self.proc.stdin is not None:
+            try:
+                self.proc.stdin.close()
+            except Exception:
+                pass
+        if self.alive:
+            _terminate_process_group(self.proc)
+        self._reader.join(timeout=2)
+
+    def run_job(
+        self,
+        argv: list[str],
+        *,
+        config_dir: Path,
+        event_log: EventLog,
+        scope: str,
+        timeout_seconds: float | None,
+        heartbeat: Callable[[], bool] | None = None,
+        heartbeat_interval: float = 15.0,
+        context: dict[str, Any] | None = None,
+        on_json_event: Callable[[dict[str, Any]], None] | None = None,
+        stop_event: threading.Event | None = None,
+    ) -> SubprocessResult:
+        start = time.monotonic()
+        deadline = (start + float(timeout_seconds)) if timeout_seconds is not None else None
+        job_id = uuid4().hex
+        cmd = [str(self.python_bin), "-m", "ade_engine", *argv]
 
-        threads = [
-            threading.Thread(target=drain, args=(proc.stdout, "stdout"), daemon=True),
-            threading.Thread(target=drain, args=(proc.stderr, "stderr"), daemon=True),
-        ]
-        for t in threads:
-            t.start()
+        event_log.emit(
+            event=f"{scope}.start",
+            message="Starting engine job on warm host",
+            data={"cmd": cmd, "cwd": "", "host_pid": self.pid, "host_jobs": self.jobs_completed},
+            context=context,
+        )
+
+        if not self.alive or self.proc.stdin is None:
+            raise EngineHostError("engine host is not running")
+        try:
+            self.proc.stdin.write(
+                json.dumps({"job_id": job_id, "argv": argv, "config_dir": str(config_dir)}) + "\n"
+            )
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as exc:
+            raise EngineHostError(f"engine host rejected job: {exc}") from exc
 
         def _call_heartbeat() -> None:
             if not heartbeat:
@@ -351,10 +764,10 @@ class SubprocessRunner:
             try:
                 ok = heartbeat()
             except BaseException:
-                self._terminate(proc)
+                self.close()
                 raise
             if ok is False:
-                self._terminate(proc)
+                self.close()
                 raise HeartbeatLostError("Lease heartbeat failed")
 
         last_hb = 0.0
@@ -362,77 +775,340 @@ class SubprocessRunner:
             _call_heartbeat()
             last_hb = time.monotonic()
 
-        while True:
-            if errors:
-                raise errors[0]
-
+        timed_out = False
+        exit_code: int | None = None
+        while exit_code is None:
             now = time.monotonic()
-
+            if stop_event is not None and stop_event.is_set():
+                self.close()
+                raise RunCancelledError("Run cancelled")
             if heartbeat and (now - last_hb) >= float(heartbeat_interval):
                 _call_heartbeat()
                 last_hb = now
 
             if deadline is not None and now >= deadline:
                 timed_out = True
-                self._terminate(proc)
+                self.close()
                 break
 
-            rc = proc.poll()
-            if rc is not None:
+            try:
+                line = self._lines.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if line is None:
+                # Host exited mid-job (crash, OOM kill); surface its return code.
+                self.proc.wait(timeout=2)
+                exit_code = int(self.proc.returncode or 1)
                 break
+            if not line:
+                continue
+            obj = _parse_event_line(line)
+            if obj is not None and obj.get("event") == ENGINE_HOST_JOB_COMPLETED:
+                data = obj.get("data") if isinstance(obj.get("data"), dict) else {}
+                if data.get("job_id") == job_id:
+                    exit_code = _as_int(data.get("exit_code"))
+                    if exit_code is None:
+                        exit_code = 1
+                continue
+            if obj is not None and obj.get("event") == ENGINE_HOST_READY:
+                continue
+            _record_output_line(
+                line,
+                obj,
+                stream_name="stdout",
+                event_log=event_log,
+                scope=scope,
+                context=context,
+                on_json_event=on_json_event,
+            )
 
-            time.sleep(0.05)
-
-        try:
-            proc.wait(timeout=2)
-        except subprocess.TimeoutExpired:
-            self._terminate(proc)
-
-        for t in threads:
-            t.join(timeout=2)
-
-        if errors:
-            raise errors[0]
-
+        self.jobs_completed += 1
+        self.last_used = time.monotonic()
         duration = max(0.0, time.monotonic() - start)
-        exit_code = int(proc.returncode or 0)
         if timed_out:
             exit_code = 124
 
         event_log.emit(
             event=f"{scope}.complete",
             message="Subprocess finished",
-            data={"cmd": cmd, "exit_code": exit_code, "timed_out": timed_out, "duration_seconds": duration},
+            data={
+                "cmd": cmd,
+                "exit_code": exit_code,
+                "timed_out": timed_out,
+                "duration_seconds": duration,
+                "host_pid": self.pid,
+            },
             context=context,
         )
+        return SubprocessResult(
+            exit_code=int(exit_code or 0),
+            timed_out=timed_out,
+            duration_seconds=duration,
+        )
 
-        return SubprocessResult(exit_code=exit_code, timed_out=timed_out, duration_seconds=duration)
 
-    def _terminate(self, proc: subprocess.Popen) -> None:
-        try:
-            if os.name != "nt":
-                try:
-                    os.killpg(proc.pid, signal.SIGTERM)
-                except ProcessLookupError:
-                    return
-            else:
-                proc.terminate()
-        except Exception:
-            pass
+class EnginePool:
+    """Warm engine hosts keyed by ``(configuration_id, deps_digest)``.
 
-        try:
-            proc.wait(timeout=5)
+    Hosts are checked out for one job at a time and returned afterwards. A host
+    is recycled once it has served ``max_jobs_per_host`` jobs, grows past
+    ``max_rss_bytes``, sits idle longer than ``idle_seconds``, or is killed by a
+    timeout or lost lease.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_jobs_per_host: int,
+        max_rss_bytes: int | None,
+        idle_seconds: float,
+        max_idle_hosts: int,
+        script: Path = ENGINE_HOST_SCRIPT,
+        memory_limit_bytes: int | None = None,
+    ) -> None:
+        self.max_jobs_per_host = max(1, int(max_jobs_per_host))
+        self.max_rss_bytes = max_rss_bytes
+        self.idle_seconds = float(idle_seconds)
+        self.max_idle_hosts = max(0, int(max_idle_hosts))
+        self.script = script
+        self.memory_limit_bytes = memory_limit_bytes
+        self._idle: list[EngineHost] = []
+        self._lock = threading.Lock()
+
+    def _should_recycle(self, host: EngineHost) -> str | None:
+        if not host.alive:
+            return "exited"
+        if host.jobs_completed >= self.max_jobs_per_host:
+            return "max_jobs"
+        if self.max_rss_bytes is not None:
+            rss = host.rss_bytes()
+            if rss is not None and rss > self.max_rss_bytes:
+                return "max_rss"
+        return None
+
+    def _evict_idle_locked(self, now: float) -> list[EngineHost]:
+        expired = [host for host in self._idle if now - host.last_used > self.idle_seconds]
+        keep = [host for host in self._idle if host not in expired]
+        while len(keep) > self.max_idle_hosts:
+            expired.append(keep.pop(0))
+        self._idle = keep
+        return expired
+
+    def acquire(
+        self,
+        key: tuple[str, str],
+        *,
+        python_bin: Path,
+        env: dict[str, str] | None,
+    ) -> EngineHost:
+        with self._lock:
+            stale = self._evict_idle_locked(time.monotonic())
+            host = None
+            for candidate in reversed(self._idle):
+                if candidate.key == key and candidate.python_bin == Path(python_bin):
+                    host = candidate
+                    break
+            if host is not None:
+                self._idle.remove(host)
+        for item in stale:
+            logger.info("engine.host.recycle pid=%s reason=idle", item.pid)
+            item.close()
+        if host is not None and host.alive:
+            return host
+        if host is not None:
+            host.close()
+        host = EngineHost(
+            key=key,
+            python_bin=python_bin,
+            env=env,
+            script=self.script,
+            memory_limit_bytes=self.memory_limit_bytes,
+        )
+        logger.info(
+            "engine.host.start pid=%s configuration_id=%s deps_digest=%s",
+            host.pid,
+            key[0],
+            key[1],
+        )
+        return host
+
+    def release(self, host: EngineHost) -> None:
+        reason = self._should_recycle(host)
+        if reason is not None:
+            logger.info(
+                "engine.host.recycle pid=%s reason=%s jobs=%s",
+                host.pid,
+                reason,
+                host.jobs_completed,
+            )
+            host.close()
             return
-        except Exception:
-            pass
+        with self._lock:
+            self._idle.append(host)
+            stale = self._evict_idle_locked(time.monotonic())
+        for item in stale:
+            logger.info("engine.host.recycle pid=%s reason=idle", item.pid)
+            item.close()
 
+    def run(
+        self,
+        key: tuple[str, str],
+        argv: list[str],
+        *,
+        python_bin: Path,
+        config_dir: Path,
+        env: dict[str, str] | None,
+        event_log: EventLog,
+        scope: str,
+        timeout_seconds: float | None,
+        heartbeat: Callable[[], bool] | None = None,
+        heartbeat_interval: float = 15.0,
+        context: dict[str, Any] | None = None,
+        on_json_event: Callable[[dict[str, Any]], None] | None = None,
+        stop_event: threading.Event | None = None,
+    ) -> SubprocessResult:
+        host = self.acquire(key, python_bin=python_bin, env=env)
         try:
-            if os.name != "nt":
-                os.killpg(proc.pid, signal.SIGKILL)
-            else:
-                proc.kill()
-        except Exception:
-            pass
+            result = host.run_job(
+                argv,
+                config_dir=config_dir,
+                event_log=event_log,
+                scope=scope,
+                timeout_seconds=timeout_seconds,
+                heartbeat=heartbeat,
+                heartbeat_interval=heartbeat_interval,
+                context=context,
+                on_json_event=on_json_event,
+                stop_event=stop_event,
+            )
+        except BaseException:
+            host.close()
+            raise
+        self.release(host)
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            hosts, self._idle = self._idle, []
+        for host in hosts:
+            host.close()
+
+
+class LeaseManager:
+    """Renew every lease this worker holds with one UPDATE per interval.
+
+    Runs are tracked from claim until they finish. Heartbeat callbacks only read
+    the manager's state, so they never touch the database; a lease found lost on
+    renewal is reported to its run at the run's next heartbeat. A lease that has
+    not been confirmed for half the lease window (claim or last successful
+    renewal) is reported lost too, so a database outage stops runs before another
+    worker can requeue them.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory: sessionmaker[Session],
+        worker_id: str,
+        lease_seconds: int,
+        interval_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.session_factory = session_factory
+        self.worker_id = worker_id
+        self.lease_seconds = int(lease_seconds)
+        self.interval_seconds = max(0.1, float(interval_seconds))
+        self.clock = clock
+        self._held: set[str] = set()
+        self._lost: set[str] = set()
+        self._confirmed_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def track(self, run_ids: list[str]) -> None:
+        claimed_at = self.clock()
+        with self._lock:
+            for run_id in run_ids:
+                key = str(run_id).lower()
+                self._held.add(key)
+                self._lost.discard(key)
+                self._confirmed_at[key] = claimed_at
+
+    def release(self, run_id: str) -> None:
+        key = str(run_id).lower()
+        with self._lock:
+            self._held.discard(key)
+            self._lost.discard(key)
+            self._confirmed_at.pop(key, None)
+
+    def mark_lost(self, run_id: str) -> bool:
+        """Mark a tracked run's lease lost (e.g. on cancellation); ``False`` if untracked."""
+
+        key = str(run_id).lower()
+        with self._lock:
+            if key not in self._held:
+                return False
+            self._lost.add(key)
+            return True
+
+    def is_held(self, run_id: str) -> bool:
+        key = str(run_id).lower()
+        with self._lock:
+            if key in self._lost:
+                return False
+            confirmed_at = self._confirmed_at.get(key)
+        if confirmed_at is None:
+            return True
+        return self.clock() - confirmed_at < self.lease_seconds / 2
+
+    def renew(self, *, now: datetime | None = None) -> set[str]:
+        """Extend all tracked leases; return the run ids whose lease was lost."""
+
+        with self._lock:
+            run_ids = sorted(self._held - self._lost)
+        if not run_ids:
+            return set()
+        renewed_at = self.clock()
+        with session_scope(self.session_factory) as session:
+            held = db.heartbeat_runs(
+                session,
+                run_ids=run_ids,
+                worker_id=self.worker_id,
+                now=now or utcnow(),
+                lease_seconds=self.lease_seconds,
+            )
+        lost = set(run_ids) - held
+        with self._lock:
+            for run_id in held & self._held:
+                self._confirmed_at[run_id] = renewed_at
+            if lost:
+                lost &= self._held
+                self._lost.update(lost)
+        for run_id in sorted(lost):
+            logger.warning("run.lease.lost run_id=%s", run_id)
+        logger.debug("run.lease.renewed held=%s lost=%s", len(held), len(lost))
+        return lost
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.renew()
+            except Exception:
+                logger.exception("run.lease.renew_failed")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="ade-lease-manager", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 5.0)
+            self._thread = None
 
 
 # --- Run results parsing ---
@@ -871,6 +1547,25 @@ def _execution_payload(started_at: datetime, completed_at: datetime) -> dict[str
     }
 
 
+def _emit_run_interrupted(
+    event_log: EventLog,
+    exc: HeartbeatLostError,
+    *,
+    message: str,
+    context: dict[str, Any],
+) -> None:
+    LEASE_LOSSES.inc(reason="cancelled" if isinstance(exc, RunCancelledError) else "lost")
+    if isinstance(exc, RunCancelledError):
+        event_log.emit(
+            event="run.cancelled",
+            level="warning",
+            message="Run cancelled; engine stopped",
+            context=context,
+        )
+        return
+    event_log.emit(event="run.lost_claim", level="warning", message=message, context=context)
+
+
 def _emit_run_complete(
     event_log: EventLog,
     *,
@@ -945,6 +1640,41 @@ def _infer_output_path(output_dir: Path, *, run_dir: Path) -> str | None:
 
 # --- Worker ---
 
+def _run_log_blob_name(workspace_id: str, run_id: str) -> str:
+    return f"{workspace_id}/runs/{run_id}/logs/events.ndjson"
+
+
+def _output_sidecar_blob_name(workspace_id: str, run_id: str) -> str:
+    return f"{workspace_id}/runs/{run_id}/output/rows{SIDECAR_SUFFIX}"
+
+
+def _input_sidecar_blob_name(blob_name: str, file_version_id: str) -> str:
+    return f"{blob_name}.{file_version_id}{SIDECAR_SUFFIX}"
+
+
+def run_result_cache_key(
+    *,
+    input_sha256: str,
+    config_digest: str,
+    deps_digest: str,
+    options: RunOptions,
+    sheet_names: list[str],
+) -> str:
+    """Hash everything that decides a process run's results (log level does not)."""
+
+    payload = {
+        "input_sha256": input_sha256,
+        "config_digest": config_digest,
+        "deps_digest": deps_digest,
+        "sheet_names": list(sheet_names),
+        "active_sheet_only": options.active_sheet_only,
+        "max_findings_per_sheet": options.max_findings_per_sheet,
+        "extra_engine_args": list(options.extra_engine_args),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
 @dataclass(slots=True)
 class LocalVenvResult:
     python_bin: Path | None
@@ -961,6 +1691,15 @@ class Worker:
     paths: PathManager
     runner: SubprocessRunner
     storage: Any
+    engine_pool: EnginePool | None = None
+    lease_manager: LeaseManager | None = None
+    input_cache: InputBlobCache | None = None
+    admission: AdmissionController | None = None
+    cancel_events: dict[str, threading.Event] = field(default_factory=dict, repr=False)
+    event_logs: dict[str, EventLog] = field(default_factory=dict, repr=False)
+    log_sinks: dict[str, IncrementalLogSink] = field(default_factory=dict, repr=False)
+    log_offsets: dict[str, int] = field(default_factory=dict, repr=False)
+    batch_waiting: dict[str, list[str]] = field(default_factory=dict, repr=False)
 
     def _pip_env(self) -> dict[str, str]:
         env = dict(os.environ)
@@ -990,25 +1729,211 @@ class Worker:
         return None
 
     def _heartbeat_run(self, *, run_id: str, now: datetime | None = None) -> bool:
+        if self.lease_manager is not None:
+            # The lease manager renews every held lease in one UPDATE per tick.
+            return self.lease_manager.is_held(run_id)
         timestamp = now or utcnow()
+        waiting = self.batch_waiting.get(run_id)
         with session_scope(self.session_factory) as session:
-            return db.heartbeat_run(
+            ok = db.heartbeat_run(
                 session,
                 run_id=run_id,
                 worker_id=self.worker_id,
                 now=timestamp,
                 lease_seconds=int(self.settings.worker_lease_seconds),
             )
+            if waiting:
+                # Runs queued behind this one in its batch keep their leases too.
+                held = db.heartbeat_runs(
+                    session,
+                    run_ids=waiting,
+                    worker_id=self.worker_id,
+                    now=timestamp,
+                    lease_seconds=int(self.settings.worker_lease_seconds),
+                )
+                if len(held) < len(waiting):
+                    logger.warning(
+                        "run.batch.lease_lost run_id=%s lost=%s",
+                        run_id,
+                        len(waiting) - len(held),
+                    )
+        return ok
+
+    def _open_run_log_sink(self, *, workspace_id: str, run_id: str) -> IncrementalLogSink | None:
+        log_path = self.paths.run_event_log_path(workspace_id, run_id)
+        try:
+            writer = self.storage.open_append_writer(_run_log_blob_name(workspace_id, run_id))
+        except (AttributeError, NotImplementedError):
+            return None
+        return IncrementalLogSink(log_path, writer)
 
     def _upload_run_log(self, *, workspace_id: str, run_id: str) -> None:
+        event_log = self.event_logs.get(run_id)
+        if event_log is not None:
+            event_log.flush()
         log_path = self.paths.run_event_log_path(workspace_id, run_id)
         if not log_path.exists():
             return
-        blob_name = f"{workspace_id}/runs/{run_id}/logs/events.ndjson"
+        sink = self.log_sinks.get(run_id)
+        notified = self.log_offsets.get(run_id, 0)
         try:
-            self.storage.upload_path(blob_name, log_path)
+            if sink is not None:
+                sink.ship()
+                shipped_offset = sink.offset
+            else:
+                # Without an append writer the whole file is re-uploaded, so only
+                # do that (and notify) once it has grown.
+                if log_path.stat().st_size <= notified:
+                    return
+                blob_name = _run_log_blob_name(workspace_id, run_id)
+                stored = self.storage.upload_path(blob_name, log_path)
+                shipped_offset = int(getattr(stored, "byte_size", 0) or 0)
         except Exception as exc:
             logger.warning("run.logs.upload_failed run_id=%s error=%s", run_id, exc)
+            return
+        if shipped_offset > notified:
+            self.log_offsets[run_id] = shipped_offset
+            self._notify_run_log_advanced(run_id=run_id, offset=shipped_offset)
+
+    def _available_input_sheets(
+        self,
+        *,
+        file_row: dict[str, Any],
+        file_version: dict[str, Any],
+    ) -> list[str] | None:
+        """Sheet names of an xlsx input, without downloading it; ``None`` if unknown."""
+
+        filename = file_version.get("filename_at_upload") or file_row.get("name")
+        if not is_workbook_filename(str(filename or "")):
+            return None
+        stored = workbook_metadata_sheets(file_version.get("workbook_metadata"))
+        if stored is not None:
+            return [str(sheet["name"]) for sheet in stored]
+        blob_name = str(file_row.get("blob_name") or "")
+        try:
+            refs = read_workbook_sheets(
+                self.storage,
+                blob_name,
+                size=int(file_version.get("byte_size") or 0),
+                version_id=file_version.get("storage_version_id"),
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.debug("run.input.sheets_unavailable blob=%s error=%s", blob_name, exc)
+            return None
+        return [ref.name for ref in refs] or None
+
+    def _stage_input(
+        self,
+        *,
+        file_row: dict[str, Any],
+        file_version: dict[str, Any],
+        destination: Path,
+        run_id: str,
+    ) -> None:
+        """Download the run input, through the node-local cache when enabled."""
+
+        blob_name = str(file_row.get("blob_name") or "")
+        version_id = file_version.get("storage_version_id")
+        cache = self.input_cache
+        started = time.monotonic()
+        if cache is None:
+            self.storage.download_to_path(blob_name, version_id=version_id, destination=destination)
+            _record_transfer("download", destination, started)
+            return
+        hit = cache.stage(
+            self.storage,
+            blob_name=blob_name,
+            version_id=version_id,
+            sha256=_as_str(file_version.get("sha256")),
+            destination=destination,
+        )
+        if hit:
+            logger.info("run.input.cache_hit run_id=%s blob=%s", run_id, blob_name)
+            return
+        _record_transfer("download", destination, started)
+        try:
+            gc_input_cache(root=cache.root, max_bytes=cache.max_bytes)
+        except Exception as exc:
+            logger.warning("run.input.cache_gc_failed run_id=%s error=%s", run_id, exc)
+
+    def _store_row_sidecar(
+        self,
+        workbook: Path,
+        *,
+        blob_name: str,
+        run_dir: Path,
+        run_id: str,
+    ) -> dict[str, Any] | None:
+        """Write and upload a workbook's row sidecar; failures only cost read speed."""
+
+        sidecar_path = run_dir / Path(blob_name).name
+        try:
+            descriptor = write_workbook_sidecar(workbook, sidecar_path)
+            stored = self.storage.upload_path(blob_name, sidecar_path)
+            descriptor["blob_name"] = blob_name
+            descriptor["version_id"] = stored.version_id
+        except Exception as exc:
+            logger.warning(
+                "run.sidecar_failed run_id=%s blob=%s error=%s", run_id, blob_name, exc
+            )
+            return None
+        finally:
+            sidecar_path.unlink(missing_ok=True)
+        return descriptor
+
+    def _store_input_sidecar(
+        self,
+        staged_input: Path,
+        *,
+        file_row: dict[str, Any],
+        file_version: dict[str, Any],
+        run_dir: Path,
+        run_id: str,
+    ) -> None:
+        """Give a large input workbook a row sidecar for deep preview offsets.
+
+        A sheet's row index only skips XML parsing: a deflated sheet part is
+        still inflated from its first byte up to the checkpoint. Inputs with
+        an indexed (large) sheet and no sidecar get one from the staged copy,
+        so previews far into the sheet read two byte ranges instead.
+        """
+
+        metadata = file_version.get("workbook_metadata")
+        sheets = workbook_metadata_sheets(metadata)
+        if not isinstance(metadata, dict) or sheets is None:
+            return
+        if sidecar_descriptor(metadata) is not None:
+            return
+        if not any(sheet_row_index(sheet) is not None for sheet in sheets):
+            return
+        file_version_id = str(file_version["id"])
+        blob_name = str(file_row.get("blob_name") or "")
+        descriptor = self._store_row_sidecar(
+            staged_input,
+            blob_name=_input_sidecar_blob_name(blob_name, file_version_id),
+            run_dir=run_dir,
+            run_id=run_id,
+        )
+        if descriptor is None:
+            return
+        try:
+            with session_scope(self.session_factory) as session:
+                db.set_file_version_sidecar(
+                    session,
+                    file_version_id=file_version_id,
+                    workbook_metadata={**metadata, "sidecar": descriptor},
+                )
+        except Exception as exc:
+            logger.warning("run.input.sidecar_failed run_id=%s error=%s", run_id, exc)
+
+    def _notify_run_log_advanced(self, *, run_id: str, offset: int) -> None:
+        try:
+            with session_scope(self.session_factory) as session:
+                db.notify_run_log_advanced(session, run_id=run_id, offset=offset)
+        except Exception as exc:
+            logger.debug("run.logs.notify_failed run_id=%s error=%s", run_id, exc)
 
     def _start_run_log_uploader(
         self,
@@ -1018,6 +1943,9 @@ class Worker:
     ) -> tuple[threading.Event, threading.Thread]:
         stop_event = threading.Event()
         interval = max(0.1, float(self.settings.worker_log_upload_interval_seconds))
+        sink = self._open_run_log_sink(workspace_id=workspace_id, run_id=run_id)
+        if sink is not None:
+            self.log_sinks[run_id] = sink
 
         def _loop() -> None:
             while not stop_event.wait(interval):
@@ -1042,6 +1970,7 @@ class Worker:
         stop_event.set()
         thread.join(timeout=2.0)
         self._upload_run_log(workspace_id=workspace_id, run_id=run_id)
+        self.log_sinks.pop(run_id, None)
 
     def _cleanup_run_dir(self, *, run_dir: Path, workspace_id: str, run_id: str) -> None:
         try:
@@ -1052,31 +1981,111 @@ class Worker:
             logger.warning("run.dir.cleanup_skipped run_id=%s path=%s", run_id, run_dir)
             return
 
-        if not run_dir.exists():
-            return
+        if not run_dir.exists():
+            return
+        try:
+            shutil.rmtree(run_dir)
+        except Exception as exc:
+            logger.warning(
+                "run.dir.cleanup_failed run_id=%s workspace_id=%s error=%s",
+                run_id,
+                workspace_id,
+                exc,
+            )
+
+    @staticmethod
+    def _venv_marker_path(venv_root: Path) -> Path:
+        return venv_root / ".ready"
+
+    def _is_venv_ready(self, *, venv_root: Path, venv_dir: Path) -> bool:
+        marker_path = self._venv_marker_path(venv_root)
+        python_bin = self.paths.python_in_venv(venv_dir)
+        return marker_path.is_file() and python_bin.is_file()
+
+    def _touch_venv_marker(self, *, venv_root: Path) -> None:
+        marker_path = self._venv_marker_path(venv_root)
+        marker_path.parent.mkdir(parents=True, exist_ok=True)
+        marker_path.touch()
+
+    def _restore_environment_artifact(
+        self,
+        *,
+        deps_digest: str,
+        build_root: Path,
+        event_log: EventLog,
+        ctx: dict[str, Any],
+    ) -> bool:
+        """Unpack the shared environment for ``deps_digest`` into ``build_root``."""
+
+        blob_name = environment_artifact_blob_name(deps_digest)
+        archive_path = build_root / "environment.tar.gz"
+        venv_dir = build_root / ".venv"
+        started = time.monotonic()
+        try:
+            self.storage.download_to_path(blob_name, version_id=None, destination=archive_path)
+            unpack_environment(archive_path, venv_dir)
+            subprocess.run(
+                [str(self.paths.python_in_venv(venv_dir)), "-c", "import sys"],
+                check=True,
+                capture_output=True,
+                timeout=60,
+            )
+        except FileNotFoundError:
+            shutil.rmtree(venv_dir, ignore_errors=True)
+            return False
+        except Exception as exc:
+            logger.warning(
+                "environment.artifact.restore_failed blob=%s error=%s",
+                blob_name,
+                exc,
+            )
+            shutil.rmtree(venv_dir, ignore_errors=True)
+            return False
+        finally:
+            archive_path.unlink(missing_ok=True)
+
+        event_log.emit(
+            event="environment.artifact.restore",
+            message="Restored shared environment",
+            data={
+                "blob_name": blob_name,
+                "duration_seconds": round(time.monotonic() - started, 3),
+            },
+            context=ctx,
+        )
+        return True
+
+    def _publish_environment_artifact(
+        self,
+        *,
+        deps_digest: str,
+        build_root: Path,
+        event_log: EventLog,
+        ctx: dict[str, Any],
+    ) -> None:
+        """Pack and upload the dependency-only venv; failures only cost other nodes a build."""
+
+        blob_name = environment_artifact_blob_name(deps_digest)
+        archive_path = build_root / "environment.tar.gz"
         try:
-            shutil.rmtree(run_dir)
+            pack_environment(build_root / ".venv", archive_path)
+            stored = self.storage.upload_path(blob_name, archive_path)
         except Exception as exc:
             logger.warning(
-                "run.dir.cleanup_failed run_id=%s workspace_id=%s error=%s",
-                run_id,
-                workspace_id,
+                "environment.artifact.publish_failed blob=%s error=%s",
+                blob_name,
                 exc,
             )
+            return
+        finally:
+            archive_path.unlink(missing_ok=True)
 
-    @staticmethod
-    def _venv_marker_path(venv_root: Path) -> Path:
-        return venv_root / ".ready"
-
-    def _is_venv_ready(self, *, venv_root: Path, venv_dir: Path) -> bool:
-        marker_path = self._venv_marker_path(venv_root)
-        python_bin = self.paths.python_in_venv(venv_dir)
-        return marker_path.is_file() and python_bin.is_file()
-
-    def _touch_venv_marker(self, *, venv_root: Path) -> None:
-        marker_path = self._venv_marker_path(venv_root)
-        marker_path.parent.mkdir(parents=True, exist_ok=True)
-        marker_path.touch()
+        event_log.emit(
+            event="environment.artifact.publish",
+            message="Published shared environment",
+            data={"blob_name": blob_name, "byte_size": stored.byte_size},
+            context=ctx,
+        )
 
     def _ensure_local_venv(
         self,
@@ -1101,6 +2110,7 @@ class Worker:
 
         if self._is_venv_ready(venv_root=venv_root, venv_dir=venv_dir):
             self._touch_venv_marker(venv_root=venv_root)
+            ENVIRONMENTS.inc(result="reused")
             event_log.emit(event="environment.reuse", message="Reusing local environment", context=ctx)
             return LocalVenvResult(
                 python_bin=self.paths.python_in_venv(venv_dir),
@@ -1124,6 +2134,7 @@ class Worker:
                     )
                 if self._is_venv_ready(venv_root=venv_root, venv_dir=venv_dir):
                     self._touch_venv_marker(venv_root=venv_root)
+                    ENVIRONMENTS.inc(result="reused")
                     event_log.emit(
                         event="environment.reuse",
                         message="Reusing local environment",
@@ -1153,8 +2164,10 @@ class Worker:
         build_venv_dir = build_root / ".venv"
         install_env = self._install_env()
         uv_bin = self._uv_bin()
-        deadline = time.monotonic() + float(self.settings.worker_env_build_timeout_seconds)
+        build_started = time.monotonic()
+        deadline = build_started + float(self.settings.worker_env_build_timeout_seconds)
         run_lost = False
+        restored = False
 
         def remaining() -> float:
             return max(0.1, deadline - time.monotonic())
@@ -1170,6 +2183,7 @@ class Worker:
         try:
             if self._is_venv_ready(venv_root=venv_root, venv_dir=venv_dir):
                 self._touch_venv_marker(venv_root=venv_root)
+                ENVIRONMENTS.inc(result="reused")
                 event_log.emit(
                     event="environment.reuse",
                     message="Reusing local environment",
@@ -1186,23 +2200,59 @@ class Worker:
             _ensure_dir(build_root)
             event_log.emit(event="environment.start", message="Starting environment build", context=ctx)
 
-            res = self.runner.run(
-                [uv_bin, "venv", "--python", os.fspath(sys.executable), str(build_venv_dir)],
+            share = self.settings.worker_env_artifacts_enabled
+            python_bin = self.paths.python_in_venv(build_venv_dir)
+            restored = share and self._restore_environment_artifact(
+                deps_digest=deps_digest,
+                build_root=build_root,
                 event_log=event_log,
-                scope="environment.venv",
-                timeout_seconds=remaining(),
-                cwd=None,
-                env=install_env,
-                heartbeat=heartbeat,
-                heartbeat_interval=max(1.0, self.settings.worker_lease_seconds / 3),
-                context=ctx,
+                ctx=ctx,
             )
-            if res.exit_code != 0:
-                raise RuntimeError(f"venv creation failed (exit {res.exit_code})")
+            if not restored:
+                venv_cmd = [uv_bin, "venv", "--python", os.fspath(sys.executable)]
+                if share:
+                    venv_cmd.append("--relocatable")
+                res = self.runner.run(
+                    [*venv_cmd, str(build_venv_dir)],
+                    event_log=event_log,
+                    scope="environment.venv",
+                    timeout_seconds=remaining(),
+                    cwd=None,
+                    env=install_env,
+                    heartbeat=heartbeat,
+                    heartbeat_interval=max(1.0, self.settings.worker_lease_seconds / 3),
+                    context=ctx,
+                )
+                if res.exit_code != 0:
+                    raise RuntimeError(f"venv creation failed (exit {res.exit_code})")
 
-            python_bin = self.paths.python_in_venv(build_venv_dir)
-            if not python_bin.exists():
-                raise RuntimeError(f"venv python missing: {python_bin}")
+                if not python_bin.exists():
+                    raise RuntimeError(f"venv python missing: {python_bin}")
+
+                pyproject = config_dir / "pyproject.toml"
+                if share and pyproject.is_file():
+                    # Install dependencies alone so the shared artifact carries no
+                    # editable link to this workspace's config package.
+                    res = self.runner.run(
+                        [uv_bin, "pip", "install", "--python", str(python_bin)]
+                        + ["-r", str(pyproject)],
+                        event_log=event_log,
+                        scope="environment.deps",
+                        timeout_seconds=remaining(),
+                        cwd=None,
+                        env=install_env,
+                        heartbeat=heartbeat,
+                        heartbeat_interval=max(1.0, self.settings.worker_lease_seconds / 3),
+                        context=ctx,
+                    )
+                    if res.exit_code != 0:
+                        raise RuntimeError(f"dependency install failed (exit {res.exit_code})")
+                    self._publish_environment_artifact(
+                        deps_digest=deps_digest,
+                        build_root=build_root,
+                        event_log=event_log,
+                        ctx=ctx,
+                    )
 
             res = self.runner.run(
                 [uv_bin, "pip", "install", "--python", str(python_bin), "-e", str(config_dir)],
@@ -1241,6 +2291,11 @@ class Worker:
                 shutil.rmtree(venv_root, ignore_errors=True)
             build_root.replace(venv_root)
             self._touch_venv_marker(venv_root=venv_root)
+            build_result = "restored" if restored else "built"
+            ENVIRONMENTS.inc(result=build_result)
+            ENVIRONMENT_BUILD_DURATION.observe(
+                time.monotonic() - build_started, result=build_result
+            )
             event_log.emit(event="environment.complete", message="Environment ready", context=ctx)
             return LocalVenvResult(
                 python_bin=self.paths.python_in_venv(venv_dir),
@@ -1248,6 +2303,7 @@ class Worker:
                 error_message=None,
             )
         except HeartbeatLostError:
+            ENVIRONMENTS.inc(result="lost")
             event_log.emit(
                 event="environment.lost_claim",
                 level="warning",
@@ -1261,6 +2317,7 @@ class Worker:
             )
         except Exception as exc:
             err = str(exc)
+            ENVIRONMENTS.inc(result="failed")
             logger.exception("environment build failed: %s", err)
             event_log.emit(
                 event="environment.failed",
@@ -1283,13 +2340,298 @@ class Worker:
                     pass
             lock_path.unlink(missing_ok=True)
 
+    def _cancel_run(self, run_id: str) -> None:
+        """Stop a cancelled run this worker holds: kill its engine, drop its lease."""
+
+        key = run_id.strip().lower()
+        stop_event = self.cancel_events.get(key)
+        if stop_event is not None:
+            stop_event.set()
+        tracked = self.lease_manager is not None and self.lease_manager.mark_lost(key)
+        if stop_event is not None or tracked:
+            logger.info("run.cancel.received run_id=%s active=%s", key, stop_event is not None)
+
+    def _listen_for_cancellations(self, listener: PgListener, stop: threading.Event) -> None:
+        while not stop.is_set():
+            payload = listener.receive(1.0)
+            if payload:
+                self._cancel_run(payload)
+
+    def _release_lease(self, run_id: str) -> None:
+        if self.lease_manager is not None:
+            self.lease_manager.release(run_id)
+
+    def _mark_run_started(self, run_id: str) -> None:
+        with session_scope(self.session_factory) as session:
+            db.mark_run_started(session, run_id=run_id, worker_id=self.worker_id, now=utcnow())
+
+    def process_run_batch(self, claims: list[db.RunClaim]) -> None:
+        """Process runs that share a batch key back to back on one engine host.
+
+        Each run keeps its own input, output directory, event log, and ack. Runs
+        waiting behind the active one keep their leases: the lease manager renews
+        them with the rest, or else the active run's heartbeat does. Their
+        ``started_at`` is stamped when their turn comes. Runs share the warm
+        engine pool when it is enabled, else each gets a one-shot subprocess.
+        """
+
+        if len(claims) == 1:
+            try:
+                self.process_run(claims[0])
+            finally:
+                self._release_lease(claims[0].id)
+            return
+
+        started = time.monotonic()
+        logger.info(
+            "run.batch.start size=%s configuration_id=%s deps_digest=%s",
+            len(claims),
+            claims[0].configuration_id,
+            claims[0].deps_digest,
+        )
+        for index, claim in enumerate(claims):
+            if self.lease_manager is not None and not self.lease_manager.is_held(claim.id):
+                logger.info("run.batch.skip run_id=%s reason=lease_lost", claim.id)
+                self._release_lease(claim.id)
+                continue
+            waiting = [item.id for item in claims[index + 1 :]]
+            if waiting:
+                self.batch_waiting[claim.id] = waiting
+            try:
+                if index > 0:
+                    self._mark_run_started(claim.id)
+                self.process_run(claim)
+            except Exception:
+                logger.exception("run.batch.item_crashed run_id=%s", claim.id)
+            finally:
+                self.batch_waiting.pop(claim.id, None)
+                self._release_lease(claim.id)
+        logger.info(
+            "run.batch.complete size=%s duration_ms=%s",
+            len(claims),
+            int((time.monotonic() - started) * 1000),
+        )
+
+    def _run_result_cache_key(
+        self,
+        run: dict[str, Any],
+        *,
+        workspace_id: str,
+        configuration_id: str,
+        deps_digest: str,
+    ) -> str | None:
+        """Return the run's result cache key, or ``None`` when it cannot be cached."""
+
+        options = parse_run_options(
+            run.get("run_options"),
+            default_log_level=self.settings.effective_worker_log_level,
+        )
+        input_file_version_id = _as_str(run.get("input_file_version_id"))
+        if options.dry_run or not input_file_version_id:
+            return None
+        config_dir = self.paths.config_package_dir(workspace_id, configuration_id)
+        if not config_dir.exists():
+            return None
+        with self.session_factory() as session:
+            file_version = db.load_file_version(session, input_file_version_id)
+        input_sha256 = _as_str(file_version.get("sha256")) if file_version else None
+        if not input_sha256:
+            return None
+        try:
+            config_digest = compute_config_digest(config_dir)
+        except Exception as exc:
+            logger.warning(
+                "run.result_cache.digest_failed run_id=%s config_dir=%s error=%s",
+                run.get("id"),
+                config_dir,
+                exc,
+            )
+            return None
+        return run_result_cache_key(
+            input_sha256=input_sha256,
+            config_digest=config_digest,
+            deps_digest=deps_digest,
+            options=options,
+            sheet_names=(
+                options.input_sheet_names
+                or _parse_input_sheet_names(run.get("input_sheet_names"))
+            ),
+        )
+
+    def _reuse_cached_result(
+        self,
+        claim: db.RunClaim,
+        run: dict[str, Any],
+        *,
+        result_cache_key: str,
+        event_log: EventLog,
+        ctx: dict[str, Any],
+        started_at: datetime,
+    ) -> bool:
+        """Finish the run from an earlier identical run; ``False`` means run the engine."""
+
+        run_id = claim.id
+        workspace_id = str(run["workspace_id"])
+        with self.session_factory() as session:
+            cached = db.find_cached_run_result(
+                session,
+                workspace_id=workspace_id,
+                result_cache_key=result_cache_key,
+                exclude_run_id=run_id,
+            )
+            if cached is None:
+                return False
+            input_version = db.load_file_version(session, str(run["input_file_version_id"]))
+            input_file = (
+                db.load_file(session, str(input_version["file_id"])) if input_version else None
+            )
+            source_version: dict[str, Any] | None = None
+            source_file: dict[str, Any] | None = None
+            if cached.get("output_file_version_id"):
+                source_version = db.load_file_version(
+                    session, str(cached["output_file_version_id"])
+                )
+                if source_version:
+                    source_file = db.load_file(session, str(source_version["file_id"]))
+
+        if (
+            input_file is None
+            or input_file.get("kind") != FileKind.INPUT
+            or input_file.get("deleted_at") is not None
+        ):
+            return False
+        if cached.get("output_file_version_id"):
+            if source_version is None or source_file is None or source_file.get("deleted_at"):
+                return False
+            # Without blob versioning only the file's current version is still readable.
+            if not source_version.get("storage_version_id") and str(
+                source_file.get("current_version_id")
+            ) != str(source_version["id"]):
+                return False
+
+        source_run_id = str(cached["id"])
+        event_log.emit(event="run.start", message="Starting run", context=ctx)
+        finished_at = utcnow()
+        output_file_row: dict[str, Any] | None = None
+        output_blob: dict[str, Any] | None = None
+        if source_version is not None and source_file is not None:
+            file_id = str(input_file["id"])
+            filename = str(source_version.get("filename_at_upload") or "output")
+            with session_scope(self.session_factory) as session:
+                output_file_row = db.ensure_output_file(
+                    session,
+                    workspace_id=workspace_id,
+                    source_file_id=file_id,
+                    name=f"{input_file.get('name') or filename} (Output)",
+                    name_key=f"output:{file_id}",
+                    now=finished_at,
+                )
+            if str(output_file_row["id"]) == str(source_file["id"]):
+                output_blob = {
+                    "sha256": source_version["sha256"],
+                    "byte_size": source_version["byte_size"],
+                    "storage_version_id": source_version.get("storage_version_id"),
+                }
+            else:
+                staged = self.paths.run_output_dir(workspace_id, run_id) / Path(filename).name
+                try:
+                    self.storage.download_to_path(
+                        str(source_file.get("blob_name") or ""),
+                        version_id=source_version.get("storage_version_id"),
+                        destination=staged,
+                    )
+                    stored = self.storage.upload_path(
+                        str(output_file_row.get("blob_name") or ""),
+                        staged,
+                    )
+                except Exception as exc:
+                    logger.warning(
+                        "run.result_cache.copy_failed run_id=%s source_run_id=%s error=%s",
+                        run_id,
+                        source_run_id,
+                        exc,
+                    )
+                    return False
+                output_blob = {
+                    "sha256": stored.sha256,
+                    "byte_size": stored.byte_size,
+                    "storage_version_id": stored.version_id,
+                }
+
+        with session_scope(self.session_factory) as session:
+            ok = db.ack_run_success(
+                session,
+                run_id=run_id,
+                worker_id=self.worker_id,
+                now=finished_at,
+            )
+            if not ok:
+                event_log.emit(
+                    event="run.lost_claim",
+                    level="warning",
+                    message="Lost run claim before ack",
+                    context=ctx,
+                )
+                return True
+
+            output_file_version_id: str | None = None
+            if output_file_row and output_blob and source_version:
+                version_payload = db.create_output_file_version(
+                    session,
+                    file_id=str(output_file_row["id"]),
+                    run_id=run_id,
+                    filename_at_upload=str(source_version.get("filename_at_upload") or "output"),
+                    content_type=source_version.get("content_type"),
+                    now=finished_at,
+                    workbook_metadata=source_version.get("workbook_metadata"),
+                    **output_blob,
+                )
+                output_file_version_id = str(version_payload["id"])
+
+            db.record_run_result(
+                session,
+                run_id=run_id,
+                completed_at=finished_at,
+                exit_code=0,
+                output_file_version_id=output_file_version_id,
+                error_message=None,
+                result_cache_key=result_cache_key,
+            )
+            try:
+                with session.begin_nested():
+                    db.copy_run_results(session, source_run_id=source_run_id, run_id=run_id)
+            except Exception:
+                logger.exception("run.results.persist_failed run_id=%s", run_id)
+
+        logger.info("run.result_cache.hit run_id=%s source_run_id=%s", run_id, source_run_id)
+        event_log.emit(
+            event="run.result_cache.hit",
+            message="Reused results from an identical run",
+            data={"source_run_id": source_run_id, "result_cache_key": result_cache_key},
+            context=ctx,
+        )
+        _emit_run_complete(
+            event_log,
+            status="succeeded",
+            message="Run succeeded",
+            context=ctx,
+            started_at=started_at,
+            completed_at=finished_at,
+            exit_code=0,
+        )
+        self._upload_run_log(workspace_id=workspace_id, run_id=run_id)
+        return True
+
     def process_run(self, claim: db.RunClaim) -> None:
         now = utcnow()
+        picked_up = time.monotonic()
         run_id = claim.id
 
         workspace_id = None
         run_dir: Path | None = None
+        input_sidecar: Callable[[], None] | None = None
         log_uploader: tuple[threading.Event, threading.Thread] | None = None
+        stop_event = self.cancel_events.setdefault(run_id.lower(), threading.Event())
         try:
             with self.session_factory() as session:
                 run = db.load_run(session, run_id)
@@ -1338,12 +2680,33 @@ class Worker:
                 "operation": operation.value,
             }
 
-            event_log = EventLog(self.paths.run_event_log_path(workspace_id, run_id))
+            event_log = EventLog(self.paths.run_event_log_path(workspace_id, run_id), buffered=True)
+            self.event_logs[run_id] = event_log
             log_uploader = self._start_run_log_uploader(
                 workspace_id=workspace_id,
                 run_id=run_id,
             )
 
+            result_cache_key: str | None = None
+            if operation == RunOperation.PROCESS and self.settings.worker_result_cache_enabled:
+                result_cache_key = self._run_result_cache_key(
+                    run,
+                    workspace_id=workspace_id,
+                    configuration_id=configuration_id,
+                    deps_digest=deps_digest,
+                )
+                if result_cache_key:
+                    run_dir = self.paths.run_dir(workspace_id, run_id)
+                    if self._reuse_cached_result(
+                        claim,
+                        run,
+                        result_cache_key=result_cache_key,
+                        event_log=event_log,
+                        ctx=ctx,
+                        started_at=run_started_at,
+                    ):
+                        return
+
             venv_result = self._ensure_local_venv(
                 workspace_id=workspace_id,
                 configuration_id=configuration_id,
@@ -1353,6 +2716,7 @@ class Worker:
                 ctx=ctx,
             )
             if venv_result.run_lost:
+                LEASE_LOSSES.inc(reason="lost")
                 event_log.emit(
                     event="run.lost_claim",
                     level="warning",
@@ -1473,15 +2837,17 @@ class Worker:
                         heartbeat=lambda: self._heartbeat_run(run_id=claim.id),
                         heartbeat_interval=max(1.0, self.settings.worker_lease_seconds / 3),
                         context=ctx,
+                        stop_event=stop_event,
                     )
-                except HeartbeatLostError:
-                    event_log.emit(
-                        event="run.lost_claim",
-                        level="warning",
+                except HeartbeatLostError as exc:
+                    _emit_run_interrupted(
+                        event_log,
+                        exc,
                         message="Lease expired during validation",
                         context=ctx,
                     )
                     return
+                ENGINE_DURATION.observe(res.duration_seconds, operation=operation.value)
                 finished_at = utcnow()
                 if res.exit_code == 0:
                     with session_scope(self.session_factory) as session:
@@ -1555,15 +2921,17 @@ class Worker:
                         heartbeat=lambda: self._heartbeat_run(run_id=claim.id),
                         heartbeat_interval=max(1.0, self.settings.worker_lease_seconds / 3),
                         context=ctx,
+                        stop_event=stop_event,
                     )
-                except HeartbeatLostError:
-                    event_log.emit(
-                        event="run.lost_claim",
-                        level="warning",
+                except HeartbeatLostError as exc:
+                    _emit_run_interrupted(
+                        event_log,
+                        exc,
                         message="Lease expired during publish validation",
                         context=ctx,
                     )
                     return
+                ENGINE_DURATION.observe(res.duration_seconds, operation=operation.value)
 
                 finished_at = utcnow()
                 if res.exit_code != 0:
@@ -1783,6 +3151,30 @@ class Worker:
                 )
                 return
 
+            if sheet_names and not options.active_sheet_only:
+                available_sheets = self._available_input_sheets(
+                    file_row=file_row,
+                    file_version=file_version,
+                )
+                missing_sheets = (
+                    [name for name in sheet_names if name not in available_sheets]
+                    if available_sheets is not None
+                    else []
+                )
+                if missing_sheets:
+                    self._handle_run_failure(
+                        claim,
+                        run_id,
+                        document_id,
+                        event_log,
+                        ctx,
+                        now,
+                        run_started_at,
+                        2,
+                        f"Input sheet(s) not found: {', '.join(missing_sheets)}",
+                    )
+                    return
+
             input_dir = self.paths.run_input_dir(workspace_id, run_id)
             output_dir = self.paths.run_output_dir(workspace_id, run_id)
             _ensure_dir(input_dir)
@@ -1793,10 +3185,11 @@ class Worker:
             ).name
             staged_input = input_dir / original_name
             try:
-                self.storage.download_to_path(
-                    str(file_row.get("blob_name") or ""),
-                    version_id=file_version.get("storage_version_id"),
+                self._stage_input(
+                    file_row=file_row,
+                    file_version=file_version,
                     destination=staged_input,
+                    run_id=run_id,
                 )
             except FileNotFoundError:
                 self._handle_run_failure(
@@ -1824,11 +3217,24 @@ class Worker:
                     f"Document download failed: {exc}",
                 )
                 return
+            if self.settings.worker_output_sidecar_enabled and is_workbook_filename(original_name):
+                input_sidecar = partial(
+                    self._store_input_sidecar,
+                    staged_input,
+                    file_row=file_row,
+                    file_version=file_version,
+                    run_dir=run_dir,
+                    run_id=run_id,
+                )
 
             engine_payload: dict[str, Any] | None = None
+            first_event_seen = False
 
             def on_event(rec: dict[str, Any]) -> None:
-                nonlocal engine_payload
+                nonlocal engine_payload, first_event_seen
+                if not first_event_seen:
+                    first_event_seen = True
+                    TIME_TO_FIRST_EVENT.observe(time.monotonic() - picked_up)
                 if rec.get("event") == "engine.run.completed":
                     data = rec.get("data")
                     if isinstance(data, dict):
@@ -1843,29 +3249,65 @@ class Worker:
                 sheet_names=sheet_names,
             )
 
+            run_timeout = (
+                float(self.settings.worker_run_timeout_seconds)
+                if self.settings.worker_run_timeout_seconds
+                else None
+            )
             try:
-                res = self.runner.run(
-                    cmd,
-                    event_log=event_log,
-                    scope="run.engine",
-                    timeout_seconds=float(self.settings.worker_run_timeout_seconds)
-                    if self.settings.worker_run_timeout_seconds
-                    else None,
-                    cwd=None,
-                    env=self._pip_env(),
-                    heartbeat=lambda: self._heartbeat_run(run_id=claim.id),
-                    heartbeat_interval=max(1.0, self.settings.worker_lease_seconds / 3),
-                    context=ctx,
-                    on_json_event=on_event,
+                if self.engine_pool is not None:
+                    res = self.engine_pool.run(
+                        (configuration_id, deps_digest),
+                        cmd[3:],
+                        python_bin=python_bin,
+                        config_dir=config_dir,
+                        env=self._pip_env(),
+                        event_log=event_log,
+                        scope="run.engine",
+                        timeout_seconds=run_timeout,
+                        heartbeat=lambda: self._heartbeat_run(run_id=claim.id),
+                        heartbeat_interval=max(1.0, self.settings.worker_lease_seconds / 3),
+                        context=ctx,
+                        on_json_event=on_event,
+                        stop_event=stop_event,
+                    )
+                else:
+                    res = self.runner.run(
+                        cmd,
+                        event_log=event_log,
+                        scope="run.engine",
+                        timeout_seconds=run_timeout,
+                        cwd=None,
+                        env=self._pip_env(),
+                        heartbeat=lambda: self._heartbeat_run(run_id=claim.id),
+                        heartbeat_interval=max(1.0, self.settings.worker_lease_seconds / 3),
+                        context=ctx,
+                        on_json_event=on_event,
+                        stop_event=stop_event,
+                        memory_limit_bytes=_run_memory_limit_bytes(self.settings),
+                    )
+            except EngineHostError as exc:
+                self._handle_run_failure(
+                    claim,
+                    run_id,
+                    document_id,
+                    event_log,
+                    ctx,
+                    utcnow(),
+                    run_started_at,
+                    2,
+                    f"Engine host failed: {exc}",
                 )
-            except HeartbeatLostError:
-                event_log.emit(
-                    event="run.lost_claim",
-                    level="warning",
+                return
+            except HeartbeatLostError as exc:
+                _emit_run_interrupted(
+                    event_log,
+                    exc,
                     message="Lease expired during engine run",
                     context=ctx,
                 )
                 return
+            ENGINE_DURATION.observe(res.duration_seconds, operation=operation.value)
 
             finished_at = utcnow()
 
@@ -1897,6 +3339,7 @@ class Worker:
                 output_file_row: dict[str, Any] | None = None
                 output_upload: Any | None = None
                 output_filename: str | None = None
+                output_workbook_metadata: dict[str, Any] | None = None
 
                 if output_path:
                     output_abs = (run_dir / output_path).resolve()
@@ -1914,10 +3357,12 @@ class Worker:
                                 now=finished_at,
                             )
                         try:
+                            upload_started = time.monotonic()
                             output_upload = self.storage.upload_path(
                                 str(output_file_row.get("blob_name") or ""),
                                 output_abs,
                             )
+                            _record_transfer("upload", output_abs, upload_started)
                         except Exception as exc:
                             self._handle_run_failure(
                                 claim,
@@ -1931,6 +3376,22 @@ class Worker:
                                 f"Output upload failed: {exc}",
                             )
                             return
+                        output_workbook_metadata = capture_workbook_metadata(
+                            output_abs,
+                            filename=output_filename,
+                        )
+                        if (
+                            output_workbook_metadata is not None
+                            and self.settings.worker_output_sidecar_enabled
+                        ):
+                            sidecar = self._store_row_sidecar(
+                                output_abs,
+                                blob_name=_output_sidecar_blob_name(workspace_id, run_id),
+                                run_dir=run_dir,
+                                run_id=run_id,
+                            )
+                            if sidecar is not None:
+                                output_workbook_metadata["sidecar"] = sidecar
                     else:
                         output_path = None
                 with session_scope(self.session_factory) as session:
@@ -1965,6 +3426,7 @@ class Worker:
                             byte_size=output_upload.byte_size,
                             storage_version_id=storage_version_id,
                             now=finished_at,
+                            workbook_metadata=output_workbook_metadata,
                         )
                         output_file_version_id = str(version_payload["id"])
 
@@ -1975,6 +3437,7 @@ class Worker:
                         exit_code=0,
                         output_file_version_id=output_file_version_id,
                         error_message=None,
+                        result_cache_key=result_cache_key,
                     )
 
                     if results_payload is None:
@@ -2031,8 +3494,16 @@ class Worker:
                     run_id=run_id,
                     uploader=log_uploader,
                 )
+            if input_sidecar is not None and not stop_event.is_set():
+                # Built after the run is acked so it never delays the result.
+                input_sidecar()
             if run_dir and workspace_id:
                 self._cleanup_run_dir(run_dir=run_dir, workspace_id=workspace_id, run_id=run_id)
+            self.log_offsets.pop(run_id, None)
+            stale_log = self.event_logs.pop(run_id, None)
+            if stale_log is not None:
+                stale_log.flush()
+            self.cancel_events.pop(run_id.lower(), None)
 
     def _handle_run_failure(
         self,
@@ -2124,6 +3595,17 @@ class Worker:
         next_maintenance = time.monotonic() + maintenance_interval
 
         listener = PgListener(self.settings, channel=CHANNEL_RUN_QUEUED)
+        cancel_listener = PgListener(self.settings, channel=CHANNEL_RUN_CANCELLED)
+        cancel_stop = threading.Event()
+        cancel_thread = threading.Thread(
+            target=self._listen_for_cancellations,
+            args=(cancel_listener, cancel_stop),
+            name="ade-cancel-listener",
+            daemon=True,
+        )
+        cancel_thread.start()
+        if self.lease_manager is not None:
+            self.lease_manager.start()
 
         try:
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -2152,6 +3634,13 @@ class Worker:
                                 logger.info("expired %s stuck run leases", expired_runs)
                         except Exception:
                             logger.exception("run lease expiration failed")
+                        try:
+                            with session_scope(self.session_factory) as session:
+                                folded = db.compact_document_facet_counts(session)
+                            if folded:
+                                logger.debug("document.facets.compacted deltas=%s", folded)
+                        except Exception:
+                            logger.exception("document facet compaction failed")
                         next_maintenance = mono + maintenance_interval
 
                     capacity = max_workers - len(futures)
@@ -2160,6 +3649,14 @@ class Worker:
                         if claimed:
                             logger.info("run.queue.claimed count=%s", claimed)
                             continue
+                        if futures and not self._has_headroom():
+                            # Headroom returns as runs finish or shrink; recheck soon.
+                            wait(
+                                futures,
+                                timeout=ADMISSION_RECHECK_SECONDS,
+                                return_when=FIRST_COMPLETED,
+                            )
+                            continue
 
                     wait_seconds = max(0.0, min(listen_timeout, next_maintenance - mono))
 
@@ -2187,6 +3684,13 @@ class Worker:
                         logger.debug("run.queue.wake notify=false")
         finally:
             listener.close()
+            cancel_stop.set()
+            cancel_thread.join(timeout=5.0)
+            cancel_listener.close()
+            if self.lease_manager is not None:
+                self.lease_manager.stop()
+            if self.engine_pool is not None:
+                self.engine_pool.close()
 
     def _submit(
         self,
@@ -2194,10 +3698,23 @@ class Worker:
         executor: ThreadPoolExecutor,
         futures: set[Future[None]],
         fn,
-        claim: db.RunClaim,
-    ) -> None:
-        future = executor.submit(fn, claim)
+        claims: list[db.RunClaim],
+    ) -> Future[None]:
+        future = executor.submit(fn, claims)
         futures.add(future)
+        return future
+
+    def _has_headroom(self) -> bool:
+        return self.admission is None or self.admission.has_headroom()
+
+    def _admit(self, future: Future[None], batch: list[db.RunClaim]) -> None:
+        admission = self.admission
+        if admission is None:
+            return
+        key = batch[0].id
+        estimate = admission.reserve(key, [claim.input_byte_size for claim in batch])
+        logger.debug("run.admission.reserve run_id=%s bytes=%s", key, estimate)
+        future.add_done_callback(lambda _future: admission.release(key))
 
     def _reap(self, *, futures: set[Future[None]]) -> None:
         done = {f for f in futures if f.done()}
@@ -2220,8 +3737,14 @@ class Worker:
         if capacity <= 0:
             return 0
 
-        while capacity > 0:
-            batch_size = min(CLAIM_BATCH_SIZE, capacity)
+        run_batch_size = max(1, int(self.settings.worker_run_batch_size))
+        if self.engine_pool is None:
+            run_batch_size = 1
+        while capacity > 0 and self._has_headroom():
+            # Under admission control, claim one batch at a time so each
+            # reservation is counted before the next headroom check.
+            batch_size = 1 if self.admission is not None else min(CLAIM_BATCH_SIZE, capacity)
+            claim_started = time.monotonic()
             with session_scope(self.session_factory) as session:
                 run_claims = db.claim_runs(
                     session,
@@ -2229,18 +3752,42 @@ class Worker:
                     now=now,
                     lease_seconds=int(self.settings.worker_lease_seconds),
                     limit=batch_size,
+                    workspace_max_running=self.settings.worker_workspace_max_concurrent_runs,
                 )
+                batches = [[claim] for claim in run_claims]
+                # Siblings only join the run that takes the last free slot; while
+                # slots are free, queued runs start in parallel instead.
+                last = batches[-1] if len(batches) >= capacity else None
+                if run_batch_size > 1 and last is not None and last[0].batch_key is not None:
+                    last.extend(
+                        db.claim_run_siblings(
+                            session,
+                            leader=last[0],
+                            worker_id=self.worker_id,
+                            now=now,
+                            lease_seconds=int(self.settings.worker_lease_seconds),
+                            limit=run_batch_size - 1,
+                            workspace_max_running=(
+                                self.settings.worker_workspace_max_concurrent_runs
+                            ),
+                        )
+                    )
+            CLAIM_DURATION.observe(time.monotonic() - claim_started)
             if not run_claims:
                 break
-            for claim in run_claims:
-                claimed_total += 1
+            RUNS_CLAIMED.inc(sum(len(batch) for batch in batches))
+            if self.lease_manager is not None:
+                self.lease_manager.track([claim.id for batch in batches for claim in batch])
+            for batch in batches:
+                claimed_total += len(batch)
                 capacity -= 1
-                self._submit(
+                future = self._submit(
                     executor=executor,
                     futures=futures,
-                    fn=self.process_run,
-                    claim=claim,
+                    fn=self.process_run_batch,
+                    claims=batch,
                 )
+                self._admit(future, batch)
 
         return claimed_total
 
@@ -2271,19 +3818,83 @@ def main() -> int:
     storage = build_storage_adapter(settings)
 
     runner = SubprocessRunner()
+    engine_pool: EnginePool | None = None
+    if settings.worker_engine_pool_enabled:
+        max_rss_mb = settings.worker_engine_pool_max_rss_mb
+        engine_pool = EnginePool(
+            max_jobs_per_host=settings.worker_engine_pool_max_jobs,
+            max_rss_bytes=max_rss_mb * 1024 * 1024 if max_rss_mb else None,
+            idle_seconds=settings.worker_engine_pool_idle_seconds,
+            max_idle_hosts=settings.worker_run_concurrency,
+            memory_limit_bytes=_run_memory_limit_bytes(settings),
+        )
+
+    input_cache: InputBlobCache | None = None
+    if settings.worker_input_cache_max_mb is not None:
+        input_cache = InputBlobCache(
+            root=settings.worker_input_cache_dir,
+            max_bytes=settings.worker_input_cache_max_mb * 1024 * 1024,
+        )
 
-    Worker(
-        settings=settings,
-        engine=engine,
+    admission: AdmissionController | None = None
+    if settings.worker_admission_enabled:
+        cgroup_dir = current_cgroup_dir()
+        admission = AdmissionController(
+            probe=ResourceProbe(cgroup_dir=cgroup_dir),
+            memory_target=settings.worker_admission_memory_target,
+            cpu_target=settings.worker_admission_cpu_target,
+        )
+        logger.info("run.admission.enabled cgroup=%s", cgroup_dir or "none")
+
+    metrics_server = None
+    if settings.worker_metrics_port is not None:
+        REGISTRY.add_collector(lambda: _queue_metric_samples(session_factory))
+        metrics_server = start_metrics_server(
+            settings.worker_metrics_host,
+            settings.worker_metrics_port,
+        )
+
+    lease_manager = LeaseManager(
         session_factory=session_factory,
         worker_id=worker_id,
-        paths=paths,
-        runner=runner,
-        storage=storage,
-    ).start()
+        lease_seconds=settings.worker_lease_seconds,
+        interval_seconds=max(1.0, settings.worker_lease_seconds / 3),
+    )
+
+    try:
+        Worker(
+            settings=settings,
+            engine=engine,
+            session_factory=session_factory,
+            worker_id=worker_id,
+            paths=paths,
+            runner=runner,
+            storage=storage,
+            engine_pool=engine_pool,
+            lease_manager=lease_manager,
+            input_cache=input_cache,
+            admission=admission,
+        ).start()
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
     return 0
 
 
+def _queue_metric_samples(
+    session_factory: sessionmaker[Session],
+) -> list[tuple[str, dict[str, str], float]]:
+    now = utcnow()
+    with session_factory() as session:
+        depth, oldest = db.queue_stats(session, now=now)
+    age = 0.0
+    if oldest is not None:
+        if oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        age = max(0.0, (now - oldest).total_seconds())
+    return [(QUEUE_DEPTH.name, {}, float(depth)), (QUEUE_OLDEST_AGE.name, {}, age)]
+
+
 def _run_capture_text(cmd: list[str]) -> str:
     p = subprocess.run(cmd, text=True, capture_output=True)
     out = (p.stdout or "").strip()
@@ -2297,8 +3908,12 @@ __all__ = [
     "parse_run_metrics",
     "parse_run_fields",
     "parse_run_table_columns",
+    "run_result_cache_key",
+    "EnginePool",
     "EventLog",
     "HeartbeatLostError",
+    "LeaseManager",
+    "RunCancelledError",
     "SubprocessRunner",
     "Worker",
     "main",
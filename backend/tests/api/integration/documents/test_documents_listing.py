@@ -323,6 +323,96 @@ async def test_list_documents_cursor_mode_still_supports_next_cursor(
     assert [item["name"] for item in second_payload["items"]] == ["cursor-beta.txt"]
 
 
+async def test_list_documents_answers_if_none_match_until_documents_change(
+    async_client: AsyncClient,
+    seed_identity,
+) -> None:
+    headers = await _auth_headers(async_client, seed_identity.member)
+    workspace_base = f"/api/v1/workspaces/{seed_identity.workspace_id}"
+
+    upload = await async_client.post(
+        f"{workspace_base}/documents",
+        headers=headers,
+        files={"file": ("etag-alpha.txt", b"alpha", "text/plain")},
+    )
+    assert upload.status_code == 201, upload.text
+
+    first = await async_client.get(f"{workspace_base}/documents", headers=headers)
+    assert first.status_code == 200, first.text
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    not_modified = await async_client.get(
+        f"{workspace_base}/documents",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    other_params = await async_client.get(
+        f"{workspace_base}/documents",
+        headers={**headers, "If-None-Match": etag},
+        params={"limit": 1},
+    )
+    assert other_params.status_code == 200, other_params.text
+    assert other_params.headers["etag"] != etag
+
+    second_upload = await async_client.post(
+        f"{workspace_base}/documents",
+        headers=headers,
+        files={"file": ("etag-beta.txt", b"beta", "text/plain")},
+    )
+    assert second_upload.status_code == 201, second_upload.text
+
+    changed = await async_client.get(
+        f"{workspace_base}/documents",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert changed.status_code == 200, changed.text
+    assert changed.headers["etag"] != etag
+    assert {item["name"] for item in changed.json()["items"]} >= {
+        "etag-alpha.txt",
+        "etag-beta.txt",
+    }
+
+
+async def test_list_documents_etag_changes_when_uploader_is_renamed(
+    async_client: AsyncClient,
+    seed_identity,
+) -> None:
+    headers = await _auth_headers(async_client, seed_identity.member)
+    workspace_base = f"/api/v1/workspaces/{seed_identity.workspace_id}"
+
+    upload = await async_client.post(
+        f"{workspace_base}/documents",
+        headers=headers,
+        files={"file": ("etag-rename.txt", b"rename", "text/plain")},
+    )
+    assert upload.status_code == 201, upload.text
+
+    first = await async_client.get(f"{workspace_base}/documents", headers=headers)
+    assert first.status_code == 200, first.text
+    etag = first.headers["etag"]
+
+    rename = await async_client.patch(
+        "/api/v1/me",
+        headers=headers,
+        json={"display_name": "Renamed Uploader"},
+    )
+    assert rename.status_code == 200, rename.text
+
+    changed = await async_client.get(
+        f"{workspace_base}/documents",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert changed.status_code == 200, changed.text
+    assert changed.headers["etag"] != etag
+    renamed = next(
+        item for item in changed.json()["items"] if item["name"] == "etag-rename.txt"
+    )
+    assert renamed["uploader"]["name"] == "Renamed Uploader"
+
+
 async def test_list_documents_filters_by_mentioned_user(
     async_client: AsyncClient,
     seed_identity,
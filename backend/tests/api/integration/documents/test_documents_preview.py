@@ -0,0 +1,56 @@
+"""Document preview caching tests."""
+
+from __future__ import annotations
+
+import pytest
+from httpx import AsyncClient
+
+from tests.api.utils import login
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_document_preview_sends_strong_etag_and_honours_if_none_match(
+    async_client: AsyncClient,
+    seed_identity,
+) -> None:
+    member = seed_identity.member
+    token, _ = await login(async_client, email=member.email, password=member.password)
+    workspace_base = f"/api/v1/workspaces/{seed_identity.workspace_id}"
+    headers = {"X-API-Key": token}
+
+    upload = await async_client.post(
+        f"{workspace_base}/documents",
+        headers=headers,
+        files={"file": ("people.csv", b"name,age\nada,36\ngrace,45\n", "text/csv")},
+    )
+    assert upload.status_code == 201, upload.text
+    preview_url = f"{workspace_base}/documents/{upload.json()['id']}/preview"
+
+    first = await async_client.get(preview_url, headers=headers, params={"maxRows": 2})
+    assert first.status_code == 200, first.text
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert first.json()["rows"] == [["name", "age"], ["ada", "36"]]
+
+    cached = await async_client.get(preview_url, headers=headers, params={"maxRows": 2})
+    assert cached.status_code == 200
+    assert cached.headers["etag"] == etag
+    assert cached.json() == first.json()
+
+    not_modified = await async_client.get(
+        preview_url,
+        headers={**headers, "If-None-Match": etag},
+        params={"maxRows": 2},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    other_window = await async_client.get(
+        preview_url,
+        headers={**headers, "If-None-Match": etag},
+        params={"maxRows": 3},
+    )
+    assert other_window.status_code == 200
+    assert other_window.headers["etag"] != etag
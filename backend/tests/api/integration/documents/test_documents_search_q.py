@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
+import anyio
 import pytest
+from fastapi import HTTPException
 
 from ade_api.common.list_filters import FilterJoinOperator
 from ade_api.common.cursor_listing import resolve_cursor_sort
 from ade_api.features.documents.service import DocumentsService
-from ade_api.features.documents.sorting import CURSOR_FIELDS, DEFAULT_SORT, ID_FIELD, SORT_FIELDS
+from ade_api.features.documents.sorting import (
+    CURSOR_FIELDS,
+    DEFAULT_SORT,
+    ID_FIELD,
+    SORT_FIELDS,
+    document_sort_fields,
+)
+from ade_db.models import FileTag
 from ade_storage import build_storage_adapter
-from tests.api.integration.documents.helpers import build_documents_fixture
+from tests.api.integration.documents.helpers import (
+    _create_document_file,
+    build_documents_fixture,
+)
 
 pytestmark = pytest.mark.asyncio
 
@@ -43,3 +55,108 @@ async def test_list_documents_q_matches_tokens_across_fields(db_session, setting
 
     assert len(result.items) == 1
     assert result.items[0].name == processed.name
+
+
+async def test_search_text_follows_tags_and_people(db_session, settings) -> None:
+    workspace, _uploader, colleague, processed, uploaded = await build_documents_fixture(
+        db_session
+    )
+    uploaded.assignee_user_id = processed.uploaded_by_user_id
+    db_session.add(FileTag(file_id=uploaded.id, tag="Alphabet"))
+    colleague.display_name = "Renamed Colleague"
+    await anyio.to_thread.run_sync(db_session.flush)
+    db_session.expire_all()
+
+    assert "alpha-report.pdf" in processed.search_text
+    assert "finance" in processed.search_text
+    assert "uploader one" in processed.search_text
+    assert "alphabet" in uploaded.search_text
+    assert "renamed colleague" in uploaded.search_text
+    assert "uploader@example.com" in uploaded.search_text
+
+    storage = build_storage_adapter(settings)
+    service = DocumentsService(session=db_session, settings=settings, storage=storage)
+
+    def search(q: str, sort: list[str]) -> list:
+        resolved_sort = resolve_cursor_sort(
+            sort,
+            allowed=document_sort_fields(q),
+            cursor_fields=CURSOR_FIELDS,
+            default=DEFAULT_SORT,
+            id_field=ID_FIELD,
+        )
+        result = service.list_documents(
+            workspace_id=workspace.id,
+            limit=50,
+            cursor=None,
+            resolved_sort=resolved_sort,
+            include_total=False,
+            include_facets=False,
+            filters=[],
+            join_operator=FilterJoinOperator.AND,
+            q=q,
+        )
+        return [item.id for item in result.items]
+
+    assert search("ALPHABET", []) == [uploaded.id]
+    assert search("renamed", []) == [uploaded.id]
+    assert search("alpha", ["-relevance"]) == [processed.id, uploaded.id]
+
+    with pytest.raises(HTTPException):
+        resolve_cursor_sort(
+            ["-relevance"],
+            allowed=document_sort_fields(None),
+            cursor_fields=CURSOR_FIELDS,
+            default=DEFAULT_SORT,
+            id_field=ID_FIELD,
+        )
+
+
+async def test_relevance_cursor_pages_through_tied_scores(db_session, settings) -> None:
+    workspace, uploader, _colleague, _processed, _uploaded = await build_documents_fixture(
+        db_session
+    )
+    # "amma" scores 3/5 against each "gamma" name: tied, and not exact as a real.
+    tied = []
+    for index in range(5):
+        document, _version = await _create_document_file(
+            db_session,
+            workspace_id=workspace.id,
+            name=f"gamma-{index}.csv",
+            uploader_id=uploader.id,
+            content_type="text/csv",
+            byte_size=64,
+            sha256=f"{index}" * 64,
+        )
+        tied.append(document.id)
+
+    storage = build_storage_adapter(settings)
+    service = DocumentsService(session=db_session, settings=settings, storage=storage)
+    resolved_sort = resolve_cursor_sort(
+        ["-relevance"],
+        allowed=document_sort_fields("amma"),
+        cursor_fields=CURSOR_FIELDS,
+        default=DEFAULT_SORT,
+        id_field=ID_FIELD,
+    )
+
+    seen = []
+    cursor = None
+    for _ in range(5):
+        result = service.list_documents(
+            workspace_id=workspace.id,
+            limit=2,
+            cursor=cursor,
+            resolved_sort=resolved_sort,
+            include_total=False,
+            include_facets=False,
+            filters=[],
+            join_operator=FilterJoinOperator.AND,
+            q="amma",
+        )
+        seen.extend(item.id for item in result.items)
+        cursor = result.meta.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == sorted(tied, reverse=True)
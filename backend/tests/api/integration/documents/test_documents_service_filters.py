@@ -4,15 +4,19 @@ from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
 
+import anyio
 import pytest
+from sqlalchemy import text
 
 from ade_api.common.list_filters import FilterItem, FilterJoinOperator, FilterOperator
 from ade_api.common.cursor_listing import resolve_cursor_sort
+from ade_api.features.documents.schemas import DocumentListLifecycle
 from ade_api.features.documents.service import DocumentsService
 from ade_api.features.documents.sorting import CURSOR_FIELDS, DEFAULT_SORT, ID_FIELD, SORT_FIELDS
 from ade_storage import build_storage_adapter
 from ade_db.models import RunStatus
 from tests.api.integration.documents.helpers import (
+    _create_document_file,
     build_documents_fixture,
     seed_failed_run,
 )
@@ -227,3 +231,160 @@ async def test_list_documents_includes_last_run_message(db_session, settings) ->
 
     uploaded_record = next(item for item in result.items if item.id == uploaded.id)
     assert uploaded_record.last_run is None
+
+
+async def test_summary_columns_follow_versions_and_runs(db_session, settings) -> None:
+    workspace, uploader, _, processed, uploaded = await build_documents_fixture(db_session)
+    run = await seed_failed_run(
+        db_session,
+        workspace_id=workspace.id,
+        document_id=processed.id,
+        uploader_id=uploader.id,
+    )
+    db_session.expire_all()
+
+    assert processed.file_type == "pdf"
+    assert processed.current_byte_size == 512
+    assert processed.current_content_type == "application/pdf"
+    assert processed.last_run_status == RunStatus.FAILED.value
+    assert processed.last_run_at == run.completed_at
+    assert processed.activity_at == max(processed.updated_at, run.completed_at)
+
+    assert uploaded.file_type is None
+    assert uploaded.current_byte_size == 128
+    assert uploaded.last_run_at is None
+    assert uploaded.activity_at == uploaded.updated_at
+
+    storage = build_storage_adapter(settings)
+    service = DocumentsService(session=db_session, settings=settings, storage=storage)
+    by_size = resolve_cursor_sort(
+        ["-byteSize"],
+        allowed=SORT_FIELDS,
+        cursor_fields=CURSOR_FIELDS,
+        default=DEFAULT_SORT,
+        id_field=ID_FIELD,
+    )
+    first = service.list_documents(
+        workspace_id=workspace.id,
+        limit=1,
+        cursor=None,
+        resolved_sort=by_size,
+        include_total=False,
+        include_facets=False,
+        filters=[FilterItem(id="fileType", operator=FilterOperator.NOT_IN, value=["csv"])],
+        join_operator=FilterJoinOperator.AND,
+        q=None,
+    )
+    second = service.list_documents(
+        workspace_id=workspace.id,
+        limit=1,
+        cursor=first.meta.next_cursor,
+        resolved_sort=by_size,
+        include_total=False,
+        include_facets=False,
+        filters=[FilterItem(id="fileType", operator=FilterOperator.NOT_IN, value=["csv"])],
+        join_operator=FilterJoinOperator.AND,
+        q=None,
+    )
+    assert [item.id for item in first.items + second.items] == [processed.id, uploaded.id]
+
+
+async def test_list_rows_report_the_materialized_file_type(db_session, settings) -> None:
+    workspace, uploader, _, processed, _uploaded = await build_documents_fixture(db_session)
+    # No extension: the type comes from the content type, as it does for filters.
+    scanned, _version = await _create_document_file(
+        db_session,
+        workspace_id=workspace.id,
+        name="scanned-invoice",
+        uploader_id=uploader.id,
+        content_type="application/pdf",
+        byte_size=256,
+        sha256="c" * 64,
+    )
+
+    storage = build_storage_adapter(settings)
+    service = DocumentsService(session=db_session, settings=settings, storage=storage)
+    order_by_default = resolve_cursor_sort(
+        [],
+        allowed=SORT_FIELDS,
+        cursor_fields=CURSOR_FIELDS,
+        default=DEFAULT_SORT,
+        id_field=ID_FIELD,
+    )
+    result = service.list_documents(
+        workspace_id=workspace.id,
+        limit=50,
+        cursor=None,
+        resolved_sort=order_by_default,
+        include_total=False,
+        include_facets=False,
+        filters=[FilterItem(id="fileType", operator=FilterOperator.IN, value=["pdf"])],
+        join_operator=FilterJoinOperator.AND,
+        q=None,
+    )
+
+    assert {item.id: item.file_type for item in result.items} == {
+        processed.id: "pdf",
+        scanned.id: "pdf",
+    }
+
+
+async def test_facet_counters_track_runs_and_archiving(db_session, settings) -> None:
+    workspace, uploader, _, processed, uploaded = await build_documents_fixture(db_session)
+    await seed_failed_run(
+        db_session,
+        workspace_id=workspace.id,
+        document_id=processed.id,
+        uploader_id=uploader.id,
+    )
+    uploaded.deleted_at = datetime.now(tz=UTC)
+    await anyio.to_thread.run_sync(db_session.flush)
+
+    storage = build_storage_adapter(settings)
+    service = DocumentsService(session=db_session, settings=settings, storage=storage)
+    order_by_default = resolve_cursor_sort(
+        [],
+        allowed=SORT_FIELDS,
+        cursor_fields=CURSOR_FIELDS,
+        default=DEFAULT_SORT,
+        id_field=ID_FIELD,
+    )
+
+    def facets(lifecycle: DocumentListLifecycle, q: str | None) -> dict:
+        result = service.list_documents(
+            workspace_id=workspace.id,
+            limit=50,
+            cursor=None,
+            resolved_sort=order_by_default,
+            include_total=False,
+            include_facets=True,
+            filters=[],
+            join_operator=FilterJoinOperator.AND,
+            q=q,
+            lifecycle=lifecycle,
+        )
+        assert result.facets is not None
+        return result.facets
+
+    expected_active = {
+        "lastRunPhase": {"buckets": [{"value": RunStatus.FAILED.value, "count": 1}]},
+        "fileType": {"buckets": [{"value": "pdf", "count": 1}]},
+    }
+    expected_archived = {
+        "lastRunPhase": {"buckets": [{"value": None, "count": 1}]},
+        "fileType": {"buckets": [{"value": "unknown", "count": 1}]},
+    }
+    assert facets(DocumentListLifecycle.ACTIVE, None) == expected_active
+    assert facets(DocumentListLifecycle.ACTIVE, "alpha") == expected_active
+    assert facets(DocumentListLifecycle.ARCHIVED, None) == expected_archived
+
+    # Folding the trigger deltas into the counters leaves the facets unchanged.
+    folded = db_session.execute(text("SELECT compact_document_facet_counts()")).scalar_one()
+    assert folded > 0
+    pending = db_session.execute(
+        text("SELECT count(*) FROM document_facet_count_deltas WHERE workspace_id = :id"),
+        {"id": workspace.id},
+    ).scalar_one()
+    assert pending == 0
+    assert facets(DocumentListLifecycle.ACTIVE, None) == expected_active
+    assert facets(DocumentListLifecycle.ARCHIVED, None) == expected_archived
@@ -10,7 +10,7 @@ from ade_api.features.runs.schemas import (
     RunCreateOptions,
     RunCreateOptionsBase,
 )
-from ade_db.models import Run, RunStatus
+from ade_db.models import Run, RunPriority, RunStatus
 from tests.api.integration.features.runs.helpers import build_runs_service
 
 
@@ -24,6 +24,7 @@ def test_prepare_run_creates_queued_run(session, tmp_path: Path) -> None:
     run = service.prepare_run(configuration_id=configuration.id, options=options)
 
     assert run.status is RunStatus.QUEUED
+    assert run.priority == RunPriority.INTERACTIVE
     assert run.deps_digest.startswith("sha256:")
     assert run.input_file_version_id == document.current_version_id
     assert run.input_sheet_names is None
@@ -64,6 +65,7 @@ def test_enqueue_pending_runs_for_configuration_queues_uploaded_document(
     assert len(runs) == 1
     assert runs[0].configuration_id == configuration.id
     assert runs[0].status is RunStatus.QUEUED
+    assert runs[0].priority == RunPriority.BACKFILL
 
     second = service.enqueue_pending_runs_for_configuration(
         configuration_id=configuration.id,
@@ -122,3 +124,4 @@ def test_prepare_runs_batch_accepts_string_operation(session, tmp_path: Path) ->
 
     assert len(runs) == 1
     assert runs[0].status is RunStatus.QUEUED
+    assert runs[0].priority == RunPriority.INTERACTIVE
@@ -11,6 +11,7 @@ from ade_api.common.cursor_listing import (
     parse_uuid,
     resolve_cursor_sort,
 )
+from ade_api.common.list_counts import CountCache, CountKey, ListCount, count_query
 from ade_db.models import Workspace
 
 
@@ -76,3 +77,26 @@ def test_paginate_cursor_returns_meta_and_next_cursor(db_session) -> None:
     assert next_page.meta.total_included is False
     assert next_page.meta.total_count is None
     assert [item.slug for item in next_page.items] == expected_slugs[2:]
+
+
+def test_count_query_estimates_large_results_and_caches_exact_counts(db_session) -> None:
+    suffix = uuid.uuid4().hex[:8]
+    db_session.add_all([
+        Workspace(name=f"Workspace {index}", slug=f"counts-{suffix}-{index}") for index in range(3)
+    ])
+    db_session.commit()
+    query = select(Workspace).where(Workspace.slug.like(f"counts-{suffix}-%"))
+
+    estimated = count_query(db_session, query, estimate_threshold=0)
+    assert estimated.estimated is True
+
+    cache = CountCache(max_entries=8, ttl_seconds=60)
+    key = CountKey(scope="workspaces", fingerprint=suffix, version="1")
+    assert count_query(db_session, query, cache_key=key, cache=cache) == ListCount(3)
+
+    db_session.add(Workspace(name="Workspace 3", slug=f"counts-{suffix}-3"))
+    db_session.commit()
+
+    assert count_query(db_session, query, cache_key=key, cache=cache) == ListCount(3)
+    moved = CountKey(scope="workspaces", fingerprint=suffix, version="2")
+    assert count_query(db_session, query, cache_key=moved, cache=cache) == ListCount(4)
@@ -241,3 +241,107 @@ async def test_run_output_edit_endpoint_saves_edits(
     assert "headerA,headerB" in download.text
     assert "newValA,newValB" in download.text
 
+
+
+async def test_run_output_patch_endpoint_applies_operations_with_if_match(
+    async_client,
+    seed_identity,
+    db_session,
+    settings: Settings,
+) -> None:
+    workspace_id = seed_identity.workspace_id
+    configuration = make_configuration(
+        workspace_id=workspace_id,
+        name="Patch Config",
+    )
+    db_session.add(configuration)
+    await anyio.to_thread.run_sync(db_session.flush)
+
+    document = make_document(workspace_id=workspace_id, filename="Intake.csv")
+    db_session.add_all([document])
+    await anyio.to_thread.run_sync(db_session.flush)
+
+    run = make_run(
+        workspace_id=workspace_id,
+        configuration_id=configuration.id,
+        file_version_id=document.current_version_id,
+        status=RunStatus.SUCCEEDED,
+    )
+    run.completed_at = utc_now()
+    db_session.add(run)
+    await anyio.to_thread.run_sync(db_session.flush)
+
+    output_file_id = generate_uuid7()
+    output_blob_name = f"{workspace_id}/files/{output_file_id}"
+    output_file = File(
+        id=output_file_id,
+        workspace_id=workspace_id,
+        kind=FileKind.OUTPUT,
+        name=f"{document.name} (Output)",
+        name_key=f"output:{document.id}",
+        blob_name=output_blob_name,
+        source_file_id=document.id,
+        attributes={},
+        uploaded_by_user_id=None,
+        comment_count=0,
+    )
+
+    storage = build_storage_adapter(settings)
+    stored = storage.write(output_blob_name, io.BytesIO(b"name,age\nada,36\ngrace,45\n"))
+
+    output_version = FileVersion(
+        id=generate_uuid7(),
+        file_id=output_file_id,
+        version_no=1,
+        origin=FileVersionOrigin.GENERATED,
+        run_id=run.id,
+        created_by_user_id=None,
+        sha256=stored.sha256,
+        byte_size=stored.byte_size,
+        content_type="text/csv",
+        filename_at_upload="normalized.csv",
+        storage_version_id=stored.version_id or stored.sha256,
+    )
+    output_file.current_version = output_version
+    output_file.versions.append(output_version)
+    db_session.add_all([output_file, output_version])
+    await anyio.to_thread.run_sync(db_session.flush)
+    run.output_file_version_id = output_version.id
+    await anyio.to_thread.run_sync(db_session.commit)
+
+    headers = await auth_headers(async_client, seed_identity.workspace_owner)
+    output_url = f"/api/v1/workspaces/{workspace_id}/runs/{run.id}/output"
+    payload = {
+        "operations": [
+            {"op": "set", "row": 1, "column": 1, "value": "37"},
+            {"op": "insertRow", "row": 1, "values": ["alan", "41"]},
+            {"op": "deleteRow", "row": 3},
+        ]
+    }
+
+    metadata = await async_client.get(output_url, headers=headers)
+    assert metadata.status_code == 200
+    etag = metadata.headers["etag"]
+
+    missing = await async_client.patch(output_url, json=payload, headers=headers)
+    assert missing.status_code == 428
+
+    response = await async_client.patch(
+        output_url,
+        json=payload,
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["fileVersionId"] != str(output_version.id)
+    assert response.headers["etag"] != etag
+
+    stale = await async_client.patch(
+        output_url,
+        json=payload,
+        headers={**headers, "If-Match": etag},
+    )
+    assert stale.status_code == 412
+
+    download = await async_client.get(response.json()["download_url"], headers=headers)
+    assert download.status_code == 200
+    assert download.text.splitlines() == ["name,age", "alan,41", "ada,37"]
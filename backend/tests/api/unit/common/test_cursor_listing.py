@@ -13,10 +13,13 @@ from ade_api.common.cursor_listing import (
     cursor_field,
     cursor_field_nulls_last,
     encode_cursor,
+    paginate_query_cursor,
     paginate_query_page,
     paginate_sequence_cursor,
     parse_datetime,
+    parse_int,
     parse_str,
+    resolve_cursor_sort,
     resolve_cursor_sort_sequence,
 )
 
@@ -94,3 +97,51 @@ def test_paginate_query_page_returns_requested_offset_slice() -> None:
     assert list(page.items) == ["record-3", "record-4"]
     assert page.meta.total_count == 5
     assert page.meta.has_more is True
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_paginate_query_cursor_walks_ties_with_row_value_keyset(descending: bool) -> None:
+    engine = create_engine("sqlite:///:memory:")
+    metadata = MetaData()
+    records = Table(
+        "records",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String, nullable=False),
+    )
+    metadata.create_all(engine)
+    rows = [{"id": index, "name": f"group-{index % 3}"} for index in range(1, 10)]
+    resolved_sort = resolve_cursor_sort(
+        ["-name" if descending else "name"],
+        allowed={
+            "id": (records.c.id.asc(), records.c.id.desc()),
+            "name": (records.c.name.asc(), records.c.name.desc()),
+        },
+        cursor_fields={
+            "id": cursor_field(lambda row: row["id"], parse_int),
+            "name": cursor_field(lambda row: row["name"], parse_str),
+        },
+        default=["name"],
+        id_field=(records.c.id.asc(), records.c.id.desc()),
+    )
+
+    seen: list[int] = []
+    with Session(engine) as session:
+        session.execute(records.insert(), rows)
+        cursor = None
+        while True:
+            page = paginate_query_cursor(
+                session,
+                select(records),
+                resolved_sort=resolved_sort,
+                limit=2,
+                cursor=cursor,
+                row_mapper=dict,
+            )
+            seen.extend(item["id"] for item in page.items)
+            cursor = page.meta.next_cursor
+            if cursor is None:
+                break
+
+    expected = sorted(rows, key=lambda row: (row["name"], row["id"]), reverse=descending)
+    assert seen == [row["id"] for row in expected]
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from ade_api.common.list_counts import CountCache, CountKey, count_fingerprint
+
+
+def test_count_cache_matches_version_and_evicts_least_recent(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("ade_api.common.list_counts.time.monotonic", lambda: now[0])
+    cache = CountCache(max_entries=2, ttl_seconds=30)
+    first = CountKey(scope="documents:w", fingerprint="a", version="7")
+    second = CountKey(scope="documents:w", fingerprint="b", version="7")
+    third = CountKey(scope="documents:w", fingerprint="c", version="7")
+
+    cache.set(first, 10)
+    cache.set(second, 20)
+    assert cache.get(first) == 10
+    cache.set(third, 30)
+
+    assert cache.get(second) is None
+    assert cache.get(CountKey(scope="documents:w", fingerprint="a", version="8")) is None
+    assert cache.get(first) is None
+    now[0] += 31
+    assert cache.get(third) is None
+
+
+def test_count_fingerprint_is_stable_and_input_sensitive() -> None:
+    filters = [{"id": "fileType", "operator": "in", "value": ["pdf"]}]
+    assert count_fingerprint("active", filters, "and", None) == count_fingerprint(
+        "active", [{"value": ["pdf"], "operator": "in", "id": "fileType"}], "and", None
+    )
+    assert count_fingerprint("active", filters, "and", None) != count_fingerprint(
+        "archived", filters, "and", None
+    )
@@ -0,0 +1,122 @@
+"""Unit tests for the workbook preview cache."""
+
+from __future__ import annotations
+
+import os
+from uuid import uuid4
+
+from ade_api.common.etag import etag_matches
+from ade_api.common.preview_cache import (
+    DiskPreviewCache,
+    PreviewCache,
+    preview_cache_key,
+    shared_preview_uri,
+)
+from ade_api.common.workbook_preview import WorkbookSheetPreview
+
+
+def _key(**overrides) -> str:
+    options = {
+        "file_type": ".xlsx",
+        "sheet_name": None,
+        "sheet_index": 0,
+        "max_rows": 100,
+        "max_columns": 50,
+        "trim_empty_columns": False,
+        "trim_empty_rows": False,
+    }
+    options.update(overrides)
+    return preview_cache_key("ab" * 32, **options)
+
+
+def _preview(name: str = "Data") -> WorkbookSheetPreview:
+    return WorkbookSheetPreview(
+        name=name,
+        index=0,
+        rows=[["a", "b"], ["1", "2"]],
+        total_rows=2,
+        total_columns=2,
+        truncated_rows=False,
+        truncated_columns=False,
+        hidden_rows=[1],
+    )
+
+
+class _MemoryStorage:
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def write(self, uri, stream, *, max_bytes=None):
+        self.objects[uri] = stream.read()
+
+    def stream(self, uri, *, version_id=None, chunk_size=1024 * 1024):
+        if uri not in self.objects:
+            raise FileNotFoundError(uri)
+        yield self.objects[uri]
+
+
+def test_cache_key_covers_every_preview_option() -> None:
+    base = _key()
+
+    assert _key() == base
+    assert len({
+        base,
+        _key(file_type=".csv"),
+        _key(sheet_name="Data", sheet_index=None),
+        _key(sheet_index=1),
+        _key(max_rows=101),
+        _key(max_columns=51),
+        _key(trim_empty_columns=True),
+        _key(trim_empty_rows=True),
+    }) == 8
+
+
+def test_disk_cache_evicts_least_recently_used_entries(tmp_path) -> None:
+    cache = DiskPreviewCache(tmp_path, max_bytes=250)
+    keys = [_key(max_rows=rows) for rows in (1, 2, 3)]
+    cache.put(keys[0], b"x" * 100)
+    cache.put(keys[1], b"y" * 100)
+    old = 1_000_000_000
+    os.utime(cache._entry_path(keys[0]), (old, old))
+    os.utime(cache._entry_path(keys[1]), (old + 10, old + 10))
+    assert cache.get(keys[0]) == b"x" * 100  # refreshes recency
+
+    cache.put(keys[2], b"z" * 100)
+
+    assert cache.get(keys[0]) == b"x" * 100
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) == b"z" * 100
+
+
+def test_preview_cache_round_trips_and_fills_local_tier_from_shared(tmp_path) -> None:
+    workspace_id = uuid4()
+    shared = _MemoryStorage()
+    key = _key()
+    writer = PreviewCache(local=DiskPreviewCache(tmp_path / "a", max_bytes=1024), shared=shared)
+
+    writer.put(key, _preview(), workspace_id=workspace_id)
+
+    assert shared_preview_uri(workspace_id, key) in shared.objects
+    reader_local = DiskPreviewCache(tmp_path / "b", max_bytes=1024)
+    reader = PreviewCache(local=reader_local, shared=shared)
+    assert reader.get(key, workspace_id=workspace_id) == _preview()
+    assert reader_local.get(key) is not None
+    assert reader.get(_key(max_rows=1), workspace_id=workspace_id) is None
+
+
+def test_preview_cache_treats_corrupt_entries_as_misses(tmp_path) -> None:
+    local = DiskPreviewCache(tmp_path, max_bytes=1024)
+    local.put(_key(), b"{not json")
+
+    assert PreviewCache(local=local).get(_key(), workspace_id=uuid4()) is None
+    PreviewCache(local=None).put(_key(), _preview(), workspace_id=uuid4())
+
+
+def test_etag_matches_handles_lists_wildcards_and_weak_tags() -> None:
+    assert etag_matches('"abc"', "abc")
+    assert etag_matches('W/"abc"', "abc")
+    assert etag_matches('"x", "abc"', "abc")
+    assert etag_matches("*", "abc")
+    assert not etag_matches('"abcd"', "abc")
+    assert not etag_matches(None, "abc")
+    assert not etag_matches('"abc"', None)
@@ -9,9 +9,11 @@ from ade_api.common.search import (
     MAX_QUERY_LENGTH,
     MAX_QUERY_TOKENS,
     SearchField,
+    SearchIndex,
     SearchRegistry,
     build_like_predicate,
     build_q_predicate,
+    build_q_relevance,
     escape_like,
     normalize_q,
     parse_q,
@@ -68,3 +70,23 @@ def test_build_q_predicate_and_or_tokens() -> None:
     sql = str(compiled)
     assert "AND" in sql
     assert "OR" in sql
+
+
+def test_build_q_predicate_uses_search_index_when_registered() -> None:
+    registry = SearchRegistry(
+        {"test": [SearchField("name", build_like_predicate(column("name")))]},
+        indexes={"test": SearchIndex(column("search_text"))},
+    )
+
+    predicate = build_q_predicate(resource="test", q="alpha beta", registry=registry)
+    sql = str(predicate.compile(dialect=postgresql.dialect()))
+    assert sql.count("search_text ILIKE") == 2
+    assert "name" not in sql
+    assert " OR " not in sql
+
+    relevance = build_q_relevance(resource="test", q=" Alpha  beta ", registry=registry)
+    compiled = relevance.compile(dialect=postgresql.dialect())
+    assert str(compiled).startswith("CAST(word_similarity(")
+    assert str(compiled).endswith("AS FLOAT(53))")
+    assert "alpha beta" in compiled.params.values()
+    assert build_q_relevance(resource="test", q="a", registry=registry) is None
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import Any
+from uuid import UUID
+
+from ade_api.features.documents.list_cache import DocumentListCache, document_list_etag
+
+WORKSPACE_ID = UUID("11111111-2222-3333-4444-555555555555")
+
+
+def _page() -> Any:
+    # The cache never looks inside pages; a distinct object per page is enough.
+    return object()
+
+
+def test_document_list_etag_tracks_change_id_and_params() -> None:
+    params = {"limit": 50, "sort": ["-createdAt", "-id"], "filters": []}
+
+    token = document_list_etag(workspace_id=WORKSPACE_ID, changes_cursor=7, params=params)
+
+    assert token == document_list_etag(
+        workspace_id=WORKSPACE_ID,
+        changes_cursor=7,
+        params={"filters": [], "sort": ["-createdAt", "-id"], "limit": 50},
+    )
+    assert token != document_list_etag(workspace_id=WORKSPACE_ID, changes_cursor=8, params=params)
+    assert token != document_list_etag(
+        workspace_id=WORKSPACE_ID, changes_cursor=7, params={**params, "limit": 25}
+    )
+
+
+def test_document_list_cache_evicts_least_recent_and_expires(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("ade_api.features.documents.list_cache.time.monotonic", lambda: now[0])
+    cache = DocumentListCache(max_entries=2, ttl_seconds=30)
+    first, second, third = _page(), _page(), _page()
+
+    cache.set("a", first)
+    cache.set("b", second)
+    assert cache.get("a") is first
+    cache.set("c", third)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is first
+    now[0] += 31
+    assert cache.get("c") is None
+
+
+def test_document_list_cache_disabled_with_zero_entries() -> None:
+    cache = DocumentListCache(max_entries=0, ttl_seconds=30)
+    cache.set("a", _page())
+    assert cache.get("a") is None
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from ade_api.features.runs.events import RunEventsHub
+
+
+def test_parse_payload_accepts_log_and_status_notifications() -> None:
+    hub = RunEventsHub(settings=SimpleNamespace())
+
+    log = hub._parse_payload(  # noqa: SLF001 - exercising payload parsing directly
+        json.dumps({"runId": "run-1", "kind": "log", "offset": 128})
+    )
+    status = hub._parse_payload(  # noqa: SLF001
+        json.dumps({"runId": "run-1", "kind": "status", "status": "succeeded"})
+    )
+
+    assert log == ("run-1", {"runId": "run-1", "kind": "log", "offset": 128})
+    assert status == ("run-1", {"runId": "run-1", "kind": "status", "status": "succeeded"})
+
+
+def test_parse_payload_rejects_malformed_notifications() -> None:
+    hub = RunEventsHub(settings=SimpleNamespace())
+
+    assert hub._parse_payload("not-json") is None  # noqa: SLF001
+    assert hub._parse_payload(json.dumps({"runId": "run-1", "kind": "log"})) is None  # noqa: SLF001
+    assert (
+        hub._parse_payload(  # noqa: SLF001
+            json.dumps({"runId": "run-1", "kind": "log", "offset": -1})
+        )
+        is None
+    )
+    for offset in ([1], {"n": 1}, "12", 1.5, True):
+        payload = json.dumps({"runId": "run-1", "kind": "log", "offset": offset})
+        assert hub._parse_payload(payload) is None  # noqa: SLF001
+    assert hub._parse_payload(json.dumps({"kind": "status", "status": "failed"})) is None  # noqa: SLF001
+
+
+def test_enqueue_overflow_collapses_backlog_into_resync_marker() -> None:
+    hub = RunEventsHub(settings=SimpleNamespace(), queue_size=10)
+    queue: asyncio.Queue[dict[str, object]] = asyncio.Queue(maxsize=2)
+    queue.put_nowait({"runId": "run-1", "kind": "log", "offset": 10})
+    queue.put_nowait({"runId": "run-1", "kind": "log", "offset": 20})
+
+    hub._enqueue(queue, {"runId": "run-1", "kind": "log", "offset": 30})  # noqa: SLF001
+
+    assert queue.qsize() == 1
+    assert queue.get_nowait() == {"runId": "run-1", "kind": "resync"}
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from azure.core.exceptions import HttpResponseError
+
+from ade_storage.append_log import IncrementalLogSink, LocalFileAppendWriter
+from ade_storage.azure_blob import AzureBlobConfig, AzureBlobStorage
+from ade_storage.base import AppendLimitError, AppendPositionError, AppendWriter
+
+
+class _RecordingWriter(AppendWriter):
+    def __init__(self, *, fail_after: int | None = None) -> None:
+        self.uri = "ws/runs/run/logs/events.ndjson"
+        self.data = b""
+        self.resets = 0
+        self.appends: list[bytes] = []
+        self.offsets: list[int] = []
+        self._fail_after = fail_after
+
+    def reset(self) -> None:
+        self.resets += 1
+        self.data = b""
+        self.appends = []
+
+    def append(self, data: bytes, *, offset: int) -> None:
+        if self._fail_after is not None and len(self.appends) >= self._fail_after:
+            self._fail_after = None
+            raise AppendLimitError("limit")
+        if offset != len(self.data):
+            raise AppendPositionError("position")
+        self.appends.append(data)
+        self.offsets.append(offset)
+        self.data += data
+
+
+def test_sink_appends_only_new_complete_lines(tmp_path: Path) -> None:
+    source = tmp_path / "events.ndjson"
+    source.write_bytes(b'{"a":1}\n{"b":')
+    remote = tmp_path / "remote" / "events.ndjson"
+    sink = IncrementalLogSink(source, LocalFileAppendWriter(remote))
+
+    assert sink.ship() == len(b'{"a":1}\n')
+    assert remote.read_bytes() == b'{"a":1}\n'
+
+    with source.open("ab") as fh:
+        fh.write(b'2}\n{"c":3}\n')
+    assert sink.ship() == len(b'{"b":2}\n{"c":3}\n')
+    assert sink.ship() == 0
+    assert remote.read_bytes() == source.read_bytes()
+
+
+def test_sink_resets_remote_object_on_first_ship(tmp_path: Path) -> None:
+    source = tmp_path / "events.ndjson"
+    source.write_bytes(b"line\n")
+    writer = _RecordingWriter()
+    writer.data = b"stale content from a previous attempt\n"
+    sink = IncrementalLogSink(source, writer)
+
+    sink.ship()
+
+    assert writer.resets == 1
+    assert writer.data == b"line\n"
+
+
+def test_sink_rebuilds_when_append_limit_is_reached(tmp_path: Path) -> None:
+    source = tmp_path / "events.ndjson"
+    source.write_bytes(b"one\n")
+    writer = _RecordingWriter(fail_after=1)
+    sink = IncrementalLogSink(source, writer, chunk_size=1024)
+    sink.ship()
+
+    with source.open("ab") as fh:
+        fh.write(b"two\n")
+    sink.ship()
+
+    assert writer.resets == 2
+    assert writer.data == b"one\ntwo\n"
+    assert sink.offset == len(b"one\ntwo\n")
+
+
+def test_sink_conditions_each_chunk_on_the_shipped_offset(tmp_path: Path) -> None:
+    source = tmp_path / "events.ndjson"
+    source.write_bytes(b"aaaa\nbbbb\n")
+    writer = _RecordingWriter()
+    sink = IncrementalLogSink(source, writer, chunk_size=4)
+
+    assert sink.ship() == 10
+
+    assert writer.appends == [b"aaaa", b"\nbbb", b"b\n"]
+    assert writer.offsets == [0, 4, 8]
+    assert sink.offset == 10
+
+
+def test_sink_rebuilds_when_remote_length_does_not_match(tmp_path: Path) -> None:
+    source = tmp_path / "events.ndjson"
+    source.write_bytes(b"one\n")
+    writer = _RecordingWriter()
+    sink = IncrementalLogSink(source, writer)
+    sink.ship()
+
+    # A retried append already landed remotely, so the next one is out of position.
+    writer.data += b"one\n"
+    with source.open("ab") as fh:
+        fh.write(b"two\n")
+    sink.ship()
+
+    assert writer.resets == 2
+    assert writer.data == b"one\ntwo\n"
+    assert sink.offset == len(b"one\ntwo\n")
+
+
+class _DummyAppendBlob:
+    def __init__(self, *, error_code: str | None = None) -> None:
+        self.created = 0
+        self.blocks: list[bytes] = []
+        self.positions: list[int | None] = []
+        self._error_code = error_code
+
+    def create_append_blob(self, **_kwargs) -> None:
+        self.created += 1
+
+    def append_block(self, data: bytes, **kwargs) -> None:
+        if self._error_code:
+            exc = HttpResponseError(message="append failed")
+            exc.error_code = self._error_code
+            raise exc
+        self.blocks.append(data)
+        self.positions.append(kwargs.get("appendpos_condition"))
+
+
+class _DummyContainer:
+    def __init__(self, blob: _DummyAppendBlob) -> None:
+        self.blob = blob
+        self.names: list[str] = []
+
+    def get_blob_client(self, name: str, *_args, **_kwargs):
+        self.names.append(name)
+        return self.blob
+
+
+def _make_storage() -> AzureBlobStorage:
+    cfg = AzureBlobConfig(
+        account_url="https://example.blob.core.windows.net",
+        connection_string=None,
+        container="ade",
+        prefix="workspaces",
+        versioning_mode="auto",
+        request_timeout_seconds=30,
+        max_concurrency=4,
+        upload_chunk_size_bytes=4 * 1024 * 1024,
+        download_chunk_size_bytes=1024 * 1024,
+    )
+    return AzureBlobStorage(cfg)
+
+
+def test_azure_append_writer_uses_append_blob() -> None:
+    storage = _make_storage()
+    blob = _DummyAppendBlob()
+    container = _DummyContainer(blob)
+    storage._container_client = container  # type: ignore[attr-defined]
+
+    writer = storage.open_append_writer("ws/runs/run/logs/events.ndjson")
+    writer.reset()
+    writer.append(b"one\n", offset=0)
+    writer.append(b"", offset=4)
+    writer.append(b"two\n", offset=4)
+
+    assert container.names == ["workspaces/ws/runs/run/logs/events.ndjson"]
+    assert blob.created == 1
+    assert blob.blocks == [b"one\n", b"two\n"]
+    assert blob.positions == [0, 4]
+
+
+def test_azure_append_writer_maps_block_limit_error() -> None:
+    storage = _make_storage()
+    storage._container_client = _DummyContainer(  # type: ignore[attr-defined]
+        _DummyAppendBlob(error_code="BlockCountExceedsLimit")
+    )
+
+    writer = storage.open_append_writer("ws/runs/run/logs/events.ndjson")
+    with pytest.raises(AppendLimitError):
+        writer.append(b"one\n", offset=0)
+
+
+def test_azure_append_writer_maps_append_position_error() -> None:
+    storage = _make_storage()
+    storage._container_client = _DummyContainer(  # type: ignore[attr-defined]
+        _DummyAppendBlob(error_code="AppendPositionConditionNotMet")
+    )
+
+    writer = storage.open_append_writer("ws/runs/run/logs/events.ndjson")
+    with pytest.raises(AppendPositionError):
+        writer.append(b"one\n", offset=0)
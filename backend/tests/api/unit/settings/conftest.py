@@ -56,15 +56,26 @@ def reset_settings(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
         "ADE_FAILED_LOGIN_LOCK_THRESHOLD",
         "ADE_FAILED_LOGIN_LOCK_DURATION",
         "ADE_WORKER_RUN_CONCURRENCY",
+        "ADE_WORKER_ADMISSION_ENABLED",
+        "ADE_WORKER_ADMISSION_MEMORY_TARGET",
+        "ADE_WORKER_ADMISSION_CPU_TARGET",
+        "ADE_WORKER_RUN_MAX_MEMORY_MB",
         "ADE_WORKER_POLL_INTERVAL",
         "ADE_WORKER_POLL_INTERVAL_MAX",
         "ADE_WORKER_CLEANUP_INTERVAL",
         "ADE_WORKER_LEASE_SECONDS",
         "ADE_WORKER_BACKOFF_BASE_SECONDS",
         "ADE_WORKER_BACKOFF_MAX_SECONDS",
+        "ADE_WORKER_RUN_BATCH_SIZE",
+        "ADE_WORKER_WORKSPACE_MAX_CONCURRENT_RUNS",
+        "ADE_WORKER_RESULT_CACHE_ENABLED",
         "ADE_WORKER_LOG_LEVEL",
+        "ADE_WORKER_METRICS_PORT",
+        "ADE_WORKER_METRICS_HOST",
         "ADE_WORKER_RUN_TIMEOUT_SECONDS",
         "ADE_WORKER_ENV_BUILD_TIMEOUT_SECONDS",
+        "ADE_WORKER_ENV_ARTIFACTS_ENABLED",
+        "ADE_WORKER_INPUT_CACHE_MAX_MB",
         "ADE_WORKER_ENABLE_GC",
         "ADE_WORKER_GC_INTERVAL_SECONDS",
         "ADE_WORKER_ENV_TTL_DAYS",
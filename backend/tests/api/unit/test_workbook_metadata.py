@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import io
+import zipfile
+
+import openpyxl
+
+from ade_api.common import workbook_metadata as wm
+from ade_api.common.workbook_metadata import (
+    capture_workbook_metadata,
+    extract_workbook_metadata,
+    find_sheet_row_index,
+    workbook_metadata_sheets,
+)
+
+
+def _save(workbook: openpyxl.Workbook, path):
+    workbook.save(path)
+    workbook.close()
+    return path
+
+
+def test_extract_reports_sheets_active_dimension_and_hidden_counts(tmp_path):
+    workbook = openpyxl.Workbook()
+    data = workbook.active
+    data.title = "Data"
+    for index in range(5):
+        data.append([index, f"row {index}", None, "x"])
+    data.row_dimensions[2].hidden = True
+    data.row_dimensions[4].hidden = True
+    data.column_dimensions["B"].hidden = True
+    summary = workbook.create_sheet("Summary")
+    summary["A1"] = "total"
+    archived = workbook.create_sheet("Archived")
+    archived.sheet_state = "hidden"
+    workbook.active = 1
+
+    metadata = extract_workbook_metadata(_save(workbook, tmp_path / "book.xlsx"))
+
+    assert metadata["version"] == wm.WORKBOOK_METADATA_VERSION
+    sheets = metadata["sheets"]
+    assert [(s["name"], s["index"], s["is_active"], s["state"]) for s in sheets] == [
+        ("Data", 0, False, "visible"),
+        ("Summary", 1, True, "visible"),
+        ("Archived", 2, False, "hidden"),
+    ]
+    assert sheets[0]["dimension"] == "A1:D5"
+    assert (sheets[0]["row_count"], sheets[0]["column_count"]) == (5, 4)
+    assert sheets[0]["hidden_row_count"] == 2
+    assert sheets[0]["hidden_column_count"] == 1
+    assert sheets[1]["hidden_row_count"] == 0
+
+
+def test_extract_handles_tags_split_across_read_chunks(tmp_path, monkeypatch):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for index in range(50):
+        sheet.append([f"value {index}"] * 3)
+        if index % 7 == 0:
+            sheet.row_dimensions[index + 1].hidden = True
+    path = _save(workbook, tmp_path / "chunks.xlsx")
+    monkeypatch.setattr(wm, "_SHEET_SCAN_CHUNK_SIZE", 7)
+
+    (metadata,) = extract_workbook_metadata(path)["sheets"]
+
+    assert metadata["row_count"] == 50
+    assert metadata["hidden_row_count"] == len(range(0, 50, 7))
+
+
+def test_capture_reads_streams_and_skips_non_workbooks(tmp_path):
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "Only"
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(10)
+
+    metadata = capture_workbook_metadata(buffer, filename="Upload.XLSX")
+
+    assert buffer.tell() == 0
+    assert [sheet["name"] for sheet in workbook_metadata_sheets(metadata)] == ["Only"]
+    assert capture_workbook_metadata(buffer, filename="upload.csv") is None
+    assert capture_workbook_metadata(io.BytesIO(b"not a zip"), filename="x.xlsx") is None
+
+
+def test_stored_sheets_ignore_missing_or_stale_payloads():
+    assert workbook_metadata_sheets(None) is None
+    assert workbook_metadata_sheets({"version": 0, "sheets": [{"name": "A"}]}) is None
+    assert workbook_metadata_sheets({"version": wm.WORKBOOK_METADATA_VERSION, "sheets": []}) is None
+
+
+def test_extract_records_row_checkpoints_at_row_tag_offsets(tmp_path, monkeypatch):
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "Data"
+    for index in range(1, 2501):
+        workbook.active.append([index])
+    path = _save(workbook, tmp_path / "long.xlsx")
+    monkeypatch.setattr(wm, "_SHEET_SCAN_CHUNK_SIZE", 4096)
+
+    metadata = extract_workbook_metadata(path)
+    row_index = find_sheet_row_index(metadata, sheet_name="Data", sheet_index=None)
+
+    assert row_index is not None
+    assert [row for row, _ in row_index.checkpoints] == [1025, 2049]
+    with zipfile.ZipFile(path) as archive:
+        part = archive.read("xl/worksheets/sheet1.xml")
+    for row, offset in row_index.checkpoints:
+        assert part[offset:].startswith(f'<row r="{row}"'.encode())
+    assert row_index.prelude.endswith(b"<sheetData>")
+    assert row_index.seek_point(1024) is None
+    assert row_index.seek_point(2048) == row_index.checkpoints[0]
+    assert find_sheet_row_index(metadata, sheet_name=None, sheet_index=0) == row_index
+    assert find_sheet_row_index(metadata, sheet_name="Missing", sheet_index=None) is None
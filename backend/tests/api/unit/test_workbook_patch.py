@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import csv
+import zipfile
+
+import openpyxl
+import pytest
+from openpyxl.styles import Font
+
+from ade_api.common.workbook_patch import (
+    DeleteRow,
+    InsertRow,
+    RowPlan,
+    SetCell,
+    WorkbookPatchError,
+    patch_csv,
+    patch_xlsx,
+)
+
+
+def _apply_to_lists(rows: list[list[str]], operations) -> list[list[str]]:
+    result = [list(row) for row in rows]
+    for operation in operations:
+        if isinstance(operation, SetCell):
+            while len(result) <= operation.row:
+                result.append([])
+            row = result[operation.row]
+            while len(row) <= operation.column:
+                row.append("")
+            row[operation.column] = operation.value
+        elif isinstance(operation, InsertRow):
+            while len(result) < operation.row:
+                result.append([])
+            result.insert(operation.row, list(operation.values))
+        elif operation.row < len(result):
+            del result[operation.row]
+    return result
+
+
+OPERATIONS = [
+    SetCell(row=1, column=1, value="edited"),
+    InsertRow(row=0, values=["new", "header"]),
+    DeleteRow(row=3),
+    SetCell(row=3, column=0, value="42"),
+    InsertRow(row=4),
+    SetCell(row=4, column=2, value="x"),
+    DeleteRow(row=0),
+    SetCell(row=8, column=0, value="past the end"),
+]
+
+
+def test_row_plan_matches_sequential_list_edits():
+    source = [[f"r{index}", str(index)] for index in range(6)]
+    plan = RowPlan(OPERATIONS)
+
+    merged: list[list[str]] = []
+    for row, values, cells in plan.rows(enumerate(source)):
+        while len(merged) < row:
+            merged.append([])
+        output = list(values or [])
+        for column, value in cells.items():
+            while len(output) <= column:
+                output.append("")
+            output[column] = value
+        merged.append(output)
+
+    assert merged == _apply_to_lists(source, OPERATIONS)
+    assert plan.output_row(0) == 0
+    assert plan.output_row(2) is None
+    assert plan.extent(len(source), 2) == (len(merged), 3)
+
+
+def test_patch_csv_streams_operations(tmp_path):
+    source = tmp_path / "in.csv"
+    source.write_text("name,age\nada,36\ngrace,45\nlinus,28\n", encoding="utf-8")
+    target = tmp_path / "out.csv"
+
+    patch_csv(
+        source,
+        target,
+        RowPlan([
+            SetCell(row=1, column=1, value="37"),
+            DeleteRow(row=2),
+            InsertRow(row=1, values=["alan", "41"]),
+        ]),
+    )
+
+    with target.open(newline="", encoding="utf-8") as handle:
+        assert list(csv.reader(handle)) == [
+            ["name", "age"],
+            ["alan", "41"],
+            ["ada", "37"],
+            ["linus", "28"],
+        ]
+
+
+def test_patch_xlsx_rewrites_only_the_target_sheet(tmp_path):
+    workbook = openpyxl.Workbook()
+    data = workbook.active
+    data.title = "Data"
+    for index in range(1, 8):
+        data.append([f"r{index}", index, None if index % 3 else "three"])
+    data["A2"].font = Font(bold=True)
+    data.row_dimensions[5].hidden = True
+    other = workbook.create_sheet("Other")
+    other.append(["untouched"])
+    source = tmp_path / "in.xlsx"
+    workbook.save(source)
+    target = tmp_path / "out.xlsx"
+
+    operations = [
+        SetCell(row=1, column=0, value="bold edit"),
+        SetCell(row=1, column=1, value="2.5"),
+        DeleteRow(row=2),
+        InsertRow(row=0, values=["id", "", "label"]),
+        SetCell(row=10, column=4, value="a < b & c"),
+        SetCell(row=4, column=1, value=""),
+    ]
+    patch_xlsx(source, target, RowPlan(operations), sheet_name="Data", sheet_index=None)
+
+    with zipfile.ZipFile(source) as before, zipfile.ZipFile(target) as after:
+        assert before.read("xl/worksheets/sheet2.xml") == after.read("xl/worksheets/sheet2.xml")
+        assert before.read("xl/styles.xml") == after.read("xl/styles.xml")
+
+    result = openpyxl.load_workbook(target)
+    sheet = result["Data"]
+    values = [list(row) for row in sheet.iter_rows(values_only=True)]
+    assert values[0][:3] == ["id", None, "label"]
+    assert values[1][:3] == ["r1", 1, None]
+    assert values[2][:3] == ["bold edit", 2.5, None]
+    assert values[3][:3] == ["r4", 4, None]
+    assert values[4][:3] == ["r5", None, None]
+    assert values[10][4] == "a < b & c"
+    assert sheet["A3"].font.bold is True
+    assert sheet.row_dimensions[5].hidden is True
+    assert sheet.max_row == 11
+    assert sheet.dimensions == "A1:E11"
+    assert result["Other"]["A1"].value == "untouched"
+
+
+def test_patch_xlsx_rejects_unknown_sheets_and_illegal_values(tmp_path):
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["a"])
+    source = tmp_path / "in.xlsx"
+    workbook.save(source)
+
+    with pytest.raises(KeyError):
+        patch_xlsx(source, tmp_path / "a.xlsx", RowPlan([]), sheet_name="Missing", sheet_index=None)
+    with pytest.raises(WorkbookPatchError):
+        patch_xlsx(
+            source,
+            tmp_path / "b.xlsx",
+            RowPlan([SetCell(row=0, column=0, value="bell\x07")]),
+            sheet_name=None,
+            sheet_index=0,
+        )
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import zipfile
+from datetime import date, datetime
+
 import openpyxl
 from openpyxl.styles import Alignment, Font, PatternFill
 
-from ade_api.common.workbook_preview import build_workbook_preview_from_xlsx
+from ade_api.common.workbook_metadata import extract_workbook_metadata, find_sheet_row_index
+from ade_api.common.workbook_preview import (
+    build_workbook_preview_from_csv,
+    build_workbook_preview_from_xlsx,
+    get_xlsx_hidden_rows,
+)
 
 
 def test_xlsx_preview_reports_hidden_rows_and_columns(tmp_path):
@@ -47,3 +55,145 @@ def test_xlsx_preview_treats_excel_argb_fills_as_opaque_rgb(tmp_path):
     preview = build_workbook_preview_from_xlsx(path)
 
     assert preview.cell_formats[0].bg_color == "#33CCCC"
+
+
+def test_xlsx_preview_decodes_values_like_openpyxl(tmp_path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["name", "count", "ratio", "seen", "active"])
+    sheet.append(["alpha", 3, 1.5, datetime(2024, 5, 1, 9, 30), True])
+    sheet.append(["beta", None, None, date(2024, 5, 2), False])
+    sheet["B3"].font = Font(italic=True)
+
+    path = tmp_path / "values.xlsx"
+    workbook.save(path)
+
+    preview = build_workbook_preview_from_xlsx(path)
+
+    assert preview.rows == [
+        ["name", "count", "ratio", "seen", "active"],
+        ["alpha", "3", "1.5", "2024-05-01T09:30:00", "true"],
+        ["beta", "", "", "2024-05-02T00:00:00", "false"],
+    ]
+    assert [(f.row, f.column, f.italic) for f in preview.cell_formats] == [(2, 1, True)]
+
+
+def test_xlsx_preview_stops_reading_after_the_row_window(tmp_path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for index in range(1, 501):
+        sheet.append([f"row {index}", index])
+    sheet.row_dimensions[3].hidden = True
+    sheet.row_dimensions[400].hidden = True
+
+    path = tmp_path / "long.xlsx"
+    workbook.save(path)
+
+    preview = build_workbook_preview_from_xlsx(path, max_rows=5, max_columns=1)
+
+    assert preview.rows == [[f"row {index}"] for index in range(1, 6)]
+    assert (preview.total_rows, preview.total_columns) == (500, 2)
+    assert preview.truncated_rows is True
+    assert preview.truncated_columns is True
+    assert preview.hidden_rows == [2]
+    assert get_xlsx_hidden_rows(path) == [2, 399]
+
+
+def test_xlsx_preview_reads_inline_strings_and_sparse_rows_without_dimension(tmp_path):
+    ns = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    rels_ns = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    path = tmp_path / "sparse.xlsx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{ns}" xmlns:r="{rels_ns}">'
+            '<sheets><sheet name="Raw" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        )
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{rels_ns}/worksheet" Target="worksheets/a.xml"/>'
+            "</Relationships>",
+        )
+        archive.writestr(
+            "xl/worksheets/a.xml",
+            f'<worksheet xmlns="{ns}"><sheetData>'
+            '<row r="1"><c r="A1" t="inlineStr">'
+            "<is><r><t>in</t></r><r><t>line</t></r></is></c></row>"
+            '<row r="3"><c r="C3" t="str"><v>formula</v></c></row>'
+            "</sheetData></worksheet>",
+        )
+
+    preview = build_workbook_preview_from_xlsx(path)
+
+    assert preview.name == "Raw"
+    assert preview.rows == [["inline", "", ""], ["", "", ""], ["", "", "formula"]]
+    assert (preview.total_rows, preview.total_columns) == (3, 3)
+
+
+def test_xlsx_preview_windows_by_row_and_column_offset(tmp_path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for index in range(1, 3001):
+        sheet.append([f"r{index}c{column}" for column in range(1, 6)])
+    sheet.row_dimensions[2502].hidden = True
+    sheet["C2501"].font = Font(bold=True)
+    path = tmp_path / "scroll.xlsx"
+    workbook.save(path)
+    row_index = find_sheet_row_index(
+        extract_workbook_metadata(path), sheet_name=None, sheet_index=0
+    )
+    assert row_index is not None
+
+    seeked = build_workbook_preview_from_xlsx(
+        path, max_rows=3, max_columns=2, row_offset=2500, column_offset=2, row_index=row_index
+    )
+    scanned = build_workbook_preview_from_xlsx(
+        path, max_rows=3, max_columns=2, row_offset=2500, column_offset=2
+    )
+
+    assert seeked == scanned
+    assert seeked.rows == [[f"r{row}c3", f"r{row}c4"] for row in (2501, 2502, 2503)]
+    assert (seeked.row_offset, seeked.column_offset) == (2500, 2)
+    assert (seeked.total_rows, seeked.total_columns) == (3000, 5)
+    assert seeked.truncated_rows is True
+    assert seeked.truncated_columns is True
+    assert seeked.hidden_rows == [2501]
+    assert [(f.row, f.column, f.bold) for f in seeked.cell_formats] == [(2500, 2, True)]
+
+
+def test_xlsx_preview_falls_back_to_a_full_read_when_the_row_index_is_stale(tmp_path):
+    workbook = openpyxl.Workbook()
+    for index in range(1, 2001):
+        workbook.active.append([index])
+    path = tmp_path / "stale.xlsx"
+    workbook.save(path)
+    row_index = find_sheet_row_index(
+        extract_workbook_metadata(path), sheet_name=None, sheet_index=0
+    )
+    assert row_index is not None
+    stale = type(row_index)(
+        prelude=row_index.prelude,
+        checkpoints=[(row, offset + 3) for row, offset in row_index.checkpoints],
+    )
+
+    preview = build_workbook_preview_from_xlsx(
+        path, max_rows=2, max_columns=1, row_offset=1998, row_index=stale
+    )
+
+    assert preview.rows == [["1999"], ["2000"]]
+    assert preview.truncated_rows is False
+
+
+def test_csv_preview_windows_by_row_and_column_offset(tmp_path):
+    path = tmp_path / "people.csv"
+    path.write_text("a,b,c\n1,2,3\n4,5,6\n7,8,9\n")
+
+    preview = build_workbook_preview_from_csv(
+        path, max_rows=2, max_columns=1, row_offset=1, column_offset=1
+    )
+
+    assert preview.rows == [["2"], ["5"]]
+    assert (preview.total_rows, preview.total_columns) == (4, 3)
+    assert preview.truncated_rows is True
+    assert preview.truncated_columns is True
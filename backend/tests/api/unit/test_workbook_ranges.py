@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import io
+import os
+import zipfile
+from collections.abc import Iterator
+
+import openpyxl
+import pytest
+
+from ade_api.common.workbook_ranges import WorkbookRangeError, read_workbook_sheets
+from ade_storage.base import StorageAdapter, StoredObject
+
+
+class _MemoryStorage(StorageAdapter):
+    def __init__(self, payload: bytes) -> None:
+        self.payload = payload
+        self.ranges: list[tuple[int, int]] = []
+
+    def check_connection(self) -> None:
+        return None
+
+    def write(self, uri, stream, *, max_bytes=None) -> StoredObject:  # pragma: no cover
+        raise NotImplementedError
+
+    def stream(self, uri, *, version_id=None, chunk_size=1024 * 1024) -> Iterator[bytes]:
+        return self.stream_range(uri, version_id=version_id, chunk_size=chunk_size)
+
+    def stream_range(
+        self,
+        uri,
+        *,
+        start_offset=0,
+        version_id=None,
+        chunk_size=1024 * 1024,
+    ) -> Iterator[bytes]:
+        if uri != "ws/files/book":
+            raise FileNotFoundError(uri)
+        self.ranges.append((start_offset, chunk_size))
+        payload = self.payload[start_offset:]
+        for start in range(0, len(payload), chunk_size):
+            yield payload[start : start + chunk_size]
+
+    def delete(self, uri, *, version_id=None) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+    @property
+    def bytes_read(self) -> int:
+        return sum(length for _, length in self.ranges)
+
+
+def _workbook_bytes(*, filler_rows: int = 0) -> bytes:
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "Data"
+    for index in range(filler_rows):
+        workbook.active.append([os.urandom(16).hex(), index])
+    workbook.create_sheet("Summary")
+    hidden = workbook.create_sheet("Lookup")
+    hidden.sheet_state = "hidden"
+    workbook.active = 1
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    workbook.close()
+    return buffer.getvalue()
+
+
+def test_reads_sheets_without_fetching_the_whole_object() -> None:
+    payload = _workbook_bytes(filler_rows=20_000)
+    storage = _MemoryStorage(payload)
+
+    sheets = read_workbook_sheets(storage, "ws/files/book", size=len(payload))
+
+    assert [(s.name, s.index, s.state, s.is_active) for s in sheets] == [
+        ("Data", 0, "visible", False),
+        ("Summary", 1, "visible", True),
+        ("Lookup", 2, "hidden", False),
+    ]
+    assert sheets[0].part == "xl/worksheets/sheet1.xml"
+    assert storage.bytes_read < 32 * 1024 < len(payload)
+
+
+def test_reads_stored_members_and_archive_comments() -> None:
+    source = zipfile.ZipFile(io.BytesIO(_workbook_bytes()))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as target:
+        for info in source.infolist():
+            target.writestr(info.filename, source.read(info.filename))
+        target.comment = b"x" * 20_000
+    payload = buffer.getvalue()
+
+    sheets = read_workbook_sheets(_MemoryStorage(payload), "ws/files/book", size=len(payload))
+
+    assert [sheet.name for sheet in sheets] == ["Data", "Summary", "Lookup"]
+
+
+def test_rejects_non_workbook_objects_and_propagates_missing_blobs() -> None:
+    payload = b"not an actual xlsx payload"
+    with pytest.raises(WorkbookRangeError):
+        read_workbook_sheets(_MemoryStorage(payload), "ws/files/book", size=len(payload))
+    with pytest.raises(FileNotFoundError):
+        read_workbook_sheets(_MemoryStorage(payload), "ws/files/other", size=len(payload))
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import itertools
+
+import openpyxl
+import pytest
+from openpyxl.styles import Font, PatternFill
+
+from ade_api.common.workbook_preview import (
+    build_workbook_preview_from_sidecar,
+    build_workbook_preview_from_xlsx,
+)
+from ade_api.common.workbook_sidecar import (
+    WorkbookSidecar,
+    WorkbookSidecarError,
+    sidecar_descriptor,
+    write_workbook_sidecar,
+)
+
+
+def _workbook(tmp_path):
+    workbook = openpyxl.Workbook()
+    data = workbook.active
+    data.title = "Data"
+    data.append(["id", "name", "joined", "active"])
+    for index in range(1, 40):
+        data.append([index, f"name {index}", None, index % 2 == 0])
+    data["C5"] = "2024-01-02"
+    data.cell(row=60, column=6, value="sparse")
+    data.row_dimensions[7].hidden = True
+    data.column_dimensions["B"].hidden = True
+    data["A1"].font = Font(bold=True)
+    data["D3"].fill = PatternFill("solid", fgColor="FFFFFF00")
+    workbook.create_sheet("Empty")
+    path = tmp_path / "book.xlsx"
+    workbook.save(path)
+    return path
+
+
+def _sidecar(tmp_path, path):
+    target = tmp_path / "book.rows"
+    descriptor = write_workbook_sidecar(path, target)
+    payload = target.read_bytes()
+    assert descriptor["byte_size"] == len(payload)
+    descriptor["blob_name"] = "ws/runs/r/output/rows.rows"
+    return descriptor, payload
+
+
+def test_sidecar_windows_match_the_workbook_reader(tmp_path):
+    path = _workbook(tmp_path)
+    descriptor, payload = _sidecar(tmp_path, path)
+    sidecar = WorkbookSidecar(descriptor, lambda offset, length: payload[offset : offset + length])
+
+    windows = itertools.product([0, 1], [0, 5, 58, 100], [0, 2], [1, 10], [False, True])
+    for sheet_index, row_offset, column_offset, max_rows, trim in windows:
+        options = {
+            "sheet_index": sheet_index,
+            "row_offset": row_offset,
+            "column_offset": column_offset,
+            "max_rows": max_rows,
+            "max_columns": 3,
+            "trim_empty_rows": trim,
+            "trim_empty_columns": trim,
+        }
+        expected = build_workbook_preview_from_xlsx(path, **options)
+        assert build_workbook_preview_from_sidecar(sidecar, **options) == expected, options
+
+    with pytest.raises(KeyError):
+        build_workbook_preview_from_sidecar(sidecar, sheet_name="Missing")
+
+
+def test_sidecar_reads_only_the_window(tmp_path):
+    path = _workbook(tmp_path)
+    descriptor, payload = _sidecar(tmp_path, path)
+    reads: list[tuple[int, int]] = []
+
+    def read(offset: int, length: int) -> bytes:
+        reads.append((offset, length))
+        return payload[offset : offset + length]
+
+    preview = build_workbook_preview_from_sidecar(
+        WorkbookSidecar(descriptor, read),
+        row_offset=6,
+        max_rows=2,
+    )
+
+    assert preview.hidden_rows == [6]
+    assert preview.rows[0][:2] == ["6", "name 6"]
+    assert len(reads) == 2
+    assert sum(length for _, length in reads) < len(payload) // 10
+
+
+def test_truncated_sidecars_and_stale_descriptors_are_rejected(tmp_path):
+    path = _workbook(tmp_path)
+    descriptor, payload = _sidecar(tmp_path, path)
+    truncated = WorkbookSidecar(descriptor, lambda offset, length: payload[offset : offset + 4])
+
+    with pytest.raises(WorkbookSidecarError):
+        build_workbook_preview_from_sidecar(truncated, max_rows=5)
+    assert sidecar_descriptor({"sidecar": descriptor}) == descriptor
+    assert sidecar_descriptor({"sidecar": {**descriptor, "version": 0}}) is None
+    assert sidecar_descriptor({"sheets": []}) is None
+    with pytest.raises(WorkbookSidecarError):
+        WorkbookSidecar({"sheets": [{"name": "x"}]}, lambda offset, length: b"")
@@ -3,13 +3,22 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from uuid import uuid4
 
-from sqlalchemy import insert, select
+import psycopg
+from sqlalchemy import insert, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import sessionmaker
 
-from ade_db.engine import session_scope
-from ade_db.schema import configurations, metadata, runs
+from ade_db.engine import build_psycopg_connect_kwargs, session_scope
+from ade_db.schema import (
+    configurations,
+    file_versions,
+    metadata,
+    run_fields,
+    run_metrics,
+    runs,
+)
 from ade_worker import db
+from ade_worker.worker import CHANNEL_RUN_CANCELLED
 
 
 def _uuid() -> str:
@@ -70,6 +79,10 @@ def _insert_run(
     claim_expires_at: datetime | None = None,
     claimed_by: str | None = None,
     input_file_version_id: str | None = None,
+    run_options: dict | None = None,
+    operation: str = "process",
+    priority: int = 0,
+    created_offset: timedelta = timedelta(minutes=10),
 ) -> None:
     _ensure_workspace_and_configuration(
         engine,
@@ -86,7 +99,7 @@ def _insert_run(
                 input_file_version_id=input_file_version_id,
                 output_file_version_id=None,
                 input_sheet_names=None,
-                run_options=None,
+                run_options=run_options,
                 deps_digest=deps_digest,
                 status=status,
                 available_at=now - timedelta(minutes=1),
@@ -94,10 +107,11 @@ def _insert_run(
                 max_attempts=max_attempts,
                 claimed_by=claimed_by,
                 claim_expires_at=claim_expires_at,
-                operation="process",
+                operation=operation,
+                priority=priority,
                 exit_code=None,
                 error_message=None,
-                created_at=now - timedelta(minutes=10),
+                created_at=now - created_offset,
                 started_at=None,
                 completed_at=None,
             )
@@ -133,6 +147,7 @@ def test_run_claim_does_not_require_ready_environment(engine) -> None:
     assert claim is not None
     assert claim.id.lower() == run_id.lower()
     assert claim.attempt_count == 1
+    assert claim.input_byte_size is None
 
     with engine.begin() as conn:
         row = conn.execute(
@@ -145,6 +160,187 @@ def test_run_claim_does_not_require_ready_environment(engine) -> None:
     assert row.attempt_count == 1
 
 
+def _claim_ids(engine, *, now: datetime, limit: int, workspace_max_running: int | None = None):
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with session_scope(session_factory) as session:
+        claims = db.claim_runs(
+            session,
+            worker_id="worker-fair",
+            now=now,
+            lease_seconds=60,
+            limit=limit,
+            workspace_max_running=workspace_max_running,
+        )
+    return [claim.id.lower() for claim in claims]
+
+
+def test_run_claim_prefers_priority_then_least_loaded_workspace(engine) -> None:
+    now = datetime(2025, 1, 10, 12, 0, 0)
+    configuration_id = _uuid()
+    busy_workspace_id = _uuid()
+    quiet_workspace_id = _uuid()
+    other_configuration_id = _uuid()
+    backlog = [_uuid() for _ in range(4)]
+    interactive_id = _uuid()
+    validate_id = _uuid()
+
+    for index, run_id in enumerate(backlog):
+        _insert_run(
+            engine,
+            run_id=run_id,
+            workspace_id=busy_workspace_id,
+            configuration_id=configuration_id,
+            deps_digest="sha256:hhh",
+            status="queued",
+            now=now,
+            created_offset=timedelta(hours=2, minutes=-index),
+        )
+    _insert_run(
+        engine,
+        run_id=interactive_id,
+        workspace_id=quiet_workspace_id,
+        configuration_id=other_configuration_id,
+        deps_digest="sha256:hhh",
+        status="queued",
+        now=now,
+        created_offset=timedelta(minutes=1),
+    )
+    _insert_run(
+        engine,
+        run_id=validate_id,
+        workspace_id=busy_workspace_id,
+        configuration_id=configuration_id,
+        deps_digest="sha256:hhh",
+        status="queued",
+        now=now,
+        operation="validate",
+        priority=100,
+        created_offset=timedelta(seconds=1),
+    )
+
+    claimed = _claim_ids(engine, now=now, limit=3)
+
+    assert claimed[0] == validate_id.lower()
+    assert set(claimed[1:]) == {interactive_id.lower(), backlog[0].lower()}
+
+
+def test_run_claim_respects_workspace_concurrency_cap(engine) -> None:
+    now = datetime(2025, 1, 10, 12, 0, 0)
+    workspace_id = _uuid()
+    configuration_id = _uuid()
+    running_id = _uuid()
+    queued_ids = [_uuid() for _ in range(3)]
+
+    _insert_run(
+        engine,
+        run_id=running_id,
+        workspace_id=workspace_id,
+        configuration_id=configuration_id,
+        deps_digest="sha256:iii",
+        status="running",
+        now=now,
+        attempt_count=1,
+        claim_expires_at=now + timedelta(minutes=5),
+        claimed_by="worker-0",
+    )
+    for run_id in queued_ids:
+        _insert_run(
+            engine,
+            run_id=run_id,
+            workspace_id=workspace_id,
+            configuration_id=configuration_id,
+            deps_digest="sha256:iii",
+            status="queued",
+            now=now,
+        )
+
+    with engine.begin() as conn:
+        conn.execute(
+            update(workspaces)
+            .where(workspaces.c.id == workspace_id)
+            .values(settings={"max_concurrent_runs": 1})
+        )
+    assert _claim_ids(engine, now=now, limit=5) == []
+
+    with engine.begin() as conn:
+        conn.execute(
+            update(workspaces).where(workspaces.c.id == workspace_id).values(settings={})
+        )
+    assert len(_claim_ids(engine, now=now, limit=5, workspace_max_running=3)) == 2
+
+
+def test_run_claim_siblings_match_configuration_digest_and_options(engine) -> None:
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    now = datetime(2025, 1, 10, 12, 0, 0)
+    workspace_id = _uuid()
+    configuration_id = _uuid()
+    other_configuration_id = _uuid()
+    options = {"log_level": "DEBUG", "dry_run": False}
+    leader_id, sibling_id, other_options_id, other_digest_id, other_config_id = (
+        _uuid() for _ in range(5)
+    )
+
+    for run_id, config_id, digest, run_options in (
+        (leader_id, configuration_id, "sha256:fff", options),
+        (sibling_id, configuration_id, "sha256:fff", {"dry_run": False, "log_level": "DEBUG"}),
+        (other_options_id, configuration_id, "sha256:fff", None),
+        (other_digest_id, configuration_id, "sha256:ggg", options),
+        (other_config_id, other_configuration_id, "sha256:fff", options),
+    ):
+        _insert_run(
+            engine,
+            run_id=run_id,
+            workspace_id=workspace_id,
+            configuration_id=config_id,
+            deps_digest=digest,
+            status="queued",
+            now=now,
+            run_options=run_options,
+        )
+
+    with session_scope(session_factory) as session:
+        leader = db.RunClaim(
+            id=leader_id,
+            attempt_count=0,
+            max_attempts=3,
+            configuration_id=configuration_id,
+            deps_digest="sha256:fff",
+            operation="process",
+            run_options='{"dry_run":false,"log_level":"DEBUG"}',
+        )
+        siblings = db.claim_run_siblings(
+            session,
+            leader=leader,
+            worker_id="worker-1",
+            now=now,
+            lease_seconds=60,
+            limit=10,
+        )
+    claimed = {claim.id.lower() for claim in siblings}
+    assert claimed == {leader_id.lower(), sibling_id.lower()}
+    assert all(claim.batch_key == leader.batch_key for claim in siblings)
+
+    with engine.begin() as conn:
+        started = conn.execute(select(runs.c.started_at).where(runs.c.id == sibling_id)).scalar()
+    assert started is None
+
+    with session_scope(session_factory) as session:
+        db.mark_run_started(session, run_id=sibling_id, worker_id="worker-1", now=now)
+    with engine.begin() as conn:
+        started = conn.execute(select(runs.c.started_at).where(runs.c.id == sibling_id)).scalar()
+    assert started is not None
+
+    with session_scope(session_factory) as session:
+        held = db.heartbeat_runs(
+            session,
+            run_ids=[leader_id, sibling_id, other_options_id],
+            worker_id="worker-1",
+            now=now,
+            lease_seconds=300,
+        )
+    assert held == {leader_id.lower(), sibling_id.lower()}
+
+
 def test_run_lease_expire_requeues(engine) -> None:
     session_factory = sessionmaker(bind=engine, expire_on_commit=False)
     now = datetime(2025, 1, 10, 12, 0, 0)
@@ -328,3 +524,164 @@ def test_run_ack_failure_requeues(engine) -> None:
     assert row.available_at.replace(tzinfo=None) == retry_at
     assert row.error_message == "boom"
     assert row.completed_at is None
+
+
+def test_run_result_cache_finds_latest_success_and_copies_results(engine) -> None:
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    now = datetime(2025, 1, 10, 12, 0, 0)
+    workspace_id = _uuid()
+    other_workspace_id = _uuid()
+    configuration_id = _uuid()
+    older_id, source_id, failed_id, foreign_id, run_id = (_uuid() for _ in range(5))
+
+    for candidate_id, status, workspace, offset in (
+        (older_id, "succeeded", workspace_id, timedelta(minutes=9)),
+        (source_id, "succeeded", workspace_id, timedelta(minutes=5)),
+        (failed_id, "failed", workspace_id, timedelta(minutes=1)),
+        (foreign_id, "succeeded", other_workspace_id, timedelta(minutes=1)),
+    ):
+        _insert_run(
+            engine,
+            run_id=candidate_id,
+            workspace_id=workspace,
+            configuration_id=configuration_id if workspace == workspace_id else _uuid(),
+            deps_digest="sha256:cache",
+            status=status,
+            now=now,
+        )
+        with engine.begin() as conn:
+            conn.execute(
+                update(runs)
+                .where(runs.c.id == candidate_id)
+                .values(result_cache_key="k" * 64, completed_at=now - offset)
+            )
+    _insert_run(
+        engine,
+        run_id=run_id,
+        workspace_id=workspace_id,
+        configuration_id=configuration_id,
+        deps_digest="sha256:cache",
+        status="running",
+        now=now,
+    )
+
+    with session_scope(session_factory) as session:
+        db.replace_run_metrics(session, run_id=source_id, metrics={"row_count_total": 28})
+        db.replace_run_fields(
+            session,
+            run_id=source_id,
+            rows=[
+                {
+                    "field": "email",
+                    "label": "Email",
+                    "detected": True,
+                    "best_mapping_score": 0.9,
+                    "valid_cells": 12,
+                    "occurrences_tables": 1,
+                    "occurrences_columns": 1,
+                }
+            ],
+        )
+        db.replace_run_metrics(session, run_id=run_id, metrics={"row_count_total": 1})
+
+    with session_scope(session_factory) as session:
+        cached = db.find_cached_run_result(
+            session,
+            workspace_id=workspace_id,
+            result_cache_key="k" * 64,
+            exclude_run_id=run_id,
+        )
+        assert cached is not None
+        assert str(cached["id"]) == source_id
+        missing = db.find_cached_run_result(
+            session,
+            workspace_id=workspace_id,
+            result_cache_key="x" * 64,
+            exclude_run_id=run_id,
+        )
+        assert missing is None
+        db.copy_run_results(session, source_run_id=source_id, run_id=run_id)
+
+    # A hand-edited output (e.g. a PATCH to the run output) is not reused.
+    with session_scope(session_factory) as session:
+        output_file = db.ensure_output_file(
+            session,
+            workspace_id=workspace_id,
+            source_file_id=None,  # type: ignore[arg-type]
+            name="output.xlsx",
+            name_key="output.xlsx",
+            now=now,
+        )
+        for output_run_id in (older_id, source_id):
+            version = db.create_output_file_version(
+                session,
+                file_id=str(output_file["id"]),
+                run_id=output_run_id,
+                filename_at_upload="output.xlsx",
+                content_type=None,
+                sha256="0" * 64,
+                byte_size=1,
+                storage_version_id=None,
+                now=now,
+            )
+            session.execute(
+                update(runs)
+                .where(runs.c.id == output_run_id)
+                .values(output_file_version_id=version["id"])
+            )
+        session.execute(
+            update(file_versions)
+            .where(file_versions.c.run_id == source_id)
+            .values(origin="manual")
+        )
+    with session_scope(session_factory) as session:
+        cached = db.find_cached_run_result(
+            session,
+            workspace_id=workspace_id,
+            result_cache_key="k" * 64,
+            exclude_run_id=run_id,
+        )
+    assert cached is not None
+    assert str(cached["id"]) == older_id
+
+    with engine.begin() as conn:
+        metrics_row = conn.execute(
+            select(run_metrics.c.row_count_total).where(run_metrics.c.run_id == run_id)
+        ).one()
+        field_rows = conn.execute(
+            select(run_fields.c.field, run_fields.c.valid_cells).where(
+                run_fields.c.run_id == run_id
+            )
+        ).all()
+    assert metrics_row.row_count_total == 28
+    assert [(row.field, row.valid_cells) for row in field_rows] == [("email", 12)]
+
+
+def test_cancelling_a_running_run_notifies_workers(engine, base_settings) -> None:
+    now = datetime(2025, 1, 10, 12, 0, 0)
+    workspace_id = _uuid()
+    configuration_id = _uuid()
+    running_id = _uuid()
+    queued_id = _uuid()
+    for run_id, status in ((running_id, "running"), (queued_id, "queued")):
+        _insert_run(
+            engine,
+            run_id=run_id,
+            workspace_id=workspace_id,
+            configuration_id=configuration_id,
+            deps_digest="sha256:cancel",
+            status=status,
+            now=now,
+        )
+
+    with psycopg.connect(**build_psycopg_connect_kwargs(base_settings), autocommit=True) as conn:
+        conn.execute(f"LISTEN {CHANNEL_RUN_CANCELLED}")
+        with engine.begin() as db_conn:
+            db_conn.execute(
+                update(runs)
+                .where(runs.c.id.in_([running_id, queued_id]))
+                .values(status="cancelled", claimed_by=None, claim_expires_at=None)
+            )
+        payloads = [notify.payload for notify in conn.notifies(timeout=2)]
+
+    assert payloads == [running_id]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import resource
+import subprocess
+import sys
+from concurrent.futures import Future
+from pathlib import Path
+from types import SimpleNamespace
+
+from ade_worker import db as worker_db
+from ade_worker.admission import (
+    RUN_BASE_BYTES,
+    AdmissionController,
+    ResourceProbe,
+    estimate_run_bytes,
+    limit_process_memory,
+)
+from ade_worker.worker import Worker
+
+GIB = 1024**3
+
+
+class _Probe:
+    def __init__(self, *, limit: int, used: int, cpu: float = 0.0) -> None:
+        self.limit = limit
+        self.used = used
+        self.cpu = cpu
+
+    def memory(self) -> tuple[int, int]:
+        return self.limit, self.used
+
+    def cpu_utilization(self) -> float:
+        return self.cpu
+
+
+def _controller(probe: _Probe) -> AdmissionController:
+    return AdmissionController(
+        probe=probe,  # type: ignore[arg-type]
+        memory_target=0.8,
+        cpu_target=0.9,
+    )
+
+
+def test_resource_probe_reads_cgroup_v2_files(tmp_path: Path) -> None:
+    (tmp_path / "memory.current").write_text(f"{3 * GIB}\n")
+    (tmp_path / "memory.max").write_text(f"{4 * GIB}\n")
+    (tmp_path / "memory.stat").write_text(f"anon 123\ninactive_file {GIB}\n")
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    (tmp_path / "cpu.stat").write_text("usage_usec 1000\n")
+
+    probe = ResourceProbe(cgroup_dir=tmp_path)
+
+    limit, used = probe.memory()  # type: ignore[misc]
+    assert used == 2 * GIB
+    assert limit <= 4 * GIB
+    assert probe.cpu_limit() <= 1.5
+
+    (tmp_path / "memory.max").write_text("max\n")
+    assert probe.memory() is not None
+
+
+def test_admission_uses_reservations_and_measured_usage() -> None:
+    probe = _Probe(limit=4 * GIB, used=10 * GIB)
+    controller = _controller(probe)
+    assert controller.has_headroom()  # nothing running: always admit one
+
+    probe.used = GIB
+    mib = 1024 * 1024
+    assert controller.reserve("run-a", [1024, 200 * mib]) == estimate_run_bytes(200 * mib)
+    assert controller.has_headroom()
+    controller.reserve("run-b", [400 * mib])
+    assert not controller.has_headroom()
+    controller.release("run-b")
+    assert controller.has_headroom()
+
+    probe.used = int(0.8 * 4 * GIB) - RUN_BASE_BYTES + 1
+    assert not controller.has_headroom()
+    probe.used = GIB
+    probe.cpu = 0.95
+    assert not controller.has_headroom()
+
+
+def test_drain_claims_until_admission_blocks(monkeypatch) -> None:
+    probe = _Probe(limit=4 * GIB, used=0)
+    worker = Worker(
+        settings=SimpleNamespace(  # type: ignore[arg-type]
+            worker_run_concurrency=8,
+            worker_run_batch_size=1,
+            worker_lease_seconds=30,
+            worker_workspace_max_concurrent_runs=None,
+        ),
+        engine=object(),  # type: ignore[arg-type]
+        session_factory=lambda: SimpleNamespace(
+            commit=lambda: None, rollback=lambda: None, close=lambda: None
+        ),
+        worker_id="worker-test",
+        paths=object(),  # type: ignore[arg-type]
+        runner=object(),  # type: ignore[arg-type]
+        storage=object(),
+        admission=_controller(probe),
+    )
+    sizes = iter([GIB // 8, GIB // 8, GIB // 8, GIB // 8])
+    limits: list[int] = []
+
+    def claim_runs(session, *, limit, **_kwargs):  # noqa: ANN001
+        limits.append(limit)
+        run_id = f"run-{len(limits)}"
+        return [
+            worker_db.RunClaim(
+                id=run_id, attempt_count=1, max_attempts=3, input_byte_size=next(sizes)
+            )
+        ]
+
+    monkeypatch.setattr(worker_db, "claim_runs", claim_runs)
+    submitted: list[str] = []
+
+    class _Executor:
+        def submit(self, fn, claims):  # noqa: ANN001
+            submitted.append(claims[0].id)
+            return Future()
+
+    claimed = worker._drain(executor=_Executor(), futures=set(), now=None)  # type: ignore[arg-type]
+
+    # Each run reserves 256 MiB + 8 x 128 MiB = 1.25 GiB; after three, one more
+    # run would pass 80% of 4 GiB.
+    assert claimed == 3
+    assert submitted == ["run-1", "run-2", "run-3"]
+    assert limits == [1, 1, 1]
+
+
+def test_limit_process_memory_sets_address_space_limit() -> None:
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        limit_process_memory(proc.pid, 4 * GIB)
+        assert resource.prlimit(proc.pid, resource.RLIMIT_AS) == (4 * GIB, 4 * GIB)
+    finally:
+        proc.kill()
+        proc.wait()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from ade_worker.worker import EnginePool, EventLog
+
+_FAKE_ENGINE_MAIN = """\
+import json
+import os
+import sys
+import time
+
+args = sys.argv[1:]
+if "--sleep" in args:
+    time.sleep(float(args[args.index("--sleep") + 1]))
+print(json.dumps({"event": "engine.run.completed", "data": {"pid": os.getpid(), "args": args}}))
+print("plain text line")
+sys.exit(3 if "--fail" in args else 0)
+"""
+
+
+def _fake_engine_env(tmp_path: Path) -> dict[str, str]:
+    package = tmp_path / "site" / "ade_engine"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "__main__.py").write_text(_FAKE_ENGINE_MAIN, encoding="utf-8")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(tmp_path / "site")
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+
+def _read_events(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_engine_pool_reuses_host_and_recycles_after_max_jobs(tmp_path: Path) -> None:
+    env = _fake_engine_env(tmp_path)
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    pool = EnginePool(max_jobs_per_host=2, max_rss_bytes=None, idle_seconds=60, max_idle_hosts=2)
+    event_log = EventLog(tmp_path / "events.ndjson")
+    pids: list[int] = []
+    exit_codes: list[int] = []
+
+    def on_event(rec: dict) -> None:
+        if rec.get("event") == "engine.run.completed":
+            pids.append(rec["data"]["pid"])
+
+    try:
+        for args in (["process"], ["process", "--fail"], ["process"]):
+            result = pool.run(
+                ("config-a", "sha256:abcd"),
+                args,
+                python_bin=Path(sys.executable),
+                config_dir=config_dir,
+                env=env,
+                event_log=event_log,
+                scope="run.engine",
+                timeout_seconds=30,
+                context={"job_id": "run-a"},
+                on_json_event=on_event,
+            )
+            exit_codes.append(result.exit_code)
+    finally:
+        pool.close()
+
+    assert exit_codes == [0, 3, 0]
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[0]
+
+    events = _read_events(tmp_path / "events.ndjson")
+    names = [item["event"] for item in events]
+    assert "engine_host.job.completed" not in names
+    assert "run.engine.stdout" in names
+    assert all(item.get("context", {}).get("job_id") == "run-a" for item in events)
+
+
+def test_engine_pool_kills_host_on_timeout(tmp_path: Path) -> None:
+    env = _fake_engine_env(tmp_path)
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    pool = EnginePool(max_jobs_per_host=10, max_rss_bytes=None, idle_seconds=60, max_idle_hosts=2)
+    event_log = EventLog(tmp_path / "events.ndjson")
+
+    try:
+        result = pool.run(
+            ("config-a", "sha256:abcd"),
+            ["process", "--sleep", "30"],
+            python_bin=Path(sys.executable),
+            config_dir=config_dir,
+            env=env,
+            event_log=event_log,
+            scope="run.engine",
+            timeout_seconds=0.5,
+        )
+        assert result.timed_out is True
+        assert result.exit_code == 124
+        assert pool._idle == []
+    finally:
+        pool.close()
@@ -21,6 +21,8 @@ class _DummySettings:
     worker_uv_cache_dir: Path
     worker_cache_ttl_days: int
     worker_run_artifact_ttl_days: int | None
+    worker_input_cache_dir: Path
+    worker_input_cache_max_mb: int | None = None
 
 
 class _DummyEngine:
@@ -42,6 +44,7 @@ def test_run_gc_uses_timezone_aware_utc_now(monkeypatch, tmp_path: Path) -> None
         worker_uv_cache_dir=tmp_path / "cache" / "uv",
         worker_cache_ttl_days=30,
         worker_run_artifact_ttl_days=30,
+        worker_input_cache_dir=tmp_path / "inputs",
     )
 
     observed: dict[str, object] = {}
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from ade_worker.gc import gc_input_cache
+from ade_worker.input_cache import InputBlobCache, InputDigestMismatchError
+
+
+class _Storage:
+    def __init__(self, blobs: dict[str, bytes]) -> None:
+        self.blobs = blobs
+        self.downloads: list[tuple[str, str | None]] = []
+
+    def download_to_path(
+        self, blob_name: str, *, version_id: str | None, destination: Path
+    ) -> None:
+        self.downloads.append((blob_name, version_id))
+        if blob_name not in self.blobs:
+            raise FileNotFoundError(blob_name)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(self.blobs[blob_name])
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_input_cache_downloads_once_and_links_into_run_dirs(tmp_path: Path) -> None:
+    data = b"name,age\nada,36\n"
+    storage = _Storage({"ws/files/a": data})
+    cache = InputBlobCache(root=tmp_path / "inputs", max_bytes=1024)
+
+    first = tmp_path / "runs" / "r1" / "input" / "a.csv"
+    second = tmp_path / "runs" / "r2" / "input" / "a.csv"
+    kwargs = {"blob_name": "ws/files/a", "version_id": "v1", "sha256": _sha(data)}
+
+    assert cache.stage(storage, destination=first, **kwargs) is False
+    assert cache.stage(storage, destination=second, **kwargs) is True
+
+    assert storage.downloads == [("ws/files/a", "v1")]
+    assert first.read_bytes() == second.read_bytes() == data
+    assert second.stat().st_ino == cache.object_path(_sha(data)).stat().st_ino
+
+    shutil.rmtree(tmp_path / "runs" / "r1")
+    assert cache.object_path(_sha(data)).read_bytes() == data
+
+
+def test_input_cache_rejects_mismatched_bytes_and_skips_unknown_digests(tmp_path: Path) -> None:
+    storage = _Storage({"blob": b"actual"})
+    cache = InputBlobCache(root=tmp_path / "inputs", max_bytes=1024)
+
+    with pytest.raises(InputDigestMismatchError):
+        cache.stage(
+            storage,
+            blob_name="blob",
+            version_id=None,
+            sha256=_sha(b"expected"),
+            destination=tmp_path / "bad.csv",
+        )
+    assert not list(cache.objects_root().glob("*/*"))
+
+    for _ in range(2):
+        cache.stage(
+            storage, blob_name="blob", version_id=None, sha256=None, destination=tmp_path / "x"
+        )
+    assert len(storage.downloads) == 3
+
+
+def test_gc_input_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    blobs = {name: name.encode() * 100 for name in ("old", "mid", "new")}
+    storage = _Storage(blobs)
+    cache = InputBlobCache(root=tmp_path / "inputs", max_bytes=650)
+    for age, name in enumerate(("new", "mid", "old")):
+        cache.stage(
+            storage,
+            blob_name=name,
+            version_id=None,
+            sha256=_sha(blobs[name]),
+            destination=tmp_path / name,
+        )
+        stamp = 1_700_000_000 - age * 60
+        os.utime(cache.object_path(_sha(blobs[name])), (stamp, stamp))
+
+    result = gc_input_cache(root=cache.root, max_bytes=cache.max_bytes)
+
+    assert (result.scanned, result.deleted) == (3, 1)
+    assert not cache.object_path(_sha(blobs["old"])).exists()
+    assert cache.object_path(_sha(blobs["mid"])).exists()
+    assert cache.object_path(_sha(blobs["new"])).exists()
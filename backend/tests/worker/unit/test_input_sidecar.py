@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import openpyxl
+
+from ade_api.common.workbook_metadata import ROW_INDEX_INTERVAL, extract_workbook_metadata
+from ade_api.common.workbook_sidecar import sidecar_descriptor
+from ade_worker import db as worker_db
+from ade_worker.worker import Worker
+
+
+class _Storage:
+    def __init__(self) -> None:
+        self.uploads: list[str] = []
+
+    def upload_path(self, uri: str, path: Path) -> SimpleNamespace:
+        self.uploads.append(uri)
+        return SimpleNamespace(version_id="v1")
+
+
+def _worker(storage: _Storage) -> Worker:
+    return Worker(
+        settings=SimpleNamespace(),  # type: ignore[arg-type]
+        engine=object(),  # type: ignore[arg-type]
+        session_factory=lambda: SimpleNamespace(  # type: ignore[arg-type]
+            commit=lambda: None, rollback=lambda: None, close=lambda: None
+        ),
+        worker_id="worker-test",
+        paths=object(),  # type: ignore[arg-type]
+        runner=object(),  # type: ignore[arg-type]
+        storage=storage,
+    )
+
+
+def _workbook(path: Path, rows: int) -> Path:
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for index in range(rows):
+        sheet.append([index, f"row {index}"])
+    workbook.save(path)
+    return path
+
+
+def test_input_sidecar_is_stored_for_indexed_workbooks(monkeypatch, tmp_path: Path) -> None:
+    stored: list[tuple[str, dict]] = []
+    monkeypatch.setattr(
+        worker_db,
+        "set_file_version_sidecar",
+        lambda session, *, file_version_id, workbook_metadata: stored.append(
+            (file_version_id, workbook_metadata)
+        ),
+    )
+    storage = _Storage()
+    worker = _worker(storage)
+
+    for name, rows in (("small.xlsx", 10), ("large.xlsx", ROW_INDEX_INTERVAL * 2 + 1)):
+        path = _workbook(tmp_path / name, rows)
+        worker._store_input_sidecar(
+            path,
+            file_row={"blob_name": f"ws/files/{name}"},
+            file_version={"id": name, "workbook_metadata": extract_workbook_metadata(path)},
+            run_dir=tmp_path,
+            run_id="run-1",
+        )
+
+    assert storage.uploads == ["ws/files/large.xlsx.large.xlsx.rows"]
+    [(file_version_id, metadata)] = stored
+    assert file_version_id == "large.xlsx"
+    descriptor = sidecar_descriptor(metadata)
+    assert descriptor is not None
+    assert descriptor["blob_name"] == "ws/files/large.xlsx.large.xlsx.rows"
+    assert descriptor["sheets"][0]["rows"] == ROW_INDEX_INTERVAL * 2 + 1
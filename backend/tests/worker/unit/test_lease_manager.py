@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from ade_worker import db as worker_db
+from ade_worker.worker import LeaseManager, Worker
+
+
+class _Session:
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _manager() -> LeaseManager:
+    return LeaseManager(
+        session_factory=_Session,  # type: ignore[arg-type]
+        worker_id="worker-test",
+        lease_seconds=30,
+        interval_seconds=10,
+    )
+
+
+def test_lease_manager_renews_all_runs_in_one_update(monkeypatch) -> None:
+    calls: list[list[str]] = []
+
+    def heartbeat_runs(session, *, run_ids, worker_id, now, lease_seconds):  # noqa: ANN001
+        calls.append(list(run_ids))
+        assert worker_id == "worker-test"
+        assert lease_seconds == 30
+        return {run_id for run_id in run_ids if run_id != "run-b"}
+
+    monkeypatch.setattr(worker_db, "heartbeat_runs", heartbeat_runs)
+    manager = _manager()
+    manager.track(["RUN-A", "run-b", "run-c"])
+
+    assert manager.renew() == {"run-b"}
+    assert calls == [["run-a", "run-b", "run-c"]]
+    assert manager.is_held("run-a") is True
+    assert manager.is_held("run-b") is False
+
+    manager.release("run-b")
+    manager.release("run-c")
+    assert manager.renew() == set()
+    assert calls[-1] == ["run-a"]
+    assert manager.is_held("run-b") is True
+
+    manager.release("run-a")
+    assert manager.renew() == set()
+    assert len(calls) == 2
+
+
+def test_worker_heartbeat_reads_lease_manager_without_a_session() -> None:
+    manager = _manager()
+    manager.track(["run-a"])
+    manager._lost.add("run-a")
+
+    def no_session():
+        raise AssertionError("heartbeat must not open a session")
+
+    worker = Worker(
+        settings=SimpleNamespace(worker_lease_seconds=30),  # type: ignore[arg-type]
+        engine=object(),  # type: ignore[arg-type]
+        session_factory=no_session,  # type: ignore[arg-type]
+        worker_id="worker-test",
+        paths=object(),  # type: ignore[arg-type]
+        runner=object(),  # type: ignore[arg-type]
+        storage=object(),
+        lease_manager=manager,
+    )
+
+    assert worker._heartbeat_run(run_id="run-a") is False
+    assert worker._heartbeat_run(run_id="run-z") is True
+
+
+def test_lease_manager_reports_leases_lost_when_renewal_keeps_failing(monkeypatch) -> None:
+    clock = [100.0]
+    outage = [False]
+
+    def heartbeat_runs(session, *, run_ids, worker_id, now, lease_seconds):  # noqa: ANN001
+        if outage[0]:
+            raise RuntimeError("database unavailable")
+        return set(run_ids)
+
+    monkeypatch.setattr(worker_db, "heartbeat_runs", heartbeat_runs)
+    manager = LeaseManager(
+        session_factory=_Session,  # type: ignore[arg-type]
+        worker_id="worker-test",
+        lease_seconds=30,
+        interval_seconds=10,
+        clock=lambda: clock[0],
+    )
+    manager.track(["run-a"])
+
+    clock[0] = 110.0
+    assert manager.renew() == set()
+    clock[0] = 124.0
+    assert manager.is_held("run-a") is True
+
+    outage[0] = True
+    clock[0] = 125.0
+    try:
+        manager.renew()
+    except RuntimeError:
+        pass
+    assert manager.is_held("run-a") is False
+
+    outage[0] = False
+    assert manager.renew() == set()
+    assert manager.is_held("run-a") is True
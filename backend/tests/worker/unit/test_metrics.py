@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from ade_worker.metrics import Counter, Gauge, Histogram, Registry, _Handler, start_metrics_server
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = Registry()
+    builds = registry.register(Counter("builds_total", "Builds.", ("result",)))
+    depth = registry.register(Gauge("queue_depth", "Depth."))
+    latency = registry.register(Histogram("claim_seconds", "Latency.", buckets=(0.1, 1.0)))
+    builds.inc(result="built")
+    builds.inc(2, result='re"used')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+    registry.add_collector(lambda: [("queue_depth", {}, 7.0)])
+
+    text = registry.render()
+
+    assert depth.value() == 7
+    assert text.splitlines() == [
+        "# HELP builds_total Builds.",
+        "# TYPE builds_total counter",
+        'builds_total{result="built"} 1',
+        'builds_total{result="re\\"used"} 2',
+        "# HELP queue_depth Depth.",
+        "# TYPE queue_depth gauge",
+        "queue_depth 7",
+        "# HELP claim_seconds Latency.",
+        "# TYPE claim_seconds histogram",
+        'claim_seconds_bucket{le="0.1"} 1',
+        'claim_seconds_bucket{le="1"} 2',
+        'claim_seconds_bucket{le="+Inf"} 3',
+        "claim_seconds_sum 5.55",
+        "claim_seconds_count 3",
+    ]
+    with pytest.raises(ValueError):
+        builds.inc(status="x")
+
+
+def test_metrics_server_serves_the_registry(monkeypatch) -> None:
+    registry = Registry()
+    registry.register(Counter("runs_claimed_total", "Claims.")).inc()
+    monkeypatch.setattr(_Handler, "registry", registry)
+    server = start_metrics_server("127.0.0.1", 0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "runs_claimed_total 1" in response.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{base}/other", timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+from ade_worker import db as worker_db
+from ade_worker.worker import Worker
+
+
+def _claim(
+    run_id: str,
+    *,
+    config: str = "config-a",
+    options: str | None = None,
+    operation: str = "process",
+) -> worker_db.RunClaim:
+    return worker_db.RunClaim(
+        id=run_id,
+        attempt_count=1,
+        max_attempts=3,
+        configuration_id=config,
+        deps_digest="sha256:abcd",
+        operation=operation,
+        run_options=options,
+    )
+
+
+def _worker(*, concurrency: int = 4, batch_size: int = 10) -> Worker:
+    settings = SimpleNamespace(
+        worker_run_concurrency=concurrency,
+        worker_run_batch_size=batch_size,
+        worker_workspace_max_concurrent_runs=None,
+        worker_lease_seconds=30,
+    )
+    return Worker(
+        settings=settings,  # type: ignore[arg-type]
+        engine=object(),  # type: ignore[arg-type]
+        session_factory=lambda: SimpleNamespace(  # type: ignore[arg-type]
+            commit=lambda: None, rollback=lambda: None, close=lambda: None
+        ),
+        worker_id="worker-test",
+        paths=object(),  # type: ignore[arg-type]
+        runner=object(),  # type: ignore[arg-type]
+        storage=object(),
+        engine_pool=object(),  # type: ignore[arg-type]
+    )
+
+
+class _Executor:
+    def __init__(self) -> None:
+        self.submitted: list[list[str]] = []
+
+    def submit(self, fn, claims):  # noqa: ANN001
+        self.submitted.append([claim.id for claim in claims])
+        return Future()
+
+
+def test_batch_key_covers_process_runs_only() -> None:
+    assert _claim("a1").batch_key == _claim("a2").batch_key
+    assert _claim("a1").batch_key != _claim("a3", options='{"log_level":"DEBUG"}').batch_key
+    assert _claim("v1", operation="validate").batch_key is None
+    assert worker_db.RunClaim(id="x", attempt_count=1, max_attempts=1).batch_key is None
+
+
+def test_drain_adds_siblings_only_to_the_run_taking_the_last_free_slot(monkeypatch) -> None:
+    queued = [f"r{index}" for index in range(1, 11)]
+    sibling_limits: list[int] = []
+
+    def claim_runs(session, *, limit, **_kwargs):  # noqa: ANN001
+        return [_claim(queued.pop(0)) for _ in range(min(limit, len(queued)))]
+
+    def claim_run_siblings(session, *, leader, limit, **_kwargs):  # noqa: ANN001
+        sibling_limits.append(limit)
+        return [_claim(queued.pop(0)) for _ in range(min(limit, len(queued)))]
+
+    monkeypatch.setattr(worker_db, "claim_runs", claim_runs)
+    monkeypatch.setattr(worker_db, "claim_run_siblings", claim_run_siblings)
+    executor = _Executor()
+
+    claimed = _worker(concurrency=4, batch_size=3)._drain(
+        executor=executor,  # type: ignore[arg-type]
+        futures=set(),
+        now=None,  # type: ignore[arg-type]
+    )
+
+    assert claimed == 6
+    assert executor.submitted == [["r1"], ["r2"], ["r3"], ["r4", "r5", "r6"]]
+    assert sibling_limits == [2]
+
+
+def test_drain_does_not_batch_while_slots_stay_free(monkeypatch) -> None:
+    def claim_run_siblings(session, **_kwargs):  # noqa: ANN001
+        raise AssertionError("siblings must not be claimed while slots are free")
+
+    monkeypatch.setattr(worker_db, "claim_run_siblings", claim_run_siblings)
+    executor = _Executor()
+    worker = _worker(concurrency=4, batch_size=3)
+    calls = iter([[_claim("r1"), _claim("r2")], []])
+    monkeypatch.setattr(worker_db, "claim_runs", lambda session, **_kwargs: next(calls))
+
+    assert worker._drain(executor=executor, futures=set(), now=None) == 2  # type: ignore[arg-type]
+    assert executor.submitted == [["r1"], ["r2"]]
+
+
+def test_drain_does_not_batch_without_the_engine_pool(monkeypatch) -> None:
+    def claim_run_siblings(session, **_kwargs):  # noqa: ANN001
+        raise AssertionError("siblings must not be claimed without warm engine hosts")
+
+    monkeypatch.setattr(worker_db, "claim_run_siblings", claim_run_siblings)
+    executor = _Executor()
+    worker = _worker(concurrency=1, batch_size=3)
+    worker.engine_pool = None
+    monkeypatch.setattr(worker_db, "claim_runs", lambda session, **_kwargs: [_claim("r1")])
+
+    assert worker._drain(executor=executor, futures=set(), now=None) == 1  # type: ignore[arg-type]
+    assert executor.submitted == [["r1"]]
+
+
+def test_process_run_batch_runs_each_claim_and_stamps_waiting_runs(monkeypatch) -> None:
+    worker = _worker()
+    calls: list[tuple[str, list[str]]] = []
+    started: list[str] = []
+
+    def process_run(self, claim):  # noqa: ANN001
+        calls.append((claim.id, list(self.batch_waiting.get(claim.id, []))))
+        if claim.id == "r2":
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(Worker, "process_run", process_run)
+    monkeypatch.setattr(Worker, "_mark_run_started", lambda self, run_id: started.append(run_id))
+
+    worker.process_run_batch([_claim("r1"), _claim("r2"), _claim("r3")])
+
+    assert calls == [("r1", ["r2", "r3"]), ("r2", ["r3"]), ("r3", [])]
+    assert started == ["r2", "r3"]
+    assert worker.batch_waiting == {}
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from ade_worker import db as worker_db
+from ade_worker.worker import (
+    EventLog,
+    LeaseManager,
+    RunCancelledError,
+    SubprocessRunner,
+    Worker,
+)
+
+
+def _worker(lease_manager: LeaseManager | None = None) -> Worker:
+    return Worker(
+        settings=SimpleNamespace(  # type: ignore[arg-type]
+            worker_engine_pool_max_jobs=50,
+            worker_engine_pool_max_rss_mb=None,
+            worker_engine_pool_idle_seconds=60.0,
+            worker_lease_seconds=30,
+            worker_run_max_memory_mb=None,
+        ),
+        engine=object(),  # type: ignore[arg-type]
+        session_factory=lambda: None,  # type: ignore[arg-type]
+        worker_id="worker-test",
+        paths=object(),  # type: ignore[arg-type]
+        runner=object(),  # type: ignore[arg-type]
+        storage=object(),
+        lease_manager=lease_manager,
+    )
+
+
+def test_subprocess_runner_kills_the_process_when_stop_event_fires(tmp_path: Path) -> None:
+    stop_event = threading.Event()
+    threading.Timer(0.2, stop_event.set).start()
+    started = time.monotonic()
+
+    with pytest.raises(RunCancelledError):
+        SubprocessRunner().run(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            event_log=EventLog(tmp_path / "events.ndjson"),
+            scope="run.engine",
+            timeout_seconds=None,
+            cwd=None,
+            env=None,
+            stop_event=stop_event,
+        )
+
+    assert time.monotonic() - started < 10
+
+
+def test_cancel_notification_stops_active_run_and_skips_waiting_runs(monkeypatch) -> None:
+    manager = LeaseManager(
+        session_factory=lambda: None,  # type: ignore[arg-type]
+        worker_id="worker-test",
+        lease_seconds=30,
+        interval_seconds=10,
+    )
+    worker = _worker(manager)
+    manager.track(["run-a", "run-b", "run-c"])
+    active = worker.cancel_events["run-a"] = threading.Event()
+
+    worker._cancel_run("RUN-A")
+    worker._cancel_run("run-b")
+    worker._cancel_run("run-unknown")
+
+    assert active.is_set()
+    assert manager.is_held("run-a") is False
+    assert manager.is_held("run-b") is False
+    assert manager.is_held("run-c") is True
+
+    processed: list[str] = []
+    monkeypatch.setattr(
+        Worker,
+        "process_run",
+        lambda self, claim: processed.append(claim.id),
+    )
+    monkeypatch.setattr(Worker, "_release_lease", lambda self, run_id: None)
+    monkeypatch.setattr(Worker, "_mark_run_started", lambda self, run_id: None)
+    claims = [
+        worker_db.RunClaim(id=run_id, attempt_count=1, max_attempts=3, operation="process")
+        for run_id in ("run-b", "run-c")
+    ]
+    worker.process_run_batch(claims)
+
+    assert processed == ["run-c"]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from ade_worker.worker import Worker
+
+
+class _Storage:
+    def __init__(self) -> None:
+        self.uploads = 0
+
+    def upload_path(self, uri: str, path: Path) -> SimpleNamespace:
+        self.uploads += 1
+        return SimpleNamespace(byte_size=path.stat().st_size)
+
+
+def test_full_upload_fallback_notifies_only_when_the_log_grows(monkeypatch, tmp_path: Path) -> None:
+    log_path = tmp_path / "events.ndjson"
+    log_path.write_text('{"event":"run.start"}\n', encoding="utf-8")
+    storage = _Storage()
+    worker = Worker(
+        settings=SimpleNamespace(),  # type: ignore[arg-type]
+        engine=object(),  # type: ignore[arg-type]
+        session_factory=lambda: None,  # type: ignore[arg-type]
+        worker_id="worker-test",
+        paths=SimpleNamespace(run_event_log_path=lambda workspace_id, run_id: log_path),  # type: ignore[arg-type]
+        runner=object(),  # type: ignore[arg-type]
+        storage=storage,
+    )
+    notified: list[int] = []
+    monkeypatch.setattr(
+        Worker,
+        "_notify_run_log_advanced",
+        lambda self, *, run_id, offset: notified.append(offset),
+    )
+
+    worker._upload_run_log(workspace_id="ws", run_id="run-1")
+    worker._upload_run_log(workspace_id="ws", run_id="run-1")
+    with log_path.open("a", encoding="utf-8") as fh:
+        fh.write('{"event":"run.complete"}\n')
+    worker._upload_run_log(workspace_id="ws", run_id="run-1")
+
+    first = len('{"event":"run.start"}\n')
+    assert notified == [first, log_path.stat().st_size]
+    assert storage.uploads == 2
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from ade_worker.worker import RunOptions, run_result_cache_key
+
+
+def _key(options: RunOptions | None = None, **overrides) -> str:
+    params = {
+        "input_sha256": "a" * 64,
+        "config_digest": "sha256:config",
+        "deps_digest": "sha256:deps",
+        "options": options or RunOptions(),
+        "sheet_names": ["Sheet1"],
+    }
+    params.update(overrides)
+    return run_result_cache_key(**params)
+
+
+def test_run_result_cache_key_ignores_log_level() -> None:
+    assert _key(RunOptions(log_level="DEBUG")) == _key(RunOptions(log_level="INFO"))
+    assert len(_key()) == 64
+
+
+def test_run_result_cache_key_changes_with_result_inputs() -> None:
+    baseline = _key()
+    variants = [
+        _key(input_sha256="b" * 64),
+        _key(config_digest="sha256:other"),
+        _key(deps_digest="sha256:other"),
+        _key(sheet_names=["Sheet2"]),
+        _key(RunOptions(active_sheet_only=True)),
+        _key(RunOptions(max_findings_per_sheet=10)),
+        _key(RunOptions(extra_engine_args=["--strict"])),
+    ]
+    assert baseline not in variants
+    assert len(set(variants)) == len(variants)
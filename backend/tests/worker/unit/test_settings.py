@@ -98,6 +98,17 @@ def test_worker_run_concurrency_env_override(monkeypatch: pytest.MonkeyPatch) ->
     assert settings.worker_run_concurrency == 7
 
 
+def test_worker_run_batch_size_requires_engine_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    _set_required_env(monkeypatch)
+    monkeypatch.setenv("ADE_WORKER_RUN_BATCH_SIZE", "4")
+
+    with pytest.raises(ValidationError, match="ADE_WORKER_ENGINE_POOL_ENABLED"):
+        Settings(_env_file=None)
+
+    monkeypatch.setenv("ADE_WORKER_ENGINE_POOL_ENABLED", "true")
+    assert Settings(_env_file=None).worker_run_batch_size == 4
+
+
 @pytest.mark.parametrize(
     ("env_name", "value", "expected_mode"),
     [
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+from ade_worker.worker import EventLog, SubprocessRunner
+
+_CHILD = r"""
+import json, sys
+for index in range(500):
+    print(json.dumps({"event": "engine.row", "data": {"index": index}}))
+    print(f"text line {index}")
+sys.stderr.buffer.write(b"warning: caf\xc3 partial")
+"""
+
+
+def _read(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_subprocess_runner_records_stdout_events_and_stderr(tmp_path: Path) -> None:
+    log_path = tmp_path / "events.ndjson"
+    event_log = EventLog(log_path, buffered=True)
+    seen: list[dict] = []
+    heartbeats: list[float] = []
+
+    def heartbeat() -> bool:
+        heartbeats.append(time.monotonic())
+        return True
+
+    result = SubprocessRunner().run(
+        [sys.executable, "-c", _CHILD],
+        event_log=event_log,
+        scope="run.engine",
+        timeout_seconds=60,
+        cwd=None,
+        env=None,
+        heartbeat=heartbeat,
+        context={"job_id": "run-1"},
+        on_json_event=seen.append,
+    )
+    event_log.flush()
+
+    assert result.exit_code == 0
+    assert not result.timed_out
+    assert heartbeats
+    assert [event["data"]["index"] for event in seen] == list(range(500))
+    assert all(event["context"] == {"job_id": "run-1"} for event in seen)
+
+    records = _read(log_path)
+    assert records[0]["event"] == "run.engine.start"
+    assert records[-1]["event"] == "run.engine.complete"
+    stdout_lines = [r["message"] for r in records if r["event"] == "run.engine.stdout"]
+    assert stdout_lines == [f"text line {index}" for index in range(500)]
+    stderr_lines = [r["message"] for r in records if r["event"] == "run.engine.stderr"]
+    assert stderr_lines == ["warning: caf\ufffd partial"]
+
+
+def test_subprocess_runner_times_out(tmp_path: Path) -> None:
+    event_log = EventLog(tmp_path / "events.ndjson")
+
+    result = SubprocessRunner().run(
+        [sys.executable, "-c", "import time; print('started', flush=True); time.sleep(30)"],
+        event_log=event_log,
+        scope="run.engine",
+        timeout_seconds=0.5,
+        cwd=None,
+        env=None,
+    )
+
+    assert result.timed_out
+    assert result.exit_code == 124
+    assert [r["message"] for r in _read(event_log.path)][1] == "started"
+
+
+def test_buffered_event_log_writes_on_flush(tmp_path: Path) -> None:
+    event_log = EventLog(tmp_path / "events.ndjson", buffered=True)
+
+    event_log.append({"event": "a"})
+    event_log.append({"event": "b", "data": {1: "non-str key"}})
+    assert not event_log.path.exists()
+
+    event_log.flush()
+    assert _read(event_log.path) == [{"event": "a"}, {"event": "b", "data": {"1": "non-str key"}}]
@@ -5,6 +5,8 @@ import sys
 from pathlib import Path
 from types import SimpleNamespace
 
+from ade_storage import StoredObject
+from ade_worker.env_artifacts import environment_artifact_blob_name
 from ade_worker.paths import PathManager
 from ade_worker.worker import EventLog, SubprocessResult, Worker
 from ade_worker import db as worker_db
@@ -39,6 +41,22 @@ class _Runner:
         return SubprocessResult(exit_code=0, timed_out=False, duration_seconds=0.01)
 
 
+class _Storage:
+    def __init__(self) -> None:
+        self.blobs: dict[str, bytes] = {}
+
+    def upload_path(self, uri: str, path: Path) -> StoredObject:
+        data = path.read_bytes()
+        self.blobs[uri] = data
+        return StoredObject(uri=uri, sha256="", byte_size=len(data), version_id=None)
+
+    def download_to_path(self, uri: str, *, version_id: str | None, destination: Path) -> None:
+        if uri not in self.blobs:
+            raise FileNotFoundError(uri)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(self.blobs[uri])
+
+
 def test_build_environment_installs_config_in_editable_mode(monkeypatch, tmp_path: Path) -> None:
     layout = _Layout(tmp_path)
     paths = PathManager(
@@ -51,6 +69,7 @@ def test_build_environment_installs_config_in_editable_mode(monkeypatch, tmp_pat
     settings = SimpleNamespace(
         worker_env_build_timeout_seconds=120,
         worker_lease_seconds=30,
+        worker_env_artifacts_enabled=False,
     )
 
     worker = Worker(
@@ -95,3 +114,62 @@ def test_build_environment_installs_config_in_editable_mode(monkeypatch, tmp_pat
     scopes = [scope for scope, _cmd in runner.calls]
     assert scopes == ["environment.venv", "environment.config"]
     assert runner.calls[1][1][-2:] == ["-e", str(config_dir)]
+
+
+def test_build_environment_shares_dependency_artifact_across_nodes(
+    monkeypatch, tmp_path: Path
+) -> None:
+    storage = _Storage()
+    settings = SimpleNamespace(
+        worker_env_build_timeout_seconds=120,
+        worker_lease_seconds=30,
+        worker_env_artifacts_enabled=True,
+    )
+    monkeypatch.setattr(Worker, "_uv_bin", lambda self: "uv")
+    monkeypatch.setattr(Worker, "_heartbeat_run", lambda self, *, run_id, now=None: True)
+
+    def build(node: str, workspace_id: str) -> list[tuple[str, list[str]]]:
+        layout = _Layout(tmp_path / node)
+        paths = PathManager(
+            layout=layout,
+            worker_runs_root=layout.runs_dir,
+            worker_venvs_root=layout.venvs_dir,
+            worker_pip_cache_root=tmp_path / node / "cache" / "pip",
+        )
+        runner = _Runner()
+        worker = Worker(
+            settings=settings,  # type: ignore[arg-type]
+            engine=object(),  # type: ignore[arg-type]
+            session_factory=lambda: None,  # type: ignore[arg-type]
+            worker_id=f"worker-{node}",
+            paths=paths,
+            runner=runner,  # type: ignore[arg-type]
+            storage=storage,
+        )
+        config_dir = paths.config_package_dir(workspace_id, "config-a")
+        config_dir.mkdir(parents=True, exist_ok=True)
+        (config_dir / "pyproject.toml").write_text("[project]\nname = 'cfg'\n", encoding="utf-8")
+        result = worker._ensure_local_venv(
+            workspace_id=workspace_id,
+            configuration_id="config-a",
+            deps_digest="sha256:abcd",
+            run_claim=worker_db.RunClaim(id=f"run-{node}", attempt_count=1, max_attempts=3),
+            event_log=EventLog(tmp_path / node / "events.ndjson"),
+            ctx={"workspace_id": workspace_id, "configuration_id": "config-a"},
+        )
+        assert result.error_message is None
+        assert result.python_bin is not None and result.python_bin.exists()
+        return runner.calls
+
+    first = build("node-a", "workspace-a")
+    assert [scope for scope, _cmd in first] == [
+        "environment.venv",
+        "environment.deps",
+        "environment.config",
+    ]
+    assert "--relocatable" in first[0][1]
+    assert list(storage.blobs) == [environment_artifact_blob_name("sha256:abcd")]
+
+    second = build("node-b", "workspace-b")
+    assert [scope for scope, _cmd in second] == ["environment.config"]
+    assert second[0][1][-2] == "-e"
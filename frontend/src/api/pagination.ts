@@ -16,6 +16,7 @@ export type CursorMeta = {
   readonly nextCursor?: string | null;
   readonly totalIncluded: boolean;
   readonly totalCount?: number | null;
+  readonly totalEstimated?: boolean | null;
   readonly changesCursor?: string | null;
 };
 
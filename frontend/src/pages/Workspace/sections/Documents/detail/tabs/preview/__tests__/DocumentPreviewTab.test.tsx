@@ -171,6 +171,8 @@ describe("DocumentPreviewTab mapping requests", () => {
       totalColumns: 3,
       truncatedRows: false,
       truncatedColumns: false,
+      rowOffset: 0,
+      columnOffset: 0,
     });
     listWorkspaceMembersMock.mockResolvedValue({
       items: [
@@ -71,6 +71,8 @@ describe("useDocumentPreviewModel", () => {
       totalColumns: 1,
       truncatedRows: false,
       truncatedColumns: false,
+      rowOffset: 0,
+      columnOffset: 0,
     });
 
     vi.spyOn(runsApi, "fetchRunOutputSheets").mockResolvedValue([]);
@@ -82,6 +84,8 @@ describe("useDocumentPreviewModel", () => {
       totalColumns: 0,
       truncatedRows: false,
       truncatedColumns: false,
+      rowOffset: 0,
+      columnOffset: 0,
     });
 
     const onSheetChange = vi.fn();
@@ -147,6 +151,8 @@ describe("useDocumentPreviewModel", () => {
       totalColumns: 8,
       truncatedRows: true,
       truncatedColumns: true,
+      rowOffset: 0,
+      columnOffset: 0,
     });
 
     const wrapper = createWrapper();
@@ -186,6 +192,8 @@ describe("useDocumentPreviewModel", () => {
       totalColumns: 3,
       truncatedRows: false,
       truncatedColumns: false,
+      rowOffset: 0,
+      columnOffset: 0,
       hiddenRows: [0],
       hiddenColumns: [1],
       cellFormats: [
@@ -275,6 +283,8 @@ describe("useDocumentPreviewModel", () => {
       totalColumns: 102,
       truncatedRows: false,
       truncatedColumns: true,
+      rowOffset: 0,
+      columnOffset: 0,
     });
 
     const wrapper = createWrapper();
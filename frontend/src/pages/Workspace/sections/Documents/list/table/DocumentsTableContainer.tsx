@@ -42,7 +42,7 @@ import {
   mapPresenceByDocument,
 } from "@/pages/Workspace/hooks/presence/presenceParticipants";
 
-import { inferFileType, shortId } from "../../shared/utils";
+import { shortId } from "../../shared/utils";
 import { partitionDocumentChanges } from "../../shared/documentChanges";
 import type { DocumentRow, WorkspacePerson } from "../../shared/types";
 import { useDocumentsListParams } from "../hooks/useDocumentsListParams";
@@ -156,10 +156,6 @@ function isSameStringArray(a: readonly string[], b: readonly string[]) {
   return true;
 }
 
-function deriveFileType(name: string): DocumentRow["fileType"] {
-  return inferFileType(name);
-}
-
 function extractRestoreConflict(error: ApiError): { message: string; suggestedName: string | null } {
   const fallbackMessage = error.message || "Unable to restore document.";
   const detail = error.problem?.detail;
@@ -481,7 +477,7 @@ export function DocumentsTableContainer({
       const activityAt = updated.activityAt ?? updated.updatedAt;
       const updates: Partial<DocumentRow> = {
         name: updated.name,
-        fileType: deriveFileType(updated.name),
+        fileType: updated.fileType,
         updatedAt: updated.updatedAt,
         activityAt,
         commentCount: updated.commentCount,
@@ -36,7 +36,7 @@ function buildServerRowUpdate(updated: DocumentRecord): Partial<DocumentListRow>
   }
   return {
     name: updated.name,
-    fileType: inferFileType(updated.name),
+    fileType: updated.fileType,
     updatedAt: updated.updatedAt,
     activityAt: updated.activityAt ?? updated.updatedAt,
     tags: updated.tags ?? [],
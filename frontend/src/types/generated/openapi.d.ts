@@ -2195,7 +2195,11 @@ export type paths = {
         delete?: never;
         options?: never;
         head?: never;
-        patch?: never;
+        /**
+         * Apply cell and row edits to a run output sheet
+         * @description Apply set-cell, insert-row and delete-row operations, in order, to a worksheet of the current run output and save the result as a new version. Only the edited sheet is rewritten. Requires an If-Match header carrying the ETag returned by the output metadata endpoint.
+         */
+        patch: operations["patch_workspace_run_output_endpoint_api_v1_workspaces__workspaceId__runs__runId__output_patch"];
         trace?: never;
     };
     "/api/v1/workspaces/{workspaceId}/runs/{runId}/output/download": {
@@ -3243,6 +3247,8 @@ export type components = {
             totalIncluded: boolean;
             /** Totalcount */
             totalCount?: number | null;
+            /** Totalestimated */
+            totalEstimated?: boolean | null;
             /** Changescursor */
             changesCursor?: string | null;
         };
@@ -3776,6 +3782,8 @@ export type components = {
                 [key: string]: unknown;
             };
             source?: components["schemas"]["FileVersionOrigin"] | null;
+            /** @default unknown */
+            fileType: components["schemas"]["DocumentFileType"];
             /** Activityat */
             activityAt?: string | null;
             /**
@@ -5136,6 +5144,19 @@ export type components = {
             /** Versionno */
             versionNo?: number | null;
         };
+        /**
+         * RunOutputDeleteRowOperation
+         * @description Delete ``row``, shifting later rows up.
+         */
+        RunOutputDeleteRowOperation: {
+            /**
+             * @description discriminator enum property added by openapi-typescript
+             * @enum {string}
+             */
+            op: "deleteRow";
+            /** Row */
+            row: number;
+        };
         /**
          * RunOutputEditRequest
          * @description Payload to save edits to a run output sheet.
@@ -5148,6 +5169,50 @@ export type components = {
             /** Rows */
             rows: string[][];
         };
+        /**
+         * RunOutputInsertRowOperation
+         * @description Insert a row before ``row``, shifting it and later rows down.
+         */
+        RunOutputInsertRowOperation: {
+            /**
+             * @description discriminator enum property added by openapi-typescript
+             * @enum {string}
+             */
+            op: "insertRow";
+            /** Row */
+            row: number;
+            /** Values */
+            values?: string[];
+        };
+        /**
+         * RunOutputPatchRequest
+         * @description Operations applied in order to a run output sheet (0-based, as in previews).
+         */
+        RunOutputPatchRequest: {
+            /** Sheetname */
+            sheetName?: string | null;
+            /** Sheetindex */
+            sheetIndex?: number | null;
+            /** Operations */
+            operations: (components["schemas"]["RunOutputSetCellOperation"] | components["schemas"]["RunOutputInsertRowOperation"] | components["schemas"]["RunOutputDeleteRowOperation"])[];
+        };
+        /**
+         * RunOutputSetCellOperation
+         * @description Set one cell; an empty value clears it.
+         */
+        RunOutputSetCellOperation: {
+            /**
+             * @description discriminator enum property added by openapi-typescript
+             * @enum {string}
+             */
+            op: "set";
+            /** Row */
+            row: number;
+            /** Column */
+            column: number;
+            /** Value */
+            value: string;
+        };
         /**
          * RunOutputSheet
          * @description Descriptor for a worksheet or single-sheet run output.
@@ -6025,6 +6090,16 @@ export type components = {
             index: number;
             /** Rows */
             rows: string[][];
+            /**
+             * Rowoffset
+             * @default 0
+             */
+            rowOffset: number;
+            /**
+             * Columnoffset
+             * @default 0
+             */
+            columnOffset: number;
             /** Totalrows */
             totalRows: number;
             /** Totalcolumns */
@@ -9838,6 +9913,14 @@ export interface operations {
                     "application/json": components["schemas"]["DocumentListPage"];
                 };
             };
+            /** @description The list page matches the ETag sent in If-None-Match. */
+            304: {
+                headers: {
+                    "X-Request-Id": components["headers"]["X-Request-Id"];
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
             /** @description Authentication required to list documents. */
             401: {
                 headers: {
@@ -11351,6 +11434,10 @@ export interface operations {
                 maxRows?: number;
                 /** @description Maximum columns per sheet to include in the preview. */
                 maxColumns?: number;
+                /** @description Rows to skip before the preview window (for scrolling large sheets). */
+                rowOffset?: number;
+                /** @description Columns to skip before the preview window. */
+                columnOffset?: number;
                 /** @description If true, trims columns with no data within the preview window. */
                 trimEmptyColumns?: boolean;
                 /** @description If true, trims rows with no data within the preview window. */
@@ -11381,6 +11468,14 @@ export interface operations {
                     "application/json": components["schemas"]["WorkbookSheetPreview"];
                 };
             };
+            /** @description The preview matches the ETag sent in If-None-Match. */
+            304: {
+                headers: {
+                    "X-Request-Id": components["headers"]["X-Request-Id"];
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
             /** @description Document not found within the workspace. */
             404: {
                 headers: {
@@ -13189,6 +13284,87 @@ export interface operations {
             default: components["responses"]["ProblemDetails"];
         };
     };
+    patch_workspace_run_output_endpoint_api_v1_workspaces__workspaceId__runs__runId__output_patch: {
+        parameters: {
+            query?: never;
+            header?: {
+                "X-CSRF-Token"?: string | null;
+            };
+            path: {
+                /** @description Workspace identifier */
+                workspaceId: string;
+                /** @description Run identifier */
+                runId: string;
+            };
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["RunOutputPatchRequest"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    "X-Request-Id": components["headers"]["X-Request-Id"];
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["RunOutput"];
+                };
+            };
+            /** @description Run or output not found */
+            404: {
+                headers: {
+                    "X-Request-Id": components["headers"]["X-Request-Id"];
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+            /** @description Output not ready */
+            409: {
+                headers: {
+                    "X-Request-Id": components["headers"]["X-Request-Id"];
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+            /** @description The output changed since the ETag in If-Match was issued. */
+            412: {
+                headers: {
+                    "X-Request-Id": components["headers"]["X-Request-Id"];
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+            /** @description Edits are not supported for this file type. */
+            415: {
+                headers: {
+                    "X-Request-Id": components["headers"]["X-Request-Id"];
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+            /** @description The sheet was not found or the operations could not be applied. */
+            422: {
+                headers: {
+                    "X-Request-Id": components["headers"]["X-Request-Id"];
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+            /** @description If-Match header is required. */
+            428: {
+                headers: {
+                    "X-Request-Id": components["headers"]["X-Request-Id"];
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+            default: components["responses"]["ProblemDetails"];
+        };
+    };
     download_workspace_run_output_endpoint_api_v1_workspaces__workspaceId__runs__runId__output_download_get: {
         parameters: {
             query?: never;
@@ -13308,6 +13484,10 @@ export interface operations {
                 maxRows?: number;
                 /** @description Maximum columns per sheet to include in the preview. */
                 maxColumns?: number;
+                /** @description Rows to skip before the preview window (for scrolling large sheets). */
+                rowOffset?: number;
+                /** @description Columns to skip before the preview window. */
+                columnOffset?: number;
                 /** @description If true, trims columns with no data within the preview window. */
                 trimEmptyColumns?: boolean;
                 /** @description If true, trims rows with no data within the preview window. */
@@ -13338,6 +13518,14 @@ export interface operations {
                     "application/json": components["schemas"]["WorkbookSheetPreview"];
                 };
             };
+            /** @description The preview matches the ETag sent in If-None-Match. */
+            304: {
+                headers: {
+                    "X-Request-Id": components["headers"]["X-Request-Id"];
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
             /** @description Run or output not found */
             404: {
                 headers: {
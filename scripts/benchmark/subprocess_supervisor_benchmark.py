@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Measure worker subprocess supervision throughput in events per second.
+
+Spawns children that print ``--events`` NDJSON events (plus one text line per
+``--text-every`` events) and supervises them with the previous design next to
+the current one. The previous design used two drain threads per child,
+``json.loads`` per line, a 50 ms poll loop and one file open per log line. The
+current design uses ``SubprocessRunner`` with a buffered ``EventLog``.
+``--concurrency`` children run at once, like a worker with several active runs.
+CPU is the supervising process's user+system time (children excluded).
+
+Run from ``backend/``:
+
+    cd backend && uv run python ../scripts/benchmark/subprocess_supervisor_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import json
+import math
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from ade_worker.worker import EventLog, SubprocessRunner
+
+_CHILD = """
+import json, sys
+events, text_every = int(sys.argv[1]), int(sys.argv[2])
+out = sys.stdout
+for index in range(events):
+    record = {"event": "engine.row", "level": "debug", "data": {"index": index}}
+    out.write(json.dumps(record) + "\\n")
+    if text_every and index % text_every == 0:
+        out.write(f"processed row {index}\\n")
+"""
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    sorted_values = sorted(values)
+    rank = math.ceil((percentile / 100.0) * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+def _legacy_run(cmd: list[str], log_path: Path) -> int:
+    lock = threading.Lock()
+    events = 0
+
+    def append(record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with lock, log_path.open("a", encoding="utf-8") as handle:
+            handle.write(line)
+
+    def drain(stream, stream_name: str) -> None:
+        nonlocal events
+        for raw in iter(stream.readline, ""):
+            line = raw.rstrip("\n")
+            if not line:
+                continue
+            obj = None
+            if line.startswith("{"):
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError:
+                    obj = None
+            if isinstance(obj, dict) and "event" in obj:
+                events += 1
+                append(obj)
+            else:
+                append({"event": f"run.engine.{stream_name}", "message": line})
+        stream.close()
+
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
+    )
+    threads = [
+        threading.Thread(target=drain, args=(proc.stdout, "stdout"), daemon=True),
+        threading.Thread(target=drain, args=(proc.stderr, "stderr"), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    while proc.poll() is None:
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join()
+    return events
+
+
+def _current_run(cmd: list[str], log_path: Path) -> int:
+    events = 0
+
+    def count(_event: dict) -> None:
+        nonlocal events
+        events += 1
+
+    event_log = EventLog(log_path, buffered=True)
+    SubprocessRunner().run(
+        cmd,
+        event_log=event_log,
+        scope="run.engine",
+        timeout_seconds=None,
+        cwd=None,
+        env=None,
+        on_json_event=count,
+    )
+    event_log.flush()
+    return events
+
+
+def _bench(name: str, run, *, args: argparse.Namespace, workdir: Path) -> None:
+    cmd = [sys.executable, "-c", _CHILD, str(args.events), str(args.text_every)]
+    rates: list[float] = []
+    for repeat in range(args.repeats):
+        logs = [workdir / f"{name}-{repeat}-{index}.ndjson" for index in range(args.concurrency)]
+        usage_before = resource.getrusage(resource.RUSAGE_SELF)
+        started = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            counts = list(executor.map(lambda path: run(cmd, path), logs))
+        elapsed = time.perf_counter() - started
+        usage_after = resource.getrusage(resource.RUSAGE_SELF)
+        cpu = (usage_after.ru_utime - usage_before.ru_utime) + (
+            usage_after.ru_stime - usage_before.ru_stime
+        )
+        total = sum(counts)
+        if total != args.events * args.concurrency:
+            raise SystemExit(
+                f"{name}: expected {args.events * args.concurrency} events, got {total}"
+            )
+        rates.append(total / elapsed)
+        print(
+            f"{name:<8} run={repeat + 1} events={total} wall={elapsed:6.2f}s "
+            f"events/s={total / elapsed:10.0f} events/cpu-s={total / max(cpu, 1e-9):10.0f}"
+        )
+    print(f"{name:<8} p50 events/s={_percentile(rates, 50):10.0f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark worker subprocess supervision.")
+    parser.add_argument(
+        "--events",
+        type=int,
+        default=200_000,
+        help="NDJSON events each child prints (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--text-every",
+        type=int,
+        default=100,
+        help="Print one plain text line per N events, 0 for none (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Children supervised at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Timed runs per design (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="ade-supervisor-bench-") as tmp:
+        workdir = Path(tmp)
+        _bench("legacy", _legacy_run, args=args, workdir=workdir)
+        _bench("selector", _current_run, args=args, workdir=workdir)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
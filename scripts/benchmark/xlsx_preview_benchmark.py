@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Compare the streaming xlsx preview reader with an openpyxl read-only baseline.
+
+Also times the same window served from a row sidecar (what run outputs use).
+
+Run from ``backend/`` so ``ade_api`` is importable:
+
+    cd backend && uv run python ../scripts/benchmark/xlsx_preview_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+
+import openpyxl
+
+from ade_api.common.workbook_preview import (
+    build_workbook_preview_from_sidecar,
+    build_workbook_preview_from_xlsx,
+)
+from ade_api.common.workbook_sidecar import WorkbookSidecar, write_workbook_sidecar
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+_PACKAGE_NS = "http://schemas.openxmlformats.org/package/2006"
+_OFFICE_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_SHEET_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+_CONTENT_TYPES = (
+    f'<Types xmlns="{_PACKAGE_NS}/content-types">'
+    f'<Default Extension="rels" ContentType="{_PACKAGE_NS}/relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    f'<Override PartName="/xl/workbook.xml" ContentType="{_SHEET_MIME}.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml"'
+    f' ContentType="{_SHEET_MIME}.worksheet+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml"'
+    f' ContentType="{_SHEET_MIME}.sharedStrings+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    f'<Relationships xmlns="{_PACKAGE_NS}/relationships">'
+    f'<Relationship Id="rId1" Type="{_OFFICE_REL}/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    f'<workbook xmlns="{SPREADSHEET_NS}" xmlns:r="{_OFFICE_REL}">'
+    '<sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    f'<Relationships xmlns="{_PACKAGE_NS}/relationships">'
+    f'<Relationship Id="rId1" Type="{_OFFICE_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_OFFICE_REL}/sharedStrings" Target="sharedStrings.xml"/>'
+    "</Relationships>"
+)
+
+
+def _write_synthetic_workbook(path: Path, *, rows: int, columns: int) -> None:
+    """Write a ``rows`` x ``columns`` sheet as raw XML (openpyxl is too slow at 1M rows)."""
+
+    last_column = openpyxl.utils.get_column_letter(columns)
+    letters = [openpyxl.utils.get_column_letter(index + 1) for index in range(columns)]
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        with archive.open("xl/sharedStrings.xml", "w", force_zip64=True) as handle:
+            header = f'<sst xmlns="{SPREADSHEET_NS}" count="{rows}" uniqueCount="{rows}">'
+            handle.write(header.encode())
+            for row in range(1, rows + 1):
+                handle.write(f"<si><t>label {row}</t></si>".encode())
+            handle.write(b"</sst>")
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as handle:
+            handle.write(
+                f'<worksheet xmlns="{SPREADSHEET_NS}"><dimension ref="A1:{last_column}{rows}"/>'
+                "<sheetData>".encode()
+            )
+            for row in range(1, rows + 1):
+                cells = [f'<c r="A{row}" t="s"><v>{row - 1}</v></c>']
+                cells.extend(
+                    f'<c r="{letter}{row}"><v>{row * index}</v></c>'
+                    for index, letter in enumerate(letters[1:], start=1)
+                )
+                hidden = ' hidden="1"' if row % 1000 == 0 else ""
+                handle.write(f'<row r="{row}"{hidden}>{"".join(cells)}</row>'.encode())
+            handle.write(b"</sheetData></worksheet>")
+
+
+def _openpyxl_preview(path: Path, *, max_rows: int, max_columns: int) -> int:
+    """Previous implementation: read-only openpyxl plus whole-part hidden scans."""
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[0]
+        cells = 0
+        for row in sheet.iter_rows(min_row=1, max_row=max_rows, max_col=max_columns):
+            for cell in row:
+                _ = (cell.value, cell.fill, cell.font, cell.alignment)
+                cells += 1
+    finally:
+        workbook.close()
+    ns = {"ns": SPREADSHEET_NS}
+    with zipfile.ZipFile(path) as archive:
+        for _ in range(2):  # hidden rows, then hidden columns
+            root = ET.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+            root.findall(".//ns:sheetData/ns:row", ns)
+    return cells
+
+
+def _streaming_preview(path: Path, *, max_rows: int, max_columns: int) -> int:
+    preview = build_workbook_preview_from_xlsx(path, max_rows=max_rows, max_columns=max_columns)
+    return sum(len(row) for row in preview.rows)
+
+
+def _sidecar_reader(path: Path, workdir: Path) -> Callable[..., int]:
+    sidecar_path = workdir / f"{path.stem}.rows"
+    descriptor = write_workbook_sidecar(path, sidecar_path)
+
+    def read(offset: int, length: int) -> bytes:
+        with sidecar_path.open("rb") as handle:
+            handle.seek(offset)
+            return handle.read(length)
+
+    sidecar = WorkbookSidecar(descriptor, read)
+
+    def preview(_: Path, *, max_rows: int, max_columns: int) -> int:
+        result = build_workbook_preview_from_sidecar(
+            sidecar,
+            max_rows=max_rows,
+            max_columns=max_columns,
+        )
+        return sum(len(row) for row in result.rows)
+
+    return preview
+
+
+def _measure(
+    func: Callable[..., int],
+    path: Path,
+    *,
+    max_rows: int,
+    max_columns: int,
+    repeat: int,
+) -> tuple[float, float]:
+    timings: list[float] = []
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        func(path, max_rows=max_rows, max_columns=max_columns)
+        timings.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(timings), peak / (1024 * 1024)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark xlsx preview readers.")
+    parser.add_argument(
+        "--samples-dir",
+        type=Path,
+        default=REPO_ROOT / "samples",
+        help="Directory of .xlsx files to benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--synthetic-rows",
+        type=int,
+        default=1_000_000,
+        help="Rows in the generated workbook; 0 skips it (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--synthetic-columns",
+        type=int,
+        default=8,
+        help="Columns in the generated workbook (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-rows",
+        type=int,
+        default=1000,
+        help="Preview window rows (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-columns",
+        type=int,
+        default=100,
+        help="Preview window columns (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per reader and file; the median time is reported (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    if args.max_rows < 1 or args.max_columns < 1 or args.repeat < 1:
+        print("error: --max-rows, --max-columns and --repeat must be >= 1", file=sys.stderr)
+        return 2
+
+    paths = sorted(args.samples_dir.glob("*.xlsx")) if args.samples_dir.is_dir() else []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if args.synthetic_rows > 0:
+            synthetic = Path(tmpdir) / f"synthetic_{args.synthetic_rows}_rows.xlsx"
+            print(f"generating {synthetic.name} ...", file=sys.stderr)
+            _write_synthetic_workbook(
+                synthetic,
+                rows=args.synthetic_rows,
+                columns=max(1, args.synthetic_columns),
+            )
+            paths.append(synthetic)
+        if not paths:
+            print("error: no workbooks to benchmark", file=sys.stderr)
+            return 2
+
+        print("ADE xlsx preview benchmark result")
+        print(f"window: {args.max_rows} rows x {args.max_columns} columns, repeat: {args.repeat}")
+        print(
+            f"{'file':<44} {'openpyxl_ms':>12} {'stream_ms':>10} {'speedup':>8} "
+            f"{'openpyxl_peak_mb':>17} {'stream_peak_mb':>15} {'sidecar_ms':>11}"
+        )
+        for path in paths:
+            baseline_s, baseline_mb = _measure(
+                _openpyxl_preview,
+                path,
+                max_rows=args.max_rows,
+                max_columns=args.max_columns,
+                repeat=args.repeat,
+            )
+            stream_s, stream_mb = _measure(
+                _streaming_preview,
+                path,
+                max_rows=args.max_rows,
+                max_columns=args.max_columns,
+                repeat=args.repeat,
+            )
+            sidecar_s, _ = _measure(
+                _sidecar_reader(path, Path(tmpdir)),
+                path,
+                max_rows=args.max_rows,
+                max_columns=args.max_columns,
+                repeat=args.repeat,
+            )
+            speedup = baseline_s / max(stream_s, 1e-9)
+            print(
+                f"{path.name[:44]:<44} {baseline_s * 1000:>12.1f} {stream_s * 1000:>10.1f} "
+                f"{speedup:>7.1f}x {baseline_mb:>17.1f} {stream_mb:>15.1f} "
+                f"{sidecar_s * 1000:>11.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())